@@ -1,19 +1,42 @@
+import itertools
 import json
 import logging
 import os
+import random
 import re
 import socket
 import threading
 import time
-import uuid
 
 import keyring
 import requests
 from websockets import Subprotocol
-from websockets.exceptions import ConnectionClosed
-from websockets.sync.client import ClientConnection, connect
 
 from ..core.data_paths import get_bundled_data_path, get_user_data_path
+from .bsatn import BsatnCodec
+from .codecs import JsonCodec
+from .query_service import QUERIED_TABLES
+from .traffic_recorder import TrafficRecorder
+from .ws_multiplexer import WebSocketMultiplexer
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 60.0) -> float:
+    """
+    Exponential backoff with jitter for reconnect attempts.
+
+    The delay is drawn from the upper half of the capped exponential window, so
+    clients that dropped together do not reconnect in lockstep.
+
+    Args:
+        attempt: Zero-based attempt number
+        base_delay: Delay cap for the first attempt in seconds
+        max_delay: Upper bound for any delay in seconds
+
+    Returns:
+        float: Seconds to wait before the attempt
+    """
+    cap = min(max_delay, base_delay * (2**attempt))
+    return cap / 2 + random.uniform(0, cap / 2)
 
 
 class BitCraft:
@@ -26,24 +49,71 @@ class BitCraft:
     def __init__(self):
         self.host = os.getenv("BITCRAFT_SPACETIME_HOST", "bitcraft-early-access.spacetimedb.com")
         self.uri = "{scheme}://{host}/v1/database/{module}/{endpoint}"
-        self.proto = Subprotocol(self.DEFAULT_SUBPROTOCOL)
-        self.ws_connection: ClientConnection | None = None
+        self.codec = self._create_codec(os.getenv("BITCRAFT_SUBPROTOCOL", self.DEFAULT_SUBPROTOCOL))
+        self.proto = Subprotocol(self.codec.subprotocol)
+        self.ws_connection: WebSocketMultiplexer | None = None
         self.module = None
         self.endpoint = None
         self.ws_uri = None
         self.headers = {}
         self.ws_lock = threading.Lock()
-        self.subscription_thread = None
-        self._stop_subscription = threading.Event()
+
+        # Supervised reconnect: re-sends the active subscription after a dropped connection
+        self.auto_reconnect = True
+        self.reconnect_base_delay = 1.0
+        self.reconnect_max_delay = 60.0
+        self.on_disconnect = None
+        self.on_reconnect = None
+        self._subscription_queries: list[str] = []
+        self._subscription_handler = None
+
+        # Ingress between the socket reader and the subscription handler: messages
+        # buffered before the reader pushes back, and an optional window (ms via
+        # BITCRAFT_COALESCE_WINDOW_MS) that merges TransactionUpdate bursts
+        self.ingress_queue_size = 1000
+        self.coalesce_window = float(os.getenv("BITCRAFT_COALESCE_WINDOW_MS", "0") or 0) / 1000.0
+
+        # Per-handle subscriptions (SubscribeMulti), keyed by query id
+        self._subscriptions: dict[int, list[str]] = {}
+        self._request_ids = itertools.count(2)
+        self._reconnect_thread: threading.Thread | None = None
+        self._reconnect_stop = threading.Event()
 
         # Configure websockets logging to prevent Unicode encoding errors
         self._configure_websocket_logging()
 
+        # Optional wire-traffic recording (see start_recording)
+        self.recorder: TrafficRecorder | None = None
+        record_path = os.getenv("BITCRAFT_RECORD_TRAFFIC")
+        if record_path:
+            self.start_recording(record_path)
+
         # Load initial data
         self.load_user_data_from_file()
         self.email = self._get_credential_from_keyring("email")
         self.auth = self._get_credential_from_keyring("authorization_token")
 
+    @staticmethod
+    def _create_codec(subprotocol: str):
+        """
+        Return the wire codec for a subprotocol name, falling back to JSON.
+
+        BSATN is only used when it has a row schema for every queried table;
+        otherwise those tables would silently come back empty.
+        """
+        if subprotocol == BsatnCodec.subprotocol:
+            codec = BsatnCodec()
+            missing = codec.missing_schemas(QUERIED_TABLES)
+            if not missing:
+                return codec
+            logging.warning(
+                f"{subprotocol} has no row schema for {', '.join(missing)} - using {JsonCodec.subprotocol}"
+            )
+            return JsonCodec()
+        if subprotocol != JsonCodec.subprotocol:
+            logging.warning(f"Unknown subprotocol '{subprotocol}', using {JsonCodec.subprotocol}")
+        return JsonCodec()
+
     def _configure_websocket_logging(self):
         """Configure websockets library logging to handle Unicode safely."""
         try:
@@ -98,6 +168,9 @@ class BitCraft:
         """
         Sends a one-off SQL query over the WebSocket and returns all result rows.
 
+        Safe to call from any thread while subscriptions are live: the connection's
+        reader task routes the response back by message_id.
+
         Args:
             query_string (str): The SQL query to execute.
 
@@ -107,69 +180,44 @@ class BitCraft:
         Raises:
             RuntimeError: If the WebSocket connection is not established.
         """
-        with self.ws_lock:
-            if not self.ws_connection:
-                raise RuntimeError("WebSocket connection is not established")
-
-            message_id = str(uuid.uuid4()).replace("-", "")
-            subscribe_message = {
-                "OneOffQuery": {
-                    "message_id": message_id,
-                    "query_string": query_string,
-                }
-            }
-
-            try:
-                self.ws_connection.send(json.dumps(subscribe_message))
-                return list(self._receive_one_off_query(message_id))
-            except (ConnectionClosed, TimeoutError) as e:
-                logging.error(f"Failed to send or receive query due to connection issue: {e}")
-                self.close_websocket()
-                return None
-            except Exception as e:
-                logging.error(f"An unexpected error occurred during query: {e}")
-                return None
-
-    def _receive_one_off_query(self, message_id: str):
-        """Listens for a specific OneOffQueryResponse and yields its rows."""
-        if not self.ws_connection:
+        connection = self.ws_connection
+        if not connection or not connection.is_open:
             raise RuntimeError("WebSocket connection is not established")
 
-        # Set a timeout to avoid blocking indefinitely
-        timeout_seconds = 10
-        start_time = time.time()
+        try:
+            results = connection.query(query_string)
+            if results is None:
+                logging.error("Failed to send or receive query due to connection issue")
+            return results
+        except Exception as e:
+            logging.error(f"An unexpected error occurred during query: {e}")
+            return None
 
-        while time.time() - start_time < timeout_seconds:
-            try:
-                msg = self.ws_connection.recv(timeout=1.0)
-                data = json.loads(msg)
-
-                if "OneOffQueryResponse" in data and data["OneOffQueryResponse"].get("message_id") == message_id:
-                    tables = data["OneOffQueryResponse"].get("tables", [])
-                    for table in tables:
-                        for row_str in table.get("rows", []):
-                            try:
-                                yield json.loads(row_str)
-                            except json.JSONDecodeError:
-                                logging.error(f"Failed to decode JSON from WebSocket row: {row_str[:100]}...")
-                    return
+    def query_many(self, query_strings: list[str]) -> list[list[dict] | None]:
+        """
+        Sends several one-off SQL queries at once and collects the responses as they arrive.
 
-                elif "error" in data:
-                    logging.error(f"WebSocket error received for message {message_id}: {data['error']}")
-                    return
+        Args:
+            query_strings (list[str]): The SQL queries to execute.
 
-            except TimeoutError:
-                continue
-            except json.JSONDecodeError:
-                logging.error(f"Failed to decode JSON from WebSocket message: {msg[:100]}...")
-            except ConnectionClosed:
-                logging.error("Connection closed while waiting for query response.")
-                return
-            except Exception as e:
-                logging.error(f"Unexpected error processing WebSocket message: {e}")
-                return
+        Returns:
+            One list of rows per query, in the same order (None for queries that failed).
 
-        logging.warning(f"Timeout after {timeout_seconds}s for message_id: {message_id} - server may be slow or unresponsive")
+        Raises:
+            RuntimeError: If the WebSocket connection is not established.
+        """
+        connection = self.ws_connection
+        if not connection or not connection.is_open:
+            raise RuntimeError("WebSocket connection is not established")
+
+        try:
+            results = connection.query_many(query_strings)
+            if not connection.is_open:
+                logging.error("Failed to send or receive queries due to connection issue")
+            return results
+        except Exception as e:
+            logging.error(f"An unexpected error occurred during batched query: {e}")
+            return [None] * len(query_strings)
 
     def _get_credential_from_keyring(self, key_name: str) -> str | None:
         try:
@@ -227,7 +275,8 @@ class BitCraft:
                 self.email = data.get("email")
                 self.region = data.get("region")
                 self.player_name = data.get("player_name")
-                self.host = data.get("host", self.host)
+                # BITCRAFT_SPACETIME_HOST (e.g. a local stand-in server) wins over the saved host
+                self.host = os.getenv("BITCRAFT_SPACETIME_HOST") or data.get("host", self.host)
                 logging.info("Non-sensitive user data loaded successfully from file.")
         except FileNotFoundError:
             logging.warning("player_data.json not found. Some user data might be missing.")
@@ -385,10 +434,26 @@ class BitCraft:
             raise ValueError("Host, module, and endpoint must be set before building WebSocket URI.")
         if not self.auth:
             raise RuntimeError("Authorization token is not set. Authenticate first.")
-        self.ws_uri = self.uri.format(scheme="wss", host=self.host, module=self.module, endpoint=self.endpoint)
+        scheme, netloc, _, _ = self._host_parts()
+        self.ws_uri = self.uri.format(scheme=scheme, host=netloc, module=self.module, endpoint=self.endpoint)
+        if self.codec.uri_query:
+            self.ws_uri = f"{self.ws_uri}?{self.codec.uri_query}"
         self.headers = {"Authorization": self.auth}
         logging.info(f"WebSocket URI set: {self.ws_uri}")
 
+    def _host_parts(self) -> tuple[str, str, str, int]:
+        """
+        Split the configured host into (scheme, host[:port], host name, TCP port).
+
+        The host may carry a scheme and port (e.g. ws://127.0.0.1:3000 for the
+        local stand-in server); a bare host name means wss on port 443.
+        """
+        scheme, separator, netloc = self.host.partition("://")
+        if not separator:
+            scheme, netloc = "wss", self.host
+        hostname, _, port = netloc.partition(":")
+        return scheme, netloc, hostname, int(port) if port.isdigit() else (443 if scheme == "wss" else 80)
+
     def diagnose_connection_issues(self):
         """Comprehensive connection diagnostics."""
         logging.info("=== Connection Diagnostics ===")
@@ -402,11 +467,12 @@ class BitCraft:
             return False
 
         # Check DNS resolution
+        hostname = self._host_parts()[2]
         try:
-            ip = socket.gethostbyname(self.host)
-            logging.info(f"DNS resolution: {self.host} -> {ip}")
+            ip = socket.gethostbyname(hostname)
+            logging.info(f"DNS resolution: {hostname} -> {ip}")
         except Exception as e:
-            logging.error(f"DNS resolution failed for {self.host}: {e}")
+            logging.error(f"DNS resolution failed for {hostname}: {e}")
             return False
 
         # Check HTTP/HTTPS connectivity to the host
@@ -422,9 +488,7 @@ class BitCraft:
         """Test basic connectivity to the server before attempting WebSocket connection."""
 
         try:
-            # Parse host from ws_uri or use self.host
-            host = self.host
-            port = 443
+            _, _, host, port = self._host_parts()
 
             logging.info(f"Testing connectivity to {host}:{port}...")
 
@@ -461,9 +525,9 @@ class BitCraft:
                     raise
 
                 # Calculate delay with exponential backoff
-                delay = base_delay * (2**attempt)
+                delay = backoff_delay(attempt, base_delay, self.reconnect_max_delay)
                 logging.warning(f"Connection attempt {attempt + 1} failed: {e}")
-                logging.info(f"Retrying in {delay} seconds...")
+                logging.info(f"Retrying in {delay:.1f} seconds...")
 
                 time.sleep(delay)
 
@@ -471,7 +535,7 @@ class BitCraft:
         with self.ws_lock:
             if not self.ws_uri:
                 raise RuntimeError("WebSocket URI is not set. Call set_websocket_uri() first.")
-            if self.ws_connection:
+            if self.ws_connection and self.ws_connection.is_open:
                 logging.info("WebSocket connection already exists. Reusing existing connection.")
                 return
             try:
@@ -479,22 +543,19 @@ class BitCraft:
                 logging.info(f"Using subprotocol: {self.proto}")
                 logging.info(f"Additional headers: {self.headers}")
 
-                # Configure connection with explicit timeouts and error handling
-                self.ws_connection = connect(
+                # One reader task serves both subscriptions and one-off queries
+                connection = WebSocketMultiplexer(
                     self.ws_uri,
-                    additional_headers=self.headers,
-                    subprotocols=[self.proto],
-                    max_size=None,
-                    max_queue=None,
+                    self.headers,
+                    self.codec,
+                    on_close=self._on_connection_lost,
+                    recorder=self.recorder,
+                    ingress_queue_size=self.ingress_queue_size,
+                    coalesce_window=self.coalesce_window,
                 )
-
-                # Try to receive the first message with a timeout
-                try:
-                    first_msg = self.ws_connection.recv(timeout=10.0)
-                    logging.info(f"Initial WebSocket handshake message: {first_msg[:20]}...")
-                    logging.info("WebSocket connection established successfully")
-                except TimeoutError:
-                    logging.warning("Timeout waiting for initial handshake message, but connection may be valid")
+                connection.start()
+                self.ws_connection = connection
+                logging.info("WebSocket connection established successfully")
 
             except Exception as e:
                 logging.error(f"Failed to establish WebSocket connection: {e}")
@@ -519,22 +580,14 @@ class BitCraft:
                 raise
 
     def close_websocket(self):
-        """Enhanced WebSocket closing with timeout handling."""
+        """Close the WebSocket connection and its reader and dispatcher threads."""
         logging.info("Closing WebSocket connection...")
 
+        # An explicit close ends any reconnect in progress
+        self._reconnect_stop.set()
+
         try:
             with self.ws_lock:
-                self._stop_subscription.set()
-
-                # Wait for subscription thread with timeout
-                if self.subscription_thread and self.subscription_thread.is_alive():
-                    logging.info("Waiting for subscription thread to finish...")
-                    self.subscription_thread.join(timeout=1.0)  # 1 second timeout
-
-                    if self.subscription_thread.is_alive():
-                        logging.warning("Subscription thread did not finish within timeout")
-
-                # Close WebSocket connection
                 if self.ws_connection:
                     try:
                         self.ws_connection.close()
@@ -549,94 +602,242 @@ class BitCraft:
         except Exception as e:
             logging.error(f"Error in close_websocket: {e}")
 
+        self.stop_recording()
+
     def start_subscription_listener(self, queries: list[str], callback: callable):
         """
-        Sends a subscription request and starts the background listener thread.
+        Sends a subscription request and routes subscription messages to the callback.
         Replaces any existing subscriptions.
         """
         with self.ws_lock:
-            if not self.ws_connection:
+            if not self.ws_connection or not self.ws_connection.is_open:
                 raise RuntimeError("WebSocket connection is not established.")
             if not queries:
                 logging.warning("No queries provided for subscription.")
                 return
 
-            # Stop existing subscription thread if running but don't send unsubscribe
-            if self.subscription_thread and self.subscription_thread.is_alive():
-                logging.info("Stopping existing subscription thread...")
-                self._stop_subscription.set()
-                self.subscription_thread.join(timeout=1.0)
-
-            self._stop_subscription.clear()
+            # Route messages to the new callback before the server starts answering
+            self.ws_connection.set_message_handler(callback)
+            self._subscription_queries = list(queries)
+            self._subscription_handler = callback
 
             # Send new subscription request (this should replace any existing subscriptions)
             subscribe_message = {"Subscribe": {"request_id": 1, "query_strings": queries}}
-            self.ws_connection.send(json.dumps(subscribe_message))
+            self.ws_connection.send(subscribe_message)
             logging.info(f"Sent subscription request for {len(queries)} queries (replaces any existing subscriptions).")
 
-            # Start the listener thread that will call the callback
-            self.subscription_thread = threading.Thread(
-                target=self._listen_for_subscription_updates,
-                args=(callback,),
-                daemon=True,
-            )
-            self.subscription_thread.start()
+    def start_recording(self, path) -> bool:
+        """
+        Record every received frame to a compressed file for offline replay.
+
+        Recording spans reconnects and stops with stop_recording() or close_websocket().
+        Also enabled at startup by the BITCRAFT_RECORD_TRAFFIC environment variable.
+
+        Args:
+            path: Output file path (conventionally *.jsonl.gz)
+
+        Returns:
+            bool: True if recording started
+        """
+        try:
+            self.stop_recording()
+            self.recorder = TrafficRecorder(path, self.codec.subprotocol)
+            if self.ws_connection:
+                self.ws_connection.recorder = self.recorder
+            logging.info(f"Recording WebSocket traffic to {path}")
+            return True
+        except Exception as e:
+            logging.error(f"Failed to start traffic recording: {e}")
+            self.recorder = None
+            return False
+
+    def stop_recording(self):
+        """Stop recording and close the recording file."""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return
+        if self.ws_connection:
+            self.ws_connection.recorder = None
+        recorder.close()
+
+    def subscribe(self, queries: list[str], callback: callable) -> int:
+        """
+        Subscribe to a group of queries that can later be removed on its own.
+
+        Unlike start_subscription_listener(), this does not replace existing
+        subscriptions: each group gets its own handle, and the server answers with a
+        SubscribeMultiApplied message carrying that handle's initial rows.
+
+        Args:
+            queries: SQL subscription queries
+            callback: Receives every subscription message (shared by all handles)
+
+        Returns:
+            int: Handle (query id) to pass to unsubscribe()
+
+        Raises:
+            RuntimeError: If the WebSocket connection is not established
+        """
+        with self.ws_lock:
+            if not self.ws_connection or not self.ws_connection.is_open:
+                raise RuntimeError("WebSocket connection is not established.")
+
+            self.ws_connection.set_message_handler(callback)
+            self._subscription_handler = callback
+
+            query_id = next(self._request_ids)
+            self._subscriptions[query_id] = list(queries)
+            self._send_subscribe_multi(query_id, queries)
+            logging.info(f"Subscribed to {len(queries)} queries (handle {query_id})")
+            return query_id
+
+    def unsubscribe(self, query_id: int) -> bool:
+        """
+        Remove one subscription group; the server answers with UnsubscribeMultiApplied.
+
+        Args:
+            query_id: Handle returned by subscribe()
+
+        Returns:
+            bool: True if the handle was active
+        """
+        with self.ws_lock:
+            if self._subscriptions.pop(query_id, None) is None:
+                logging.warning(f"No active subscription with handle {query_id}")
+                return False
+
+            if self.ws_connection and self.ws_connection.is_open:
+                self._send_unsubscribe_multi(query_id)
+            logging.info(f"Unsubscribed handle {query_id}")
+            return True
+
+    def get_ingress_stats(self) -> dict:
+        """
+        Return backpressure statistics of the current connection's ingress queue.
+
+        Returns:
+            dict: See IngressQueue.get_stats (empty when not connected)
+        """
+        connection = self.ws_connection
+        return connection.get_ingress_stats() if connection else {}
+
+    def get_subscription_ids(self) -> list[int]:
+        """Return the handles of all active subscription groups."""
+        return list(self._subscriptions)
+
+    def _send_subscribe_multi(self, query_id: int, queries: list[str]):
+        request_id = next(self._request_ids)
+        message = {"SubscribeMulti": {"query_strings": list(queries), "request_id": request_id, "query_id": {"id": query_id}}}
+        self.ws_connection.send(message)
+
+    def _send_unsubscribe_multi(self, query_id: int):
+        request_id = next(self._request_ids)
+        self.ws_connection.send({"UnsubscribeMulti": {"request_id": request_id, "query_id": {"id": query_id}}})
 
     def stop_subscriptions(self):
         """
-        Stops current subscriptions without closing the WebSocket connection.
+        Stops delivering subscription messages without closing the WebSocket connection.
+
+        Every subscription handle is unsubscribed on the server before the callback is
+        detached. One-off queries keep working.
         """
         with self.ws_lock:
             if not self.ws_connection:
                 logging.warning("No WebSocket connection to stop subscriptions on.")
                 return
 
+            if self.ws_connection.is_open:
+                for query_id in list(self._subscriptions):
+                    self._send_unsubscribe_multi(query_id)
+
+            self.ws_connection.set_message_handler(None)
+            self._subscription_queries = []
+            self._subscription_handler = None
+            self._subscriptions.clear()
+            logging.info("Subscriptions stopped successfully.")
+
+    def _on_connection_lost(self, connection: WebSocketMultiplexer):
+        """
+        Start the reconnect loop when the active connection drops unexpectedly.
+
+        Called by the multiplexer on its event loop thread, so the actual work
+        happens on a separate reconnect thread.
+        """
+        if connection is not self.ws_connection or not self.auto_reconnect:
+            return
+
+        logging.warning("WebSocket connection lost - starting automatic reconnect")
+        if self.on_disconnect:
             try:
-                # Just stop the subscription listener thread, don't send unsubscribe message
-                logging.info("Stopping subscription thread...")
+                self.on_disconnect()
+            except Exception as e:
+                logging.error(f"Error in disconnect callback: {e}")
+
+        if self._reconnect_thread and self._reconnect_thread.is_alive():
+            return
+
+        self._reconnect_stop = threading.Event()
+        self._reconnect_thread = threading.Thread(
+            target=self._reconnect_loop, args=(self._reconnect_stop,), name="WebSocketReconnect", daemon=True
+        )
+        self._reconnect_thread.start()
+
+    def _reconnect_loop(self, stop: threading.Event):
+        """Reconnect with jittered backoff until it succeeds or close_websocket() is called."""
+        attempt = 0
+        while not stop.is_set():
+            delay = backoff_delay(attempt, self.reconnect_base_delay, self.reconnect_max_delay)
+            logging.info(f"Reconnecting in {delay:.1f}s (attempt {attempt + 1})")
+            if stop.wait(delay):
+                break
 
-                # Stop the subscription listener thread
-                self._stop_subscription.set()
+            try:
+                self._reconnect(stop)
+                connection = self.ws_connection
+                if stop.is_set() or (connection and connection.is_open):
+                    return
+                # Dropped again before this thread finished; its close callback was ignored
+                raise RuntimeError("connection closed during resubscribe")
+            except Exception as e:
+                logging.warning(f"Reconnect attempt {attempt + 1} failed: {e}")
+                attempt += 1
 
-                # Wait for subscription thread to finish
-                if self.subscription_thread and self.subscription_thread.is_alive():
-                    logging.info("Waiting for subscription thread to finish...")
-                    self.subscription_thread.join(timeout=2.0)
+        logging.info("Automatic reconnect cancelled")
 
-                    if self.subscription_thread.is_alive():
-                        logging.warning("Subscription thread did not finish within timeout")
+    def _reconnect(self, stop: threading.Event):
+        """
+        Replace the dropped connection and re-send the active subscription set.
 
-                self.subscription_thread = None
-                logging.info("Subscriptions stopped successfully.")
+        on_reconnect runs after the new connection is up and before the subscriptions
+        are re-sent, so listeners can prepare for the fresh initial rows.
+        """
+        with self.ws_lock:
+            stale, self.ws_connection = self.ws_connection, None
+        if stale is not None:
+            stale.close()
 
+        self.connect_websocket()
+        if stop.is_set():
+            self.close_websocket()
+            return
+
+        logging.info("WebSocket reconnected")
+        if self.on_reconnect:
+            try:
+                self.on_reconnect()
             except Exception as e:
-                logging.error(f"Error stopping subscriptions: {e}")
-                raise
+                logging.error(f"Error in reconnect callback: {e}")
 
-    def _listen_for_subscription_updates(self, callback):
-        """A dedicated loop for listening to subscription messages."""
-        logging.info("Subscription listener thread started.")
-        try:
-            while not self._stop_subscription.is_set():
-                if not self.ws_connection:
-                    logging.warning("Subscription listener: WebSocket connection is closed.")
-                    break
-                try:
-                    # Use a timeout to allow the loop to check the stop event
-                    msg = self.ws_connection.recv(timeout=1.0)
-                    data = json.loads(msg)
-                    # Call the DataService callback with the message
-                    callback(data)
-                except TimeoutError:
-                    continue  # No message received, loop again
-                except json.JSONDecodeError as e:
-                    logging.error(f"Failed to decode JSON from subscription message: {e}")
-                except Exception as e:
-                    # Handle connection drops or other errors
-                    logging.error(f"Error in subscription listener: {e}")
-                    break
-        finally:
-            logging.info("Subscription listener thread stopped.")
+        if self._subscription_queries and self._subscription_handler:
+            self.start_subscription_listener(self._subscription_queries, self._subscription_handler)
+
+        # Handles keep their query ids so callers can still unsubscribe them
+        if self._subscriptions and self._subscription_handler:
+            with self.ws_lock:
+                self.ws_connection.set_message_handler(self._subscription_handler)
+                for query_id, queries in list(self._subscriptions.items()):
+                    self._send_subscribe_multi(query_id, queries)
+            logging.info(f"Re-sent {len(self._subscriptions)} subscription groups")
 
     def logout(self):
         try:
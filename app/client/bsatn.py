@@ -0,0 +1,698 @@
+"""
+BSATN codec for the binary v1.bsatn.spacetimedb subprotocol.
+
+With the JSON subprotocol every row arrives as a JSON string nested inside a
+JSON message and is parsed twice. With BSATN, rows are compact little-endian
+binary values. This module decodes them straight into the row shapes the
+processors already consume, which differ by message like the JSON ones do:
+
+- subscription and query rows become dicts keyed by field name, with
+  timestamps as {"__timestamp_micros_since_unix_epoch__": micros}
+- transaction rows (TransactionUpdate, UnsubscribeMultiApplied) become arrays
+  in column order, with timestamps as [micros], for the processors' from_array()
+- nested products become lists, sums become [tag, value], unit becomes {}
+
+BSATN carries no field names or types, so every table needs a schema. Row
+schemas are derived from the dataclasses in app/models/object_dataclasses.py
+(field names and order), with the wire type of each field declared in
+TABLE_SCHEMAS. A row whose bytes do not match its schema raises ValueError.
+Table updates for tables without a schema are dropped with a warning, so the
+client only negotiates BSATN when missing_schemas() is empty for every table
+it queries.
+"""
+
+import dataclasses
+import gzip
+import logging
+import struct
+import zlib
+
+from ..models import (
+    BuildingState,
+    CharacterStatsState,
+    ClaimMemberState,
+    ClaimState,
+    ClaimTechState,
+    InventoryState,
+    ProgressiveActionState,
+    PublicProgressiveActionState,
+    StaminaState,
+    TravelerTaskState,
+)
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Errors raised by the decompressors on corrupt payloads (gzip.BadGzipFile is an OSError)
+DECOMPRESSION_ERRORS = (OSError, EOFError, zlib.error) + ((brotli.error,) if BROTLI_AVAILABLE else ())
+
+
+# ========== BSATN TYPES ==========
+# Each type decodes with decode(buf, pos) -> (value, new_pos) and encodes with
+# encode(value, out: bytearray).
+
+
+class Primitive:
+    """Fixed-width little-endian number or bool."""
+
+    def __init__(self, fmt: str):
+        self._struct = struct.Struct("<" + fmt)
+        self.size = self._struct.size
+
+    def decode(self, buf, pos):
+        return self._struct.unpack_from(buf, pos)[0], pos + self.size
+
+    def encode(self, value, out):
+        out += self._struct.pack(value)
+
+
+class BigInt:
+    """128/256-bit little-endian integer."""
+
+    def __init__(self, size: int, signed: bool):
+        self.size = size
+        self.signed = signed
+
+    def decode(self, buf, pos):
+        end = pos + self.size
+        if end > len(buf):
+            raise ValueError("BSATN buffer too short")
+        return int.from_bytes(buf[pos:end], "little", signed=self.signed), end
+
+    def encode(self, value, out):
+        out += int(value).to_bytes(self.size, "little", signed=self.signed)
+
+
+class _String:
+    def decode(self, buf, pos):
+        length, pos = U32.decode(buf, pos)
+        end = pos + length
+        if end > len(buf):
+            raise ValueError("BSATN buffer too short")
+        return bytes(buf[pos:end]).decode("utf-8"), end
+
+    def encode(self, value, out):
+        data = value.encode("utf-8")
+        U32.encode(len(data), out)
+        out += data
+
+
+class _Bytes:
+    def decode(self, buf, pos):
+        length, pos = U32.decode(buf, pos)
+        end = pos + length
+        if end > len(buf):
+            raise ValueError("BSATN buffer too short")
+        return bytes(buf[pos:end]), end
+
+    def encode(self, value, out):
+        U32.encode(len(value), out)
+        out += value
+
+
+class _Unit:
+    def decode(self, buf, pos):
+        return {}, pos
+
+    def encode(self, value, out):
+        pass
+
+
+class Array:
+    """u32 element count followed by the elements."""
+
+    def __init__(self, element):
+        self.element = element
+
+    def decode(self, buf, pos):
+        count, pos = U32.decode(buf, pos)
+        decode = self.element.decode
+        values = []
+        for _ in range(count):
+            value, pos = decode(buf, pos)
+            values.append(value)
+        return values, pos
+
+    def encode(self, value, out):
+        U32.encode(len(value), out)
+        for element in value:
+            self.element.encode(element, out)
+
+
+class Product:
+    """Fields in declaration order; decodes to a dict (named=True) or a list."""
+
+    def __init__(self, fields, named: bool = False):
+        self.fields = list(fields)
+        self.named = named
+
+    def decode(self, buf, pos):
+        if self.named:
+            values = {}
+            for name, field_type in self.fields:
+                values[name], pos = field_type.decode(buf, pos)
+        else:
+            values = []
+            for _, field_type in self.fields:
+                value, pos = field_type.decode(buf, pos)
+                values.append(value)
+        return values, pos
+
+    def encode(self, value, out):
+        if self.named:
+            for name, field_type in self.fields:
+                field_type.encode(value[name], out)
+        else:
+            for (_, field_type), element in zip(self.fields, value):
+                field_type.encode(element, out)
+
+
+class Sum:
+    """u8 tag followed by the variant payload; decodes to [tag, value]."""
+
+    def __init__(self, variants):
+        self.variants = list(variants)
+
+    def decode(self, buf, pos):
+        tag, pos = U8.decode(buf, pos)
+        if tag >= len(self.variants):
+            raise ValueError(f"Unknown BSATN sum tag {tag}")
+        value, pos = self.variants[tag].decode(buf, pos)
+        return [tag, value], pos
+
+    def encode(self, value, out):
+        tag, payload = value
+        U8.encode(tag, out)
+        self.variants[tag].encode(payload, out)
+
+
+class TaggedSum:
+    """Sum whose value is rendered as {variant_name: value}, like message-level JSON enums."""
+
+    def __init__(self, variants):
+        self.variants = list(variants)
+        self._tags = {name: tag for tag, (name, _) in enumerate(self.variants)}
+
+    def decode(self, buf, pos):
+        tag, pos = U8.decode(buf, pos)
+        if tag >= len(self.variants):
+            raise ValueError(f"Unsupported BSATN message variant {tag}")
+        name, variant_type = self.variants[tag]
+        value, pos = variant_type.decode(buf, pos)
+        return {name: value}, pos
+
+    def encode(self, value, out):
+        (name, payload), = value.items()
+        tag = self._tags[name]
+        U8.encode(tag, out)
+        self.variants[tag][1].encode(payload, out)
+
+
+class Wrapped:
+    """A single-field product rendered as {key: value} (timestamps, identities, ...)."""
+
+    def __init__(self, key, inner, to_json=None, from_json=None):
+        self.key = key
+        self.inner = inner
+        self.to_json = to_json
+        self.from_json = from_json
+
+    def decode(self, buf, pos):
+        value, pos = self.inner.decode(buf, pos)
+        return {self.key: self.to_json(value) if self.to_json else value}, pos
+
+    def encode(self, value, out):
+        value = value[self.key]
+        self.inner.encode(self.from_json(value) if self.from_json else value, out)
+
+
+def as_array(field_type, value):
+    """
+    Render a decoded value in the array form of JSON transaction rows.
+
+    Named products become lists in field order and wrapped values such as
+    timestamps become [value].
+
+    Args:
+        field_type: BSATN type the value was decoded with
+        value: Decoded value
+
+    Returns:
+        The value with every nested product as a list
+    """
+    if isinstance(field_type, Product):
+        values = [value[name] for name, _ in field_type.fields] if field_type.named else value
+        return [as_array(element_type, element) for (_, element_type), element in zip(field_type.fields, values)]
+    if isinstance(field_type, Wrapped):
+        return [value[field_type.key]]
+    if isinstance(field_type, Array):
+        return [as_array(field_type.element, element) for element in value]
+    if isinstance(field_type, Sum):
+        tag, payload = value
+        return [tag, as_array(field_type.variants[tag], payload)]
+    return value
+
+
+def Option(inner):
+    """SATS Option: tag 0 = some(value), tag 1 = none."""
+    return Sum([inner, UNIT])
+
+
+def Enum(variant_count):
+    """Sum of unit variants (plain Rust enums)."""
+    return Sum([UNIT] * variant_count)
+
+
+BOOL = Primitive("?")
+U8 = Primitive("B")
+U16 = Primitive("H")
+U32 = Primitive("I")
+U64 = Primitive("Q")
+I8 = Primitive("b")
+I16 = Primitive("h")
+I32 = Primitive("i")
+I64 = Primitive("q")
+F32 = Primitive("f")
+F64 = Primitive("d")
+U128 = BigInt(16, False)
+I128 = BigInt(16, True)
+U256 = BigInt(32, False)
+STRING = _String()
+BYTES = _Bytes()
+UNIT = _Unit()
+
+TIMESTAMP = Wrapped("__timestamp_micros_since_unix_epoch__", I64)
+TIME_DURATION = Wrapped("__time_duration_micros__", I64)
+IDENTITY = Wrapped("__identity__", U256, to_json=lambda v: f"0x{v:064x}", from_json=lambda v: int(v, 16))
+CONNECTION_ID = Wrapped("__connection_id__", U128)
+ENERGY_QUANTA = Wrapped("quanta", U128)
+
+
+# ========== TABLE SCHEMAS ==========
+
+_ANNOTATION_TYPES = {"str": STRING, "bool": BOOL, "float": F32}
+
+
+def dataclass_schema(cls, **field_types):
+    """
+    Build a row schema from a dataclass.
+
+    Field names and order come from the dataclass. str, bool and float fields map to
+    String, Bool and F32; every other field must be given explicitly, since Python
+    annotations do not carry integer widths or nested layouts.
+
+    Args:
+        cls: Row dataclass (e.g. BuildingState)
+        **field_types: BSATN type per field name
+
+    Returns:
+        Product: Named product decoding rows to dicts
+
+    Raises:
+        ValueError: If a field has no type or field_types names an unknown field
+    """
+    fields = dataclasses.fields(cls)
+    unknown = set(field_types) - {field.name for field in fields}
+    if unknown:
+        raise ValueError(f"{cls.__name__} has no fields {sorted(unknown)}")
+
+    schema = []
+    for field in fields:
+        field_type = field_types.get(field.name)
+        if field_type is None:
+            annotation = field.type if isinstance(field.type, str) else getattr(field.type, "__name__", "")
+            field_type = _ANNOTATION_TYPES.get(annotation)
+        if field_type is None:
+            raise ValueError(f"No BSATN type for {cls.__name__}.{field.name}")
+        schema.append((field.name, field_type))
+    return Product(schema, named=True)
+
+
+ITEM_STACK = Product([("item_id", I32), ("quantity", I32), ("item_type", Enum(2)), ("durability", Option(I32))])
+POCKET = Product([("volume", I32), ("contents", Option(ITEM_STACK)), ("locked", BOOL)])
+
+TABLE_SCHEMAS = {
+    "inventory_state": dataclass_schema(
+        InventoryState,
+        entity_id=U64,
+        pockets=Array(POCKET),
+        inventory_index=I32,
+        cargo_index=I32,
+        owner_entity_id=U64,
+        player_owner_entity_id=U64,
+    ),
+    # building_description_id is not a column (see PassiveCraftState.from_array)
+    "passive_craft_state": Product(
+        [
+            ("entity_id", U64),
+            ("owner_entity_id", U64),
+            ("recipe_id", I32),
+            ("building_entity_id", U64),
+            ("timestamp", TIMESTAMP),
+            ("status", Enum(5)),
+            ("slot", Option(I32)),
+        ],
+        named=True,
+    ),
+    "progressive_action_state": dataclass_schema(
+        ProgressiveActionState,
+        entity_id=U64,
+        building_entity_id=U64,
+        function_type=I32,
+        progress=I32,
+        recipe_id=I32,
+        craft_count=I32,
+        last_crit_outcome=I32,
+        owner_entity_id=U64,
+        lock_expiration=TIMESTAMP,
+    ),
+    "public_progressive_action_state": dataclass_schema(
+        PublicProgressiveActionState, entity_id=U64, building_entity_id=U64, owner_entity_id=U64
+    ),
+    "traveler_task_state": dataclass_schema(
+        TravelerTaskState, entity_id=U64, player_entity_id=U64, traveler_id=I32, task_id=I32
+    ),
+    "claim_state": dataclass_schema(
+        ClaimState, entity_id=U64, owner_player_entity_id=U64, owner_building_entity_id=U64
+    ),
+    "claim_member_state": dataclass_schema(
+        ClaimMemberState, entity_id=U64, claim_entity_id=U64, player_entity_id=U64
+    ),
+    "building_state": dataclass_schema(
+        BuildingState,
+        entity_id=U64,
+        claim_entity_id=U64,
+        direction_index=I32,
+        building_description_id=I32,
+        constructed_by_player_entity_id=U64,
+    ),
+    "stamina_state": dataclass_schema(StaminaState, entity_id=U64, last_stamina_decrease_timestamp=TIMESTAMP),
+    "character_stats_state": dataclass_schema(CharacterStatsState, entity_id=U64, values=Array(F32)),
+    "claim_tech_state": dataclass_schema(
+        ClaimTechState,
+        entity_id=U64,
+        learned=Array(I32),
+        researching=I32,
+        start_timestamp=TIMESTAMP,
+        scheduled_id=Option(U64),
+    ),
+    # No dataclass: only the nickname is read
+    "building_nickname_state": Product([("entity_id", U64), ("nickname", STRING)], named=True),
+    # No schema yet: claim_local_state (the live rows have far more columns than
+    # ClaimLocalState, see its from_array), player_lowercase_username_state,
+    # user_data, traveler_task_desc and the reference *_desc tables
+}
+
+
+# ========== MESSAGE SCHEMAS ==========
+
+
+class RowList:
+    """BsatnRowList: a size hint plus the concatenated row bytes; decodes to per-row byte strings."""
+
+    _SIZE_HINT = Sum([U16, Array(U64)])
+
+    def decode(self, buf, pos):
+        (hint_tag, hint), pos = self._SIZE_HINT.decode(buf, pos)
+        data, pos = BYTES.decode(buf, pos)
+        if hint_tag == 0:
+            size = hint
+            if not size:
+                return [], pos
+            return [data[start : start + size] for start in range(0, len(data), size)], pos
+        offsets = list(hint) + [len(data)]
+        return [data[offsets[i] : offsets[i + 1]] for i in range(len(hint))], pos
+
+    def encode(self, rows, out):
+        offsets = []
+        total = 0
+        for row in rows:
+            offsets.append(total)
+            total += len(row)
+        self._SIZE_HINT.encode([1, offsets], out)
+        BYTES.encode(b"".join(rows), out)
+
+
+ROW_LIST = RowList()
+QUERY_UPDATE = Product([("deletes", ROW_LIST), ("inserts", ROW_LIST)], named=True)
+
+
+class CompressableQueryUpdate:
+    """Query update that may be brotli/gzip compressed; decodes to {"deletes", "inserts"}."""
+
+    def decode(self, buf, pos):
+        tag, pos = U8.decode(buf, pos)
+        if tag == 0:
+            return QUERY_UPDATE.decode(buf, pos)
+        data, pos = BYTES.decode(buf, pos)
+        value, _ = QUERY_UPDATE.decode(_decompress(tag, data), 0)
+        return value, pos
+
+    def encode(self, value, out):
+        U8.encode(0, out)
+        QUERY_UPDATE.encode(value, out)
+
+
+TABLE_UPDATE = Product(
+    [("table_id", U32), ("table_name", STRING), ("num_rows", U64), ("updates", Array(CompressableQueryUpdate()))],
+    named=True,
+)
+DATABASE_UPDATE = Product([("tables", Array(TABLE_UPDATE))], named=True)
+QUERY_ID = Product([("id", U32)], named=True)
+
+_SUBSCRIBE_ROWS = Product([("table_id", U32), ("table_name", STRING), ("table_rows", TABLE_UPDATE)], named=True)
+_SINGLE_APPLIED = Product(
+    [("request_id", U32), ("total_host_execution_duration_micros", U64), ("query_id", QUERY_ID), ("rows", _SUBSCRIBE_ROWS)],
+    named=True,
+)
+_MULTI_APPLIED = Product(
+    [
+        ("request_id", U32),
+        ("total_host_execution_duration_micros", U64),
+        ("query_id", QUERY_ID),
+        ("update", DATABASE_UPDATE),
+    ],
+    named=True,
+)
+
+SERVER_MESSAGE = TaggedSum(
+    [
+        (
+            "InitialSubscription",
+            Product(
+                [("database_update", DATABASE_UPDATE), ("request_id", U32), ("total_host_execution_duration", TIME_DURATION)],
+                named=True,
+            ),
+        ),
+        (
+            "TransactionUpdate",
+            Product(
+                [
+                    ("status", TaggedSum([("Committed", DATABASE_UPDATE), ("Failed", STRING), ("OutOfEnergy", UNIT)])),
+                    ("timestamp", TIMESTAMP),
+                    ("caller_identity", IDENTITY),
+                    ("caller_connection_id", CONNECTION_ID),
+                    (
+                        "reducer_call",
+                        Product(
+                            [("reducer_name", STRING), ("reducer_id", U32), ("args", BYTES), ("request_id", U32)], named=True
+                        ),
+                    ),
+                    ("energy_quanta_used", ENERGY_QUANTA),
+                    ("total_host_execution_duration", TIME_DURATION),
+                ],
+                named=True,
+            ),
+        ),
+        ("TransactionUpdateLight", Product([("request_id", U32), ("update", DATABASE_UPDATE)], named=True)),
+        (
+            "IdentityToken",
+            Product([("identity", IDENTITY), ("token", STRING), ("connection_id", CONNECTION_ID)], named=True),
+        ),
+        (
+            "OneOffQueryResponse",
+            Product(
+                [
+                    ("message_id", BYTES),
+                    ("error", Option(STRING)),
+                    ("tables", Array(Product([("table_name", STRING), ("rows", ROW_LIST)], named=True))),
+                    ("total_host_execution_duration", TIME_DURATION),
+                ],
+                named=True,
+            ),
+        ),
+        ("SubscribeApplied", _SINGLE_APPLIED),
+        ("UnsubscribeApplied", _SINGLE_APPLIED),
+        (
+            "SubscriptionError",
+            Product(
+                [
+                    ("total_host_execution_duration_micros", U64),
+                    ("request_id", Option(U32)),
+                    ("query_id", Option(U32)),
+                    ("table_id", Option(U32)),
+                    ("error", STRING),
+                ],
+                named=True,
+            ),
+        ),
+        ("SubscribeMultiApplied", _MULTI_APPLIED),
+        ("UnsubscribeMultiApplied", _MULTI_APPLIED),
+    ]
+)
+
+CLIENT_MESSAGE = TaggedSum(
+    [
+        (
+            "CallReducer",
+            Product([("reducer", STRING), ("args", BYTES), ("request_id", U32), ("flags", U8)], named=True),
+        ),
+        ("Subscribe", Product([("query_strings", Array(STRING)), ("request_id", U32)], named=True)),
+        ("OneOffQuery", Product([("message_id", BYTES), ("query_string", STRING)], named=True)),
+        ("SubscribeSingle", Product([("query", STRING), ("request_id", U32), ("query_id", QUERY_ID)], named=True)),
+        (
+            "SubscribeMulti",
+            Product([("query_strings", Array(STRING)), ("request_id", U32), ("query_id", QUERY_ID)], named=True),
+        ),
+        ("Unsubscribe", Product([("request_id", U32), ("query_id", QUERY_ID)], named=True)),
+        ("UnsubscribeMulti", Product([("request_id", U32), ("query_id", QUERY_ID)], named=True)),
+    ]
+)
+
+# Server frames start with a compression tag
+COMPRESSION_NONE = 0
+COMPRESSION_BROTLI = 1
+COMPRESSION_GZIP = 2
+
+
+def _decompress(tag, data):
+    if tag == COMPRESSION_NONE:
+        return data
+    try:
+        if tag == COMPRESSION_GZIP:
+            return gzip.decompress(data)
+        if tag == COMPRESSION_BROTLI:
+            if not BROTLI_AVAILABLE:
+                raise ValueError("Received brotli-compressed BSATN data but brotli is not installed")
+            return brotli.decompress(data)
+    except DECOMPRESSION_ERRORS as e:
+        raise ValueError(f"Corrupt compressed BSATN data (tag {tag}): {e}") from e
+    raise ValueError(f"Unknown BSATN compression tag {tag}")
+
+
+# ========== CODEC ==========
+
+
+class BsatnCodec:
+    """Codec for the v1.bsatn.spacetimedb subprotocol."""
+
+    subprotocol = "v1.bsatn.spacetimedb"
+
+    def __init__(self, table_schemas=None):
+        """
+        Args:
+            table_schemas: Row schema per table name (defaults to TABLE_SCHEMAS)
+        """
+        self.table_schemas = TABLE_SCHEMAS if table_schemas is None else table_schemas
+        self._warned_tables = set()
+        # Ask for gzip when brotli (the server default) cannot be decoded
+        self.uri_query = None if BROTLI_AVAILABLE else "compression=Gzip"
+
+    def encode(self, message: dict) -> bytes:
+        """Encode a client message; hex-string message_ids are sent as bytes."""
+        if "OneOffQuery" in message:
+            query = dict(message["OneOffQuery"])
+            if isinstance(query["message_id"], str):
+                query["message_id"] = bytes.fromhex(query["message_id"])
+            message = {"OneOffQuery": query}
+        elif "CallReducer" in message:
+            message = {"CallReducer": {"flags": 0, **message["CallReducer"]}}
+
+        out = bytearray()
+        CLIENT_MESSAGE.encode(message, out)
+        return bytes(out)
+
+    def decode(self, frame) -> dict:
+        """
+        Decode a server frame into the same message dict the JSON codec produces.
+
+        Raises:
+            ValueError: If the frame is malformed or uses an unsupported message type
+        """
+        if isinstance(frame, str):
+            raise ValueError("Expected a binary BSATN frame, got text")
+        try:
+            buf = _decompress(frame[0], memoryview(frame)[1:])
+            message, _ = SERVER_MESSAGE.decode(buf, 0)
+
+            (name, body), = message.items()
+            if name == "InitialSubscription":
+                self._decode_database_update(body["database_update"])
+            elif name == "TransactionUpdate":
+                committed = body["status"].get("Committed")
+                if committed is not None:
+                    self._decode_database_update(committed, as_arrays=True)
+            elif name in ("TransactionUpdateLight", "UnsubscribeMultiApplied"):
+                self._decode_database_update(body["update"], as_arrays=True)
+            elif name == "SubscribeMultiApplied":
+                self._decode_database_update(body["update"])
+            elif name == "OneOffQueryResponse":
+                self._decode_query_response(body)
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"Malformed BSATN frame: {e}") from e
+        return message
+
+    def missing_schemas(self, table_names):
+        """
+        Return the tables this codec cannot decode rows for.
+
+        Args:
+            table_names: Table names the client queries or subscribes to
+
+        Returns:
+            list: Sorted names of tables without a row schema
+        """
+        return sorted(set(table_names) - set(self.table_schemas))
+
+    def _row_schema(self, table_name):
+        schema = self.table_schemas.get(table_name)
+        if schema is None and table_name not in self._warned_tables:
+            self._warned_tables.add(table_name)
+            logging.warning(f"[BsatnCodec] No BSATN schema for table '{table_name}' - its rows are dropped")
+        return schema
+
+    def _decode_rows(self, table_name, schema, rows, as_arrays=False):
+        decode = schema.decode
+        decoded = []
+        for row in rows:
+            value, end = decode(row, 0)
+            if end != len(row):
+                raise ValueError(f"BSATN row of '{table_name}' has {len(row) - end} bytes left over its schema")
+            decoded.append(as_array(schema, value) if as_arrays else value)
+        return decoded
+
+    def _decode_database_update(self, database_update, as_arrays=False):
+        tables = []
+        for table_update in database_update["tables"]:
+            table_name = table_update["table_name"]
+            schema = self._row_schema(table_name)
+            if schema is None:
+                continue
+            for update in table_update["updates"]:
+                update["deletes"] = self._decode_rows(table_name, schema, update["deletes"], as_arrays)
+                update["inserts"] = self._decode_rows(table_name, schema, update["inserts"], as_arrays)
+            tables.append(table_update)
+        database_update["tables"] = tables
+
+    def _decode_query_response(self, response):
+        response["message_id"] = response["message_id"].hex()
+        error_tag, error = response["error"]
+        response["error"] = error if error_tag == 0 else None
+        for table in response["tables"]:
+            schema = self._row_schema(table["table_name"])
+            table["rows"] = self._decode_rows(table["table_name"], schema, table["rows"]) if schema is not None else []
@@ -0,0 +1,26 @@
+"""
+Wire codecs for the SpacetimeDB WebSocket connection.
+
+A codec names the WebSocket subprotocol it speaks and converts between frames
+and the message dicts used by MessageRouter (the v1 JSON message shapes):
+
+- encode(message) -> str | bytes   for client messages ({"Subscribe": {...}}, ...)
+- decode(frame) -> dict            for server messages
+
+The binary BSATN codec lives in bsatn.py.
+"""
+
+from app.services import json_codec
+
+
+class JsonCodec:
+    """Codec for the v1.json.spacetimedb subprotocol."""
+
+    subprotocol = "v1.json.spacetimedb"
+    uri_query = None
+
+    def encode(self, message: dict) -> str:
+        return json_codec.dumps(message)
+
+    def decode(self, frame) -> dict:
+        return json_codec.loads(frame)
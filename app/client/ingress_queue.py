@@ -0,0 +1,208 @@
+"""
+Bounded ingress queue between the WebSocket reader and the message router worker.
+
+The reader puts decoded subscription messages on the queue and the dispatcher
+thread takes them off. When the queue is full the reader waits, which stops it
+reading the socket and lets TCP flow control push back on the server instead of
+buffering without limit. Queue depth, waits and coalescing are counted for
+diagnostics (see IngressQueue.get_stats).
+
+merge_transaction_updates() folds a burst of committed TransactionUpdates into
+one message with a single update group per table, so processors handle the
+burst in one pass.
+"""
+
+import collections
+import queue
+import threading
+import time
+
+from app.services import json_codec
+
+
+class IngressQueue:
+    """Thread-safe FIFO with a soft capacity and backpressure statistics."""
+
+    def __init__(self, maxsize: int = 1000):
+        """
+        Args:
+            maxsize: Capacity before put() blocks (0 or None for unbounded)
+        """
+        self.maxsize = maxsize or 0
+        self._items = collections.deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+        self.enqueued = 0
+        self.dispatched = 0
+        self.high_water = 0
+        self.backpressure_waits = 0
+        self.backpressure_seconds = 0.0
+        self.overflow = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def full(self) -> bool:
+        with self._lock:
+            return self._full()
+
+    def _full(self):
+        return 0 < self.maxsize <= len(self._items)
+
+    def put(self, item, timeout: float | None = None) -> bool:
+        """
+        Append an item, waiting for space while the queue is full.
+
+        Args:
+            item: Message to enqueue
+            timeout: Seconds to wait for space (None waits indefinitely)
+
+        Returns:
+            bool: True if the item was enqueued, False on timeout
+        """
+        with self._not_full:
+            if self._full():
+                start = time.monotonic()
+                self._not_full.wait_for(lambda: not self._full(), timeout)
+                self.backpressure_seconds += time.monotonic() - start
+                if self._full():
+                    return False
+            self._append(item)
+            return True
+
+    def put_nowait(self, item) -> bool:
+        """Append an item if there is space; returns False when the queue is full."""
+        with self._lock:
+            if self._full():
+                return False
+            self._append(item)
+            return True
+
+    def force_put(self, item):
+        """Append an item even when the queue is full (counted as overflow)."""
+        with self._lock:
+            if self._full():
+                self.overflow += 1
+            self._append(item)
+
+    def _append(self, item):
+        self._items.append(item)
+        self.enqueued += 1
+        self.high_water = max(self.high_water, len(self._items))
+        self._not_empty.notify()
+
+    def get(self, timeout: float | None = None):
+        """
+        Remove and return the oldest item.
+
+        Args:
+            timeout: Seconds to wait for an item (None waits indefinitely)
+
+        Raises:
+            queue.Empty: If no item arrived within the timeout
+        """
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            item = self._items.popleft()
+            self.dispatched += 1
+            self._not_full.notify()
+            return item
+
+    def record_backpressure_wait(self):
+        with self._lock:
+            self.backpressure_waits += 1
+
+    def record_coalesced(self, count: int):
+        with self._lock:
+            self.coalesced += count
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: Current depth, capacity, high-water mark, totals enqueued and
+                  dispatched, backpressure waits/seconds, overflow and coalesced
+                  transaction counts
+        """
+        with self._lock:
+            return {
+                "depth": len(self._items),
+                "capacity": self.maxsize,
+                "high_water": self.high_water,
+                "enqueued": self.enqueued,
+                "dispatched": self.dispatched,
+                "backpressure_waits": self.backpressure_waits,
+                "backpressure_seconds": round(self.backpressure_seconds, 3),
+                "overflow": self.overflow,
+                "coalesced": self.coalesced,
+            }
+
+
+def is_committed_transaction(message) -> bool:
+    """Return True for a TransactionUpdate whose status is Committed."""
+    if not isinstance(message, dict):
+        return False
+    body = message.get("TransactionUpdate")
+    return isinstance(body, dict) and isinstance(body.get("status"), dict) and "Committed" in body["status"]
+
+
+def _row_identity(row):
+    # JSON rows are strings and BSATN rows bytes; decoded rows fall back to their JSON text
+    if isinstance(row, (str, bytes)):
+        return row
+    return json_codec.dumps(row)
+
+
+def merge_transaction_updates(messages: list) -> dict:
+    """
+    Merge committed TransactionUpdates into one with a single update group per table.
+
+    Rows are netted out in order: a row inserted by one transaction and deleted
+    by a later one in the burst disappears from both lists, so processors that
+    apply all deletes before all inserts still end up with the final state.
+    The merged message carries the timestamp and reducer call of the last
+    transaction.
+
+    Args:
+        messages: Consecutive committed TransactionUpdate messages
+
+    Returns:
+        dict: One TransactionUpdate message
+    """
+    tables = {}
+    for message in messages:
+        for table_update in message["TransactionUpdate"]["status"]["Committed"].get("tables", []):
+            name = table_update.get("table_name")
+            entry = tables.get(name)
+            if entry is None:
+                base = {k: v for k, v in table_update.items() if k not in ("updates", "inserts", "deletes")}
+                entry = tables[name] = (base, {}, {})
+            _, deletes, inserts = entry
+
+            row_groups = [table_update]
+            row_groups.extend(u for u in table_update.get("updates", []) if isinstance(u, dict))
+            for group in row_groups:
+                for row in group.get("deletes") or ():
+                    key = _row_identity(row)
+                    if key in inserts:
+                        del inserts[key]
+                    else:
+                        deletes[key] = row
+                for row in group.get("inserts") or ():
+                    inserts[_row_identity(row)] = row
+
+    merged_tables = []
+    for base, deletes, inserts in tables.values():
+        table_update = dict(base)
+        if "num_rows" in table_update:
+            table_update["num_rows"] = len(inserts)
+        table_update["updates"] = [{"deletes": list(deletes.values()), "inserts": list(inserts.values())}]
+        merged_tables.append(table_update)
+
+    merged = dict(messages[-1]["TransactionUpdate"])
+    merged["status"] = {"Committed": {"tables": merged_tables}}
+    return {"TransactionUpdate": merged}
@@ -0,0 +1,775 @@
+"""
+Local SpacetimeDB stand-in server for load testing.
+
+Speaks the subset of the v1.json.spacetimedb protocol the client uses:
+Subscribe/InitialSubscription, SubscribeMulti/UnsubscribeMulti, OneOffQuery and
+TransactionUpdate. Tables live in memory and are seeded either from a traffic
+recording (see TrafficRecorder) or from a synthetic claim. A workload task
+then commits transactions at a configurable rate and pushes each one to every
+connection whose subscriptions cover the changed rows.
+
+Only the SQL shapes QueryService sends are understood:
+
+    SELECT * | table.* FROM table [JOIN other ON a.col = b.col] [WHERE [t.]col = 'value' [AND ...]];
+
+Point the client at it with BITCRAFT_SPACETIME_HOST=ws://127.0.0.1:<port>:
+
+    python -m app.client.local_server --port 3000 --buildings 400 --rate 50
+    python -m app.client.local_server --recording session.jsonl.gz --rate 0
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from websockets import Subprotocol
+from websockets.asyncio.server import serve
+
+from app.services import json_codec
+
+from .codecs import JsonCodec
+from .traffic_recorder import read_recording
+
+_SELECT_RE = re.compile(
+    r"^\s*SELECT\s+(?P<projection>.+?)\s+FROM\s+(?P<table>\w+)"
+    r"(?:\s+JOIN\s+(?P<join>\w+)\s+ON\s+(?P<left>[\w.]+)\s*=\s*(?P<right>[\w.]+))?"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION_RE = re.compile(r"^\s*(?P<column>[\w.]+)\s*=\s*(?:'(?P<text>(?:[^']|'')*)'|(?P<number>-?\d+))\s*$")
+
+
+@dataclass
+class Query:
+    """A parsed subscription or one-off query."""
+
+    table: str
+    join_table: str | None = None
+    join_on: tuple = ()
+    conditions: list = field(default_factory=list)
+
+
+def parse_query(query_string: str) -> Query:
+    """
+    Parse the SELECT subset QueryService uses.
+
+    The result rows come from the first projected table (`table.*`), or the FROM
+    table for `SELECT *`.
+
+    Args:
+        query_string: SQL query text
+
+    Returns:
+        Query: Parsed query
+
+    Raises:
+        ValueError: If the query is outside the supported subset
+    """
+    match = _SELECT_RE.match(query_string)
+    if not match:
+        raise ValueError(f"Unsupported query: {query_string}")
+
+    from_table = match.group("table")
+    join_table = match.group("join")
+    projection = match.group("projection").split(",")[0].strip()
+    table = from_table if projection == "*" else projection.split(".")[0]
+    if table not in (from_table, join_table):
+        raise ValueError(f"Unsupported projection '{projection}' in: {query_string}")
+
+    def qualify(column):
+        owner, _, name = column.rpartition(".")
+        return (owner or from_table, name)
+
+    join_on = ()
+    if join_table:
+        join_on = (qualify(match.group("left")), qualify(match.group("right")))
+
+    conditions = []
+    if match.group("where"):
+        for clause in re.split(r"\s+AND\s+", match.group("where"), flags=re.IGNORECASE):
+            condition = _CONDITION_RE.match(clause)
+            if not condition:
+                raise ValueError(f"Unsupported condition '{clause}' in: {query_string}")
+            value = condition.group("number")
+            if value is None:
+                value = condition.group("text").replace("''", "'")
+            conditions.append((qualify(condition.group("column")), value))
+
+    other = join_table if table == from_table else from_table
+    return Query(table=table, join_table=other if join_table else None, join_on=join_on, conditions=conditions)
+
+
+def row_key(row: dict):
+    """Primary key of a row: entity_id for state tables, id for reference tables."""
+    if "entity_id" in row:
+        return row["entity_id"]
+    if "id" in row:
+        return row["id"]
+    return json_codec.dumps(row)
+
+
+class LocalDatabase:
+    """In-memory tables with just enough query evaluation for the client's SQL."""
+
+    def __init__(self, tables: dict | None = None):
+        """
+        Args:
+            tables: Optional initial rows by table name
+        """
+        self.tables: dict[str, dict] = {}
+        self._indexes: dict[tuple, dict] = {}
+        for table_name, rows in (tables or {}).items():
+            self.apply(table_name, inserts=rows)
+
+    def apply(self, table_name: str, inserts=(), deletes=()):
+        """Delete then insert rows of one table."""
+        table = self.tables.setdefault(table_name, {})
+        for row in deletes:
+            table.pop(row_key(row), None)
+        for row in inserts:
+            table[row_key(row)] = row
+        # Join indexes over this table are rebuilt on next use
+        for index_key in [k for k in self._indexes if k[0] == table_name]:
+            del self._indexes[index_key]
+
+    def select(self, query: Query) -> list[dict]:
+        """Return the rows a query selects."""
+        return [row for row in self.tables.get(query.table, {}).values() if self.matches(query, row)]
+
+    def matches(self, query: Query, row: dict) -> bool:
+        """Return True if a row of query.table is selected by the query."""
+        if not query.join_table:
+            return self._conditions_hold(query, {query.table: row})
+
+        (left_table, left_column), (right_table, right_column) = query.join_on
+        if left_table == query.table:
+            column, other_column = left_column, right_column
+        else:
+            column, other_column = right_column, left_column
+
+        for other in self._index(query.join_table, other_column).get(_normalize(row.get(column)), ()):
+            if self._conditions_hold(query, {query.table: row, query.join_table: other}):
+                return True
+        return False
+
+    def _conditions_hold(self, query, rows):
+        for (table, column), value in query.conditions:
+            row = rows.get(table)
+            if row is None or _normalize(row.get(column)) != value:
+                return False
+        return True
+
+    def _index(self, table_name, column):
+        index = self._indexes.get((table_name, column))
+        if index is None:
+            index = {}
+            for row in self.tables.get(table_name, {}).values():
+                index.setdefault(_normalize(row.get(column)), []).append(row)
+            self._indexes[(table_name, column)] = index
+        return index
+
+
+def _normalize(value):
+    # Ids are compared as strings: queries quote them, rows carry integers
+    return value if isinstance(value, str) else str(value)
+
+
+# Tables whose TransactionUpdate rows the client reads positionally (from_array),
+# as (column, default) in column order
+POSITIONAL_COLUMNS = {
+    "inventory_state": [
+        ("entity_id", 0),
+        ("pockets", []),
+        ("inventory_index", 0),
+        ("cargo_index", 0),
+        ("owner_entity_id", 0),
+        ("player_owner_entity_id", 0),
+    ],
+}
+
+
+def _encode_row(table_name, row, positional):
+    columns = POSITIONAL_COLUMNS.get(table_name) if positional else None
+    if columns:
+        row = [row.get(column, default) for column, default in columns]
+    return json_codec.dumps(row)
+
+
+def _decode_row(table_name, row):
+    # Inverse of _encode_row for recorded frames: positional rows become dicts again
+    if isinstance(row, str):
+        row = json_codec.loads(row)
+    columns = POSITIONAL_COLUMNS.get(table_name)
+    if columns and isinstance(row, list):
+        row = {column: value for (column, _), value in zip(columns, row)}
+    return row
+
+
+def _table_update(table_name, inserts=(), deletes=(), positional=False):
+    inserts = [_encode_row(table_name, row, positional) for row in inserts]
+    deletes = [_encode_row(table_name, row, positional) for row in deletes]
+    return {
+        "table_id": 0,
+        "table_name": table_name,
+        "num_rows": len(inserts),
+        "updates": [{"deletes": deletes, "inserts": inserts}],
+    }
+
+
+def _now_micros():
+    return int(time.time() * 1_000_000)
+
+
+def synthetic_claim(
+    player_name: str = "loadtest",
+    buildings: int = 200,
+    pockets: int = 20,
+    crafts: int = 300,
+    members: int = 10,
+    items: int = 2000,
+    seed: int = 1,
+) -> dict:
+    """
+    Generate reference data and one claim with the given size.
+
+    Args:
+        player_name: Username of the claim owner (look it up with this name)
+        buildings: Storage buildings in the claim, each with one inventory
+        pockets: Pockets per building inventory
+        crafts: Passive crafts spread over the buildings
+        members: Claim members including the owner
+        items: Item/cargo reference rows
+        seed: Random seed
+
+    Returns:
+        dict: Rows by table name, ready for LocalDatabase
+    """
+    rng = random.Random(seed)
+    player_id = 1_000
+    claim_id = 2_000
+    now = _now_micros()
+
+    tables = {
+        "item_desc": [{"id": i, "name": f"Item {i}", "tier": i % 10, "tag": "Material"} for i in range(1, items + 1)],
+        "cargo_desc": [{"id": i, "name": f"Cargo {i}", "tier": i % 10, "tag": "Cargo"} for i in range(1, items // 4 + 1)],
+        "resource_desc": [],
+        "building_desc": [{"id": 100, "name": "Storage Chest"}, {"id": 101, "name": "Workbench"}],
+        "building_function_type_mapping_desc": [],
+        "building_type_desc": [],
+        "crafting_recipe_desc": [
+            {"id": i, "name": f"Recipe {i}", "actions_required": 50, "crafted_item_stacks": [[i, 1]]} for i in range(1, 501)
+        ],
+        "claim_tile_cost": [],
+        "npc_desc": [],
+        "claim_tech_desc": [],
+        "player_lowercase_username_state": [{"entity_id": player_id, "username_lowercase": player_name.lower()}],
+        "claim_state": [
+            {
+                "entity_id": claim_id,
+                "owner_player_entity_id": player_id,
+                "owner_building_entity_id": 10_000,
+                "name": "Load Test Claim",
+                "neutral": False,
+            }
+        ],
+        "claim_local_state": [
+            {"entity_id": claim_id, "supplies": 1000, "num_tiles": buildings * 4, "treasury": 5000, "location": [0, 0]}
+        ],
+        "claim_member_state": [
+            {
+                "entity_id": 3_000 + i,
+                "claim_entity_id": claim_id,
+                "player_entity_id": player_id + i,
+                "user_name": player_name if i == 0 else f"member{i}",
+                "inventory_permission": True,
+                "build_permission": True,
+                "officer_permission": i == 0,
+                "co_owner_permission": i == 0,
+            }
+            for i in range(members)
+        ],
+        "stamina_state": [
+            {"entity_id": player_id, "stamina": 100.0, "last_stamina_decrease_timestamp": {"__timestamp_micros_since_unix_epoch__": now}}
+        ],
+        "character_stats_state": [],
+        "traveler_task_state": [],
+        "traveler_task_desc": [],
+        "claim_tech_state": [],
+        "building_state": [],
+        "building_nickname_state": [],
+        "inventory_state": [],
+        "passive_craft_state": [],
+        "progressive_action_state": [],
+        "public_progressive_action_state": [],
+    }
+
+    for i in range(buildings):
+        building_id = 10_000 + i
+        tables["building_state"].append(
+            {
+                "entity_id": building_id,
+                "claim_entity_id": claim_id,
+                "direction_index": 0,
+                "building_description_id": 100 if i % 5 else 101,
+                "constructed_by_player_entity_id": player_id,
+            }
+        )
+        if i % 10 == 0:
+            tables["building_nickname_state"].append({"entity_id": building_id, "nickname": f"Chest {i}"})
+        tables["inventory_state"].append(synthetic_inventory(rng, 100_000 + i, building_id, pockets, items))
+
+    for i in range(crafts):
+        tables["passive_craft_state"].append(
+            synthetic_craft(rng, 200_000 + i, player_id + rng.randrange(members), 10_000 + rng.randrange(buildings), now)
+        )
+
+    return tables
+
+
+def synthetic_inventory(rng, entity_id, owner_entity_id, pockets, items):
+    """Create an inventory_state row with randomly filled pockets."""
+    cargo_index = pockets * 3 // 4
+    rows = []
+    for slot in range(pockets):
+        item_id = rng.randint(1, items // 4 if slot >= cargo_index else items)
+        rows.append([0, [0, [item_id, rng.randint(1, 100), [0, []], [1, []]]], False])
+    return {"entity_id": entity_id, "owner_entity_id": owner_entity_id, "cargo_index": cargo_index, "pockets": rows}
+
+
+def synthetic_craft(rng, entity_id, owner_entity_id, building_entity_id, now_micros):
+    """Create a passive_craft_state row in progress."""
+    return {
+        "entity_id": entity_id,
+        "owner_entity_id": owner_entity_id,
+        "recipe_id": rng.randint(1, 500),
+        "building_entity_id": building_entity_id,
+        "building_description_id": 101,
+        "timestamp": {"__timestamp_micros_since_unix_epoch__": now_micros},
+        "status": [1, {}],
+        "slot": [0, rng.randint(0, 3)],
+    }
+
+
+class SyntheticWorkload:
+    """Generates inventory and crafting transactions against a synthetic claim."""
+
+    def __init__(self, database: LocalDatabase, seed: int = 1):
+        self.database = database
+        self.rng = random.Random(seed)
+
+    def __iter__(self):
+        while True:
+            yield self.next_transaction()
+
+    def next_transaction(self):
+        """
+        Returns:
+            tuple: (reducer_name, [(table_name, inserts, deletes)])
+        """
+        rng = self.rng
+        inventories = self.database.tables.get("inventory_state", {})
+        crafts = self.database.tables.get("passive_craft_state", {})
+
+        if inventories and (not crafts or rng.random() < 0.7):
+            old = inventories[rng.choice(list(inventories))]
+            pockets = [list(pocket) for pocket in old["pockets"]]
+            slot = rng.randrange(len(pockets)) if pockets else None
+            if slot is not None:
+                item_id, _, *rest = pockets[slot][1][1]
+                pockets[slot] = [0, [0, [item_id, rng.randint(1, 100), *rest]], False]
+            new = dict(old, pockets=pockets)
+            return "inventory_update", [("inventory_state", [new], [old])]
+
+        old = crafts[rng.choice(list(crafts))]
+        new = synthetic_craft(rng, old["entity_id"], old["owner_entity_id"], old["building_entity_id"], _now_micros())
+        return "passive_craft_collect", [("passive_craft_state", [new], [old])]
+
+
+def load_recording(path):
+    """
+    Seed tables and a transaction script from a JSON traffic recording.
+
+    Subscription snapshots and one-off query responses become the initial table
+    contents; recorded TransactionUpdates become the workload, in order.
+
+    Args:
+        path: Recording written by TrafficRecorder
+
+    Returns:
+        tuple: (tables by name, list of (offset_seconds, reducer_name, [(table_name, inserts, deletes)]))
+
+    Raises:
+        ValueError: If the recording is not a JSON (v1.json.spacetimedb) session
+    """
+    header, frames = read_recording(path)
+    if header.get("subprotocol") != JsonCodec.subprotocol:
+        raise ValueError(f"Only {JsonCodec.subprotocol} recordings can seed the local server")
+
+    database = LocalDatabase()
+    transactions = []
+
+    def decoded_rows(table_name, rows):
+        return [_decode_row(table_name, row) for row in rows]
+
+    def table_changes(tables):
+        changes = []
+        for table in tables:
+            name = table.get("table_name")
+            for update in table.get("updates", []):
+                changes.append(
+                    (name, decoded_rows(name, update.get("inserts", [])), decoded_rows(name, update.get("deletes", [])))
+                )
+        return changes
+
+    for offset, frame in frames:
+        if not isinstance(frame, str):
+            continue
+        message = json_codec.loads(frame)
+        if "InitialSubscription" in message:
+            tables = message["InitialSubscription"].get("database_update", {}).get("tables", [])
+        elif "SubscribeMultiApplied" in message:
+            tables = message["SubscribeMultiApplied"].get("update", {}).get("tables", [])
+        elif "OneOffQueryResponse" in message:
+            for table in message["OneOffQueryResponse"].get("tables", []):
+                database.apply(table.get("table_name"), inserts=decoded_rows(table.get("table_name"), table.get("rows", [])))
+            continue
+        elif "TransactionUpdate" in message:
+            update = message["TransactionUpdate"]
+            tables = update.get("status", {}).get("Committed", {}).get("tables", [])
+            reducer_name = update.get("reducer_call", {}).get("reducer_name", "recorded")
+            transactions.append((offset, reducer_name, table_changes(tables)))
+            continue
+        else:
+            continue
+
+        for table_name, inserts, deletes in table_changes(tables):
+            database.apply(table_name, inserts=inserts, deletes=deletes)
+
+    tables = {name: list(rows.values()) for name, rows in database.tables.items()}
+    return tables, transactions
+
+
+class _Connection:
+    """Per-connection subscription state."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        # Subscription handle -> parsed queries; None is the legacy Subscribe set
+        self.subscriptions: dict = {}
+
+
+class LocalSpacetimeServer:
+    """WebSocket server on its own event loop thread, backed by a LocalDatabase."""
+
+    def __init__(self, database: LocalDatabase, workload=None, rate: float | None = 20.0, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            database: Tables served to queries and subscriptions
+            workload: Iterable of (reducer_name, changes) or (offset, reducer_name, changes)
+                      transactions; None disables transactions
+            rate: Transactions per second; None or 0 replays recorded offsets
+                  (for timed workloads) or commits as fast as possible
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        self.database = database
+        self.workload = workload
+        self.rate = rate
+        self.host = host
+        self.port = port
+        self.transactions_committed = 0
+        self.frames_sent = 0
+
+        self._connections: set[_Connection] = set()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="LocalSpacetimeServer")
+        self._stop = None
+        self._workload_task = None
+
+    @property
+    def url(self) -> str:
+        """Value for BITCRAFT_SPACETIME_HOST."""
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 5.0):
+        """Start serving on a background thread; returns self once listening."""
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Local server did not start")
+        return self
+
+    def stop(self):
+        """Stop the workload and close every connection."""
+        if self._stop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(lambda: self._stop.done() or self._stop.set_result(None))
+        self._thread.join(5)
+
+    def start_workload(self, workload=None):
+        """
+        Start committing transactions, replacing any running workload (thread-safe).
+
+        Args:
+            workload: New workload; None restarts the current one
+        """
+        if workload is not None:
+            self.workload = workload
+        self._loop.call_soon_threadsafe(self._start_workload_task)
+
+    def stop_workload(self):
+        """Stop committing transactions (thread-safe)."""
+
+        def cancel():
+            if self._workload_task:
+                self._workload_task.cancel()
+                self._workload_task = None
+
+        self._loop.call_soon_threadsafe(cancel)
+
+    def commit(self, reducer_name: str, changes):
+        """
+        Commit a transaction from any thread and push it to subscribers.
+
+        Args:
+            reducer_name: Reducer reported in the TransactionUpdate
+            changes: List of (table_name, inserts, deletes)
+        """
+        asyncio.run_coroutine_threadsafe(self._commit(reducer_name, changes), self._loop).result(5)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+
+    async def _serve(self):
+        self._stop = self._loop.create_future()
+        async with serve(
+            self._handle, self.host, self.port, subprotocols=[Subprotocol(JsonCodec.subprotocol)], max_size=None
+        ) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            logging.info(f"[LocalServer] Listening on {self.url}")
+            self._ready.set()
+            if self.workload is not None:
+                self._start_workload_task()
+            await self._stop
+            if self._workload_task:
+                self._workload_task.cancel()
+
+    async def _handle(self, websocket):
+        connection = _Connection(websocket)
+        self._connections.add(connection)
+        try:
+            await self._send(
+                connection,
+                {
+                    "IdentityToken": {
+                        "identity": {"__identity__": "0x0"},
+                        "token": "local",
+                        "connection_id": {"__connection_id__": 0},
+                    }
+                },
+            )
+            async for raw in websocket:
+                await self._handle_message(connection, json_codec.loads(raw))
+        except Exception as e:
+            logging.debug(f"[LocalServer] Connection ended: {e}")
+        finally:
+            self._connections.discard(connection)
+
+    async def _handle_message(self, connection, message):
+        if "OneOffQuery" in message:
+            request = message["OneOffQuery"]
+            response = {"message_id": request.get("message_id"), "error": None, "tables": [], "total_host_execution_duration": {}}
+            try:
+                query = parse_query(request.get("query_string", ""))
+                rows = [json_codec.dumps(row) for row in self.database.select(query)]
+                response["tables"] = [{"table_name": query.table, "rows": rows}]
+            except ValueError as e:
+                response["error"] = str(e)
+            await self._send(connection, {"OneOffQueryResponse": response})
+
+        elif "Subscribe" in message:
+            request = message["Subscribe"]
+            queries = await self._parse_subscription(connection, request.get("query_strings", []), request.get("request_id"))
+            if queries is None:
+                return
+            connection.subscriptions = {None: queries}
+            update = {"tables": self._snapshot(queries)}
+            await self._send(
+                connection,
+                {"InitialSubscription": {"database_update": update, "request_id": request.get("request_id"), "total_host_execution_duration": {}}},
+            )
+
+        elif "SubscribeMulti" in message:
+            request = message["SubscribeMulti"]
+            queries = await self._parse_subscription(connection, request.get("query_strings", []), request.get("request_id"))
+            if queries is None:
+                return
+            query_id = request.get("query_id", {}).get("id")
+            connection.subscriptions[query_id] = queries
+            await self._send(connection, {"SubscribeMultiApplied": self._applied(request, self._snapshot(queries))})
+
+        elif "UnsubscribeMulti" in message:
+            request = message["UnsubscribeMulti"]
+            queries = connection.subscriptions.pop(request.get("query_id", {}).get("id"), [])
+            tables = [
+                {**update, "num_rows": 0, "updates": [{"deletes": update["updates"][0]["inserts"], "inserts": []}]}
+                for update in self._snapshot(queries)
+            ]
+            await self._send(connection, {"UnsubscribeMultiApplied": self._applied(request, tables)})
+
+        else:
+            logging.debug(f"[LocalServer] Ignoring message: {list(message)}")
+
+    async def _parse_subscription(self, connection, query_strings, request_id):
+        try:
+            return [parse_query(query_string) for query_string in query_strings]
+        except ValueError as e:
+            await self._send(connection, {"SubscriptionError": {"request_id": request_id, "query_id": None, "error": str(e)}})
+            return None
+
+    @staticmethod
+    def _applied(request, tables):
+        return {
+            "request_id": request.get("request_id"),
+            "total_host_execution_duration_micros": 0,
+            "query_id": request.get("query_id"),
+            "update": {"tables": tables},
+        }
+
+    def _snapshot(self, queries):
+        rows_by_table: dict[str, dict] = {}
+        for query in queries:
+            rows = rows_by_table.setdefault(query.table, {})
+            for row in self.database.select(query):
+                rows[row_key(row)] = row
+        return [_table_update(table_name, rows.values()) for table_name, rows in rows_by_table.items()]
+
+    def _start_workload_task(self):
+        if self._workload_task:
+            self._workload_task.cancel()
+        self._workload_task = self._loop.create_task(self._run_workload())
+
+    async def _run_workload(self):
+        interval = 1.0 / self.rate if self.rate else 0.0
+        start = time.monotonic()
+        first_offset = None
+        try:
+            for index, transaction in enumerate(self.workload):
+                if len(transaction) == 3:
+                    offset, reducer_name, changes = transaction
+                else:
+                    offset, (reducer_name, changes) = None, transaction
+
+                if interval:
+                    due = start + index * interval
+                elif offset is not None:
+                    first_offset = offset if first_offset is None else first_offset
+                    due = start + offset - first_offset
+                else:
+                    due = 0.0
+                delay = due - time.monotonic()
+                # Yield at least once per transaction so queries are still served
+                await asyncio.sleep(max(delay, 0))
+
+                await self._commit(reducer_name, changes)
+            logging.info(f"[LocalServer] Workload finished after {self.transactions_committed} transactions")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.error(f"[LocalServer] Workload failed: {e}")
+
+    async def _commit(self, reducer_name, changes):
+        # Deletes are matched against the rows before the commit, inserts after it
+        matched = {connection: {} for connection in self._connections}
+        for table_name, inserts, deletes in changes:
+            self._match(matched, table_name, deletes, "deletes")
+        for table_name, inserts, deletes in changes:
+            self.database.apply(table_name, inserts=inserts, deletes=deletes)
+        for table_name, inserts, deletes in changes:
+            self._match(matched, table_name, inserts, "inserts")
+        self.transactions_committed += 1
+
+        timestamp = {"__timestamp_micros_since_unix_epoch__": _now_micros()}
+        for connection, tables in matched.items():
+            if not tables:
+                continue
+            update = {
+                "status": {
+                    "Committed": {
+                        "tables": [
+                            _table_update(name, rows["inserts"], rows["deletes"], positional=True)
+                            for name, rows in tables.items()
+                        ]
+                    }
+                },
+                "timestamp": timestamp,
+                "caller_identity": {"__identity__": "0x0"},
+                "caller_connection_id": {"__connection_id__": 0},
+                "reducer_call": {"reducer_name": reducer_name, "reducer_id": 0, "args": "", "request_id": 0},
+                "energy_quanta_used": {"quanta": 0},
+                "total_host_execution_duration": {},
+            }
+            await self._send(connection, {"TransactionUpdate": update})
+
+    def _match(self, matched, table_name, rows, kind):
+        for connection, tables in matched.items():
+            queries = [q for group in connection.subscriptions.values() for q in group if q.table == table_name]
+            if not queries:
+                continue
+            for row in rows:
+                if any(self.database.matches(query, row) for query in queries):
+                    entry = tables.setdefault(table_name, {"inserts": [], "deletes": []})
+                    entry[kind].append(row)
+
+    async def _send(self, connection, message):
+        try:
+            await connection.websocket.send(json_codec.dumps(message))
+            self.frames_sent += 1
+        except Exception as e:
+            logging.debug(f"[LocalServer] Send failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--recording", help="seed tables and transactions from a JSON traffic recording")
+    parser.add_argument("--rate", type=float, default=20.0, help="transactions per second (0 = recorded timing / unthrottled)")
+    parser.add_argument("--player", default="loadtest", help="synthetic claim owner username")
+    parser.add_argument("--buildings", type=int, default=200)
+    parser.add_argument("--pockets", type=int, default=20)
+    parser.add_argument("--crafts", type=int, default=300)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.recording:
+        tables, workload = load_recording(args.recording)
+        database = LocalDatabase(tables)
+    else:
+        database = LocalDatabase(
+            synthetic_claim(args.player, args.buildings, args.pockets, args.crafts, args.members, seed=args.seed)
+        )
+        workload = SyntheticWorkload(database, seed=args.seed)
+
+    server = LocalSpacetimeServer(database, workload, rate=args.rate, host=args.host, port=args.port).start()
+    print(f"Serving on {server.url} - set BITCRAFT_SPACETIME_HOST={server.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,49 @@
 import logging
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from app.services.reference_cache_service import ReferenceCacheService
 
+# Tables filled by get_player_subscription_queries() - kept warm across claim switches
+PLAYER_SCOPED_TABLES = frozenset(
+    {"traveler_task_state", "traveler_task_desc", "stamina_state", "character_stats_state", "claim_state", "claim_local_state"}
+)
+
+# Tables filled by get_claim_subscription_queries() - replaced on claim switch
+CLAIM_SCOPED_TABLES = frozenset(
+    {
+        "building_state",
+        "claim_member_state",
+        "building_nickname_state",
+        "inventory_state",
+        "progressive_action_state",
+        "public_progressive_action_state",
+        "passive_craft_state",
+        "claim_tech_state",
+    }
+)
+
+# Static tables loaded once by get_reference_data()
+REFERENCE_TABLES = (
+    "resource_desc",
+    "item_desc",
+    "cargo_desc",
+    "building_desc",
+    "building_function_type_mapping_desc",
+    "building_type_desc",
+    "crafting_recipe_desc",
+    "claim_tile_cost",
+    "npc_desc",
+    "claim_tech_desc",
+)
+
+# Every table the client queries or subscribes to - a wire codec must decode all of them
+QUERIED_TABLES = (
+    PLAYER_SCOPED_TABLES
+    | CLAIM_SCOPED_TABLES
+    | frozenset(REFERENCE_TABLES)
+    | frozenset({"player_lowercase_username_state", "user_data"})
+)
+
 
 class QueryService:
     """
@@ -13,15 +54,18 @@ class QueryService:
        - get_claim_state(): Claim info for UI display
        - get_claim_local_state(): Claim validation
        - get_user_claims(): Available claims for user
+       - get_user_claims_with_details(): Memberships plus claim (local) state in one batch
        - get_claim_members(): Legacy method for claim_members_service
 
     2. SUBSCRIPTION QUERIES: Generate SQL strings for real-time subscriptions
-       - get_subscription_queries(): Returns SQL strings for client.start_subscription_listener()
+       - get_player_subscription_queries(): Player-scoped queries (tasks, stamina, claims list)
+       - get_claim_subscription_queries(): Claim-scoped queries (buildings, inventories, crafting)
+       - get_subscription_queries(): Both groups in one list
 
     The subscription pattern is the core architecture:
-    - Call get_subscription_queries() once with claim_id and user_id
-    - Pass SQL strings to client.start_subscription_listener()
-    - Data flows automatically via InitialSubscription/SubscriptionUpdate messages
+    - Subscribe each group with client.subscribe() to get a handle per group
+    - On claim switch, unsubscribe only the claim handle and subscribe the new claim's queries
+    - Data flows automatically via SubscribeMultiApplied/TransactionUpdate messages
     """
 
     def __init__(self, client):
@@ -30,6 +74,28 @@ class QueryService:
 
     # ========== ONE-OFF QUERIES (Initial Setup & Authentication) ==========
 
+    def query_many(self, queries: List[str]) -> List[Optional[List[Dict]]]:
+        """
+        Run several one-off queries, pipelined when the client supports it.
+
+        Args:
+            queries: SQL query strings
+
+        Returns:
+            One result list per query, in order (None for failed queries)
+        """
+        if hasattr(self.client, "query_many"):
+            return self.client.query_many(queries)
+
+        results = []
+        for query in queries:
+            try:
+                results.append(self.client.query(query))
+            except Exception as e:
+                logging.error(f"[QueryService] Error running query {query[:50]}: {e}")
+                results.append(None)
+        return results
+
     def get_user_by_name(self, username: str) -> Optional[Dict]:
         sanitized_username = username.lower().replace("'", "''")
         query_string = f"SELECT * FROM player_lowercase_username_state WHERE username_lowercase = '{sanitized_username}';"
@@ -77,6 +143,41 @@ class QueryService:
             logging.error(f"Error fetching user claims: {e}")
             return []
 
+    def get_user_claims_with_details(self, user_id: str) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        Get a user's claim memberships together with every claim's local state and state.
+
+        Uses JOINs on claim_member_state so the details of all claims arrive in two
+        queries, and sends all three queries at once.
+
+        Args:
+            user_id: Player entity ID
+
+        Returns:
+            Tuple of (memberships, claim_local_states, claim_states)
+        """
+        queries = [
+            "SELECT * FROM claim_member_state WHERE player_entity_id = '{user_id}';".format(user_id=user_id),
+            (
+                "SELECT claim_local_state.* "
+                "FROM claim_local_state "
+                "JOIN claim_member_state ON claim_local_state.entity_id = claim_member_state.claim_entity_id "
+                "WHERE claim_member_state.player_entity_id = '{user_id}';".format(user_id=user_id)
+            ),
+            (
+                "SELECT claim_state.* "
+                "FROM claim_state "
+                "JOIN claim_member_state ON claim_state.entity_id = claim_member_state.claim_entity_id "
+                "WHERE claim_member_state.player_entity_id = '{user_id}';".format(user_id=user_id)
+            ),
+        ]
+        try:
+            memberships, local_states, claim_states = self.query_many(queries)
+            return memberships or [], local_states or [], claim_states or []
+        except Exception as e:
+            logging.error(f"Error fetching user claims with details: {e}")
+            return [], [], []
+
     def get_claim_buildings(self, claim_id: str) -> List[Dict]:
         """Get all buildings for a claim with nicknames."""
         try:
@@ -123,50 +224,27 @@ class QueryService:
         # Cache miss - fetch from server
         logging.info("Reference cache miss - fetching from server...")
 
-        reference_queries = [
-            "SELECT * FROM resource_desc;",
-            "SELECT * FROM item_desc;",
-            "SELECT * FROM cargo_desc;",
-            "SELECT * FROM building_desc;",
-            "SELECT * FROM building_function_type_mapping_desc;",
-            "SELECT * FROM building_type_desc;",
-            "SELECT * FROM crafting_recipe_desc;",
-            "SELECT * FROM claim_tile_cost;",
-            "SELECT * FROM npc_desc;",
-            "SELECT * FROM claim_tech_desc;",
-        ]
+        reference_queries = [f"SELECT * FROM {table_name};" for table_name in REFERENCE_TABLES]
 
         reference_data = {}
         total_records = 0
 
         try:
-            for query in reference_queries:
+            # Send every query up front; latency is bounded by the slowest table
+            logging.info(f"Loading {len(reference_queries)} reference tables")
+            all_results = self.query_many(reference_queries)
+
+            for query, results in zip(reference_queries, all_results):
                 # Extract table name from query
                 table_name = query.split("FROM ")[1].split(";")[0].strip()
 
-                logging.info(f"Loading reference data: {table_name}")
-                query_start = time.time()
-
-                try:
-                    results = self.client.query(query)
-                    query_time = time.time() - query_start
-
-                    reference_data[table_name] = results if results else []
-
-                    record_count = len(reference_data[table_name])
-                    total_records += record_count
-                    logging.debug(f"Loaded {record_count} records from {table_name} ({query_time:.3f}s)")
-
-                    # Special logging for traveler_task_desc
-                    if table_name == "traveler_task_desc":
-                        if record_count == 0:
-                            logging.warning(f"[QueryService] traveler_task_desc table is empty")
-                        else:
-                            logging.info(f"[QueryService] Successfully loaded {record_count} traveler task descriptions")
+                if results is None:
+                    logging.error(f"[QueryService] Error loading {table_name}: no response")
+                reference_data[table_name] = results if results else []
 
-                except Exception as e:
-                    logging.error(f"[QueryService] Error loading {table_name}: {e}")
-                    reference_data[table_name] = []  # Ensure the table exists even if empty
+                record_count = len(reference_data[table_name])
+                total_records += record_count
+                logging.debug(f"Loaded {record_count} records from {table_name}")
 
             total_load_time = time.time() - load_start_time
             logging.info(
@@ -208,15 +286,21 @@ class QueryService:
 
         Static reference data (items, buildings, recipes, etc.) is now loaded
         via get_reference_data() instead of subscriptions for better performance.
+
+        Returns the player-scoped queries followed by the claim-scoped ones; subscribe
+        to the two groups separately to swap claims without touching player data.
         """
-        queries = [
-            # Dynamic queries that benefit from real-time subscriptions
+        return self.get_player_subscription_queries(user_id) + self.get_claim_subscription_queries(claim_id)
+
+    def get_player_subscription_queries(self, user_id: str) -> List[str]:
+        """
+        Get subscription queries that depend only on the player.
+
+        These stay subscribed across claim switches (see PLAYER_SCOPED_TABLES).
+        """
+        return [
             # Get traveler tasks for player
             ("SELECT * FROM traveler_task_state WHERE player_entity_id = '{user_id}';".format(user_id=user_id)),
-            # Get claim buildings
-            ("SELECT * FROM building_state WHERE claim_entity_id = '{claim_id}';".format(claim_id=claim_id)),
-            # Get claim members' information
-            ("SELECT * FROM claim_member_state WHERE claim_entity_id = '{claim_id}';".format(claim_id=claim_id)),
             # Get player's stamina state
             ("SELECT * FROM stamina_state WHERE entity_id = '{user_id}';".format(user_id=user_id)),
             # Get player's stats
@@ -244,6 +328,19 @@ class QueryService:
                 "ON traveler_task_state.task_id = traveler_task_desc.id "
                 "WHERE traveler_task_state.player_entity_id = '{user_id}';".format(user_id=user_id)
             ),
+        ]
+
+    def get_claim_subscription_queries(self, claim_id: str) -> List[str]:
+        """
+        Get subscription queries for the current claim.
+
+        Swapped on claim switch and refresh (see CLAIM_SCOPED_TABLES).
+        """
+        return [
+            # Get claim buildings
+            ("SELECT * FROM building_state WHERE claim_entity_id = '{claim_id}';".format(claim_id=claim_id)),
+            # Get claim members' information
+            ("SELECT * FROM claim_member_state WHERE claim_entity_id = '{claim_id}';".format(claim_id=claim_id)),
             # Get claim building nicknames
             (
                 "SELECT building_nickname_state.* "
@@ -288,5 +385,3 @@ class QueryService:
                 "WHERE claim_tech_state.entity_id = '{claim_id}';".format(claim_id=claim_id)
             ),
         ]
-
-        return queries
@@ -0,0 +1,225 @@
+"""
+Wire-traffic recording and replay for the SpacetimeDB WebSocket connection.
+
+TrafficRecorder writes every frame the connection receives to a gzip-compressed
+JSON-lines file. The first line is a header naming the subprotocol; every
+following line holds one frame and its monotonic offset in seconds since
+recording started:
+
+    {"format": "bitcraft-traffic", "version": 1, "subprotocol": "v1.json.spacetimedb", "started_at": 1700000000.0}
+    {"t": 0.0132, "text": "{\"InitialSubscription\": ...}"}
+    {"t": 1.5021, "binary": "<base64 BSATN frame>"}
+
+ReplayClient decodes a recording with the matching codec and feeds the messages
+to a handler such as MessageRouter.handle_message, at recorded speed, N times
+faster, or as fast as possible.
+"""
+
+import base64
+import gzip
+import logging
+import threading
+import time
+
+from app.services import json_codec
+
+from .bsatn import BsatnCodec
+from .codecs import JsonCodec
+
+RECORDING_FORMAT = "bitcraft-traffic"
+RECORDING_VERSION = 1
+
+
+class TrafficRecorder:
+    """Appends received frames with monotonic timestamps to a compressed recording."""
+
+    def __init__(self, path, subprotocol: str, compresslevel: int = 5):
+        """
+        Open a new recording (an existing file is overwritten).
+
+        Args:
+            path: Output file path (conventionally *.jsonl.gz)
+            subprotocol: WebSocket subprotocol of the recorded frames
+            compresslevel: gzip compression level
+        """
+        self.path = path
+        self.frame_count = 0
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=compresslevel)
+        self._write(
+            {
+                "format": RECORDING_FORMAT,
+                "version": RECORDING_VERSION,
+                "subprotocol": subprotocol,
+                "started_at": time.time(),
+            }
+        )
+
+    def record(self, frame):
+        """
+        Append one received frame.
+
+        Args:
+            frame: Text (JSON) or binary (BSATN) WebSocket frame
+        """
+        entry = {"t": round(time.monotonic() - self._start, 6)}
+        if isinstance(frame, str):
+            entry["text"] = frame
+        else:
+            entry["binary"] = base64.b64encode(bytes(frame)).decode("ascii")
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._write(entry)
+            self.frame_count += 1
+
+    def close(self):
+        """Flush and close the recording."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        logging.info(f"[TrafficRecorder] Recorded {self.frame_count} frames to {self.path}")
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def _write(self, entry):
+        self._file.write(json_codec.dumps(entry))
+        self._file.write("\n")
+
+
+def read_recording(path):
+    """
+    Read a recording written by TrafficRecorder.
+
+    Args:
+        path: Recording file path
+
+    Returns:
+        tuple: (header dict, list of (offset_seconds, frame) tuples)
+
+    Raises:
+        ValueError: If the file is not a traffic recording
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = iter(f)
+        header = json_codec.loads(next(lines, "{}"))
+        if header.get("format") != RECORDING_FORMAT:
+            raise ValueError(f"{path} is not a {RECORDING_FORMAT} recording")
+
+        frames = []
+        for line in lines:
+            if not line.strip():
+                continue
+            entry = json_codec.loads(line)
+            frame = entry["text"] if "text" in entry else base64.b64decode(entry["binary"])
+            frames.append((entry["t"], frame))
+
+    return header, frames
+
+
+class ReplayClient:
+    """Feeds a recorded session to a subscription message handler."""
+
+    def __init__(self, path, codec=None):
+        """
+        Load a recording.
+
+        Args:
+            path: Recording file path
+            codec: Codec used to decode frames (defaults to the one matching the
+                   recorded subprotocol)
+        """
+        self.path = path
+        self.header, self.frames = read_recording(path)
+        if codec is None:
+            subprotocol = self.header.get("subprotocol")
+            codec = BsatnCodec() if subprotocol == BsatnCodec.subprotocol else JsonCodec()
+        self.codec = codec
+
+    def decode_messages(self):
+        """
+        Decode every recorded frame up front (e.g. to time processors without decode cost).
+
+        Returns:
+            list: (offset_seconds, message) tuples for frames the handler would receive
+        """
+        messages = []
+        for offset, frame in self.frames:
+            message = self._decode(frame)
+            if message is not None:
+                messages.append((offset, message))
+        return messages
+
+    def replay(self, handler, speed: float | None = 1.0, stop_event: threading.Event | None = None, messages=None):
+        """
+        Deliver recorded messages to a handler in order.
+
+        OneOffQueryResponse frames are skipped, since the live connection routes
+        them to query callers rather than to the subscription handler.
+
+        Args:
+            handler: Callable taking one decoded message (e.g. MessageRouter.handle_message)
+            speed: 1.0 for recorded timing, N for N times faster, None or 0 for no delays
+            stop_event: Optional event that ends the replay early
+            messages: Pre-decoded messages from decode_messages(); decoded on the fly if None
+
+        Returns:
+            dict: Replay statistics (messages, errors, elapsed seconds, messages per second)
+        """
+        source = messages if messages is not None else self._iter_messages()
+        delivered = 0
+        errors = 0
+        start = time.monotonic()
+        first_offset = None
+
+        for offset, message in source:
+            if stop_event is not None and stop_event.is_set():
+                break
+
+            if speed:
+                if first_offset is None:
+                    first_offset = offset
+                delay = (offset - first_offset) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    if stop_event is not None:
+                        if stop_event.wait(delay):
+                            break
+                    else:
+                        time.sleep(delay)
+
+            try:
+                handler(message)
+            except Exception as e:
+                errors += 1
+                logging.error(f"[ReplayClient] Error in message handler: {e}")
+            delivered += 1
+
+        elapsed = time.monotonic() - start
+        return {
+            "messages": delivered,
+            "errors": errors,
+            "elapsed": elapsed,
+            "messages_per_second": delivered / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def _iter_messages(self):
+        for offset, frame in self.frames:
+            message = self._decode(frame)
+            if message is not None:
+                yield offset, message
+
+    def _decode(self, frame):
+        try:
+            message = self.codec.decode(frame)
+        except ValueError as e:
+            logging.error(f"[ReplayClient] Failed to decode recorded frame: {e}")
+            return None
+        if isinstance(message, dict) and "OneOffQueryResponse" in message:
+            return None
+        return message
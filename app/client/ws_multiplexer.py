@@ -0,0 +1,461 @@
+"""
+Multiplexed SpacetimeDB WebSocket connection.
+
+One asyncio event loop runs on a background thread and owns the socket. A single
+reader task receives every frame and routes it:
+
+- OneOffQueryResponse frames resolve the future waiting on their message_id, so
+  any number of one-off queries can be in flight at once.
+- Everything else (IdentityToken, InitialSubscription, TransactionUpdate, ...)
+  is handed to the subscription message handler on a dispatcher thread, in order.
+
+Slow message handlers therefore never delay query responses, and one-off
+queries no longer need the subscription listener to be stopped first.
+
+The dispatcher reads from a bounded IngressQueue. When a slow handler lets it
+fill up, the reader stops reading the socket until there is room again, so
+memory stays bounded and the server sees TCP backpressure. With a coalescing
+window, bursts of TransactionUpdates are merged into one handler call.
+
+Dead sockets are detected with WebSocket ping/pong keepalives: when a pong does
+not arrive within ping_timeout the reader ends and on_close is called, so the
+owner can reconnect.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from websockets import Subprotocol
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from app.services import json_codec
+from app.services.latency_tracer import TRACE_KEY, earliest, stamp_frame, use_trace
+from app.services.metrics_registry import get_metrics_registry
+
+from .codecs import JsonCodec
+from .ingress_queue import IngressQueue, is_committed_transaction, merge_transaction_updates
+
+# Sentinel that stops the dispatcher thread
+_STOP = object()
+
+
+class WebSocketMultiplexer:
+    """Thread-safe wrapper around an asyncio WebSocket connection with a single reader task."""
+
+    def __init__(
+        self,
+        uri: str,
+        headers: dict,
+        codec=None,
+        connect_timeout: float = 10.0,
+        ping_interval: float | None = 20.0,
+        ping_timeout: float | None = 20.0,
+        on_close=None,
+        recorder=None,
+        ingress_queue_size: int = 1000,
+        coalesce_window: float = 0.0,
+        max_queue: int | None = 16,
+        metrics=None,
+    ):
+        """
+        Args:
+            uri: WebSocket URI to connect to
+            headers: Additional HTTP headers (e.g. Authorization)
+            codec: Wire codec (defaults to JsonCodec); also selects the subprotocol
+            connect_timeout: Seconds to wait for the connection and initial handshake message
+            ping_interval: Seconds between keepalive pings (None disables them)
+            ping_timeout: Seconds to wait for a pong before treating the socket as dead
+            on_close: Optional callable(multiplexer) run when the connection drops
+                      without close() having been called. Runs on the event loop
+                      thread, so it must not block.
+            recorder: Optional TrafficRecorder that receives every frame read
+            ingress_queue_size: Decoded messages buffered for the handler before the
+                                reader stops reading the socket (0 for unbounded)
+            coalesce_window: Seconds the dispatcher waits after a TransactionUpdate
+                             to merge following ones into a single handler call
+                             (0 disables coalescing)
+            max_queue: Frames the websockets library buffers before it stops
+                       reading from the network (None for unbounded)
+            metrics: MetricsRegistry that counts frames and bytes read
+                     (defaults to the global registry)
+        """
+        self.uri = uri
+        self.headers = headers
+        self.codec = codec or JsonCodec()
+        self.subprotocol = Subprotocol(self.codec.subprotocol)
+        self.connect_timeout = connect_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.on_close = on_close
+        self.recorder = recorder
+        self.coalesce_window = coalesce_window
+        self.max_queue = max_queue
+        self.metrics = metrics or get_metrics_registry()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._connection = None
+        self._reader_task: asyncio.Task | None = None
+        self._pending: dict[str, asyncio.Future] = {}
+
+        self._message_handler = None
+        self._handler_lock = threading.Lock()
+        self._dispatch_queue = IngressQueue(ingress_queue_size)
+        self._dispatch_thread: threading.Thread | None = None
+
+        self.closed = threading.Event()
+        self._closing = False
+
+    # ---- lifecycle ----
+
+    def start(self):
+        """
+        Start the event loop thread, connect, and start the reader task.
+
+        Blocks until the connection is established and the initial handshake message
+        has been received (or the connect timeout elapses).
+
+        Raises:
+            Exception: Whatever the underlying connect raised
+        """
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, name="WebSocketLoop", daemon=True)
+        self._loop_thread.start()
+
+        self._dispatch_thread = threading.Thread(target=self._dispatch_messages, name="WebSocketDispatch", daemon=True)
+        self._dispatch_thread.start()
+
+        future = asyncio.run_coroutine_threadsafe(self._connect(), self._loop)
+        try:
+            future.result(timeout=self.connect_timeout + 5)
+        except Exception:
+            self.close()
+            raise
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _connect(self):
+        self._connection = await asyncio.wait_for(
+            connect(
+                self.uri,
+                additional_headers=self.headers,
+                subprotocols=[self.subprotocol],
+                max_size=None,
+                max_queue=self.max_queue,
+                ping_interval=self.ping_interval,
+                ping_timeout=self.ping_timeout,
+            ),
+            timeout=self.connect_timeout,
+        )
+
+        # The server greets every connection with an IdentityToken message
+        try:
+            first_msg = await asyncio.wait_for(self._connection.recv(), timeout=self.connect_timeout)
+            logging.info(f"Initial WebSocket handshake message: {first_msg[:20]}...")
+        except asyncio.TimeoutError:
+            logging.warning("Timeout waiting for initial handshake message, but connection may be valid")
+
+        self._reader_task = asyncio.ensure_future(self._read_frames())
+
+    def close(self):
+        """Close the connection and stop the loop and dispatcher threads."""
+        self._closing = True
+        if self._loop is not None and self._loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=2.0)
+            except Exception as e:
+                logging.warning(f"Error closing WebSocket: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+        if self._loop_thread and self._loop_thread is not threading.current_thread():
+            self._loop_thread.join(timeout=2.0)
+
+        self._dispatch_queue.force_put(_STOP)
+        if self._dispatch_thread and self._dispatch_thread is not threading.current_thread():
+            self._dispatch_thread.join(timeout=2.0)
+
+        self.closed.set()
+
+    async def _shutdown(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._connection is not None:
+            await self._connection.close()
+        self._fail_pending()
+
+    # ---- reader ----
+
+    async def _read_frames(self):
+        """Single reader: route query responses to futures and everything else to the dispatcher."""
+        try:
+            async for msg in self._connection:
+                received = time.time()
+                self.metrics.record_frame(len(msg))
+                if self.recorder is not None:
+                    try:
+                        self.recorder.record(msg)
+                    except Exception as e:
+                        logging.error(f"Failed to record WebSocket frame: {e}")
+                        self.recorder = None
+
+                try:
+                    data = self.codec.decode(msg)
+                except ValueError as e:
+                    logging.error(f"Failed to decode WebSocket message ({e}): {msg[:100]}...")
+                    continue
+
+                response = data.get("OneOffQueryResponse") if isinstance(data, dict) else None
+                if response is not None:
+                    self._resolve_query(response)
+                else:
+                    stamp_frame(data, received)
+                    await self._enqueue(data)
+
+        except ConnectionClosed as e:
+            logging.error(f"WebSocket connection closed: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in WebSocket reader: {e}")
+        finally:
+            self._fail_pending()
+            self.closed.set()
+            if not self._closing and self.on_close is not None:
+                try:
+                    self.on_close(self)
+                except Exception as e:
+                    logging.error(f"Error in WebSocket close callback: {e}")
+
+    async def _enqueue(self, data):
+        """Hand a message to the dispatcher, waiting while the ingress queue is full."""
+        if self._dispatch_queue.put_nowait(data):
+            return
+
+        self._dispatch_queue.record_backpressure_wait()
+        while True:
+            # The handler may itself be waiting on a one-off query whose response is
+            # behind this frame, so never hold the reader back while queries are pending
+            if self._pending or self._closing:
+                self._dispatch_queue.force_put(data)
+                return
+            if await asyncio.to_thread(self._dispatch_queue.put, data, 0.05):
+                return
+
+    def _resolve_query(self, response: dict):
+        future = self._pending.pop(response.get("message_id"), None)
+        if future is None or future.done():
+            logging.debug(f"Dropping OneOffQueryResponse for unknown message_id: {response.get('message_id')}")
+            return
+
+        if response.get("error"):
+            logging.error(f"WebSocket error received for message {response.get('message_id')}: {response['error']}")
+            future.set_result([])
+            return
+
+        rows = []
+        for table in response.get("tables", []):
+            for row in table.get("rows", []):
+                if isinstance(row, str):
+                    try:
+                        row = json_codec.loads(row)
+                    except json.JSONDecodeError:
+                        logging.error(f"Failed to decode JSON from WebSocket row: {row[:100]}...")
+                        continue
+                rows.append(row)
+        future.set_result(rows)
+
+    def _fail_pending(self):
+        """Complete all waiting queries with None once the connection is gone."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_result(None)
+
+    # ---- dispatcher ----
+
+    def set_message_handler(self, handler):
+        """
+        Set the callable that receives every non-query frame (None to drop them).
+
+        Args:
+            handler: Callable taking the decoded message dict
+        """
+        with self._handler_lock:
+            self._message_handler = handler
+
+    def get_ingress_stats(self) -> dict:
+        """Return backpressure and coalescing statistics of the ingress queue (see IngressQueue.get_stats)."""
+        return self._dispatch_queue.get_stats()
+
+    def _dispatch_messages(self):
+        carry = None
+        while True:
+            if carry is not None:
+                data, carry = carry, None
+            else:
+                data = self._dispatch_queue.get()
+            if data is _STOP:
+                break
+            if self.coalesce_window > 0 and is_committed_transaction(data):
+                data, carry = self._coalesce(data)
+            with self._handler_lock:
+                handler = self._message_handler
+            if handler is None:
+                continue
+            # The handler sees the plain message; its trace is current on this thread instead
+            trace = data.pop(TRACE_KEY, None) if isinstance(data, dict) else None
+            try:
+                with use_trace(trace):
+                    handler(data)
+            except Exception as e:
+                logging.error(f"Error in subscription message handler: {e}")
+
+    def _coalesce(self, first):
+        """
+        Collect TransactionUpdates arriving within the coalescing window after first.
+
+        Returns:
+            tuple: (message to dispatch, first non-transaction message taken from
+                    the queue or None)
+        """
+        batch = [first]
+        carry = None
+        deadline = time.monotonic() + self.coalesce_window
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                data = self._dispatch_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if not is_committed_transaction(data):
+                carry = data
+                break
+            batch.append(data)
+
+        if len(batch) == 1:
+            return first, carry
+        self._dispatch_queue.record_coalesced(len(batch) - 1)
+        merged = merge_transaction_updates(batch)
+        trace = earliest(message.get(TRACE_KEY) for message in batch)
+        if trace is not None:
+            merged[TRACE_KEY] = trace
+        return merged, carry
+
+    # ---- sending ----
+
+    @property
+    def is_open(self) -> bool:
+        return self._connection is not None and not self.closed.is_set()
+
+    def _require_loop(self):
+        if not self.is_open:
+            raise RuntimeError("WebSocket connection is not established")
+        if threading.current_thread() is self._loop_thread:
+            raise RuntimeError("Blocking WebSocket calls cannot be made from the event loop thread")
+
+    async def send_async(self, message: dict):
+        """Send a message from the event loop, encoded with the connection's codec."""
+        await self._connection.send(self.codec.encode(message))
+
+    def send(self, message: dict, timeout: float = 10.0):
+        """
+        Send a message from any thread.
+
+        Args:
+            message: Message dict (e.g. {"Subscribe": {...}})
+            timeout: Seconds to wait for the send to complete
+        """
+        self._require_loop()
+        asyncio.run_coroutine_threadsafe(self.send_async(message), self._loop).result(timeout=timeout)
+
+    async def query_async(self, query_string: str, timeout: float = 10.0) -> list[dict] | None:
+        """
+        Run a one-off SQL query on the event loop.
+
+        Args:
+            query_string: SQL query
+            timeout: Seconds to wait for the response
+
+        Returns:
+            List of result rows ([] on server error or timeout), or None if the connection dropped
+        """
+        message_id = uuid.uuid4().hex
+        future = self._loop.create_future()
+        self._pending[message_id] = future
+
+        try:
+            await self.send_async({"OneOffQuery": {"message_id": message_id, "query_string": query_string}})
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"Timeout after {timeout}s for message_id: {message_id} - server may be slow or unresponsive")
+            return []
+        except ConnectionClosed as e:
+            logging.error(f"Failed to send or receive query due to connection issue: {e}")
+            return None
+        finally:
+            self._pending.pop(message_id, None)
+
+    def query(self, query_string: str, timeout: float = 10.0) -> list[dict] | None:
+        """
+        Run a one-off SQL query from any thread, concurrently with live subscription traffic.
+
+        Args:
+            query_string: SQL query
+            timeout: Seconds to wait for the response
+
+        Returns:
+            List of result rows ([] on server error or timeout), or None if the connection dropped
+
+        Raises:
+            RuntimeError: If the connection is not established
+        """
+        self._require_loop()
+        future = asyncio.run_coroutine_threadsafe(self.query_async(query_string, timeout), self._loop)
+        return future.result(timeout=timeout + 5)
+
+    async def query_many_async(self, query_strings: list[str], timeout: float = 10.0) -> list[list[dict] | None]:
+        """
+        Run several one-off queries at once on the event loop.
+
+        Every OneOffQuery frame is sent before any response is awaited, so the total
+        latency is bounded by the slowest query rather than the sum of all of them.
+
+        Args:
+            query_strings: SQL queries
+            timeout: Seconds to wait for each response
+
+        Returns:
+            One result per query, in the same order (see query_async)
+        """
+        return list(await asyncio.gather(*(self.query_async(query, timeout) for query in query_strings)))
+
+    def query_many(self, query_strings: list[str], timeout: float = 10.0) -> list[list[dict] | None]:
+        """
+        Run several one-off queries at once from any thread.
+
+        Args:
+            query_strings: SQL queries
+            timeout: Seconds to wait for each response
+
+        Returns:
+            One result per query, in the same order (see query)
+
+        Raises:
+            RuntimeError: If the connection is not established
+        """
+        self._require_loop()
+        future = asyncio.run_coroutine_threadsafe(self.query_many_async(query_strings, timeout), self._loop)
+        return future.result(timeout=timeout + 5)
@@ -7,11 +7,18 @@ that handle SpacetimeDB subscription data.
 
 from .data_service import DataService
 from .message_router import MessageRouter
+from .table_store import TableStore
+from .change_feed import ChangeFeed, RowInserted, RowUpdated, RowDeleted
 from .processors import *
 
 __all__ = [
     "DataService",
     "MessageRouter",
+    "TableStore",
+    "ChangeFeed",
+    "RowInserted",
+    "RowUpdated",
+    "RowDeleted",
     "BaseProcessor",
     "InventoryProcessor",
     "CraftingProcessor",
@@ -0,0 +1,202 @@
+"""
+Row-level change feed for SpacetimeDB table updates.
+
+SpacetimeDB reports a modified row as a delete of the old value plus an insert of
+the new value. This module pairs those by primary key in a single pass and turns
+a table update into RowInserted / RowUpdated / RowDeleted events, so processors
+no longer repeat the delete+insert matching themselves.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .table_store import row_to_dict, primary_key
+
+
+@dataclass(frozen=True)
+class RowInserted:
+    """A row that appeared in a table."""
+
+    table_name: str
+    key: Any
+    row: Any
+
+
+@dataclass(frozen=True)
+class RowUpdated:
+    """A row replaced by a delete+insert pair with the same primary key."""
+
+    table_name: str
+    key: Any
+    old_row: Any
+    new_row: Any
+
+
+@dataclass(frozen=True)
+class RowDeleted:
+    """A row removed from a table."""
+
+    table_name: str
+    key: Any
+    row: Any
+
+
+def compute_row_changes(table_update, parse_row=None):
+    """
+    Pair the deletes and inserts of a table update into row change events.
+
+    All update groups of the table update are considered together, so a row
+    deleted in one group and re-inserted in another is reported as one update.
+
+    Args:
+        table_update: Table update dict with decoded (or JSON string) rows
+        parse_row: Optional callable(row) -> dict or None. Rows it returns None for
+                   are skipped. Defaults to converting rows with row_to_dict().
+
+    Returns:
+        list: RowInserted, RowUpdated and RowDeleted events in that order
+    """
+    table_name = table_update.get("table_name", "")
+    if parse_row is None:
+        parse_row = lambda row: row_to_dict(table_name, row)
+
+    row_groups = [table_update]
+    row_groups.extend(u for u in table_update.get("updates", []) if isinstance(u, dict))
+
+    deleted = {}
+    inserted = {}
+    for group in row_groups:
+        for row in group.get("deletes", None) or []:
+            parsed = parse_row(row)
+            if parsed is not None:
+                deleted[primary_key(parsed)] = parsed
+        for row in group.get("inserts", None) or []:
+            parsed = parse_row(row)
+            if parsed is not None:
+                inserted[primary_key(parsed)] = parsed
+
+    events = []
+    for key, new_row in inserted.items():
+        old_row = deleted.pop(key, None)
+        if old_row is None:
+            events.append(RowInserted(table_name, key, new_row))
+        else:
+            events.append(RowUpdated(table_name, key, old_row, new_row))
+
+    for key, old_row in deleted.items():
+        events.append(RowDeleted(table_name, key, old_row))
+
+    return events
+
+
+@dataclass
+class _Subscription:
+    callback: Any
+    tables: Optional[frozenset]
+    event_types: Optional[tuple]
+    predicate: Any
+
+    def matches_table(self, table_name):
+        return self.tables is None or table_name in self.tables
+
+    def select(self, events):
+        if self.event_types is not None:
+            events = [event for event in events if isinstance(event, self.event_types)]
+        if self.predicate is not None:
+            events = [event for event in events if self.predicate(event)]
+        return events
+
+
+class ChangeFeed:
+    """
+    Publishes row change events for routed TransactionUpdate table updates.
+
+    Subscribers register a callback with optional table, event type and predicate
+    filters. Events for a table update are computed once, only if at least one
+    subscriber is interested in that table.
+    """
+
+    def __init__(self):
+        self._subscriptions = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, tables=None, event_types=None, predicate=None):
+        """
+        Register a change listener.
+
+        Args:
+            callback: Called as callback(events, reducer_name, timestamp) with the
+                      non-empty list of matching events for one table update
+            tables: Optional iterable of table names to receive events for
+            event_types: Optional iterable of event classes (RowInserted, ...)
+            predicate: Optional callable(event) -> bool for row-level filtering
+
+        Returns:
+            int: Subscription id for unsubscribe()
+        """
+        subscription = _Subscription(
+            callback=callback,
+            tables=frozenset(tables) if tables is not None else None,
+            event_types=tuple(event_types) if event_types is not None else None,
+            predicate=predicate,
+        )
+        with self._lock:
+            subscription_id = self._next_id
+            self._next_id += 1
+            self._subscriptions[subscription_id] = subscription
+        return subscription_id
+
+    def unsubscribe(self, subscription_id):
+        """
+        Remove a change listener.
+
+        Args:
+            subscription_id: Id returned by subscribe()
+
+        Returns:
+            bool: True if a subscription was removed
+        """
+        with self._lock:
+            return self._subscriptions.pop(subscription_id, None) is not None
+
+    def has_subscribers(self, table_name):
+        """Check whether any subscriber wants events for a table."""
+        with self._lock:
+            return any(s.matches_table(table_name) for s in self._subscriptions.values())
+
+    def publish(self, table_update, reducer_name=None, timestamp=None):
+        """
+        Compute change events for a table update and deliver them to subscribers.
+
+        Args:
+            table_update: Table update dict with decoded rows
+            reducer_name: Name of the reducer that caused the change
+            timestamp: Transaction timestamp in seconds
+
+        Returns:
+            list: The computed events (empty if nobody subscribed to the table)
+        """
+        table_name = table_update.get("table_name", "")
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions.values() if s.matches_table(table_name)]
+
+        if not subscriptions:
+            return []
+
+        events = compute_row_changes(table_update)
+        if not events:
+            return events
+
+        for subscription in subscriptions:
+            selected = subscription.select(events)
+            if not selected:
+                continue
+            try:
+                subscription.callback(selected, reducer_name, timestamp)
+            except Exception as e:
+                logging.error(f"[ChangeFeed] Error in change listener for {table_name}: {e}")
+
+        return events
@@ -1,9 +1,10 @@
 import logging
-import queue
 import threading
 import time
 
 from .message_router import MessageRouter
+from .table_store import TableStore
+from .change_feed import ChangeFeed
 from .processors import (
     InventoryProcessor,
     CraftingProcessor,
@@ -14,11 +15,12 @@ from .processors import (
     StaminaProcessor,
 )
 from .utils import ItemLookupService
+from .utils.notifying_queue import NotifyingQueue
 from ..services.notification_service import NotificationService
 from ..services.claim_service import ClaimService
 from ..services.background_processor import BackgroundProcessor
 from ..services.codex_service import CodexService
-from ..client.query_service import QueryService
+from ..client.query_service import QueryService, CLAIM_SCOPED_TABLES
 from ..models.claim import Claim
 
 
@@ -44,6 +46,10 @@ class DataService:
         self.claim_manager = None
         self.current_subscriptions = []
 
+        # Subscription handles: player-scoped queries stay subscribed across claim switches
+        self.player_subscription_id = None
+        self.claim_subscription_id = None
+
         # Notification service
         self.notification_service = None
         self.main_app = None
@@ -52,10 +58,15 @@ class DataService:
         self.message_router = None
         self.processors = []
 
+        # Shared client-side copy of subscribed tables and its row change feed
+        self.table_store = None
+        self.change_feed = None
+
         # Background processing
         self.background_processor = None
 
-        self.data_queue = queue.Queue()
+        # Wakes the main window's drain loop on every put
+        self.data_queue = NotifyingQueue()
         self._stop_event = threading.Event()
         self.service_thread = None
 
@@ -91,6 +102,9 @@ class DataService:
                         logging.debug(f"Stopping timer for {processor.__class__.__name__}...")
                         processor.stop_real_time_timer()
 
+            if self.message_router:
+                self.message_router.validator.stop()
+
             # Shutdown background processor
             if self.background_processor:
                 logging.info("Shutting down background processor...")
@@ -357,6 +371,10 @@ class DataService:
             self.codex_service = CodexService(self)
             logging.debug(f"[DataService] CodexService initialized")
 
+            # Shared table store - processors read building and claim member rows from here
+            self.table_store = TableStore()
+            self.change_feed = ChangeFeed()
+
             # Initialize processors and message router (subscription-based architecture only)
             services = {
                 "claim_manager": self.claim_manager,
@@ -366,6 +384,8 @@ class DataService:
                 "data_service": self,
                 "background_processor": self.background_processor,
                 "codex_service": self.codex_service,
+                "table_store": self.table_store,
+                "change_feed": self.change_feed,
             }
 
             self.processors = [
@@ -378,7 +398,13 @@ class DataService:
                 StaminaProcessor(self.data_queue, services, reference_data),
             ]
 
-            self.message_router = MessageRouter(self.processors, self.data_queue)
+            self.message_router = MessageRouter(
+                self.processors, self.data_queue, table_store=self.table_store, change_feed=self.change_feed
+            )
+
+            # Dropped connections are re-established by the client; only changed rows reach the UI
+            self.client.on_disconnect = self._handle_connection_lost
+            self.client.on_reconnect = self._handle_reconnected
 
             # Start real-time timers in processors and load initial data
             for processor in self.processors:
@@ -406,6 +432,8 @@ class DataService:
         try:
             setup_start = time.time()
             logging.info("[DataService] Setting up data subscriptions...")
+            self.player_subscription_id = None
+            self.claim_subscription_id = None
             self._setup_subscriptions_for_current_claim()
             setup_time = time.time() - setup_start
             logging.debug(f"[DataService] Subscriptions setup completed in {setup_time:.3f}s")
@@ -416,6 +444,16 @@ class DataService:
             self.data_queue.put({"type": "error", "data": f"Subscriptions setup error: {e}"})
             return False
 
+    def _handle_connection_lost(self):
+        """Tell the UI the connection dropped and a reconnect is in progress."""
+        self.data_queue.put({"type": "connection_status", "data": {"status": "reconnecting"}})
+
+    def _handle_reconnected(self):
+        """Diff the re-sent subscription against cached state instead of reloading it."""
+        if self.message_router:
+            self.message_router.begin_resync(self.client.get_subscription_ids())
+        self.data_queue.put({"type": "connection_status", "data": {"status": "connected"}})
+
     def _handle_timer_update(self, timer_data):
         """Handle real-time timer updates from the crafting service"""
         try:
@@ -428,6 +466,9 @@ class DataService:
         Sets up subscriptions for the currently active claim using query service.
         All data comes through subscriptions - no one-off queries.
 
+        Player-scoped queries are subscribed once under their own handle; only the
+        claim-scoped handle is replaced on claim switch and refresh.
+
         Args:
             context: "startup" for initial app startup, "refresh" for claim refresh
         """
@@ -438,22 +479,29 @@ class DataService:
                 logging.warning("[DataService] No claim ID or user ID available for subscriptions")
                 return
 
-            # Use query service to get all subscription queries
+            # Use query service to get the player and claim subscription groups
             query_service = QueryService(self.client)
-            all_subscriptions = query_service.get_subscription_queries(self.user_id, self.claim.claim_id)
+            player_queries = query_service.get_player_subscription_queries(self.user_id)
+            claim_queries = query_service.get_claim_subscription_queries(self.claim.claim_id)
+            all_subscriptions = player_queries + claim_queries
 
             logging.debug(f"[DataService] Generated {len(all_subscriptions)} subscription queries")
             for i, query in enumerate(all_subscriptions):
                 logging.debug(f"[DataService] Subscription {i+1}: {query[:50]}...")
 
             # Start subscriptions - route to message router
-            if all_subscriptions:
-                logging.debug("[DataService] Starting subscription listener with message router")
-                self.client.start_subscription_listener(all_subscriptions, self.message_router.handle_message)
-                self.current_subscriptions = all_subscriptions
-                logging.info(f"[DataService] Started {len(all_subscriptions)} subscriptions for claim {self.claim.claim_id}")
-            else:
-                logging.warning("[DataService] No subscription queries generated")
+            if self.player_subscription_id is None:
+                self.player_subscription_id = self.client.subscribe(player_queries, self.message_router.handle_message)
+
+            if self.claim_subscription_id is not None:
+                self.client.unsubscribe(self.claim_subscription_id)
+            self.claim_subscription_id = self.client.subscribe(claim_queries, self.message_router.handle_message)
+
+            self.current_subscriptions = all_subscriptions
+            logging.info(
+                f"[DataService] Subscribed {len(claim_queries)} claim queries for claim {self.claim.claim_id} ({context}), "
+                f"{len(player_queries)} player queries active"
+            )
 
         except Exception as e:
             logging.error(f"[DataService] Error setting up subscriptions: {e}")
@@ -497,14 +545,20 @@ class DataService:
             if self.claim_manager:
                 self.claim_manager._save_claims_cache()
 
-            # Clear processor caches to prevent data contamination
+            # Clear claim-scoped caches to prevent data contamination; player data stays warm
             logging.info("Clearing processor caches for claim switch...")
             for processor in self.processors:
                 try:
+                    if not CLAIM_SCOPED_TABLES.intersection(processor.get_table_names()):
+                        continue
                     processor.clear_cache()
                 except Exception as e:
                     logging.warning(f"Error clearing cache in {processor.__class__.__name__}: {e}")
 
+            if self.table_store is not None:
+                for table_name in CLAIM_SCOPED_TABLES:
+                    self.table_store.clear(table_name)
+
             # Switch to new claim (we'll implement set_current_claim method)
             self.claim_manager.set_current_claim(claim_id)
 
@@ -526,7 +580,7 @@ class DataService:
                     processor.services = existing_services
                     processor.claim = self.claim
 
-            # Restart subscriptions for new claim (this automatically replaces existing subscriptions)
+            # Swap the claim-scoped subscription for the new claim
             self._setup_subscriptions_for_current_claim(context="claim_switch")
 
             # Notify UI that claim switching completed successfully
@@ -571,16 +625,16 @@ class DataService:
 
             logging.info(f"[DataService] Refreshing data for current claim: {self.claim.claim_id}")
 
-            # Clear all processor caches to ensure fresh data
+            # Clear claim-scoped caches to ensure fresh data
             if hasattr(self, "message_router") and self.message_router:
-                logging.debug("[DataService] Clearing all processor caches before refresh")
-                self.message_router.clear_all_processor_caches()
+                logging.debug("[DataService] Clearing claim processor caches before refresh")
+                self.message_router.clear_all_processor_caches(CLAIM_SCOPED_TABLES)
                 logging.debug("[DataService] Processor caches cleared successfully")
             else:
                 logging.warning("[DataService] No message router available for cache clearing")
 
-            # Restart subscriptions for current claim (this will fetch all fresh data)
-            logging.debug("[DataService] Restarting subscriptions for fresh data")
+            # Re-subscribe the claim queries (player-scoped subscriptions stay live)
+            logging.debug("[DataService] Restarting claim subscriptions for fresh data")
             self._setup_subscriptions_for_current_claim(context="refresh")
             logging.debug("[DataService] Subscriptions restarted successfully")
 
@@ -641,12 +695,7 @@ class DataService:
         try:
             logging.info("[DataService] Starting comprehensive data refresh...")
 
-            # Stop active subscriptions to free the WebSocket for one-off queries
-            logging.info("[DataService] Stopping subscriptions for reference data refresh...")
-            if self.client:
-                self.client.stop_subscriptions()
-
-            # Refresh reference data while WebSocket is free
+            # One-off queries run alongside live subscriptions on the same connection
             query_service = QueryService(self.client)
             logging.info("[DataService] Refreshing reference data...")
             reference_data = query_service.get_reference_data()
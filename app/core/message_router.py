@@ -1,12 +1,20 @@
 """
 Message router for handling SpacetimeDB messages.
 
-Routes TransactionUpdate, SubscriptionUpdate, and InitialSubscription messages
-to the appropriate data processors based on table names.
+Routes TransactionUpdate, SubscriptionUpdate, and InitialSubscription messages,
+plus the per-handle SubscribeMultiApplied / UnsubscribeMultiApplied messages, to
+the appropriate data processors based on table names.
 """
 
-import json
 import logging
+import time
+from contextlib import nullcontext
+
+from app.services import json_codec
+from app.services.latency_tracer import current_trace, use_trace
+from app.services.metrics_registry import get_metrics_registry
+from .sampled_validator import SampledValidator
+from .table_store import primary_key, row_to_dict
 from app.models import (
     InventoryState,
     PassiveCraftState,
@@ -40,16 +48,34 @@ class MessageRouter:
     Handles the message routing logic that was previously in DataService._handle_message()
     """
 
-    def __init__(self, processors, data_queue):
+    def __init__(
+        self, processors, data_queue, table_store=None, change_feed=None, validation_sample_rate=0.1, metrics=None
+    ):
         """
         Initialize the message router with processors.
 
         Args:
             processors: List of data processor instances
             data_queue: Thread-safe queue for sending data to UI
+            table_store: Optional TableStore kept in sync with every routed table update
+            change_feed: Optional ChangeFeed that receives row change events for transactions
+            validation_sample_rate: Fraction of table updates validated against their
+                                    dataclasses on a background worker (0 disables)
+            metrics: MetricsRegistry for table throughput and processor latency
+                     (defaults to the global registry)
         """
         self.processors = processors
         self.data_queue = data_queue
+        self.table_store = table_store
+        self.change_feed = change_feed
+        self.metrics = metrics or get_metrics_registry()
+
+        # Set by begin_resync(): initial rows for these handles are diffed against the current rows.
+        # None stands for the legacy InitialSubscription.
+        self._resync_pending = set()
+
+        # Tables each subscription handle (query id) has delivered rows for
+        self._query_tables = {}
 
         # Build mapping of table names to processors
         self.table_to_processors = {}
@@ -84,13 +110,13 @@ class MessageRouter:
             "building_function_type_mapping_desc": BuildingFunctionTypeMappingDesc,
         }
 
-        # Statistics for monitoring dataclass validation
-        self.validation_stats = {
-            "total_validations": 0,
-            "successful_validations": 0,
-            "validation_errors": 0,
-            "table_validation_counts": {},
-        }
+        # Dataclass validation runs on a sample of updates, off the routing thread
+        self.validator = SampledValidator(self.table_dataclass_mapping, sample_rate=validation_sample_rate)
+
+    @property
+    def validation_stats(self):
+        """Current dataclass validation statistics (see get_validation_stats)."""
+        return self.validator.get_stats()
 
     def handle_message(self, message):
         """
@@ -101,6 +127,12 @@ class MessageRouter:
         Args:
             message: The complete message from SpacetimeDB
         """
+        # UI updates queued while this runs carry the frame's latency trace
+        with use_trace(current_trace(), mark="routed"):
+            self._route_message(message)
+
+    def _route_message(self, message):
+        """Dispatch a message to the handler for its type."""
         try:
             if "TransactionUpdate" in message:
                 self._process_transaction_update(message["TransactionUpdate"])
@@ -108,6 +140,13 @@ class MessageRouter:
                 self._process_subscription_update(message["SubscriptionUpdate"])
             elif "InitialSubscription" in message:
                 self._process_initial_subscription(message["InitialSubscription"])
+            elif "SubscribeMultiApplied" in message:
+                self._process_subscribe_applied(message["SubscribeMultiApplied"])
+            elif "UnsubscribeMultiApplied" in message:
+                self._process_unsubscribe_applied(message["UnsubscribeMultiApplied"])
+            elif "SubscriptionError" in message:
+                error = message["SubscriptionError"]
+                logging.error(f"[MessageRouter] Subscription error (query {error.get('query_id')}): {error.get('error')}")
             else:
                 logging.warning(f"Unknown message type: {list(message.keys())}")
 
@@ -136,26 +175,40 @@ class MessageRouter:
             tables = status.get("Committed", {}).get("tables", [])
 
             for table_update in tables:
-                table_name = table_update.get("table_name", "")
+                self._route_transaction_table(table_update, reducer_name, timestamp_seconds)
 
-                # Route to appropriate processors
-                processors = self.table_to_processors.get(table_name, [])
-                if not processors and table_name:
-                    logging.warning(f"No processors found for table '{table_name}' - data will not be processed")
+        except Exception as e:
+            logging.error(f"Error processing transaction update: {e}")
 
-                # Validate data if we have a dataclass for this table
-                self._validate_table_data(table_name, table_update, "transaction")
+    def _route_transaction_table(self, table_update, reducer_name, timestamp_seconds):
+        """Apply one transaction table update to the store and pass it to its processors."""
+        table_name = table_update.get("table_name", "")
 
-                for processor in processors:
-                    try:
-                        processor.process_transaction(table_update, reducer_name, timestamp_seconds)
-                    except Exception as e:
-                        logging.error(f"Error in {processor.__class__.__name__} processing transaction: {e}")
-                        # Log additional context for debugging
-                        self._log_processor_error(processor, table_name, "transaction", e)
+        # Route to appropriate processors
+        processors = self.table_to_processors.get(table_name, [])
+        if not processors and table_name:
+            logging.warning(f"No processors found for table '{table_name}' - data will not be processed")
 
-        except Exception as e:
-            logging.error(f"Error processing transaction update: {e}")
+        # Decode row JSON once so every processor shares the parsed rows
+        if processors:
+            self._decode_table_rows(table_update)
+            self._apply_to_table_store(table_update)
+            self._publish_row_changes(table_update, reducer_name, timestamp_seconds)
+            self.metrics.record_table(table_name, self._count_rows(table_update))
+
+        # Validate a sample of updates in the background
+        self.validator.submit(table_name, table_update, "transaction")
+
+        for processor in processors:
+            try:
+                with self._processor_lock(processor), self.metrics.time(
+                    f"{processor.__class__.__name__}.process_transaction"
+                ):
+                    processor.process_transaction(table_update, reducer_name, timestamp_seconds)
+            except Exception as e:
+                logging.error(f"Error in {processor.__class__.__name__} processing transaction: {e}")
+                # Log additional context for debugging
+                self._log_processor_error(processor, table_name, "transaction", e)
 
     def _process_subscription_update(self, subscription_data, is_initial=False):
         """Process SubscriptionUpdate messages - batch updates."""
@@ -179,6 +232,12 @@ class MessageRouter:
                 if not processors and table_name:
                     logging.warning(f"No processors found for subscription table '{table_name}' - data will not be processed")
 
+                # Decode row JSON once so every processor shares the parsed rows
+                if processors:
+                    self._decode_table_rows(table_update)
+                    self._apply_to_table_store(table_update)
+                    self.metrics.record_table(table_name, self._count_rows(table_update))
+
                 for processor in processors:
                     if processor not in processor_updates:
                         processor_updates[processor] = []
@@ -203,13 +262,16 @@ class MessageRouter:
                             else:
                                 logging.info(f"[MessageRouter] {table_name} table is empty")
 
-                        self._validate_table_data(table_name, update, "subscription")
+                        self.validator.submit(table_name, update, "subscription")
 
                         # Pass is_initial context to processors that support it
-                        if hasattr(processor, "process_subscription_with_context"):
-                            processor.process_subscription_with_context(update, is_initial=is_initial)
-                        else:
-                            processor.process_subscription(update)
+                        with self._processor_lock(processor), self.metrics.time(
+                            f"{processor.__class__.__name__}.process_subscription"
+                        ):
+                            if hasattr(processor, "process_subscription_with_context"):
+                                processor.process_subscription_with_context(update, is_initial=is_initial)
+                            else:
+                                processor.process_subscription(update)
                 except Exception as e:
                     logging.error(f"[MessageRouter] Error in {processor.__class__.__name__} processing {update_type}: {e}")
                     # Enhanced error logging for subscription processing
@@ -229,114 +291,293 @@ class MessageRouter:
             # Log which tables are in the initial subscription
             table_names = [table.get("table_name", "unknown") for table in tables]
 
+            if None in self._resync_pending:
+                self._resync_pending.discard(None)
+                if self.table_store is not None and self.table_store.get_stats():
+                    self._process_resync(tables)
+                    return
+
             # Process similar to subscription update but mark as initial
             self._process_subscription_update(initial_data, is_initial=True)
 
         except Exception as e:
             logging.error(f"[MessageRouter] Error processing initial subscription: {e}")
 
-    def clear_all_processor_caches(self):
-        """Clear caches in all processors to ensure fresh data on refresh."""
+    def _process_subscribe_applied(self, applied_data):
+        """Process SubscribeMultiApplied messages - initial rows for one subscription handle."""
+        try:
+            query_id = (applied_data.get("query_id") or {}).get("id")
+            database_update = applied_data.get("update", {})
+            tables = database_update.get("tables", [])
+
+            table_names = {table.get("table_name", "") for table in tables}
+            self._query_tables[query_id] = self._query_tables.get(query_id, set()) | table_names
+            logging.info(f"Loading subscription handle {query_id} ({len(tables)} tables)")
+
+            if query_id in self._resync_pending:
+                self._resync_pending.discard(query_id)
+                if self.table_store is not None and self.table_store.get_stats():
+                    self._process_resync(tables, self._query_tables[query_id])
+                    return
+
+            self._process_subscription_update({"database_update": database_update}, is_initial=True)
+
+        except Exception as e:
+            logging.error(f"[MessageRouter] Error processing SubscribeMultiApplied: {e}")
+
+    def _process_unsubscribe_applied(self, applied_data):
+        """Process UnsubscribeMultiApplied messages - rows that left with a removed handle."""
         try:
+            query_id = (applied_data.get("query_id") or {}).get("id")
+            self._query_tables.pop(query_id, None)
+            self._resync_pending.discard(query_id)
+
+            timestamp_seconds = time.time()
+            for table_update in applied_data.get("update", {}).get("tables", []):
+                self._route_transaction_table(table_update, "unsubscribe", timestamp_seconds)
+
+        except Exception as e:
+            logging.error(f"[MessageRouter] Error processing UnsubscribeMultiApplied: {e}")
+
+    def begin_resync(self, query_ids=None):
+        """
+        Reconcile the next initial rows against the current rows.
+
+        Call after a reconnect re-sends the same subscriptions. Each fresh snapshot
+        is then diffed against the table store and the rows processors keep, and
+        only rows that changed while the connection was down are routed, as a
+        transaction, instead of reloading every processor and the UI from scratch.
+
+        Args:
+            query_ids: Subscription handles being re-sent, or None for the legacy
+                       InitialSubscription
+        """
+        self._resync_pending = {None} if query_ids is None else set(query_ids)
+
+    def _process_resync(self, tables, expected_tables=None):
+        """
+        Route the difference between a fresh snapshot and the current rows.
+
+        Tables the table store keeps are diffed against the store; other tables
+        against the rows their processors report through get_resync_rows(). Both
+        sides are normalized with row_to_dict() before comparing, and the
+        difference is routed as a transaction in the same column-dict shape.
+        Tables without such a baseline (reference data) are processed as a regular
+        subscription update. Expected tables missing from the snapshot are treated
+        as empty, so their rows are reported as deleted.
+
+        Args:
+            tables: Table updates of the InitialSubscription or SubscribeMultiApplied
+            expected_tables: Tables the snapshot covers (None for every stored table)
+        """
+        snapshots = {}
+        baselines = {}
+        passthrough = []
+        for table_update in tables:
+            table_name = table_update.get("table_name", "")
+            if not self.table_to_processors.get(table_name):
+                continue
+            baseline = self._get_resync_baseline(table_name)
+            if baseline is None:
+                passthrough.append(table_update)
+                continue
+            baselines[table_name] = baseline
+
+            self._decode_table_rows(table_update)
+            rows = snapshots.setdefault(table_name, {})
+            row_groups = [table_update]
+            row_groups.extend(u for u in table_update.get("updates", []) if isinstance(u, dict))
+            for group in row_groups:
+                for row in group.get("inserts", None) or []:
+                    row_dict = row_to_dict(table_name, row, self.table_store.row_types, self.table_store.column_names)
+                    if row_dict is not None and primary_key(row_dict) is not None:
+                        rows[primary_key(row_dict)] = row_dict
+
+        covered = set(self.table_store.get_stats()) if expected_tables is None else set(expected_tables)
+        for table_name in covered - set(snapshots):
+            if table_name in self.table_to_processors:
+                baseline = self._get_resync_baseline(table_name)
+                if baseline is not None:
+                    baselines[table_name] = baseline
+                    snapshots[table_name] = {}
+
+        timestamp_seconds = time.time()
+        changed_rows = 0
+        for table_name, fresh in snapshots.items():
+            stored = baselines[table_name]
+            deletes = []
+            inserts = []
+            for key, row in fresh.items():
+                old_row = stored.pop(key, None)
+                if old_row is None:
+                    inserts.append(row)
+                elif old_row != row:
+                    deletes.append(old_row)
+                    inserts.append(row)
+            deletes.extend(stored.values())
+
+            if not deletes and not inserts:
+                continue
+
+            changed_rows += len(inserts) + len(deletes)
+            diff = {"table_name": table_name, "updates": [{"deletes": deletes, "inserts": inserts}]}
+            self._route_transaction_table(diff, "reconnect_resync", timestamp_seconds)
+
+        if passthrough:
+            self._process_subscription_update({"database_update": {"tables": passthrough}})
+
+        logging.info(f"[MessageRouter] Resynced after reconnect: {changed_rows} row inserts/deletes")
+
+    def _get_resync_baseline(self, table_name):
+        """
+        Get the rows a resync snapshot of a table is diffed against.
+
+        Args:
+            table_name: Name of the table being resynced
+
+        Returns:
+            dict: Normalized row dicts keyed by primary key, or None if neither the
+                  table store nor any processor keeps the table
+        """
+        if self.table_store.handles(table_name):
+            rows = self.table_store.get_rows(table_name)
+        else:
+            rows = None
+            for processor in self.table_to_processors.get(table_name, []):
+                get_resync_rows = getattr(processor, "get_resync_rows", None)
+                if get_resync_rows is None:
+                    continue
+                with self._processor_lock(processor):
+                    processor_rows = get_resync_rows(table_name)
+                if processor_rows is not None:
+                    rows = (rows or []) + list(processor_rows)
+            if rows is None:
+                return None
+
+        baseline = {}
+        for row in rows:
+            row_dict = row_to_dict(table_name, row, self.table_store.row_types, self.table_store.column_names)
+            if row_dict is not None and primary_key(row_dict) is not None:
+                baseline[primary_key(row_dict)] = row_dict
+        return baseline
+
+    def clear_all_processor_caches(self, table_names=None):
+        """
+        Clear caches in all processors to ensure fresh data on refresh.
+
+        Args:
+            table_names: Optional set of tables being reloaded. Only processors that
+                         handle one of them are cleared, and only those tables are
+                         dropped from the table store; None clears everything.
+        """
+        try:
+            cleared = 0
             for processor in self.processors:
+                if table_names is not None and not set(processor.get_table_names()) & set(table_names):
+                    continue
                 if hasattr(processor, "clear_cache"):
                     processor.clear_cache()
+                    cleared += 1
                     logging.debug(f"Cleared cache for {processor.__class__.__name__}")
-            logging.info(f"Cleared caches for {len(self.processors)} processors")
+            logging.info(f"Cleared caches for {cleared} processors")
+            if self.table_store is not None:
+                if table_names is None:
+                    self.table_store.clear()
+                else:
+                    for table_name in table_names:
+                        self.table_store.clear(table_name)
             # Reset validation stats on cache clear
             self._reset_validation_stats()
         except Exception as e:
             logging.error(f"Error clearing processor caches: {e}")
 
-    def _validate_table_data(self, table_name, table_update, update_type):
+    def _decode_table_rows(self, table_update):
         """
-        Validate table data using appropriate dataclass if available.
+        Decode JSON row strings in a table update in place.
+
+        Several processors subscribe to the same tables (building_state,
+        claim_member_state, ...), so rows are parsed here once and every processor
+        receives the decoded dicts/lists. Rows that fail to decode are left as
+        strings so the owning processor can report them as before.
 
         Args:
-            table_name: Name of the table being updated
-            table_update: The table update data
-            update_type: Type of update ("transaction" or "subscription")
+            table_update: Table update dict from a SpacetimeDB message
+
+        Returns:
+            int: Number of rows decoded
+        """
+        decoded = 0
+        row_groups = [table_update]
+        row_groups.extend(u for u in table_update.get("updates", []) if isinstance(u, dict))
+
+        for group in row_groups:
+            for key in ("inserts", "deletes"):
+                rows = group.get(key)
+                if not rows:
+                    continue
+                for i, row in enumerate(rows):
+                    if not isinstance(row, str):
+                        continue
+                    try:
+                        rows[i] = json_codec.loads(row)
+                        decoded += 1
+                    except (ValueError, TypeError) as e:
+                        logging.debug(f"[MessageRouter] Leaving undecodable row in {table_update.get('table_name', '')}: {e}")
+
+        return decoded
+
+    def _apply_to_table_store(self, table_update):
         """
+        Apply a decoded table update to the shared table store, if one is configured.
+
+        Runs before processors see the update so they can read the new rows.
+
+        Args:
+            table_update: Table update dict with decoded rows
+        """
+        if self.table_store is None:
+            return
+
         try:
-            dataclass_type = self.table_dataclass_mapping.get(table_name)
-            if not dataclass_type:
-                return  # No validation available for this table
-
-            self.validation_stats["total_validations"] += 1
-            if table_name not in self.validation_stats["table_validation_counts"]:
-                self.validation_stats["table_validation_counts"][table_name] = {"success": 0, "error": 0}
-
-            # Extract sample data for validation
-            validation_samples = 0
-            validation_errors = 0
-
-            if update_type == "subscription":
-                # For subscription data, validate table_rows directly
-                table_rows = table_update.get("table_rows", [])
-                validation_data = table_rows[:5]  # Only validate first 5 records
-            else:
-                # For transaction data, look in updates -> inserts
-                updates = table_update.get("updates", [])
-                validation_data = []
-                for update in updates:
-                    inserts = update.get("inserts", [])
-                    validation_data.extend(inserts[:5])  # Only validate first 5 records
-                validation_data = validation_data[:5]  # Limit to 5 total
-
-            for i, data_item in enumerate(validation_data):
-                try:
-                    if isinstance(data_item, str):
-                        data = json.loads(data_item)
-                    else:
-                        data = data_item
-
-                    # Try to create dataclass instance for validation
-                    if update_type == "subscription":
-                        # Subscription data is usually in dict format
-                        if isinstance(data, dict):
-                            dataclass_type.from_dict(data)
-                        else:
-                            # Check if from_array method exists
-                            if hasattr(dataclass_type, "from_array"):
-                                dataclass_type.from_array(data)
-                            else:
-                                # Skip validation for classes without from_array
-                                continue
-                    else:
-                        # Transaction data is usually in array format
-                        if isinstance(data, list):
-                            # Check if from_array method exists
-                            if hasattr(dataclass_type, "from_array"):
-                                dataclass_type.from_array(data)
-                            else:
-                                # Skip validation for classes without from_array
-                                continue
-                        else:
-                            dataclass_type.from_dict(data)
-
-                    validation_samples += 1
-
-                except Exception as validation_error:
-                    validation_errors += 1
-                    if validation_errors <= 2:  # Only log first few errors per batch
-                        logging.warning(
-                            f"Dataclass validation failed for {table_name}, data may be inconsistent: {validation_error}"
-                        )
-                        logging.debug(f"Dataclass validation warning for {table_name}: {validation_error}")
-                        # Log the problematic data for debugging
-                        if table_name in ["stamina_state", "character_stats_state"]:
-                            logging.warning(f"[Validation] Problematic {table_name} data: {data}")
+            self.table_store.apply_table_update(table_update)
+        except Exception as e:
+            logging.error(f"[MessageRouter] Error applying {table_update.get('table_name', '')} to table store: {e}")
+
+    def _publish_row_changes(self, table_update, reducer_name, timestamp):
+        """
+        Publish row change events for a decoded transaction table update.
 
-            # Update statistics
-            if validation_errors == 0 and validation_samples > 0:
-                self.validation_stats["successful_validations"] += 1
-                self.validation_stats["table_validation_counts"][table_name]["success"] += 1
-            elif validation_errors > 0:
-                self.validation_stats["validation_errors"] += 1
-                self.validation_stats["table_validation_counts"][table_name]["error"] += 1
+        Args:
+            table_update: Table update dict with decoded rows
+            reducer_name: Name of the reducer that caused the transaction
+            timestamp: Transaction timestamp in seconds
+        """
+        if self.change_feed is None:
+            return
 
+        try:
+            self.change_feed.publish(table_update, reducer_name, timestamp)
         except Exception as e:
-            logging.debug(f"Error in dataclass validation for {table_name}: {e}")
+            logging.error(f"[MessageRouter] Error publishing {table_update.get('table_name', '')} row changes: {e}")
+
+    @staticmethod
+    def _count_rows(table_update):
+        """Return the number of rows inserted and deleted by a table update."""
+        row_groups = [table_update]
+        row_groups.extend(u for u in table_update.get("updates", []) if isinstance(u, dict))
+        return sum(len(group.get("inserts") or ()) + len(group.get("deletes") or ()) for group in row_groups)
+
+    @staticmethod
+    def _processor_lock(processor):
+        """
+        Lock held while a processor handles an update.
+
+        Processors defer merged UI emissions to a timer thread (see
+        BaseProcessor._schedule_emission); holding their state_lock keeps those
+        emissions from reading half-applied state.
+        """
+        lock = getattr(processor, "state_lock", None)
+        return lock if hasattr(lock, "__enter__") else nullcontext()
 
     def _log_processor_error(self, processor, table_name, operation_type, error):
         """
@@ -367,19 +608,18 @@ class MessageRouter:
         Log current dataclass validation statistics for monitoring.
         """
         try:
-            if self.validation_stats["total_validations"] > 0:
-                success_rate = (
-                    self.validation_stats["successful_validations"] / self.validation_stats["total_validations"]
-                ) * 100
+            stats = self.validator.get_stats()
+            if stats["total_validations"] > 0:
+                success_rate = (stats["successful_validations"] / stats["total_validations"]) * 100
 
                 logging.info(
-                    f"Dataclass validation stats: {self.validation_stats['successful_validations']}/"
-                    f"{self.validation_stats['total_validations']} successful ({success_rate:.1f}%)"
+                    f"Dataclass validation stats: {stats['successful_validations']}/"
+                    f"{stats['total_validations']} successful ({success_rate:.1f}%)"
                 )
 
                 # Log per-table stats if there are errors
-                if self.validation_stats["validation_errors"] > 0:
-                    for table_name, counts in self.validation_stats["table_validation_counts"].items():
+                if stats["validation_errors"] > 0:
+                    for table_name, counts in stats["table_validation_counts"].items():
                         if counts["error"] > 0:
                             logging.debug(f"Table {table_name}: {counts['success']} success, {counts['error']} errors")
 
@@ -390,12 +630,7 @@ class MessageRouter:
         """
         Reset validation statistics (called on cache clear).
         """
-        self.validation_stats = {
-            "total_validations": 0,
-            "successful_validations": 0,
-            "validation_errors": 0,
-            "table_validation_counts": {},
-        }
+        self.validator.reset()
         logging.debug("Reset dataclass validation statistics")
 
     def get_validation_stats(self):
@@ -403,6 +638,7 @@ class MessageRouter:
         Get current validation statistics for monitoring.
 
         Returns:
-            dict: Current validation statistics
+            dict: Validation totals and per-table counts for the sampled updates,
+                  plus sampled, dropped and sample_rate
         """
-        return self.validation_stats.copy()
+        return self.validator.get_stats()
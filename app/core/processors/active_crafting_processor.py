@@ -4,9 +4,9 @@ Active crafting processor for handling progressive_action_state table updates.
 
 import json
 import logging
-import re
 
 from .base_processor import BaseProcessor
+from ..change_feed import compute_row_changes, RowInserted, RowUpdated, RowDeleted
 from app.models import ProgressiveActionState, PublicProgressiveActionState, BuildingState, ClaimMemberState
 
 
@@ -48,13 +48,22 @@ class ActiveCraftingProcessor(BaseProcessor):
             current_active_crafting_data: Last sent UI data for progress tracking
             _progressive_action_data: Dict[int, dict] - Active crafts by entity_id
             _public_actions: Set[int] - Progressive action entity IDs accepting help
-            _building_data: Dict[int, dict] - Building info by entity_id
-            _building_nicknames: Dict[int, str] - Custom building names
-            _claim_members: Dict[str, str] - Player names by player_entity_id
+            _building_data: Dict[int, dict] - Building info by entity_id (only without a table store)
+            _building_nicknames: Dict[int, str] - Custom building names (only without a table store)
+            _claim_members: Dict[str, str] - Player names by player_entity_id (only without a table store)
         """
         super().__init__(data_queue, services, reference_data)
         self.current_active_crafting_data = []
 
+        # Live action rows arrive as row changes; only claim members' crafts are tracked
+        if self.change_feed is not None:
+            self.change_feed.subscribe(
+                self._on_progressive_action_changes,
+                tables=["progressive_action_state"],
+                predicate=self._is_claim_member_change,
+            )
+            self.change_feed.subscribe(self._on_public_action_changes, tables=["public_progressive_action_state"])
+
     def get_table_names(self):
         """Return list of table names this processor handles."""
         return [
@@ -69,211 +78,171 @@ class ActiveCraftingProcessor(BaseProcessor):
         """
         Handle progressive_action_state transactions - LIVE incremental updates.
 
-        Processes real-time active crafting progress changes without full refresh.
+        Processes real-time active crafting progress changes without full refresh. With
+        a change feed, progressive_action_state and public_progressive_action_state rows
+        were already applied by the feed listeners when the router published them.
         """
         try:
             table_name = table_update.get("table_name", "")
             updates = table_update.get("updates", [])
 
-            # Track if we need to send updates
-            has_active_crafting_changes = False
+            if table_name == "progressive_action_state":
+                if self.change_feed is None:
+                    changes = [c for c in compute_row_changes(table_update) if self._is_claim_member_change(c)]
+                    self._apply_progressive_action_changes(changes, reducer_name, timestamp)
+                return
 
+            if table_name == "public_progressive_action_state":
+                if self.change_feed is None:
+                    self._apply_public_action_changes(compute_row_changes(table_update), reducer_name, timestamp)
+                return
+
+            # For other table types, do full refresh if we have changes
             for update in updates:
-                inserts = update.get("inserts", [])
-                deletes = update.get("deletes", [])
-
-                # Process progressive_action_state updates (progress changes)
-                if table_name == "progressive_action_state":
-                    # Collect all operations first to handle delete+insert as updates
-                    delete_operations = {}
-                    insert_operations = {}
-
-                    # Parse all deletes
-                    for delete_str in deletes:
-                        parsed_data = self._parse_progressive_action_state(delete_str)
-                        if parsed_data:
-                            owner_id = parsed_data.get("owner_entity_id")
-                            if self._is_current_claim_member(owner_id):
-                                entity_id = parsed_data.get("entity_id")
-                                delete_operations[entity_id] = parsed_data
-
-                    # Parse all inserts
-                    for insert_str in inserts:
-                        parsed_data = self._parse_progressive_action_state(insert_str)
-                        if parsed_data:
-                            owner_id = parsed_data.get("owner_entity_id")
-                            if self._is_current_claim_member(owner_id):
-                                entity_id = parsed_data.get("entity_id")
-                                insert_operations[entity_id] = parsed_data
-
-                    # Process operations: handle delete+insert as updates, standalone deletes as removals
-                    if not hasattr(self, "_progressive_action_data"):
-                        self._progressive_action_data = {}
-
-                    # Handle updates (delete+insert for same entity)
-                    for entity_id in insert_operations:
-                        insert_data = insert_operations[entity_id]
-                        self._progressive_action_data[entity_id] = insert_data
-
-                        building_id = insert_data.get("building_entity_id")
-                        # Add missing building to building_data if it's not already there
-                        if not hasattr(self, "_building_data"):
-                            self._building_data = {}
-
-                        if building_id not in self._building_data:
-                            # Create a basic building entry - we'll populate it with known data
-                            self._building_data[building_id] = {
-                                "entity_id": building_id,
-                                "building_description_id": None,
-                                "claim_entity_id": None,
-                            }
+                if update.get("inserts") or update.get("deletes"):
+                    logging.debug(f"Sending full refresh for table: {table_name}")
+                    self._refresh_active_crafting()
+                    break
 
-                        if entity_id in delete_operations:
-                            # This is an update (delete+insert)
-                            old_data = delete_operations[entity_id]
-                            old_progress = old_data.get("progress", 0)
-                            progress = insert_data.get("progress", 0)
-                            preparation = insert_data.get("preparation", False)
-                            recipe_id = insert_data.get("recipe_id", 0)
-                            craft_count = insert_data.get("craft_count", 1)
-
-                            # Check if this progress update represents completion (READY status)
-                            if not preparation and recipe_id:
-                                try:
-                                    if self.reference_data:
-                                        recipe_lookup = {r["id"]: r for r in self.reference_data.get("crafting_recipe_desc", [])}
-                                        recipe_info = recipe_lookup.get(recipe_id, {})
-                                        if recipe_info:
-                                            recipe_actions_required = recipe_info.get("actions_required", 1)
-                                            total_effort = recipe_actions_required * craft_count
-                                            current_effort = progress
-                                            remaining_effort = max(0, total_effort - current_effort)
-
-                                            # Check if this is newly completed
-                                            old_total_effort = recipe_actions_required * old_data.get("craft_count", 1)
-                                            old_remaining_effort = max(0, old_total_effort - old_progress)
-
-                                            if remaining_effort == 0 and old_remaining_effort > 0:
-                                                # Only trigger notification if this craft belongs to the current player
-                                                owner_entity_id = insert_data.get("owner_entity_id")
-                                                if self._is_current_player(owner_entity_id):
-                                                    self._trigger_active_craft_notification(recipe_id)
-                                except Exception as e:
-                                    logging.error(f"Error checking active craft completion status: {e}")
-                        else:
-                            # This is a new insert
-                            recipe_id = insert_data.get("recipe_id", 0)
-                            progress = insert_data.get("progress", 0)
-
-                        has_active_crafting_changes = True
-
-                    # Handle standalone deletes (completions)
-                    for entity_id in delete_operations:
-                        if entity_id not in insert_operations:
-                            # This is a standalone delete (completion/claimed)
-                            if entity_id in self._progressive_action_data:
-                                del self._progressive_action_data[entity_id]
-
-                            delete_data = delete_operations[entity_id]
-                            recipe_id = delete_data.get("recipe_id", 0)
-
-                            # Notification is triggered when item becomes READY, not when claimed
-
-                            has_active_crafting_changes = True
-
-                # Process public_progressive_action_state updates (accept help changes)
-                elif table_name == "public_progressive_action_state":
-                    # Initialize _public_actions if it doesn't exist
-                    if not hasattr(self, "_public_actions"):
-                        self._public_actions = set()
-
-                    # Process inserts (buildings now accepting help)
-                    for insert_str in inserts:
-                        try:
-                            # Parse the insert data
-                            if isinstance(insert_str, str):
-                                insert_data = json.loads(insert_str)
-                            else:
-                                insert_data = insert_str
-
-                            # Handle both array format [entity_id, building_entity_id, owner_entity_id] and object format
-                            progressive_action_entity_id = None
-                            building_entity_id = None
-
-                            if isinstance(insert_data, list) and len(insert_data) >= 3:
-                                # Array format: [entity_id, building_entity_id, owner_entity_id]
-                                progressive_action_entity_id = insert_data[0]  # entity_id is the progressive action ID
-                                building_entity_id = insert_data[1]  # building_entity_id for reference
-                            elif isinstance(insert_data, dict):
-                                # Object format: {"entity_id": value, "building_entity_id": value}
-                                progressive_action_entity_id = insert_data.get("entity_id")
-                                building_entity_id = insert_data.get("building_entity_id")
-                            else:
-                                logging.warning(f"Unexpected public_progressive_action_state insert format: {insert_data}")
-                                continue
-
-                            if progressive_action_entity_id:
-                                self._public_actions.add(progressive_action_entity_id)
-
-                                # Ensure building exists in building_data for accept help buildings
-                                if not hasattr(self, "_building_data"):
-                                    self._building_data = {}
-
-                                if building_entity_id not in self._building_data:
-                                    # Create a basic building entry for accept help toggle buildings
-                                    self._building_data[building_entity_id] = {
-                                        "entity_id": building_entity_id,
-                                        "building_description_id": None,
-                                        "claim_entity_id": None,
-                                    }
-                        except Exception as e:
-                            logging.error(f"Error processing public action insert: {e}")
-
-                    # Process deletes (buildings no longer accepting help)
-                    for delete_str in deletes:
-                        try:
-                            # Parse the delete data
-                            if isinstance(delete_str, str):
-                                delete_data = json.loads(delete_str)
-                            else:
-                                delete_data = delete_str
-
-                            # Handle both array format [entity_id, building_entity_id, owner_entity_id] and object format
-                            progressive_action_entity_id = None
-
-                            if isinstance(delete_data, list) and len(delete_data) >= 3:
-                                # Array format: [entity_id, building_entity_id, owner_entity_id]
-                                progressive_action_entity_id = delete_data[0]  # entity_id is the progressive action ID
-                            elif isinstance(delete_data, dict):
-                                # Object format: {"entity_id": value}
-                                progressive_action_entity_id = delete_data.get("entity_id")
-                            else:
-                                logging.warning(f"Unexpected public_progressive_action_state delete format: {delete_data}")
-                                continue
-
-                            if progressive_action_entity_id and progressive_action_entity_id in self._public_actions:
-                                self._public_actions.remove(progressive_action_entity_id)
-                        except Exception as e:
-                            logging.warning(f"Failed to parse public_progressive_action_state delete, skipping: {e}")
-                            logging.error(f"Error processing public action delete: {e}")
-
-                    if inserts or deletes:
-                        has_active_crafting_changes = True
-
-                # For other table types, do full refresh if we have changes
-                elif inserts or deletes:
+        except Exception as e:
+            logging.error(f"Error handling active crafting transaction: {e}")
+
+    def _is_claim_member_change(self, change):
+        """Check whether a progressive_action_state row change belongs to a current claim member."""
+        row = change.new_row if isinstance(change, RowUpdated) else change.row
+        return self._is_current_claim_member(row.get("owner_entity_id"))
+
+    def _on_progressive_action_changes(self, changes, reducer_name, timestamp):
+        """ChangeFeed listener for progressive_action_state row changes of current claim members."""
+        with self.state_lock:
+            self._apply_progressive_action_changes(changes, reducer_name, timestamp)
+
+    def _on_public_action_changes(self, changes, reducer_name, timestamp):
+        """ChangeFeed listener for public_progressive_action_state row changes."""
+        with self.state_lock:
+            self._apply_public_action_changes(changes, reducer_name, timestamp)
+
+    def _apply_progressive_action_changes(self, changes, reducer_name, timestamp):
+        """
+        Apply progressive_action_state row changes and send the matching UI update.
+
+        Progress-only changes go out as an active_crafting_progress_update, anything
+        else as a merged incremental active crafting update.
+
+        Args:
+            changes: RowInserted / RowUpdated / RowDeleted events with ProgressiveActionState dicts
+            reducer_name: Name of the reducer that caused the changes
+            timestamp: Transaction timestamp in seconds
+        """
+        try:
+            has_active_crafting_changes = False
+            progress_deltas = {}
+
+            if not hasattr(self, "_progressive_action_data"):
+                self._progressive_action_data = {}
+
+            # Delete+insert pairs arrive as RowUpdated, standalone deletes (completions/claims) as RowDeleted
+            for change in changes:
+                entity_id = change.key
+
+                if isinstance(change, RowDeleted):
+                    # Notification is triggered when item becomes READY, not when claimed
+                    self._progressive_action_data.pop(entity_id, None)
                     has_active_crafting_changes = True
+                    continue
+
+                insert_data = change.row if isinstance(change, RowInserted) else change.new_row
+                self._progressive_action_data[entity_id] = insert_data
+                self._add_placeholder_building(insert_data.get("building_entity_id"))
+
+                if isinstance(change, RowUpdated):
+                    self._notify_if_newly_ready(change.old_row, insert_data)
+
+                    if self._is_progress_only_change(change.old_row, insert_data):
+                        remaining_effort = self._get_remaining_effort(insert_data)
+                        if remaining_effort is not None:
+                            progress_deltas[entity_id] = remaining_effort
+                            continue
+
+                has_active_crafting_changes = True
 
-            # Send incremental update for progressive_action_state and public_progressive_action_state, full refresh for others
             if has_active_crafting_changes:
-                if table_name in ["progressive_action_state", "public_progressive_action_state"]:
-                    self._send_incremental_active_crafting_update(reducer_name, timestamp)
-                else:
-                    logging.debug(f"Sending full refresh for table: {table_name}")
-                    self._refresh_active_crafting()
+                self._schedule_emission(
+                    "active_crafting", self._send_incremental_active_crafting_update, reducer_name, timestamp
+                )
+            elif progress_deltas:
+                self._queue_update(
+                    "active_crafting_progress_update",
+                    progress_deltas,
+                    changes={"source": "live_transaction", "reducer": reducer_name},
+                    timestamp=timestamp,
+                )
 
         except Exception as e:
-            logging.error(f"Error handling active crafting transaction: {e}")
+            logging.error(f"Error handling active crafting changes: {e}")
+
+    def _notify_if_newly_ready(self, old_data, new_data):
+        """
+        Notify the current player when an update completes their active craft.
+
+        Args:
+            old_data: Previous progressive_action_state dict
+            new_data: New progressive_action_state dict
+        """
+        recipe_id = new_data.get("recipe_id", 0)
+        if new_data.get("preparation", False) or not recipe_id or not self.item_lookup_service:
+            return
+
+        try:
+            recipe = self.item_lookup_service.get_recipe_record(recipe_id)
+            if not recipe:
+                return
+
+            total_effort = recipe.actions_required * new_data.get("craft_count", 1)
+            remaining_effort = max(0, total_effort - new_data.get("progress", 0))
+
+            old_total_effort = recipe.actions_required * old_data.get("craft_count", 1)
+            old_remaining_effort = max(0, old_total_effort - old_data.get("progress", 0))
+
+            if remaining_effort == 0 and old_remaining_effort > 0:
+                # Only trigger notification if this craft belongs to the current player
+                if self._is_current_player(new_data.get("owner_entity_id")):
+                    self._trigger_active_craft_notification(recipe_id)
+        except Exception as e:
+            logging.error(f"Error checking active craft completion status: {e}")
+
+    def _apply_public_action_changes(self, changes, reducer_name, timestamp):
+        """
+        Apply public_progressive_action_state row changes (accept help toggles).
+
+        Args:
+            changes: RowInserted / RowUpdated / RowDeleted events with PublicProgressiveActionState dicts
+            reducer_name: Name of the reducer that caused the changes
+            timestamp: Transaction timestamp in seconds
+        """
+        try:
+            if not hasattr(self, "_public_actions"):
+                self._public_actions = set()
+
+            for change in changes:
+                # entity_id is the progressive action ID
+                if isinstance(change, RowDeleted):
+                    self._public_actions.discard(change.key)
+                    continue
+
+                row = change.row if isinstance(change, RowInserted) else change.new_row
+                if change.key:
+                    self._public_actions.add(change.key)
+                    # Ensure building exists in building_data for accept help buildings
+                    self._add_placeholder_building(row.get("building_entity_id"))
+
+            if changes:
+                self._schedule_emission(
+                    "active_crafting", self._send_incremental_active_crafting_update, reducer_name, timestamp
+                )
+
+        except Exception as e:
+            logging.error(f"Error handling public progressive action changes: {e}")
 
     def process_subscription(self, table_update):
         """
@@ -288,7 +257,7 @@ class ActiveCraftingProcessor(BaseProcessor):
             for update in table_update.get("updates", []):
                 for insert_str in update.get("inserts", []):
                     try:
-                        row_data = json.loads(insert_str)
+                        row_data = self._decode_row(insert_str)
                         table_rows.append(row_data)
                     except json.JSONDecodeError:
                         logging.warning(f"Failed to parse {table_name} insert: {insert_str[:100]}...")
@@ -391,9 +360,36 @@ class ActiveCraftingProcessor(BaseProcessor):
         except Exception as e:
             logging.error(f"Error processing public progressive action data: {e}")
 
+    def _add_placeholder_building(self, building_id):
+        """
+        Add a basic _building_data entry for a building seen only in a craft row.
+
+        Only used without a table store; with one, _get_building_info() reads the
+        store and unknown buildings already resolve to an empty entry.
+
+        Args:
+            building_id: Building entity ID
+        """
+        if self.table_store is not None:
+            return
+
+        if not hasattr(self, "_building_data"):
+            self._building_data = {}
+
+        if building_id not in self._building_data:
+            self._building_data[building_id] = {
+                "entity_id": building_id,
+                "building_description_id": None,
+                "claim_entity_id": None,
+            }
+
     def _process_building_data(self, building_rows):
         """Process building_state data using data classes."""
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             if not hasattr(self, "_building_data"):
                 self._building_data = {}
 
@@ -418,6 +414,10 @@ class ActiveCraftingProcessor(BaseProcessor):
     def _process_building_nickname_data(self, nickname_rows):
         """Process building_nickname_state data using data classes."""
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             if not hasattr(self, "_building_nicknames"):
                 self._building_nicknames = {}
 
@@ -438,6 +438,10 @@ class ActiveCraftingProcessor(BaseProcessor):
     def _process_claim_member_data(self, member_rows):
         """Process claim_member_state data using data classes."""
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             if not hasattr(self, "_claim_members"):
                 self._claim_members = {}
 
@@ -459,13 +463,9 @@ class ActiveCraftingProcessor(BaseProcessor):
             if not (hasattr(self, "_progressive_action_data") and self._progressive_action_data):
                 return
 
-            if not (hasattr(self, "_building_data") and self._building_data):
+            if not self._has_building_data():
                 return
 
-            # Building nicknames are optional
-            if not hasattr(self, "_building_nicknames"):
-                self._building_nicknames = {}
-
             # Consolidate active crafting by item
             consolidated_crafting = self._consolidate_active_crafting()
 
@@ -507,10 +507,6 @@ class ActiveCraftingProcessor(BaseProcessor):
                 owner_id = action_data.get("owner_entity_id")
                 recipe_id = action_data.get("recipe_id")
 
-            # Use shared item lookup service
-            recipe_lookup = {r["id"]: r for r in self.reference_data.get("crafting_recipe_desc", [])}
-            building_desc_lookup = {b["id"]: b["name"] for b in self.reference_data.get("building_desc", [])}
-
             # Process each active crafting operation to extract individual items
             for action_id, action_data in self._progressive_action_data.items():
                 try:
@@ -525,29 +521,26 @@ class ActiveCraftingProcessor(BaseProcessor):
                     continue
 
                 # Skip actions from players who are not current claim members
-                owner_id_str = str(owner_id)
-                if hasattr(self, "_claim_members") and self._claim_members:
-                    if owner_id_str not in self._claim_members:
-                        continue
+                if self._has_claim_members() and self._get_claim_member(owner_id) is None:
+                    continue
 
                 # Get building info
-                building_info = self._building_data.get(building_id, {})
+                building_info = self._get_building_info(building_id)
                 building_description_id = building_info.get("building_description_id")
 
                 # Get container name (nickname or building type name)
-                container_name = self._building_nicknames.get(building_id)
+                container_name = self._get_building_nickname(building_id)
                 if not container_name and building_description_id:
-                    container_name = building_desc_lookup.get(building_description_id, f"Building {building_id}")
+                    container_name = self._get_building_type_name(building_description_id, building_id)
                 if not container_name:
                     container_name = f"Unknown Building {building_id}"
 
-                # Get recipe info
-                recipe_info = recipe_lookup.get(recipe_id, {})
-                recipe_name = recipe_info.get("name", f"Recipe {recipe_id}")
-                recipe_name = re.sub(r"\{\d+\}", "", recipe_name).strip()
+                # Get precomputed recipe info
+                recipe = self.item_lookup_service.get_recipe_record(recipe_id)
+                recipe_name = recipe.display_name if recipe else f"Recipe {recipe_id}"
 
                 # Calculate progress percentage and status using current_effort/total_effort approach
-                recipe_actions_required = recipe_info.get("actions_required", 1)
+                recipe_actions_required = recipe.actions_required if recipe else 1
                 total_effort = recipe_actions_required * craft_count  # Total effort needed
                 current_effort = progress  # Current progress is the current effort
 
@@ -575,15 +568,13 @@ class ActiveCraftingProcessor(BaseProcessor):
 
                 try:
                     # Process crafted items from this operation
-                    crafted_items = recipe_info.get("crafted_item_stacks", [])
+                    crafted_items = recipe.outputs if recipe else ()
 
                     if not crafted_items:
                         logging.warning(f"Recipe {recipe_id} has empty crafted_item_stacks! Using recipe name fallback.")
                         # Create fallback operation using recipe name
-                        fallback_item_name = re.sub(r"\{\d+\}", "", recipe_name).strip()
-
                         raw_operation = {
-                            "item_name": fallback_item_name,
+                            "item_name": recipe_name,
                             "tier": 0,
                             "quantity": craft_count,
                             "tag": "",
@@ -601,45 +592,39 @@ class ActiveCraftingProcessor(BaseProcessor):
                         raw_operations.append(raw_operation)
                         continue
 
-                    for item_stack in crafted_items:
-                        if isinstance(item_stack, list) and len(item_stack) >= 2:
-                            item_id = item_stack[0]
-                            base_quantity = item_stack[1]
-                            total_quantity = base_quantity * craft_count
-
-                            # Look up item details with preference for item_desc (crafting stations produce items, not resources)
-                            found_items = self.item_lookup_service.find_items_by_id_preferred_source(item_id, "item_desc")
-
-                            if found_items:
-                                # Use first found item (prevents items like ancient texts overwriting other items)
-                                item_info = found_items[0]
-                                item_name = item_info.get("name", f"Unknown Item {item_id}")
-                                item_tier = item_info.get("tier", 0)
-                                item_tag = item_info.get("tag", "")
-                                source_table = item_info.get("_source_table", "unknown")
-
-                                # Validate that active crafting is not producing resources
-                                if source_table == "resource_desc":
-                                    logging.warning(
-                                        f"[ActiveCraftingProcessor] Recipe {recipe_id} claims to produce resource '{item_name}' (ID {item_id}) - this should not happen! Crafting stations cannot produce resources."
-                                    )
-
-                                # Log when there are ID conflicts for debugging
-                                if len(found_items) > 1:
-                                    all_names_sources = [
-                                        (item.get("name", ""), item.get("_source_table", "")) for item in found_items
-                                    ]
-                                    logging.info(
-                                        f"[ActiveCraftingProcessor] Item {item_id} has ID conflict: {all_names_sources}, using '{item_name}' from {source_table}"
-                                    )
-                            else:
-                                item_name = f"Unknown Item {item_id}"
-                                item_tier = 0
-                                item_tag = ""
-                                logging.warning(f"[ActiveCraftingProcessor] Item {item_id} not found in any reference table")
+                    for item_id, base_quantity in crafted_items:
+                        total_quantity = base_quantity * craft_count
+
+                        # Look up item details with preference for item_desc (crafting stations produce items, not resources)
+                        found_items = self.item_lookup_service.find_items_by_id_preferred_source(item_id, "item_desc")
+
+                        if found_items:
+                            # Use first found item (prevents items like ancient texts overwriting other items)
+                            item_info = found_items[0]
+                            item_name = item_info.get("name", f"Unknown Item {item_id}")
+                            item_tier = item_info.get("tier", 0)
+                            item_tag = item_info.get("tag", "")
+                            source_table = item_info.get("_source_table", "unknown")
+
+                            # Validate that active crafting is not producing resources
+                            if source_table == "resource_desc":
+                                logging.warning(
+                                    f"[ActiveCraftingProcessor] Recipe {recipe_id} claims to produce resource '{item_name}' (ID {item_id}) - this should not happen! Crafting stations cannot produce resources."
+                                )
+
+                            # Log when there are ID conflicts for debugging
+                            if len(found_items) > 1:
+                                all_names_sources = [
+                                    (item.get("name", ""), item.get("_source_table", "")) for item in found_items
+                                ]
+                                logging.info(
+                                    f"[ActiveCraftingProcessor] Item {item_id} has ID conflict: {all_names_sources}, using '{item_name}' from {source_table}"
+                                )
                         else:
-                            logging.warning(f"Invalid item_stack format in recipe {recipe_id}: {item_stack} - skipping item")
-                            continue
+                            item_name = f"Unknown Item {item_id}"
+                            item_tier = 0
+                            item_tag = ""
+                            logging.warning(f"[ActiveCraftingProcessor] Item {item_id} not found in any reference table")
 
                         # Create raw operation
                         raw_operation = {
@@ -793,6 +778,7 @@ class ActiveCraftingProcessor(BaseProcessor):
                                     "accept_help": operation["accept_help"],
                                     "crafter": operation["crafter"],
                                     "building_name": operation["building_name"],
+                                    "action_id": operation["action_id"],
                                     "is_expandable": False,
                                     "expansion_level": 0,
                                 }
@@ -856,12 +842,9 @@ class ActiveCraftingProcessor(BaseProcessor):
             str: Player name or fallback
         """
         try:
-            # Convert to string for consistent lookup
-            player_id_str = str(player_entity_id)
-
-            # Try cached claim member data (primary method)
-            if hasattr(self, "_claim_members") and player_id_str in self._claim_members:
-                player_name = self._claim_members[player_id_str]
+            # Try claim member data (primary method)
+            player_name = self._get_claim_member_name(player_entity_id)
+            if player_name:
                 return player_name
 
             # Try claim members service as fallback
@@ -887,45 +870,12 @@ class ActiveCraftingProcessor(BaseProcessor):
         except Exception as e:
             logging.error(f"Error refreshing active crafting: {e}")
 
-    def _parse_progressive_action_state(self, data_str):
-        """
-        Parse progressive_action_state from SpacetimeDB transaction format using data class.
-
-        Args:
-            data_str: Raw transaction data from SpacetimeDB
-
-        Returns:
-            Dict representation of ProgressiveActionState or None if parsing fails
-        """
-        try:
-            # Parse JSON string to list first
-            data = json.loads(data_str)
-            progressive_action = ProgressiveActionState.from_array(data)
-            if progressive_action:
-                return {
-                    "entity_id": progressive_action.entity_id,
-                    "building_entity_id": progressive_action.building_entity_id,
-                    "function_type": progressive_action.function_type,
-                    "progress": progressive_action.progress,
-                    "recipe_id": progressive_action.recipe_id,
-                    "craft_count": progressive_action.craft_count,
-                    "last_crit_outcome": progressive_action.last_crit_outcome,
-                    "owner_entity_id": progressive_action.owner_entity_id,
-                    "lock_expiration": progressive_action.lock_expiration,
-                    "preparation": progressive_action.preparation,
-                }
-            return None
-        except Exception as e:
-            logging.debug(f"Failed to parse progressive_action_state: {e}")
-            return None
-
     def _is_current_claim_member(self, owner_entity_id):
         """Check if the owner is a member of the current claim."""
-        if not hasattr(self, "_claim_members") or not self._claim_members:
+        if not self._has_claim_members():
             return True  # For display purposes, if no member data available, show everything
 
-        owner_id_str = str(owner_entity_id)
-        return owner_id_str in self._claim_members
+        return self._get_claim_member(owner_entity_id) is not None
 
     def _is_current_player(self, owner_entity_id):
         """Check if the owner entity ID belongs to the current player."""
@@ -940,11 +890,10 @@ class ActiveCraftingProcessor(BaseProcessor):
                 return False
 
             # Get owner name from entity ID using claim members data
-            if not hasattr(self, "_claim_members") or not self._claim_members:
+            if not self._has_claim_members():
                 return False
 
-            owner_id_str = str(owner_entity_id)
-            owner_name = self._claim_members.get(owner_id_str)
+            owner_name = self._get_claim_member_name(owner_entity_id)
             if not owner_name:
                 return False
 
@@ -955,9 +904,48 @@ class ActiveCraftingProcessor(BaseProcessor):
             logging.error(f"Error checking if owner {owner_entity_id} is current player: {e}")
             return False
 
-    def _send_incremental_active_crafting_update(self, reducer_name, timestamp):
+    def _is_progress_only_change(self, old_data, new_data):
+        """
+        Check whether a progressive action update only advances its progress.
+
+        Args:
+            old_data: Previous progressive_action_state dict
+            new_data: New progressive_action_state dict
+
+        Returns:
+            bool: True if only the progress value changed
+        """
+        for field in ("recipe_id", "craft_count", "building_entity_id", "owner_entity_id", "preparation"):
+            if old_data.get(field) != new_data.get(field):
+                return False
+        return True
+
+    def _get_remaining_effort(self, action_data):
+        """
+        Get the remaining effort of a progressive action for progress deltas.
+
+        Args:
+            action_data: progressive_action_state dict
+
+        Returns:
+            int: Remaining effort (0 when ready), or None if the recipe is unknown
+        """
+        recipe = self.item_lookup_service.get_recipe_record(action_data.get("recipe_id"))
+        if not recipe:
+            return None
+
+        total_effort = recipe.total_effort(action_data.get("craft_count", 1))
+        current_effort = min(max(0, action_data.get("progress", 0)), total_effort)
+        return total_effort - current_effort
+
+    def _send_incremental_active_crafting_update(self, reducer_name, timestamp, attribution=None):
         """
         Send incremental active crafting update without full refresh.
+
+        Args:
+            reducer_name: Name of the reducer that triggered this update
+            timestamp: Timestamp of the change
+            attribution: Reducers merged into this update (set for coalesced bursts)
         """
         try:
             # Get fresh active crafting data using existing consolidation logic
@@ -970,11 +958,15 @@ class ActiveCraftingProcessor(BaseProcessor):
                 # Store current data for progress tracking
                 self.current_active_crafting_data = crafting_list
 
+                changes = {"type": "incremental", "source": "live_transaction", "reducer": reducer_name}
+                if attribution:
+                    changes.update(attribution)
+
                 # Send targeted update with incremental flag
                 self._queue_update(
                     "active_crafting_update",
                     crafting_list,
-                    changes={"type": "incremental", "source": "live_transaction", "reducer": reducer_name},
+                    changes=changes,
                     timestamp=timestamp,
                 )
 
@@ -1017,34 +1009,14 @@ class ActiveCraftingProcessor(BaseProcessor):
     def _get_item_name_from_recipe(self, recipe_id: int) -> str:
         """Get the actual item name from a recipe ID by looking up crafted_item_stacks."""
         try:
-            if not self.reference_data or not recipe_id:
+            if not recipe_id:
                 return f"Recipe {recipe_id}"
 
-            recipes = self.reference_data.get("crafting_recipe_desc", [])
-
-            for recipe in recipes:
-                if recipe.get("id") == recipe_id:
-                    recipe_name = recipe.get("name", "Unknown Recipe")
-                    crafted_items = recipe.get("crafted_item_stacks", [])
-
-                    if crafted_items and len(crafted_items) > 0:
-                        first_item = crafted_items[0]
-
-                        if isinstance(first_item, list) and len(first_item) >= 2:
-                            item_id = first_item[0]
-                            # Use compound key system for item lookup
-                            found_items = self.item_lookup_service.find_items_by_id(item_id)
-
-                            if found_items:
-                                # Use first found item (compound key system prevents overwrites)
-                                item_info = found_items[0]
-                                return item_info.get("name", f"Item {item_id}")
-                    else:
-                        # Fallback to cleaned recipe name
-                        return re.sub(r"\{\d+\}", "", recipe_name).strip()
-                    break
+            recipe = self.item_lookup_service.get_recipe_record(recipe_id)
+            if not recipe:
+                return f"Recipe {recipe_id}"
 
-            return f"Recipe {recipe_id}"
+            return recipe.item_name
 
         except Exception as e:
             logging.error(f"Error resolving item name for recipe {recipe_id}: {e}")
@@ -6,8 +6,14 @@ for processing transactions and subscriptions.
 """
 
 import logging
+import threading
 from abc import ABC, abstractmethod
 
+from app.services import json_codec
+from app.services.latency_tracer import current_trace, mark
+
+from ..utils.emission_scheduler import EmissionScheduler
+
 
 class BaseProcessor(ABC):
     """
@@ -17,6 +23,9 @@ class BaseProcessor(ABC):
     SpacetimeDB transactions and subscriptions.
     """
 
+    # Minimum seconds between incremental UI updates of one kind (0 disables merging)
+    EMISSION_WINDOW = 0.25
+
     def __init__(self, data_queue, services, reference_data):
         """
         Initialize the processor with required dependencies.
@@ -37,6 +46,14 @@ class BaseProcessor(ABC):
         self.active_crafting_service = services.get("active_crafting_service")
         self.claim_manager = services.get("claim_manager")
         self.item_lookup_service = services.get("item_lookup_service")
+        self.table_store = services.get("table_store")
+        self.change_feed = services.get("change_feed")
+
+        # Held by MessageRouter while it hands this processor an update, and by
+        # deferred UI emissions, so both see a consistent processor state
+        self.state_lock = threading.RLock()
+        self.emission_window = self.EMISSION_WINDOW
+        self._emission_schedulers = {}
 
     @abstractmethod
     def process_transaction(self, table_update, reducer_name, timestamp):
@@ -79,6 +96,185 @@ class BaseProcessor(ABC):
         between different claims.
         """
         logging.info(f"Clearing cache for {self.__class__.__name__}")
+        for scheduler in self._emission_schedulers.values():
+            scheduler.cancel()
+
+    def get_resync_rows(self, table_name):
+        """
+        Return this processor's current rows of a table it keeps itself.
+
+        MessageRouter diffs the snapshot re-sent after a reconnect against these
+        rows, for tables the table store does not keep, and routes only the
+        difference. Override in processors that hold a private copy of a table.
+
+        Args:
+            table_name: Name of the table being resynced
+
+        Returns:
+            list: Row dicts in the shape row_to_dict() produces, or None if the
+                  processor keeps no copy (the snapshot is then reloaded as a
+                  subscription update)
+        """
+        return None
+
+    def _schedule_emission(self, key, send, reducer_name, timestamp, *args):
+        """
+        Request an incremental UI update, merged with others arriving within emission_window.
+
+        The first request after a quiet period calls send immediately with the
+        same arguments; later ones within the window are emitted once when it
+        ends, as send(last_reducer, last_timestamp, *merged_args, attribution=...)
+        where attribution lists every contributing reducer.
+
+        Args:
+            key: Emission kind (one scheduler per key)
+            send: Callable that builds and queues the UI update
+            reducer_name: Reducer that caused the transaction
+            timestamp: Transaction timestamp
+            *args: Extra arguments for send (dicts such as player context are merged)
+        """
+        scheduler = self._emission_schedulers.get(key)
+        if scheduler is None or scheduler.emit != send:
+            scheduler = EmissionScheduler(send, self.emission_window, self.state_lock, name=key)
+            self._emission_schedulers[key] = scheduler
+        scheduler.window = self.emission_window
+        scheduler.request(reducer_name, timestamp, *args)
+
+    def flush_emissions(self):
+        """Emit every pending merged UI update now."""
+        for scheduler in self._emission_schedulers.values():
+            scheduler.flush()
+
+    def _decode_row(self, row):
+        """
+        Return a table row as parsed JSON.
+
+        MessageRouter decodes every row once before fanning a table update out to
+        processors, so rows normally arrive already parsed. Raw JSON strings are
+        still accepted for callers that bypass the router.
+
+        Args:
+            row: A JSON row string or an already-decoded row
+
+        Returns:
+            The decoded row (dict or list)
+        """
+        if isinstance(row, str):
+            return json_codec.loads(row)
+        return row
+
+    def _has_building_data(self):
+        """
+        Check whether any building rows are available for this claim.
+
+        Returns:
+            bool: True if the table store or the processor's own cache has buildings
+        """
+        if self.table_store is not None and self.table_store.count("building_state"):
+            return True
+        return bool(getattr(self, "_building_data", None))
+
+    def _get_building_info(self, building_id):
+        """
+        Get building_state info for a building.
+
+        Reads from the shared table store when available, falling back to the
+        processor's own _building_data cache.
+
+        Args:
+            building_id: Building entity ID
+
+        Returns:
+            dict: Building row (building_description_id, claim_entity_id, ...) or {}
+        """
+        if self.table_store is not None:
+            building = self.table_store.get("building_state", building_id)
+            if building is not None:
+                return building
+        return getattr(self, "_building_data", {}).get(building_id, {})
+
+    def _get_building_nickname(self, building_id):
+        """
+        Get the custom nickname for a building.
+
+        Args:
+            building_id: Building entity ID
+
+        Returns:
+            str: Nickname, or None if the building has none
+        """
+        if self.table_store is not None:
+            row = self.table_store.get("building_nickname_state", building_id)
+            if row is not None and row.get("nickname"):
+                return row.get("nickname")
+        return getattr(self, "_building_nicknames", {}).get(building_id)
+
+    def _has_claim_members(self):
+        """
+        Check whether claim member rows are available for the current claim.
+
+        Returns:
+            bool: True if the table store or the processor's own cache has members
+        """
+        if self.table_store is not None and self.table_store.count("claim_member_state"):
+            return True
+        return bool(getattr(self, "_claim_members", None))
+
+    def _get_claim_member(self, player_entity_id):
+        """
+        Get the claim_member_state row of a current claim member.
+
+        Reads from the shared table store when available, falling back to the
+        processor's own _claim_members cache (player_entity_id -> user_name).
+
+        Args:
+            player_entity_id: Player entity ID (int or numeric string)
+
+        Returns:
+            dict: Member row with at least player_entity_id and user_name, or None
+        """
+        if self.table_store is not None and self.table_store.count("claim_member_state"):
+            rows = self.table_store.find_by("claim_member_state", "player_entity_id", player_entity_id)
+            if not rows and isinstance(player_entity_id, str) and player_entity_id.isdigit():
+                rows = self.table_store.find_by("claim_member_state", "player_entity_id", int(player_entity_id))
+            return rows[0] if rows else None
+
+        claim_members = getattr(self, "_claim_members", None) or {}
+        player_id_str = str(player_entity_id)
+        if player_id_str not in claim_members:
+            return None
+        return {"player_entity_id": player_entity_id, "user_name": claim_members[player_id_str]}
+
+    def _get_claim_member_name(self, player_entity_id):
+        """
+        Get the user name of a current claim member.
+
+        Args:
+            player_entity_id: Player entity ID
+
+        Returns:
+            str: User name, or None if the player is not a known member or has no name
+        """
+        member = self._get_claim_member(player_entity_id)
+        return member.get("user_name") if member else None
+
+    def _get_building_type_name(self, building_description_id, building_id):
+        """
+        Get the building_desc name for a building's type.
+
+        Args:
+            building_description_id: building_desc ID of the building
+            building_id: Building entity ID (used in the fallback name)
+
+        Returns:
+            str: Building type name, or "Building <entity id>" if unknown
+        """
+        building = None
+        if self.item_lookup_service is not None:
+            building = self.item_lookup_service.lookup_building_by_id(building_description_id)
+        if building and building.get("name"):
+            return building["name"]
+        return f"Building {building_id}"
 
     def _queue_update(self, update_type, data, changes=None, timestamp=None):
         """
@@ -99,7 +295,12 @@ class BaseProcessor(ABC):
             if timestamp is not None:
                 update["timestamp"] = timestamp
 
-            logging.info(
+            # Carry the latency trace of the transaction being handled, if any
+            trace = current_trace()
+            if trace is not None:
+                update["trace"] = mark(trace, "queued")
+
+            logging.debug(
                 f"[BaseProcessor] Queuing {update_type} message with data size: {len(data) if isinstance(data, (dict, list)) else 'unknown'}"
             )
             self.data_queue.put(update)
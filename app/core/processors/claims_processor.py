@@ -2,7 +2,6 @@
 Claims processor for handling claim state table updates.
 """
 import ast
-import json
 import logging
 
 from .base_processor import BaseProcessor
@@ -43,7 +42,7 @@ class ClaimsProcessor(BaseProcessor):
                     for insert_str in inserts:
                         try:
                             # Parse JSON string to list first, then use dataclass
-                            data = json.loads(insert_str)
+                            data = self._decode_row(insert_str)
                             claim_local = ClaimLocalState.from_array(data)
                             if claim_local:
                                 # Only process updates for the current claim
@@ -64,7 +63,7 @@ class ClaimsProcessor(BaseProcessor):
                     for insert_str in inserts:
                         try:
                             # Parse JSON string to list first, then use dataclass
-                            data = json.loads(insert_str)
+                            data = self._decode_row(insert_str)
                             claim_state = ClaimState.from_array(data) 
                             if claim_state:
                                 # Only process updates for the current claim
@@ -91,7 +90,7 @@ class ClaimsProcessor(BaseProcessor):
                     for insert_str in inserts:
                         try:
                             # Parse JSON string to dict first, then use dataclass
-                            data = json.loads(insert_str)
+                            data = self._decode_row(insert_str)
                             claim_tech = ClaimTechState.from_dict(data)
                             if claim_tech:
                                 # Only process updates for the current claim
@@ -125,7 +124,7 @@ class ClaimsProcessor(BaseProcessor):
             for update in table_update.get("updates", []):
                 for insert_str in update.get("inserts", []):
                     try:
-                        row_data = json.loads(insert_str)
+                        row_data = self._decode_row(insert_str)
                         table_rows.append(row_data)
                     except:
                         pass
@@ -159,6 +158,11 @@ class ClaimsProcessor(BaseProcessor):
         Process claim_member_state data to determine available claims.
         """
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                self._send_claim_info_update()
+                return
+
             # Store claim member data for later combination with claim details
             if not hasattr(self, "_claim_members"):
                 self._claim_members = {}
@@ -275,7 +279,7 @@ class ClaimsProcessor(BaseProcessor):
         """
         try:
             # Check if we have all required data types
-            if not (hasattr(self, "_claim_members") and self._claim_members):
+            if not self._has_claim_members():
                 return
 
             if not (hasattr(self, "_claim_names") and self._claim_names):
@@ -293,7 +297,7 @@ class ClaimsProcessor(BaseProcessor):
                 return
 
             # Send claim info update only for the current claim
-            if current_claim_id in self._claim_members:
+            if self._is_member_claim(current_claim_id):
                 claim_details = self._get_claim_details(current_claim_id)
                 claim_info = {
                     "entity_id": current_claim_id,
@@ -308,6 +312,28 @@ class ClaimsProcessor(BaseProcessor):
         except Exception as e:
             logging.error(f"Error sending claim info update: {e}")
 
+    def _is_member_claim(self, claim_entity_id):
+        """
+        Check whether claim_member_state has rows for a claim.
+
+        Reads from the shared table store when available, falling back to the
+        processor's own _claim_members cache (claim_entity_id -> member info).
+
+        Args:
+            claim_entity_id: Claim entity ID (int or numeric string)
+
+        Returns:
+            bool: True if the claim has known members
+        """
+        if self.table_store is not None and self.table_store.count("claim_member_state"):
+            if self.table_store.find_by("claim_member_state", "claim_entity_id", claim_entity_id):
+                return True
+            if isinstance(claim_entity_id, str) and claim_entity_id.isdigit():
+                return bool(self.table_store.find_by("claim_member_state", "claim_entity_id", int(claim_entity_id)))
+            return False
+
+        return claim_entity_id in (getattr(self, "_claim_members", None) or {})
+
     def _get_claim_details(self, claim_entity_id):
         """
         Get claim details for a specific claim entity ID by combining cached subscription data.
@@ -366,7 +392,7 @@ class ClaimsProcessor(BaseProcessor):
         """
         try:
 
-            data = ast.literal_eval(data_str)
+            data = ast.literal_eval(data_str) if isinstance(data_str, str) else data_str
             if not isinstance(data, list) or len(data) < 11:
                 return None
 
@@ -408,7 +434,7 @@ class ClaimsProcessor(BaseProcessor):
         Example: [360287970203715017, 576460752315731874, 360287970203714996, "Retirement Home T4", false]
         """
         try:
-            data = ast.literal_eval(data_str)
+            data = ast.literal_eval(data_str) if isinstance(data_str, str) else data_str
             if not isinstance(data, list) or len(data) < 5:
                 return None
 
@@ -550,18 +576,17 @@ class ClaimsProcessor(BaseProcessor):
         return None
 
     def clear_cache(self):
-        """Clear cached claims data when switching claims."""
+        """
+        Clear cached claims data when switching claims.
+
+        Claim names and local details come from the player-scoped subscription,
+        which stays active across claim switches, so they are kept.
+        """
         super().clear_cache()
 
         # Clear claim-specific cached data
         if hasattr(self, "_claim_members"):
             self._claim_members.clear()
 
-        if hasattr(self, "_claim_names"):
-            self._claim_names.clear()
-
-        if hasattr(self, "_claim_local_details"):
-            self._claim_local_details.clear()
-            
         if hasattr(self, "_claim_tech_data"):
             self._claim_tech_data.clear()
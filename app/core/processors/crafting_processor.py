@@ -3,14 +3,15 @@
 Crafting processor for handling passive_craft_state table updates.
 """
 
+import heapq
 import json
-import ast
 import logging
-import re
 import threading
 import time
 
 from .base_processor import BaseProcessor
+from ..change_feed import compute_row_changes, RowInserted, RowUpdated, RowDeleted
+from ..utils.countdown import format_time_remaining
 from app.models import BuildingState, ClaimMemberState, PassiveCraftState
 
 
@@ -31,14 +32,13 @@ class CraftingProcessor(BaseProcessor):
         """Initialize the processor with timer functionality."""
         super().__init__(data_queue, services, reference_data)
 
-        # Real-time timer management
+        # Completion scheduler: min-heap of (deadline, entity_id), stale entries are skipped
         self.timer_thread = None
         self.timer_stop_event = threading.Event()
         self.ui_update_callback = None
-        self.last_timer_update = 0
-
-        # Store raw crafting operations for timer calculations
-        self.raw_crafting_operations = []
+        self._deadline_condition = threading.Condition()
+        self._deadline_heap = []
+        self._scheduled_deadlines = {}
 
         # Track items that have already been notified as ready to prevent duplicates
         self.notified_ready_items = set()
@@ -47,6 +47,12 @@ class CraftingProcessor(BaseProcessor):
         # Key: f"{item_name}|{crafter}", Value: Dict of stable child groups
         self._child_groups_cache = {}
 
+        # Live passive_craft_state rows of current claim members arrive as row changes
+        if self.change_feed is not None:
+            self.change_feed.subscribe(
+                self._on_passive_craft_changes, tables=["passive_craft_state"], predicate=self._is_claim_member_change
+            )
+
     def get_table_names(self):
         """Return list of table names this processor handles."""
         return ["passive_craft_state", "building_state", "building_nickname_state", "claim_member_state"]
@@ -55,106 +61,106 @@ class CraftingProcessor(BaseProcessor):
         """
         Handle passive_craft_state transactions - LIVE incremental updates.
 
-        Process real-time passive crafting changes without full refresh.
+        Process real-time passive crafting changes without full refresh. With a change
+        feed, passive_craft_state rows were already applied by _on_passive_craft_changes()
+        when the router published them.
         """
         try:
             table_name = table_update.get("table_name", "")
             updates = table_update.get("updates", [])
 
-            # Track if we need to send updates
-            has_crafting_changes = False
+            # Process passive_craft_state updates (craft starts, completions, collections)
+            if table_name == "passive_craft_state":
+                if self.change_feed is None:
+                    changes = [c for c in compute_row_changes(table_update) if self._is_claim_member_change(c)]
+                    self._apply_passive_craft_changes(changes, reducer_name, timestamp)
+                return
 
+            # For other table types, do full refresh if we have changes
+            has_crafting_changes = False
             for update in updates:
                 inserts = update.get("inserts", [])
                 deletes = update.get("deletes", [])
+                if inserts or deletes:
+                    self._log_transaction_debug("passive_crafting", len(inserts), len(deletes), reducer_name)
+                    has_crafting_changes = True
 
-                # Process passive_craft_state updates (craft starts, completions, collections)
-                if table_name == "passive_craft_state":
-                    # Collect all operations first to handle delete+insert as updates
-                    delete_operations = {}
-                    insert_operations = {}
-
-                    # Parse all deletes using dataclass
-                    for delete_str in deletes:
-                        try:
-                            parsed_data = self._parse_crafting_data(delete_str)
-                            if parsed_data:
-                                # Only process updates for current claim members
-                                owner_id = parsed_data.get("owner_entity_id")
-                                if self._is_current_claim_member(owner_id):
-                                    entity_id = parsed_data.get("entity_id")
-                                    delete_operations[entity_id] = parsed_data
-                        except Exception as e:
-                            logging.warning(f"Failed to parse crafting delete: {e}")
-                            continue
-
-                    # Parse all inserts using dataclass
-                    for insert_str in inserts:
-                        try:
-                            parsed_data = self._parse_crafting_data(insert_str)
-                            if parsed_data:
-                                # Only process updates for current claim members
-                                owner_id = parsed_data.get("owner_entity_id")
-                                if self._is_current_claim_member(owner_id):
-                                    entity_id = parsed_data.get("entity_id")
-                                    insert_operations[entity_id] = parsed_data
-                        except Exception as e:
-                            logging.warning(f"Failed to parse crafting insert: {e}")
-                            continue
-
-                    # Process operations: handle delete+insert as updates, standalone deletes as collections
-                    if not hasattr(self, "_passive_craft_data"):
-                        self._passive_craft_data = {}
-
-                    # Handle updates (delete+insert for same entity) and new inserts
-                    for entity_id in insert_operations:
-                        insert_data = insert_operations[entity_id]
-                        self._passive_craft_data[entity_id] = insert_data
-
-                        if entity_id in delete_operations:
-                            # This is an update (delete+insert)
-                            recipe_id = insert_data.get("recipe_id")
-                            building_id = insert_data.get("building_entity_id")
-                            logging.debug(
-                                f"Passive craft UPDATED: recipe_id={recipe_id}, building_id={building_id}, entity_id={entity_id}"
-                            )
-                        else:
-                            # This is a new insert
-                            recipe_id = insert_data.get("recipe_id")
-                            building_id = insert_data.get("building_entity_id")
-                            logging.debug(
-                                f"Passive craft STARTED: recipe_id={recipe_id}, building_id={building_id}, entity_id={entity_id}"
-                            )
+            if has_crafting_changes:
+                self._refresh_crafting()
+
+        except Exception as e:
+            logging.error(f"Error handling passive crafting transaction: {e}")
 
-                        has_crafting_changes = True
+    def _is_claim_member_change(self, change):
+        """Check whether a passive_craft_state row change belongs to a current claim member."""
+        row = change.new_row if isinstance(change, RowUpdated) else change.row
+        return self._is_current_claim_member(row.get("owner_entity_id"))
 
-                    # Handle standalone deletes (collections/completions)
-                    for entity_id in delete_operations:
-                        if entity_id not in insert_operations:
-                            # This is a standalone delete (collection/completion)
-                            if entity_id in self._passive_craft_data:
-                                del self._passive_craft_data[entity_id]
+    def _on_passive_craft_changes(self, changes, reducer_name, timestamp):
+        """ChangeFeed listener for passive_craft_state row changes of current claim members."""
+        with self.state_lock:
+            self._apply_passive_craft_changes(changes, reducer_name, timestamp)
 
-                            delete_data = delete_operations[entity_id]
-                            recipe_id = delete_data.get("recipe_id")
-                            building_id = delete_data.get("building_entity_id")
-                            self._cleanup_collected_notification(entity_id)
-                            has_crafting_changes = True
+    def _apply_passive_craft_changes(self, changes, reducer_name, timestamp):
+        """
+        Apply passive_craft_state row changes and send the matching UI update.
 
-                # For other table types, do full refresh if we have changes
-                elif inserts or deletes:
-                    self._log_transaction_debug("passive_crafting", len(inserts), len(deletes), reducer_name)
+        Countdown-only changes go out as a crafting_timer_update, anything else as a
+        merged incremental crafting update.
+
+        Args:
+            changes: RowInserted / RowUpdated / RowDeleted events with PassiveCraftState dicts
+            reducer_name: Name of the reducer that caused the changes
+            timestamp: Transaction timestamp in seconds
+        """
+        try:
+            has_crafting_changes = False
+            timer_deltas = {}
+
+            if not hasattr(self, "_passive_craft_data"):
+                self._passive_craft_data = {}
+
+            # Delete+insert pairs arrive as RowUpdated, standalone deletes (collections) as RowDeleted
+            for change in changes:
+                entity_id = change.key
+
+                if isinstance(change, RowDeleted):
+                    if entity_id in self._passive_craft_data:
+                        del self._passive_craft_data[entity_id]
+                    self._cleanup_collected_notification(entity_id)
+                    self._schedule_completion(entity_id)
                     has_crafting_changes = True
+                    continue
+
+                insert_data = change.row if isinstance(change, RowInserted) else change.new_row
+                self._passive_craft_data[entity_id] = insert_data
+                self._schedule_completion(entity_id)
+
+                if isinstance(change, RowUpdated) and self._is_timer_only_change(change.old_row, insert_data):
+                    remaining_seconds = self._get_remaining_seconds(insert_data)
+                    if remaining_seconds is not None:
+                        timer_deltas[entity_id] = remaining_seconds
+                        continue
+
+                recipe_id = insert_data.get("recipe_id")
+                building_id = insert_data.get("building_entity_id")
+                action = "UPDATED" if isinstance(change, RowUpdated) else "STARTED"
+                logging.debug(f"Passive craft {action}: recipe_id={recipe_id}, building_id={building_id}, entity_id={entity_id}")
+
+                has_crafting_changes = True
 
-            # Send incremental update for passive_craft_state, full refresh for others
             if has_crafting_changes:
-                if table_name == "passive_craft_state":
-                    self._send_incremental_crafting_update(reducer_name, timestamp)
-                else:
-                    self._refresh_crafting()
+                self._schedule_emission("crafting", self._send_incremental_crafting_update, reducer_name, timestamp)
+            elif timer_deltas:
+                self._queue_update(
+                    "crafting_timer_update",
+                    timer_deltas,
+                    changes={"source": "live_transaction", "reducer": reducer_name},
+                    timestamp=timestamp,
+                )
 
         except Exception as e:
-            logging.error(f"Error handling passive crafting transaction: {e}")
+            logging.error(f"Error handling passive crafting changes: {e}")
 
     def process_subscription(self, table_update):
         """
@@ -169,7 +175,7 @@ class CraftingProcessor(BaseProcessor):
             for update in table_update.get("updates", []):
                 for insert_str in update.get("inserts", []):
                     try:
-                        row_data = json.loads(insert_str)
+                        row_data = self._decode_row(insert_str)
                         table_rows.append(row_data)
                     except json.JSONDecodeError:
                         logging.warning(f"Failed to parse {table_name} insert: {insert_str[:100]}...")
@@ -193,46 +199,6 @@ class CraftingProcessor(BaseProcessor):
         except Exception as e:
             logging.error(f"Error handling crafting subscription: {e}")
 
-    def _parse_crafting_data(self, data_str):
-        """
-        Parse crafting data from the SpacetimeDB transaction format using PassiveCraftState dataclass.
-
-        This method now uses the dataclass factory method for consistent parsing.
-        """
-        try:
-            # First parse the raw data
-            data = ast.literal_eval(data_str)
-            if not isinstance(data, list) or len(data) < 7:
-                return None
-
-            # Extract timestamp - can be direct value or in array format
-            timestamp_obj = {}
-            if data[4]:
-                if isinstance(data[4], list) and len(data[4]) > 0:
-                    timestamp_obj = {"__timestamp_micros_since_unix_epoch__": data[4][0]}
-                else:
-                    timestamp_obj = {"__timestamp_micros_since_unix_epoch__": data[4]}
-
-            # Create a dict in the format expected by PassiveCraftState.from_dict()
-            craft_dict = {
-                "entity_id": data[0],
-                "owner_entity_id": data[1],
-                "recipe_id": data[2],
-                "building_entity_id": data[3],
-                "building_description_id": 0,  # Not available in transaction format
-                "timestamp": timestamp_obj,
-                "status": data[5] if len(data[5]) > 0 else [0, {}],
-                "slot": data[6],
-            }
-
-            # Use dataclass factory method for validation and consistency
-            passive_craft = PassiveCraftState.from_dict(craft_dict)
-            return passive_craft.to_dict()
-
-        except Exception as e:
-            logging.warning(f"Error parsing crafting data with dataclass: {e}")
-            return None
-
     def _cleanup_collected_notification(self, entity_id):
         """Remove entity from notification tracking when item is collected."""
         if entity_id and entity_id in self.notified_ready_items:
@@ -252,33 +218,11 @@ class CraftingProcessor(BaseProcessor):
             if not recipe_id:
                 return f"Recipe {recipe_id}"
 
-            # Use ItemLookupService to get recipe details
-            recipe = self.item_lookup_service.lookup_recipe_by_id(recipe_id)
+            recipe = self.item_lookup_service.get_recipe_record(recipe_id)
             if not recipe:
                 return f"Recipe {recipe_id}"
 
-            recipe_name = recipe.get("name", "Unknown Recipe")
-            crafted_items = recipe.get("crafted_item_stacks", [])
-
-            if crafted_items and len(crafted_items) > 0:
-                first_item = crafted_items[0]
-
-                if isinstance(first_item, list) and len(first_item) >= 2:
-                    item_id = first_item[0]
-                    # Use compound key system for item lookup
-                    found_items = self.item_lookup_service.find_items_by_id(item_id)
-
-                    if found_items:
-                        # Use first found item (compound key system prevents overwrites)
-                        item_info = found_items[0]
-                        return item_info.get("name", f"Item {item_id}")
-                    else:
-                        return f"Item {item_id}"
-            else:
-                # Fallback to recipe name if no crafted items
-                return re.sub(r"\{\d+\}", "", recipe_name).strip()
-
-            return f"Recipe {recipe_id}"
+            return recipe.item_name
 
         except Exception as e:
             logging.error(f"Error resolving item name for recipe {recipe_id}: {e}")
@@ -363,31 +307,19 @@ class CraftingProcessor(BaseProcessor):
         except Exception as e:
             logging.error(f"Error refreshing crafting: {e}")
 
-    def _send_incremental_crafting_update(self, reducer_name, timestamp):
+    def _send_incremental_crafting_update(self, reducer_name, timestamp, attribution=None):
         """
         Send incremental passive crafting update using processor's own consolidation logic.
-        Updates the processor's raw_crafting_operations for timer thread.
+
+        Args:
+            reducer_name: Name of the reducer that triggered this update
+            timestamp: Timestamp of the change
+            attribution: Reducers merged into this update (set for coalesced bursts)
         """
         try:
-            # Convert processor data to format expected by timer thread
-            processor_crafting_operations = []
-
-            for entity_id, craft_data in self._passive_craft_data.items():
-                # Create operation in format expected by timer thread
-                operation = {
-                    "entity_id": entity_id,
-                    "recipe_id": craft_data.get("recipe_id"),
-                    "building_entity_id": craft_data.get("building_entity_id"),
-                    "owner_entity_id": craft_data.get("owner_entity_id"),
-                    "timestamp_micros": craft_data.get("timestamp_micros"),
-                    "status": craft_data.get("status", [0, {}]),
-                    "slot": craft_data.get("slot", 0),
-                    "raw_craft_state": craft_data,  # Include raw data for timer calculations
-                }
-                processor_crafting_operations.append(operation)
-
-            # Update the processor's raw operations for timer thread
-            self.raw_crafting_operations = processor_crafting_operations
+            changes = {"type": "incremental", "source": "live_transaction", "reducer": reducer_name}
+            if attribution:
+                changes.update(attribution)
 
             # Use the full consolidation method that formats hierarchy for UI
             consolidated_data = self._consolidate_crafting()
@@ -396,7 +328,7 @@ class CraftingProcessor(BaseProcessor):
             self._queue_update(
                 "crafting_update",
                 fresh_crafting_data,
-                changes={"type": "incremental", "source": "live_transaction", "reducer": reducer_name},
+                changes=changes,
                 timestamp=timestamp,
             )
         except Exception as e:
@@ -435,23 +367,9 @@ class CraftingProcessor(BaseProcessor):
                 # Also check by calculating time remaining for extra safety
                 elif craft_data.get("recipe_id"):
                     try:
-                        # Extract timestamp using helper function
-                        timestamp_micros = craft_data.get("timestamp_micros")
-                        if timestamp_micros:
-                            recipe_id = craft_data.get("recipe_id")
-                            if self.reference_data:
-                                recipes = self.reference_data.get("crafting_recipe_desc", [])
-                                for recipe in recipes:
-                                    if recipe.get("id") == recipe_id:
-                                        duration_seconds = recipe.get("time_requirement", 0)
-                                        start_time = timestamp_micros / 1_000_000
-                                        current_time = time.time()
-                                        elapsed_time = current_time - start_time
-                                        remaining_time = duration_seconds - elapsed_time
-
-                                        if remaining_time <= 0:
-                                            self.notified_ready_items.add(entity_id)
-                                        break
+                        completion_time = self._get_completion_time(craft_data)
+                        if completion_time is not None and completion_time <= time.time():
+                            self.notified_ready_items.add(entity_id)
                     except Exception as e:
                         logging.warning(f"Error checking passive craft completion time for {entity_id}: {e}")
 
@@ -461,6 +379,10 @@ class CraftingProcessor(BaseProcessor):
     def _process_building_data(self, building_rows):
         "Process building_state data to store building info."
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             # Store building data keyed by entity_id
             if not hasattr(self, "_building_data"):
                 self._building_data = {}
@@ -486,6 +408,10 @@ class CraftingProcessor(BaseProcessor):
         Process building_nickname_state data to store custom building names.
         """
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             # Store nickname data keyed by entity_id
             if not hasattr(self, "_building_nicknames"):
                 self._building_nicknames = {}
@@ -512,6 +438,10 @@ class CraftingProcessor(BaseProcessor):
         with the user's own claims from other claim_member_state queries.
         """
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             # Store member data keyed by player_entity_id
             if not hasattr(self, "_claim_members"):
                 self._claim_members = {}
@@ -533,10 +463,13 @@ class CraftingProcessor(BaseProcessor):
 
     def start_real_time_timer(self, ui_update_callback):
         """
-        Start the real-time countdown timer that updates the UI every second.
+        Start the completion scheduler that marks crafts READY when they finish.
+
+        The thread sleeps until the next completion deadline instead of polling; the
+        UI derives display countdowns from each row's completion_time.
 
         Args:
-            ui_update_callback: Function to call when timers need UI update
+            ui_update_callback: Function to call when crafts become ready
         """
         if self.timer_thread and self.timer_thread.is_alive():
             logging.warning("Timer thread already running")
@@ -547,16 +480,18 @@ class CraftingProcessor(BaseProcessor):
 
         self.timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
         self.timer_thread.start()
-        logging.debug("Started real-time crafting countdown timer in processor")
+        logging.debug("Started passive crafting completion scheduler in processor")
 
     def stop_real_time_timer(self):
-        """Stop the real-time countdown timer with improved cleanup."""
-        logging.debug("Stopping real-time crafting countdown timer in processor...")
+        """Stop the completion scheduler with improved cleanup."""
+        logging.debug("Stopping passive crafting completion scheduler...")
 
         try:
             if self.timer_thread:
-                # Set stop event
+                # Set stop event and wake the scheduler
                 self.timer_stop_event.set()
+                with self._deadline_condition:
+                    self._deadline_condition.notify_all()
 
                 # Wait for thread with timeout
                 if self.timer_thread.is_alive():
@@ -572,173 +507,242 @@ class CraftingProcessor(BaseProcessor):
         except Exception as e:
             logging.error(f"Error stopping timer thread: {e}")
         finally:
-            logging.debug("Real-time timer shutdown complete")
+            logging.debug("Completion scheduler shutdown complete")
 
     def _timer_loop(self):
-        """Background thread that updates timers every second."""
-        timer_count = 0
+        """Background thread that sleeps until the next craft completion deadline."""
         while not self.timer_stop_event.is_set():
             try:
-                current_time = time.time()
+                with self._deadline_condition:
+                    timeout = self._next_deadline_timeout()
+                    if timeout is None or timeout > 0:
+                        # Woken early by stop_real_time_timer() or a schedule change
+                        self._deadline_condition.wait(timeout)
+                    due_entity_ids = self._pop_due_deadlines()
 
-                # Only update every second to avoid excessive UI updates
-                if current_time - self.last_timer_update >= 1.0:
-                    timer_count += 1
-                    self._update_all_timers()
-                    self.last_timer_update = current_time
-
-                # Sleep for a short time to avoid busy waiting
-                time.sleep(0.1)
+                if due_entity_ids and not self.timer_stop_event.is_set():
+                    self._on_crafts_ready(due_entity_ids)
 
             except Exception as e:
                 logging.error(f"Error in timer loop: {e}")
-                time.sleep(1.0)  # Longer sleep on error
+                self.timer_stop_event.wait(1.0)  # Back off on error
+
+    def _next_deadline_timeout(self):
+        """Seconds until the earliest scheduled deadline, or None if nothing is scheduled. Caller holds the condition."""
+        while self._deadline_heap:
+            deadline, entity_id = self._deadline_heap[0]
+            if self._scheduled_deadlines.get(entity_id) == deadline:
+                return max(0.0, deadline - time.time())
+            heapq.heappop(self._deadline_heap)  # Stale entry from a rescheduled or removed craft
+        return None
+
+    def _pop_due_deadlines(self):
+        """Remove and return entity IDs whose deadline has passed. Caller holds the condition."""
+        now = time.time()
+        due_entity_ids = []
+        while self._deadline_heap and self._deadline_heap[0][0] <= now:
+            deadline, entity_id = heapq.heappop(self._deadline_heap)
+            if self._scheduled_deadlines.get(entity_id) == deadline:
+                del self._scheduled_deadlines[entity_id]
+                due_entity_ids.append(entity_id)
+        return due_entity_ids
+
+    def _get_craft_deadline(self, entity_id, craft_data):
+        """
+        Get the time a passive craft should be reported ready.
+
+        Crafts the server already reports READY get deadline 0 so they are reported
+        right away.
+
+        Args:
+            entity_id: Passive craft entity ID
+            craft_data: passive_craft_state dict, or None if the craft is gone
+
+        Returns:
+            float: Deadline as a unix timestamp, or None if nothing is to be scheduled
+        """
+        if craft_data is None or entity_id in self.notified_ready_items:
+            return None
+
+        status = craft_data.get("status", [0, {}])
+        if status and len(status) > 0 and status[0] == 2:
+            return 0.0
 
-    def _update_all_timers(self):
-        """Update all crafting timers and send FULL data refresh to UI."""
+        return self._get_completion_time(craft_data)
+
+    def _schedule_completion(self, entity_id):
+        """
+        Reschedule one passive craft's completion deadline after it changed.
+
+        Pushes a new (deadline, entity_id) entry; the craft's previous entry becomes
+        stale and is skipped by the timer thread. The heap is compacted once stale
+        entries outnumber the scheduled ones.
+
+        Args:
+            entity_id: Passive craft entity ID
+        """
         try:
-            has_timer_changes = False
-            updated_operations = []
-            newly_ready_items = []  # Collect items that become ready this cycle
+            craft_data = getattr(self, "_passive_craft_data", {}).get(entity_id)
+            deadline = self._get_craft_deadline(entity_id, craft_data)
+
+            with self._deadline_condition:
+                if deadline == self._scheduled_deadlines.get(entity_id):
+                    return
+                if deadline is None:
+                    del self._scheduled_deadlines[entity_id]
+                    return
+
+                self._scheduled_deadlines[entity_id] = deadline
+                if len(self._deadline_heap) > 2 * len(self._scheduled_deadlines) + 64:
+                    self._deadline_heap = [(d, e) for e, d in self._scheduled_deadlines.items()]
+                    heapq.heapify(self._deadline_heap)
+                else:
+                    heapq.heappush(self._deadline_heap, (deadline, entity_id))
+                self._deadline_condition.notify_all()
 
-            if len(self.raw_crafting_operations) == 0:
+        except Exception as e:
+            logging.error(f"Error scheduling passive craft completion for {entity_id}: {e}")
 
-                return
+    def _schedule_completions(self):
+        """
+        Rebuild the completion deadline heap from all cached passive crafts.
 
-            for operation in self.raw_crafting_operations:
-                # Calculate current time remaining
-                new_time_remaining = self._calculate_current_time_remaining(operation)
-                old_time_remaining = operation.get("time_remaining", "")
-
-                entity_id = operation.get("entity_id", "unknown")
-
-                # Check if status changed (e.g., from "5m 30s" to "READY")
-                if new_time_remaining != old_time_remaining:
-                    operation["time_remaining"] = new_time_remaining
-                    has_timer_changes = True
-
-                    # Check if item just became ready - collect for bundled notification
-                    if old_time_remaining != "READY" and new_time_remaining == "READY":
-                        if entity_id not in self.notified_ready_items:
-                            # Only notify for crafts belonging to the current player
-                            owner_entity_id = operation.get("owner_entity_id")
-                            if owner_entity_id and self._is_current_player(owner_entity_id):
-                                recipe_id = operation.get("recipe_id")
-                                if recipe_id:
-                                    item_name = self._get_item_name_from_recipe(recipe_id)
-                                    newly_ready_items.append(
-                                        {"entity_id": entity_id, "recipe_id": recipe_id, "item_name": item_name}
-                                    )
-                            self.notified_ready_items.add(entity_id)
+        Called when a subscription (re)loads passive_craft_state; live row changes
+        go through _schedule_completion() one craft at a time.
+        """
+        try:
+            deadlines = {}
+            for entity_id, craft_data in list(getattr(self, "_passive_craft_data", {}).items()):
+                deadline = self._get_craft_deadline(entity_id, craft_data)
+                if deadline is not None:
+                    deadlines[entity_id] = deadline
+
+            with self._deadline_condition:
+                self._scheduled_deadlines = deadlines
+                self._deadline_heap = [(deadline, entity_id) for entity_id, deadline in deadlines.items()]
+                heapq.heapify(self._deadline_heap)
+                self._deadline_condition.notify_all()
 
-                updated_operations.append(operation)
+        except Exception as e:
+            logging.error(f"Error scheduling passive craft completions: {e}")
 
-            # Process bundled notifications for all items that became ready this cycle
-            if newly_ready_items:
-                self._trigger_bundled_passive_craft_notifications(newly_ready_items)
+    def _on_crafts_ready(self, entity_ids):
+        """
+        Handle crafts whose completion deadline has passed.
 
-            # Update the stored operations
-            self.raw_crafting_operations = updated_operations
+        Sends one bundled notification for the current player's crafts and a timer
+        delta marking the crafts READY, so the UI updates just those rows.
 
-            # If any timers changed, send a FULL data refresh to avoid entity mapping issues
-            if has_timer_changes and self.ui_update_callback:
+        Args:
+            entity_ids: Passive craft entity IDs that just completed
+        """
+        try:
+            newly_ready_items = []
+            passive_craft_data = getattr(self, "_passive_craft_data", {})
 
-                # Generate fresh consolidated data with updated timers
-                consolidated_data = self._consolidate_crafting()
-                fresh_crafting_data = self._format_crafting_for_ui(consolidated_data)
+            for entity_id in entity_ids:
+                craft_data = passive_craft_data.get(entity_id)
+                if craft_data is None or entity_id in self.notified_ready_items:
+                    continue
 
-                # Send as regular crafting_update so UI rebuilds completely
+                # Only notify for crafts belonging to the current player
+                owner_entity_id = craft_data.get("owner_entity_id")
+                recipe_id = craft_data.get("recipe_id")
+                if owner_entity_id and self._is_current_player(owner_entity_id) and recipe_id:
+                    item_name = self._get_item_name_from_recipe(recipe_id)
+                    newly_ready_items.append({"entity_id": entity_id, "recipe_id": recipe_id, "item_name": item_name})
+                self.notified_ready_items.add(entity_id)
+
+            if newly_ready_items:
+                self._trigger_bundled_passive_craft_notifications(newly_ready_items)
+
+            if self.ui_update_callback:
                 self.ui_update_callback(
                     {
-                        "type": "crafting_update",
-                        "data": fresh_crafting_data,
+                        "type": "crafting_timer_update",
+                        "data": {entity_id: 0.0 for entity_id in entity_ids},
                         "timestamp": time.time(),
                         "changes": {"source": "timer_update"},
                     }
                 )
 
         except Exception as e:
-            logging.error(f"Error updating timers: {e}")
+            logging.error(f"Error handling completed passive crafts: {e}")
 
-    def _calculate_current_time_remaining(self, operation):
+    def _get_recipe_duration(self, recipe_id):
         """
-        Calculate the current time remaining for a crafting operation.
-        This is called by the timer thread every second.
-        """
-        try:
-            # First check database status - this is still the source of truth
-            raw_craft_state = operation.get("raw_craft_state", {})
-            status = raw_craft_state.get("status")
-            entity_id = operation.get("entity_id")
-            recipe_id = raw_craft_state.get("recipe_id")
+        Get a recipe's crafting duration in seconds.
 
-            if status and isinstance(status, list) and len(status) > 0:
-                if status[0] == 2:  # Completed
-                    return "READY"
-                elif status[0] != 1:  # Not in progress
-                    return "Unknown"
+        Args:
+            recipe_id: crafting_recipe_desc ID
 
-            # For in-progress items, calculate real-time countdown
-            if not recipe_id:
-                return "In Progress"
+        Returns:
+            float: Duration in seconds (0 if unknown)
+        """
+        recipe = self.item_lookup_service.get_recipe_record(recipe_id)
+        return recipe.duration_seconds if recipe else 0
 
-            # Get recipe duration from reference data
-            crafting_recipes = self.reference_data.get("crafting_recipe_desc", [])
-            recipe_lookup = {r["id"]: r for r in crafting_recipes}
+    def _is_timer_only_change(self, old_row, new_row):
+        """
+        Check whether a passive craft update only moves its countdown.
 
-            if recipe_id not in recipe_lookup:
-                return "In Progress"
+        Args:
+            old_row: Previous passive_craft_state dict
+            new_row: New passive_craft_state dict
 
-            recipe = recipe_lookup[recipe_id]
-            duration_seconds = recipe.get("time_requirement", 0)
+        Returns:
+            bool: True if only the timestamp or in-progress/ready status changed
+        """
+        for field in ("recipe_id", "building_entity_id", "owner_entity_id", "slot"):
+            if old_row.get(field) != new_row.get(field):
+                return False
 
-            # Get timestamp - now available directly from dataclass to_dict()
-            timestamp_micros = operation.get("timestamp_micros")
-            if not timestamp_micros:
-                return "In Progress"
+        counting_statuses = (1, 2)  # IN_PROGRESS, READY
+        old_status = old_row.get("status") or [0]
+        new_status = new_row.get("status") or [0]
+        return old_status[0] in counting_statuses and new_status[0] in counting_statuses
 
-            # Calculate remaining time with current timestamp
-            start_time = timestamp_micros / 1_000_000
-            current_time = time.time()
-            elapsed_time = current_time - start_time
-            remaining_time = duration_seconds - elapsed_time
+    def _get_remaining_seconds(self, craft_data):
+        """
+        Get the seconds left on a passive craft for timer deltas.
 
-            if remaining_time <= 0:
-                return "READY"
+        Args:
+            craft_data: passive_craft_state dict
 
-            formatted_time = self._format_duration_for_display(remaining_time)
-            return formatted_time
+        Returns:
+            float: Remaining seconds (0 when ready), or None if it cannot be computed
+        """
+        status = craft_data.get("status") or [0]
+        if status[0] == 2:
+            return 0.0
 
-        except Exception as e:
-            logging.error(f"Error calculating timer for entity {operation.get('entity_id')}: {e}")
-            return "Error"
+        completion_time = self._get_completion_time(craft_data)
+        if completion_time is None:
+            return None
+        return max(0.0, completion_time - time.time())
 
-    def _format_duration_for_display(self, seconds: float) -> str:
+    def _get_completion_time(self, craft_data):
         """
-        Format seconds into a human-readable duration string for display.
+        Get when an in-progress passive craft completes.
 
         Args:
-            seconds: Duration in seconds
+            craft_data: passive_craft_state dict
 
         Returns:
-            str: Formatted duration (e.g., "2h 30m 15s", "45m 30s", "30s")
+            float: Completion time in seconds since the epoch, or None if the craft is
+                   not counting down (ready, unknown status or unknown duration)
         """
-        if seconds <= 0:
-            return "0s"
-
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        remaining_seconds = int(seconds % 60)
+        status = craft_data.get("status", [0, {}])
+        status_code = status[0] if status and len(status) > 0 else 0
+        timestamp_micros = craft_data.get("timestamp_micros")
+        if status_code != 1 or not timestamp_micros:
+            return None
 
-        parts = []
-        if hours > 0:
-            parts.append(f"{hours}h")
-        if minutes > 0:
-            parts.append(f"{minutes}m")
-        if remaining_seconds > 0:
-            parts.append(f"{remaining_seconds}s")
+        duration_seconds = self._get_recipe_duration(craft_data.get("recipe_id"))
+        if duration_seconds <= 0:
+            return None
 
-        return " ".join(parts) if parts else "0s"
+        return timestamp_micros / 1_000_000 + duration_seconds
 
     def _get_player_name(self, player_entity_id):
         """
@@ -751,12 +755,9 @@ class CraftingProcessor(BaseProcessor):
             str: Player name or fallback
         """
         try:
-            # Convert to string for consistent lookup
-            player_id_str = str(player_entity_id)
-
-            # Try cached claim member data
-            if hasattr(self, "_claim_members") and player_id_str in self._claim_members:
-                player_name = self._claim_members[player_id_str]
+            # Try claim member data
+            player_name = self._get_claim_member_name(player_entity_id)
+            if player_name:
                 return player_name
 
             # Fallback to entity ID format
@@ -774,29 +775,11 @@ class CraftingProcessor(BaseProcessor):
             if not (hasattr(self, "_passive_craft_data") and self._passive_craft_data):
                 return
 
-            if not (hasattr(self, "_building_data") and self._building_data):
+            if not self._has_building_data():
                 return
 
-            # Building nicknames are optional
-            if not hasattr(self, "_building_nicknames"):
-                self._building_nicknames = {}
-
-            # Update raw_crafting_operations for timer thread (same as in incremental update)
-            processor_crafting_operations = []
-            for entity_id, craft_data in self._passive_craft_data.items():
-                operation = {
-                    "entity_id": entity_id,
-                    "recipe_id": craft_data.get("recipe_id"),
-                    "building_entity_id": craft_data.get("building_entity_id"),
-                    "owner_entity_id": craft_data.get("owner_entity_id"),
-                    "timestamp_micros": craft_data.get("timestamp_micros"),
-                    "status": craft_data.get("status", [0, {}]),
-                    "slot": craft_data.get("slot", 0),
-                    "raw_craft_state": craft_data,
-                }
-                processor_crafting_operations.append(operation)
-
-            self.raw_crafting_operations = processor_crafting_operations
+            # Reschedule completion deadlines for timer thread (same as in incremental update)
+            self._schedule_completions()
 
             # Consolidate crafting by item
             consolidated_crafting = self._consolidate_crafting()
@@ -821,10 +804,6 @@ class CraftingProcessor(BaseProcessor):
             # First collect all raw operations
             raw_operations = []
 
-            # Get reference data for lookups
-            recipe_lookup = {r["id"]: r for r in self.reference_data.get("crafting_recipe_desc", [])}
-            building_desc_lookup = {b["id"]: b["name"] for b in self.reference_data.get("building_desc", [])}
-
             # Process each crafting operation to extract individual items
             for craft_id, craft_data in self._passive_craft_data.items():
                 building_id = craft_data.get("building_entity_id")
@@ -834,50 +813,40 @@ class CraftingProcessor(BaseProcessor):
                 timestamp_micros = craft_data.get("timestamp_micros")
 
                 # Skip crafting operations from players who are not current claim members
-                owner_id_str = str(owner_id)
-                if hasattr(self, "_claim_members") and self._claim_members:
-                    if owner_id_str not in self._claim_members:
-                        continue
+                if self._has_claim_members() and self._get_claim_member(owner_id) is None:
+                    continue
 
                 # Get building info
-                building_info = self._building_data.get(building_id, {})
+                building_info = self._get_building_info(building_id)
                 building_description_id = building_info.get("building_description_id")
 
                 # Get container name (nickname or building type name)
-                container_name = self._building_nicknames.get(building_id)
+                container_name = self._get_building_nickname(building_id)
                 if not container_name and building_description_id:
-                    container_name = building_desc_lookup.get(building_description_id, f"Building {building_id}")
+                    container_name = self._get_building_type_name(building_description_id, building_id)
                 if not container_name:
                     container_name = f"Unknown Building {building_id}"
 
-                # Get recipe info
-                recipe_info = recipe_lookup.get(recipe_id, {})
-                recipe_name = recipe_info.get("name", f"Recipe {recipe_id}")
-                recipe_name = re.sub(r"\{\d+\}", "", recipe_name).strip()
+                # Get precomputed recipe info
+                recipe = self.item_lookup_service.get_recipe_record(recipe_id)
+                recipe_name = recipe.display_name if recipe else f"Recipe {recipe_id}"
 
-                # Calculate time remaining
+                # Calculate time remaining; the UI counts down from completion_time
                 status_code = status[0] if status and len(status) > 0 else 0
                 time_remaining_display = "READY"
                 remaining_seconds = 0
+                completion_time = None
 
                 if status_code == 1 and timestamp_micros:  # IN_PROGRESS
-                    current_time_micros = int(time.time() * 1_000_000)
-                    elapsed_micros = current_time_micros - timestamp_micros
-                    # Try different duration field names
-                    recipe_duration = recipe_info.get("duration_micros", 0)
-                    if recipe_duration == 0:
-                        # Check for time_requirement field (from user's data structure)
-                        time_requirement_seconds = recipe_info.get("time_requirement", 0)
-                        if time_requirement_seconds > 0:
-                            recipe_duration = int(time_requirement_seconds * 1_000_000)  # Convert to microseconds
-
-                    if recipe_duration > 0:
-                        remaining_micros = max(0, recipe_duration - elapsed_micros)
-                        remaining_seconds = remaining_micros / 1_000_000
+                    completion_time = self._get_completion_time(craft_data)
+                    if completion_time is not None:
+                        remaining_seconds = max(0, completion_time - time.time())
                         time_remaining_display = self._format_time_remaining(remaining_seconds)
+                        if remaining_seconds <= 0:
+                            completion_time = None
                     else:
                         logging.warning(
-                            f"[PASSIVE CRAFTING] Recipe {recipe_id}: No duration_micros found in recipe_info: {recipe_info.keys()}"
+                            f"[PASSIVE CRAFTING] Recipe {recipe_id}: No duration found for recipe"
                         )
                 elif status_code == 0:
                     time_remaining_display = "Unknown"
@@ -886,36 +855,29 @@ class CraftingProcessor(BaseProcessor):
                 crafter_name = self._get_player_name(owner_id)
 
                 # Process crafted items from this operation
-                crafted_items = recipe_info.get("crafted_item_stacks", [])
-                for item_stack in crafted_items:
-                    if isinstance(item_stack, list) and len(item_stack) >= 2:
-                        item_id = item_stack[0]
-                        quantity = item_stack[1]
-
-                        # Look up item details using compound key system
-                        found_items = self.item_lookup_service.find_items_by_id(item_id)
-
-                        if found_items:
-                            # Use first found item (compound key system prevents overwrites)
-                            item_info = found_items[0]
-                            item_name = item_info.get("name", f"Unknown Item {item_id}")
-                            item_tier = item_info.get("tier", 0)
-                            item_tag = item_info.get("tag", "")
-
-                            # Log when there are multiple items for debugging
-                            if len(found_items) > 1:
-                                all_names = [item.get("name", "") for item in found_items]
-                                logging.debug(
-                                    f"[CraftingProcessor] Item {item_id} has multiple matches: {all_names}, using: '{item_name}'"
-                                )
-                        else:
-                            item_name = f"Unknown Item {item_id}"
-                            item_tier = 0
-                            item_tag = ""
-                            logging.warning(f"[CraftingProcessor] Item {item_id} not found in any reference table")
+                crafted_items = recipe.outputs if recipe else ()
+                for item_id, quantity in crafted_items:
+                    # Look up item details using compound key system
+                    found_items = self.item_lookup_service.find_items_by_id(item_id)
+
+                    if found_items:
+                        # Use first found item (compound key system prevents overwrites)
+                        item_info = found_items[0]
+                        item_name = item_info.get("name", f"Unknown Item {item_id}")
+                        item_tier = item_info.get("tier", 0)
+                        item_tag = item_info.get("tag", "")
+
+                        # Log when there are multiple items for debugging
+                        if len(found_items) > 1:
+                            all_names = [item.get("name", "") for item in found_items]
+                            logging.debug(
+                                f"[CraftingProcessor] Item {item_id} has multiple matches: {all_names}, using: '{item_name}'"
+                            )
                     else:
-                        logging.warning(f"Invalid item_stack format: {item_stack} - skipping")
-                        continue
+                        item_name = f"Unknown Item {item_id}"
+                        item_tier = 0
+                        item_tag = ""
+                        logging.warning(f"[CraftingProcessor] Item {item_id} not found in any reference table")
 
                     # Create raw operation
                     raw_operation = {
@@ -927,6 +889,7 @@ class CraftingProcessor(BaseProcessor):
                         "building_name": container_name,
                         "time_remaining": time_remaining_display,
                         "remaining_seconds": remaining_seconds,
+                        "completion_time": completion_time,
                         "entity_id": craft_id,  # This is the entity_id for timer updates
                         "craft_id": craft_id,
                         "recipe_name": recipe_name,
@@ -999,6 +962,7 @@ class CraftingProcessor(BaseProcessor):
                     hierarchy[item_crafter_key]["buildings"][child_group_key] = {
                         "building_name": op["building_name"],
                         "time_remaining": op["time_remaining"],
+                        "completion_time": op.get("completion_time"),
                         "quantity": 0,
                         "operations": [],
                     }
@@ -1049,6 +1013,14 @@ class CraftingProcessor(BaseProcessor):
                 else:
                     parent_time = "READY"  # All jobs complete
 
+                # Latest completion among active jobs, for the UI countdown
+                active_completions = [
+                    building_data["completion_time"]
+                    for building_data in group_data["buildings"].values()
+                    if building_data["time_remaining"] != "READY" and building_data.get("completion_time")
+                ]
+                parent_completion_time = max(active_completions) if active_completions else None
+
                 # Build smart building summary
                 num_buildings = len(group_data["unique_buildings"])
                 num_building_types = len(group_data["unique_building_types"])
@@ -1081,6 +1053,7 @@ class CraftingProcessor(BaseProcessor):
                         "quantity": total_quantity,  # Consolidated quantity
                         "tag": group_data["tag"],
                         "time_remaining": building_data["time_remaining"],
+                        "completion_time": building_data.get("completion_time"),
                         "crafter": crafter,
                         "building_name": self._add_building_suffix(
                             building_data["building_name"], group_data["unique_buildings"]
@@ -1109,6 +1082,8 @@ class CraftingProcessor(BaseProcessor):
                     "total_quantity": group_data["total_quantity"],
                     "tag": group_data["tag"],
                     "time_remaining": parent_time,
+                    "completion_time": parent_completion_time,
+                    "countdown_approximate": len(active_times) > 1,
                     "crafter": crafter,
                     "building_name": building_summary,
                     "completed_jobs": completed_jobs,
@@ -1309,12 +1284,9 @@ class CraftingProcessor(BaseProcessor):
             str: Player name or fallback
         """
         try:
-            # Convert to string for consistent lookup
-            player_id_str = str(player_entity_id)
-
-            # Try cached claim member data (primary method)
-            if hasattr(self, "_claim_members") and player_id_str in self._claim_members:
-                player_name = self._claim_members[player_id_str]
+            # Try claim member data (primary method)
+            player_name = self._get_claim_member_name(player_entity_id)
+            if player_name:
                 return player_name
 
             # Try claim members service as fallback
@@ -1342,27 +1314,7 @@ class CraftingProcessor(BaseProcessor):
         Returns:
             str: Formatted duration (e.g., "2h 30m", "45m", "30s")
         """
-        try:
-            if seconds <= 0:
-                return "READY"
-
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            remaining_seconds = int(seconds % 60)
-
-            parts = []
-            if hours > 0:
-                parts.append(f"{hours}h")
-            if minutes > 0:
-                parts.append(f"{minutes}m")
-            if remaining_seconds > 0 and hours == 0:  # Only show seconds if no hours
-                parts.append(f"{remaining_seconds}s")
-
-            return " ".join(parts) if parts else "READY"
-
-        except Exception as e:
-            logging.warning(f"Error formatting time {seconds}: {e}")
-            return "Unknown"
+        return format_time_remaining(seconds)
 
     def _get_time_bucket(self, remaining_seconds):
         """
@@ -1492,11 +1444,10 @@ class CraftingProcessor(BaseProcessor):
 
     def _is_current_claim_member(self, owner_entity_id):
         """Check if the owner is a member of the current claim."""
-        if not hasattr(self, "_claim_members") or not self._claim_members:
+        if not self._has_claim_members():
             return True  # If no member data, process everything
 
-        owner_id_str = str(owner_entity_id)
-        return owner_id_str in self._claim_members
+        return self._get_claim_member(owner_entity_id) is not None
 
     def _is_current_player(self, owner_entity_id):
         """Check if the owner entity ID belongs to the current player."""
@@ -1511,11 +1462,10 @@ class CraftingProcessor(BaseProcessor):
                 return False
 
             # Get owner name from entity ID using claim members data
-            if not hasattr(self, "_claim_members") or not self._claim_members:
+            if not self._has_claim_members():
                 return False
 
-            owner_id_str = str(owner_entity_id)
-            owner_name = self._claim_members.get(owner_id_str)
+            owner_name = self._get_claim_member_name(owner_entity_id)
             if not owner_name:
                 return False
 
@@ -1526,6 +1476,12 @@ class CraftingProcessor(BaseProcessor):
             logging.error(f"Error checking if owner {owner_entity_id} is current player: {e}")
             return False
 
+    def get_resync_rows(self, table_name):
+        """Return the stored passive_craft_state rows for a reconnect resync."""
+        if table_name != "passive_craft_state":
+            return None
+        return list(getattr(self, "_passive_craft_data", {}).values())
+
     def clear_cache(self):
         """Clear cached crafting data when switching claims."""
         super().clear_cache()
@@ -1550,3 +1506,9 @@ class CraftingProcessor(BaseProcessor):
         # Clear sticky child groups cache
         if hasattr(self, "_child_groups_cache"):
             self._child_groups_cache.clear()
+
+        # Drop scheduled completions for the old claim
+        with self._deadline_condition:
+            self._deadline_heap = []
+            self._scheduled_deadlines = {}
+            self._deadline_condition.notify_all()
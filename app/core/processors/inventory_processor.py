@@ -3,9 +3,17 @@ Inventory processor for handling inventory_state table updates.
 """
 import logging
 import json
+import threading
 
 from app.models import BuildingState, InventoryState, ClaimMemberState
 from .base_processor import BaseProcessor
+from ..change_feed import compute_row_changes, RowInserted, RowUpdated, RowDeleted
+from ..utils.inventory_consolidation import (
+    NUMPY_AVAILABLE,
+    MIN_VECTORIZED_POCKETS,
+    consolidate_inventory_vectorized,
+    count_pockets,
+)
 
 
 class InventoryProcessor(BaseProcessor):
@@ -16,6 +24,30 @@ class InventoryProcessor(BaseProcessor):
     for inventory changes.
     """
 
+    def __init__(self, data_queue, services, reference_data):
+        """Initialize the processor with an incrementally maintained inventory aggregate."""
+        super().__init__(data_queue, services, reference_data)
+
+        # Inventory records grouped by owner and keyed by entity_id for O(1) upserts and removals:
+        # owner_entity_id -> {entity_id: inventory_state dict}
+        self._inventory_data = {}
+        # entity_id -> owner_entity_id, so a record can be removed without knowing its owner
+        self._inventory_owners = {}
+
+        # Consolidated inventory kept up to date per changed inventory record:
+        # item_name -> {"tier", "total_quantity", "tag", "containers": {container_name: quantity}}
+        self._inventory_aggregate = {}
+        # entity_id -> (container_name, {item_name: (tier, tag, quantity)}) currently counted in the aggregate
+        self._record_contributions = {}
+        self._aggregate_ready = False
+        self._aggregate_lock = threading.RLock()
+        # item_name -> whether it existed before the changes not yet sent to the UI
+        self._touched_items = {}
+
+        # Live inventory_state rows arrive as row changes published by the router
+        if self.change_feed is not None:
+            self.change_feed.subscribe(self._on_inventory_changes, tables=["inventory_state"])
+
     def get_table_names(self):
         """Return list of table names this processor handles."""
         return ["inventory_state", "building_state", "building_nickname_state", "claim_member_state"]
@@ -24,114 +56,90 @@ class InventoryProcessor(BaseProcessor):
         """
         Handle inventory_state transactions - LIVE incremental updates.
 
-        Process real-time inventory changes without full refresh.
+        Process real-time inventory changes without full refresh. With a change feed,
+        inventory_state rows were already applied by _on_inventory_changes() when the
+        router published them.
         """
         try:
             table_name = table_update.get("table_name", "")
             updates = table_update.get("updates", [])
-            
-            # Track if we need to send updates
-            has_inventory_changes = False
 
+            # Process inventory_state updates (item moves, additions, removals)
+            if table_name == "inventory_state":
+                if self.change_feed is None:
+                    self._apply_inventory_changes(compute_row_changes(table_update), reducer_name, timestamp)
+                return
+
+            # For other table types, do full refresh if we have changes
+            has_inventory_changes = False
             for update in updates:
                 inserts = update.get("inserts", [])
                 deletes = update.get("deletes", [])
-
-                # Process inventory_state updates (item moves, additions, removals)
-                if table_name == "inventory_state":
-                    # Collect all operations first to handle delete+insert as updates
-                    delete_operations = {}
-                    insert_operations = {}
-                    player_context = {}  
-                    
-                    # Parse all deletes using dataclass
-                    for delete_str in deletes:
-                        try:
-                            inventory_state = InventoryState.from_array(delete_str)
-                            if inventory_state:
-                                delete_operations[inventory_state.entity_id] = inventory_state.to_dict()
-                                # Track player who made this change
-                                if inventory_state.player_owner_entity_id:
-                                    player_context[inventory_state.entity_id] = inventory_state.player_owner_entity_id
-                        except (ValueError, TypeError) as e:
-                            logging.warning(f"[InventoryProcessor] Failed to parse inventory delete: {e}")
-                            continue
-
-                    # Parse all inserts using dataclass
-                    for insert_str in inserts:
-                        try:
-                            inventory_state = InventoryState.from_array(insert_str)
-                            if inventory_state:
-                                insert_operations[inventory_state.entity_id] = inventory_state.to_dict()
-                                # Track player who made this change
-                                if inventory_state.player_owner_entity_id:
-                                    player_context[inventory_state.entity_id] = inventory_state.player_owner_entity_id
-                        except (ValueError, TypeError) as e:
-                            logging.warning(f"[InventoryProcessor] Failed to parse inventory insert: {e}")
-                            continue
-
-                    # Process operations: handle delete+insert as updates, standalone deletes as removals
-                    if not hasattr(self, "_inventory_data"):
-                        self._inventory_data = {}
-
-                    # Handle updates (delete+insert for same entity) and new inserts
-                    for entity_id in insert_operations:
-                        insert_data = insert_operations[entity_id]
-                        owner_entity_id = insert_data.get("owner_entity_id")
-
-                        if owner_entity_id:
-                            # Update inventory data cache
-                            if owner_entity_id not in self._inventory_data:
-                                self._inventory_data[owner_entity_id] = []
-
-                            # Remove old record if this is an update
-                            if entity_id in delete_operations:
-                                # Find and remove the old record
-                                self._inventory_data[owner_entity_id] = [
-                                    record
-                                    for record in self._inventory_data[owner_entity_id]
-                                    if record.get("entity_id") != entity_id
-                                ]
-
-                            # Add new record
-                            self._inventory_data[owner_entity_id].append(insert_data)
-                            has_inventory_changes = True
-
-                    # Handle standalone deletes (item removals)
-                    for entity_id in delete_operations:
-                        if entity_id not in insert_operations:
-                            # This is a standalone delete (item removal)
-                            delete_data = delete_operations[entity_id]
-                            owner_entity_id = delete_data.get("owner_entity_id")
-
-                            if owner_entity_id and owner_entity_id in self._inventory_data:
-                                # Remove the record
-                                self._inventory_data[owner_entity_id] = [
-                                    record
-                                    for record in self._inventory_data[owner_entity_id]
-                                    if record.get("entity_id") != entity_id
-                                ]
-                                has_inventory_changes = True
-
-                # For other table types, do full refresh if we have changes
-                elif inserts or deletes:
+                if inserts or deletes:
                     self._log_transaction_debug("inventory", len(inserts), len(deletes), reducer_name)
                     has_inventory_changes = True
 
-            # Send incremental update if we have changes
             if has_inventory_changes:
                 logging.info(f"[InventoryProcessor] Detected inventory changes, sending update for table: {table_name}")
-                if table_name == "inventory_state":
-                    # Pass player context for accurate activity tracking
-                    self._send_incremental_inventory_update(reducer_name, timestamp, player_context)
-                else:
-                    self._refresh_inventory()
+                self._refresh_inventory()
             else:
                 logging.debug(f"[InventoryProcessor] No inventory changes detected for transaction")
 
         except Exception as e:
             logging.error(f"Error handling inventory transaction: {e}")
 
+    def _on_inventory_changes(self, changes, reducer_name, timestamp):
+        """ChangeFeed listener for inventory_state row changes."""
+        with self.state_lock:
+            self._apply_inventory_changes(changes, reducer_name, timestamp)
+
+    def _apply_inventory_changes(self, changes, reducer_name, timestamp):
+        """
+        Apply inventory_state row changes to the records and the aggregate.
+
+        Args:
+            changes: RowInserted / RowUpdated / RowDeleted events with inventory_state dicts
+            reducer_name: Name of the reducer that caused the changes
+            timestamp: Transaction timestamp in seconds
+        """
+        try:
+            has_inventory_changes = False
+            player_context = {}
+
+            # Delete+insert pairs arrive as RowUpdated, standalone deletes as RowDeleted
+            for change in changes:
+                row = change.new_row if isinstance(change, RowUpdated) else change.row
+
+                # Track player who made this change
+                if row.get("player_owner_entity_id"):
+                    player_context[change.key] = row["player_owner_entity_id"]
+
+                if isinstance(change, RowDeleted):
+                    if self._remove_inventory_record(change.key) is not None:
+                        self._apply_record_to_aggregate(change.key, None)
+                        has_inventory_changes = True
+                    continue
+
+                if self._upsert_inventory_record(row):
+                    self._apply_record_to_aggregate(change.key, row)
+                    has_inventory_changes = True
+                elif self._remove_inventory_record(change.key) is not None:
+                    # Record no longer has an owner - drop the stale copy
+                    self._apply_record_to_aggregate(change.key, None)
+                    has_inventory_changes = True
+
+            if has_inventory_changes:
+                logging.info("[InventoryProcessor] Detected inventory changes, sending update for table: inventory_state")
+                # Pass player context for accurate activity tracking; bursts are merged
+                self._schedule_emission(
+                    "inventory", self._send_incremental_inventory_update, reducer_name, timestamp, player_context
+                )
+            else:
+                logging.debug(f"[InventoryProcessor] No inventory changes detected for transaction")
+
+        except Exception as e:
+            logging.error(f"Error handling inventory changes: {e}")
+
     def process_subscription(self, table_update):
         """
         Handle inventory_state, building_state, and building_nickname_state subscription updates.
@@ -145,7 +153,7 @@ class InventoryProcessor(BaseProcessor):
             for update in table_update.get("updates", []):
                 for insert_str in update.get("inserts", []):
                     try:
-                        row_data = json.loads(insert_str)
+                        row_data = self._decode_row(insert_str)
                         table_rows.append(row_data)
                     except json.JSONDecodeError:
                         logging.warning(f"Failed to parse {table_name} insert: {insert_str[:100]}...")
@@ -176,7 +184,7 @@ class InventoryProcessor(BaseProcessor):
         """
         try:
             # For transaction updates, trigger a refresh if we have subscription data
-            if hasattr(self, "_inventory_data") and self._inventory_data:
+            if self._inventory_data:
                 self._send_inventory_update()
             else:
                 # Send empty data for transaction-only updates
@@ -191,20 +199,13 @@ class InventoryProcessor(BaseProcessor):
         Process inventory_state data to store inventory contents.
         """
         try:
-            # Store inventory data keyed by owner_entity_id (building)
-            if not hasattr(self, "_inventory_data"):
-                self._inventory_data = {}
-
             for row in inventory_rows:
                 try:
                     # Create InventoryState dataclass instance
                     inventory_state = InventoryState.from_dict(row)
-                    if inventory_state.owner_entity_id:
-                        if inventory_state.owner_entity_id not in self._inventory_data:
-                            self._inventory_data[inventory_state.owner_entity_id] = []
 
-                        # Store the inventory record as dict for compatibility
-                        self._inventory_data[inventory_state.owner_entity_id].append(inventory_state.to_dict())
+                    # Store the inventory record as dict for compatibility
+                    self._upsert_inventory_record(inventory_state.to_dict())
                 except (ValueError, TypeError) as e:
                     logging.debug(f"Failed to process inventory row: {e}")
                     continue
@@ -212,11 +213,62 @@ class InventoryProcessor(BaseProcessor):
         except Exception as e:
             logging.error(f"Error processing inventory data: {e}")
 
+    def _upsert_inventory_record(self, inventory_record):
+        """
+        Insert or replace one inventory record in O(1).
+
+        Args:
+            inventory_record: inventory_state dict
+
+        Returns:
+            bool: True if the record was stored (it has an owner)
+        """
+        entity_id = inventory_record.get("entity_id")
+        owner_entity_id = inventory_record.get("owner_entity_id")
+        if not owner_entity_id:
+            return False
+
+        # The record may have moved to a different owner
+        previous_owner = self._inventory_owners.get(entity_id)
+        if previous_owner is not None and previous_owner != owner_entity_id:
+            self._remove_inventory_record(entity_id)
+
+        self._inventory_data.setdefault(owner_entity_id, {})[entity_id] = inventory_record
+        self._inventory_owners[entity_id] = owner_entity_id
+        return True
+
+    def _remove_inventory_record(self, entity_id):
+        """
+        Remove one inventory record in O(1).
+
+        Args:
+            entity_id: inventory_state entity ID
+
+        Returns:
+            dict: The removed record, or None if it was not stored
+        """
+        owner_entity_id = self._inventory_owners.pop(entity_id, None)
+        if owner_entity_id is None:
+            return None
+
+        owner_records = self._inventory_data.get(owner_entity_id)
+        if owner_records is None:
+            return None
+
+        record = owner_records.pop(entity_id, None)
+        if not owner_records:
+            del self._inventory_data[owner_entity_id]
+        return record
+
     def _process_building_data(self, building_rows):
         """
         Process building_state data to store building info.
         """
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             # Store building data keyed by entity_id
             if not hasattr(self, "_building_data"):
                 self._building_data = {}
@@ -242,6 +294,10 @@ class InventoryProcessor(BaseProcessor):
         Process building_nickname_state data to store custom building names.
         """
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             # Store nickname data keyed by entity_id
             if not hasattr(self, "_building_nicknames"):
                 self._building_nicknames = {}
@@ -268,16 +324,12 @@ class InventoryProcessor(BaseProcessor):
         Uses background processing for heavy consolidation operations.
         """
         try:
-            if not (hasattr(self, "_inventory_data") and self._inventory_data):
+            if not self._inventory_data:
                 return
 
-            if not (hasattr(self, "_building_data") and self._building_data):
+            if not self._has_building_data():
                 return
 
-            # Building nicknames are optional
-            if not hasattr(self, "_building_nicknames"):
-                self._building_nicknames = {}
-
             # Use background processing for consolidation if available
             background_processor = self.services.get("background_processor")
             if background_processor:
@@ -306,6 +358,11 @@ class InventoryProcessor(BaseProcessor):
             consolidated_inventory: The consolidated inventory data
         """
         try:
+            # Send the current aggregate rather than the result captured at rebuild time, so
+            # deltas from transactions that landed in between are not lost (deltas carry absolute
+            # totals, so re-applying them afterwards is harmless)
+            consolidated_inventory = self._snapshot_aggregate()
+
             # Send the consolidated data to UI
             logging.info(f"[InventoryProcessor] Sending inventory_update (background) - {len(consolidated_inventory)} items")
             self._queue_update("inventory_update", consolidated_inventory)
@@ -356,115 +413,232 @@ class InventoryProcessor(BaseProcessor):
         """
         Consolidate inventory data by item name, combining quantities from all containers.
 
+        Rebuilds the persistent aggregate from every cached inventory record, using
+        the NumPy engine for large claims when NumPy is installed. Live transactions
+        afterwards only adjust the records they touch via _apply_record_to_aggregate().
+
         Returns:
             Dictionary with items consolidated by name with container details
         """
         try:
-            consolidated = {}
+            with self._aggregate_lock:
+                self._inventory_aggregate = {}
+                self._record_contributions = {}
+                self._touched_items = {}
+
+                # Resolve containers (snapshot - transactions may update the cache concurrently)
+                containers = []
+                for building_id, inventory_records in list(self._inventory_data.items()):
+                    container_name = self._get_container_name(building_id)
+                    if container_name is not None:
+                        containers.append((container_name, list(inventory_records.values())))
+
+                if NUMPY_AVAILABLE and count_pockets(containers) >= MIN_VECTORIZED_POCKETS:
+                    self._inventory_aggregate, self._record_contributions = consolidate_inventory_vectorized(
+                        containers, self.item_lookup_service
+                    )
+                else:
+                    for container_name, inventory_records in containers:
+                        for inventory_record in inventory_records:
+                            self._add_contribution(
+                                inventory_record.get("entity_id"), container_name, self._get_record_items(inventory_record)
+                            )
 
-            # Process each building's inventory
-            for building_id, inventory_records in self._inventory_data.items():
-                building_info = self._building_data.get(building_id, {})
-                building_description_id = building_info.get("building_description_id")
+                self._aggregate_ready = True
+                return self._snapshot_aggregate()
 
-                # Skip Town Bank buildings
-                if self._is_town_bank_building(building_description_id):
-                    continue
+        except Exception as e:
+            logging.error(f"Error consolidating inventory: {e}")
+            return {}
 
-                # Get container name (nickname or building type name)
-                container_name = self._building_nicknames.get(building_id)
-                if not container_name and building_description_id:
-                    # Use ItemLookupService for building name lookup
-                    container_name = self.item_lookup_service.get_building_name(building_description_id)
-                if not container_name:
-                    container_name = f"Unknown Building {building_id}"
+    def _get_container_name(self, building_id):
+        """
+        Get the display name of an inventory owner.
 
-                # Process each inventory record for this building using dataclass methods
-                for inventory_record in inventory_records:
-                    try:
-                        # Create InventoryState from dict to use dataclass methods
-                        inventory_state = InventoryState.from_dict(inventory_record)
-                        
-                        # Build simple reference data for dataclass
-                        reference_data = {}
-                        for table_name in ["item_desc", "cargo_desc"]: 
-                            items = self.reference_data.get(table_name, [])
-                            for item in items:
-                                item_id = item.get("id")
-                                if item_id is not None:
-                                    if item_id not in reference_data:
-                                        reference_data[item_id] = item
-                        
-                        # Get container info for slot-based item type detection
-                        cargo_index = inventory_state.cargo_index
-                        total_pockets = len(inventory_state.pockets)
-                        
-                        # Get items from inventory state
-                        items = inventory_state.get_items(reference_data)
-                        
-                        for item_info in items:
-                            item_id = item_info.get("item_id", 0)
-                            quantity = item_info.get("quantity", 0)
-                            slot_index = item_info.get("slot_index", 0)
-                            
-                            # Determine correct table based on slot position
-                            if cargo_index == 0:
-                                # Cargo-only container: all slots are cargo
-                                correct_table = "cargo_desc"
-                            elif cargo_index >= total_pockets:
-                                # Inventory-only container: all slots are items
-                                correct_table = "item_desc"
-                            else:
-                                # Mixed container: check slot position
-                                if slot_index < cargo_index:
-                                    correct_table = "item_desc"  # Item slots (0 to cargo_index-1)
-                                else:
-                                    correct_table = "cargo_desc"  # Cargo slots (cargo_index to end)
-                            
-                            # Get the correct item from the appropriate table
-                            item_data = self.item_lookup_service.lookup_item_by_id(item_id, correct_table)
-                            
-                            if item_data:
-                                item_name = item_data.get("name", f"Unknown Item ({item_id})")
-                                item_tier = item_data.get("tier", 0)
-                                item_tag = item_data.get("tag", "")
-                                
-                            else:
-                                # Fallback if not found in correct table
-                                item_name = f"Unknown Item ({item_id})"
-                                item_tier = 0
-                                item_tag = ""
-                                logging.warning(f"[InventoryProcessor] Item {item_id} not found in {correct_table} table")
-
-                            # Add to consolidated inventory
-                            if item_name not in consolidated:
-                                consolidated[item_name] = {
-                                    "tier": item_tier,
-                                    "total_quantity": 0,
-                                    "tag": item_tag,
-                                    "containers": {},
-                                }
-
-                            # Add quantity to total and container
-                            consolidated[item_name]["total_quantity"] += quantity
-                            if container_name not in consolidated[item_name]["containers"]:
-                                consolidated[item_name]["containers"][container_name] = 0
-                            consolidated[item_name]["containers"][container_name] += quantity
-                            
-                    except Exception as e:
-                        logging.debug(f"Error processing inventory record: {e}")
-                        continue
-
-            return consolidated
+        Args:
+            building_id: Entity ID owning the inventory (usually a building)
+
+        Returns:
+            str: Nickname, building type name or fallback, or None for excluded Town Banks
+        """
+        building_info = self._get_building_info(building_id)
+        building_description_id = building_info.get("building_description_id")
+
+        # Skip Town Bank buildings
+        if self._is_town_bank_building(building_description_id):
+            return None
+
+        # Get container name (nickname or building type name)
+        container_name = self._get_building_nickname(building_id)
+        if not container_name and building_description_id:
+            # Use ItemLookupService for building name lookup
+            container_name = self.item_lookup_service.get_building_name(building_description_id)
+        if not container_name:
+            container_name = f"Unknown Building {building_id}"
+        return container_name
+
+    def _get_record_items(self, inventory_record):
+        """
+        Resolve the items held by one inventory record.
+
+        Args:
+            inventory_record: inventory_state dict
+
+        Returns:
+            dict: item_name -> (tier, tag, quantity) summed over the record's pockets
+        """
+        record_items = {}
+        try:
+            # Create InventoryState from dict to use dataclass methods
+            inventory_state = InventoryState.from_dict(inventory_record)
+
+            # Get container info for slot-based item type detection
+            cargo_index = inventory_state.cargo_index
+            total_pockets = len(inventory_state.pockets)
+
+            # Names come from ItemLookupService below, so no reference enrichment is needed here
+            for item_info in inventory_state.get_items():
+                item_id = item_info.get("item_id", 0)
+                quantity = item_info.get("quantity", 0)
+                slot_index = item_info.get("slot_index", 0)
+
+                # Determine correct table based on slot position
+                if cargo_index == 0:
+                    # Cargo-only container: all slots are cargo
+                    correct_table = "cargo_desc"
+                elif cargo_index >= total_pockets:
+                    # Inventory-only container: all slots are items
+                    correct_table = "item_desc"
+                else:
+                    # Mixed container: check slot position
+                    if slot_index < cargo_index:
+                        correct_table = "item_desc"  # Item slots (0 to cargo_index-1)
+                    else:
+                        correct_table = "cargo_desc"  # Cargo slots (cargo_index to end)
+
+                # Get the correct item from the appropriate table
+                item_data = self.item_lookup_service.lookup_item_by_id(item_id, correct_table)
+
+                if item_data:
+                    item_name = item_data.get("name", f"Unknown Item ({item_id})")
+                    item_tier = item_data.get("tier", 0)
+                    item_tag = item_data.get("tag", "")
+                else:
+                    # Fallback if not found in correct table
+                    item_name = f"Unknown Item ({item_id})"
+                    item_tier = 0
+                    item_tag = ""
+                    logging.warning(f"[InventoryProcessor] Item {item_id} not found in {correct_table} table")
+
+                if item_name in record_items:
+                    tier, tag, total = record_items[item_name]
+                    record_items[item_name] = (tier, tag, total + quantity)
+                else:
+                    record_items[item_name] = (item_tier, item_tag, quantity)
 
         except Exception as e:
-            logging.error(f"Error consolidating inventory: {e}")
-            return {}
+            logging.debug(f"Error processing inventory record: {e}")
+
+        return record_items
+
+    def _add_contribution(self, entity_id, container_name, record_items):
+        """Add one inventory record's items to the aggregate. Caller holds _aggregate_lock."""
+        for item_name, (tier, tag, quantity) in record_items.items():
+            self._touch_item(item_name)
+            entry = self._inventory_aggregate.get(item_name)
+            if entry is None:
+                entry = {"tier": tier, "total_quantity": 0, "tag": tag, "containers": {}}
+                self._inventory_aggregate[item_name] = entry
+
+            entry["total_quantity"] += quantity
+            entry["containers"][container_name] = entry["containers"].get(container_name, 0) + quantity
+
+        self._record_contributions[entity_id] = (container_name, record_items)
+
+    def _remove_contribution(self, entity_id):
+        """Subtract one inventory record's items from the aggregate. Caller holds _aggregate_lock."""
+        contribution = self._record_contributions.pop(entity_id, None)
+        if contribution is None:
+            return
+
+        container_name, record_items = contribution
+        for item_name, (_, _, quantity) in record_items.items():
+            self._touch_item(item_name)
+            entry = self._inventory_aggregate.get(item_name)
+            if entry is None:
+                continue
+
+            entry["total_quantity"] -= quantity
+            remaining = entry["containers"].get(container_name, 0) - quantity
+            if remaining > 0:
+                entry["containers"][container_name] = remaining
+            else:
+                entry["containers"].pop(container_name, None)
+
+            if not entry["containers"]:
+                del self._inventory_aggregate[item_name]
+
+    def _apply_record_to_aggregate(self, entity_id, inventory_record):
+        """
+        Replace one inventory record's contribution to the consolidated inventory.
+
+        Costs O(pockets of that record) instead of a full rebuild. Does nothing until
+        the aggregate has been built by _consolidate_inventory().
+
+        Args:
+            entity_id: inventory_state entity ID
+            inventory_record: New inventory_state dict, or None if the record was deleted
+        """
+        with self._aggregate_lock:
+            if not self._aggregate_ready:
+                return
+
+            self._remove_contribution(entity_id)
+            if inventory_record is None:
+                return
 
+            container_name = self._get_container_name(inventory_record.get("owner_entity_id"))
+            if container_name is not None:
+                self._add_contribution(entity_id, container_name, self._get_record_items(inventory_record))
 
+    def _touch_item(self, item_name):
+        """Remember that an item changed since the last delta. Caller holds _aggregate_lock."""
+        if self._aggregate_ready and item_name not in self._touched_items:
+            self._touched_items[item_name] = item_name in self._inventory_aggregate
 
+    def _take_inventory_delta(self):
+        """
+        Collect the items changed since the last call into an inventory delta.
 
-    def _send_incremental_inventory_update(self, reducer_name, timestamp, player_context=None):
+        Returns:
+            dict: {"added": {item_name: entry}, "changed": {item_name: entry}, "removed": [item_name]}
+                  where entries have the same shape as consolidated inventory items
+        """
+        with self._aggregate_lock:
+            touched_items, self._touched_items = self._touched_items, {}
+
+            delta = {"added": {}, "changed": {}, "removed": []}
+            for item_name, existed in touched_items.items():
+                entry = self._inventory_aggregate.get(item_name)
+                if entry is None:
+                    if existed:
+                        delta["removed"].append(item_name)
+                    continue
+
+                entry = {**entry, "containers": dict(entry["containers"])}
+                delta["changed" if existed else "added"][item_name] = entry
+
+            return delta
+
+    def _snapshot_aggregate(self):
+        """Return a copy of the aggregate that is safe to hand to the UI thread."""
+        with self._aggregate_lock:
+            return {
+                item_name: {**entry, "containers": dict(entry["containers"])}
+                for item_name, entry in self._inventory_aggregate.items()
+            }
+
+    def _send_incremental_inventory_update(self, reducer_name, timestamp, player_context=None, attribution=None):
         """
         Send incremental inventory update without full refresh.
         
@@ -472,41 +646,58 @@ class InventoryProcessor(BaseProcessor):
             reducer_name: Name of the reducer that triggered this update
             timestamp: Timestamp of the change
             player_context: Dict mapping entity_id to player_owner_entity_id for attribution
+            attribution: Reducers merged into this update (set for coalesced bursts)
         """
         try:
             # Store player context for recent changes
             self._last_player_context = player_context or {}
             
-            # Get fresh inventory data using existing consolidation logic
-            consolidated_inventory = self._consolidate_inventory()
-
-            if consolidated_inventory:
-                # Send targeted update with incremental flag and player context
-                changes_data = {
-                    "type": "incremental", 
-                    "source": "live_transaction", 
-                    "reducer": reducer_name,
-                    "player_context": player_context or {}
-                }
-                self._queue_update(
-                    "inventory_update",
-                    consolidated_inventory,
-                    changes=changes_data,
-                    timestamp=timestamp,
-                )
+            changes_data = {
+                "type": "incremental",
+                "source": "live_transaction",
+                "reducer": reducer_name,
+                "player_context": player_context or {},
+            }
+            if attribution:
+                changes_data.update(attribution)
+
+            # Aggregate never built yet - fall back to a full consolidated update
+            if not self._aggregate_ready:
+                consolidated_inventory = self._consolidate_inventory()
+                if consolidated_inventory:
+                    self._queue_update("inventory_update", consolidated_inventory, changes=changes_data, timestamp=timestamp)
+                    logging.info(f"[INVENTORY] Sent full update: {len(consolidated_inventory)} unique items - {reducer_name}")
+                return
 
-                logging.info(f"[INVENTORY] Sent incremental update: {len(consolidated_inventory)} unique items - {reducer_name}")
+            # Send only the items whose totals or container breakdowns changed
+            delta = self._take_inventory_delta()
+            changed_count = len(delta["added"]) + len(delta["changed"]) + len(delta["removed"])
+            if changed_count:
+                self._queue_update("inventory_delta", delta, changes=changes_data, timestamp=timestamp)
+                logging.info(f"[INVENTORY] Sent inventory delta: {changed_count} changed items - {reducer_name}")
 
         except Exception as e:
             logging.error(f"Error sending incremental inventory update: {e}")
 
+    def get_resync_rows(self, table_name):
+        """Return the stored inventory_state records for a reconnect resync."""
+        if table_name != "inventory_state":
+            return None
+        return [record for records in self._inventory_data.values() for record in records.values()]
+
     def clear_cache(self):
         """Clear cached inventory data when switching claims."""
         super().clear_cache()
 
         # Clear claim-specific cached data
-        if hasattr(self, "_inventory_data"):
-            self._inventory_data.clear()
+        self._inventory_data.clear()
+        self._inventory_owners.clear()
+
+        with self._aggregate_lock:
+            self._inventory_aggregate = {}
+            self._record_contributions = {}
+            self._touched_items = {}
+            self._aggregate_ready = False
 
         if hasattr(self, "_building_data"):
             self._building_data.clear()
@@ -520,6 +711,10 @@ class InventoryProcessor(BaseProcessor):
     def _process_claim_member_data(self, member_rows):
         """Process claim_member_state data to store player names."""
         try:
+            # Rows are already held by the shared table store
+            if self.table_store is not None:
+                return
+
             if not hasattr(self, "_claim_members"):
                 self._claim_members = {}
 
@@ -550,12 +745,9 @@ class InventoryProcessor(BaseProcessor):
             str: Player name or fallback
         """
         try:
-            # Convert to string for consistent lookup
-            player_id_str = str(player_entity_id)
-
-            # Try cached claim member data
-            if hasattr(self, "_claim_members") and player_id_str in self._claim_members:
-                player_name = self._claim_members[player_id_str]
+            # Try claim member data
+            player_name = self._get_claim_member_name(player_entity_id)
+            if player_name:
                 return player_name
 
             # Try current player name from client as fallback for most actions
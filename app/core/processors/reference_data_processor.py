@@ -155,7 +155,7 @@ class ReferenceDataProcessor(BaseProcessor):
                 for delete_str in deletes:
                     try:
                         # Parse the delete to get the entity ID
-                        delete_data = json.loads(delete_str)
+                        delete_data = self._decode_row(delete_str)
                         entity_id = delete_data.get("id") or delete_data.get("entity_id")
                         
                         if entity_id and table_name in self._reference_cache:
@@ -195,7 +195,7 @@ class ReferenceDataProcessor(BaseProcessor):
             for update in table_update.get("updates", []):
                 for insert_str in update.get("inserts", []):
                     try:
-                        row_data = json.loads(insert_str)
+                        row_data = self._decode_row(insert_str)
                         table_rows.append(row_data)
                     except json.JSONDecodeError:
                         logging.debug(f"Failed to parse {table_name} subscription row")
@@ -1,4 +1,3 @@
-import json
 import logging
 import time
 from typing import Dict, Optional
@@ -67,10 +66,7 @@ class StaminaProcessor(BaseProcessor):
 
             for delete in deletes:
                 try:
-                    if isinstance(delete, str):
-                        data = json.loads(delete)
-                    else:
-                        data = delete
+                    data = self._decode_row(delete)
 
                     if isinstance(data, list) and len(data) > 0:
                         player_entity_id = data[0]
@@ -80,10 +76,7 @@ class StaminaProcessor(BaseProcessor):
 
             for insert in inserts:
                 try:
-                    if isinstance(insert, str):
-                        data = json.loads(insert)
-                    else:
-                        data = insert
+                    data = self._decode_row(insert)
 
                     stamina_state = StaminaState.from_array(data)
                     player_entity_id = stamina_state.player_entity_id
@@ -113,10 +106,7 @@ class StaminaProcessor(BaseProcessor):
 
             for insert in inserts:
                 try:
-                    if isinstance(insert, str):
-                        data = json.loads(insert)
-                    else:
-                        data = insert
+                    data = self._decode_row(insert)
 
                     stamina_state = StaminaState.from_dict(data)
                     self._update_stamina_state(stamina_state, current_time)
@@ -153,10 +143,7 @@ class StaminaProcessor(BaseProcessor):
 
             for insert in inserts:
                 try:
-                    if isinstance(insert, str):
-                        data = json.loads(insert)
-                    else:
-                        data = insert
+                    data = self._decode_row(insert)
 
                     stats_state = CharacterStatsState.from_array(data)
                     self._character_stats[stats_state.player_entity_id] = stats_state
@@ -181,10 +168,7 @@ class StaminaProcessor(BaseProcessor):
 
             for delete in deletes:
                 try:
-                    if isinstance(delete, str):
-                        data = json.loads(delete)
-                    else:
-                        data = delete
+                    data = self._decode_row(delete)
 
                     player_entity_id = (
                         data.get("entity_id")
@@ -209,10 +193,7 @@ class StaminaProcessor(BaseProcessor):
 
             for insert in inserts:
                 try:
-                    if isinstance(insert, str):
-                        data = json.loads(insert)
-                    else:
-                        data = insert
+                    data = self._decode_row(insert)
 
                     stats_state = CharacterStatsState.from_dict(data)
                     self._character_stats[stats_state.player_entity_id] = stats_state
@@ -123,7 +123,7 @@ class TasksProcessor(BaseProcessor):
             for update in table_update.get("updates", []):
                 for insert_str in update.get("inserts", []):
                     try:
-                        row_data = json.loads(insert_str)
+                        row_data = self._decode_row(insert_str)
                         table_rows.append(row_data)
                     except json.JSONDecodeError:
                         logging.warning(f"Failed to parse {table_name} insert: {insert_str[:100]}...")
@@ -594,7 +594,7 @@ class TasksProcessor(BaseProcessor):
                 try:
 
                     if isinstance(delete_str, str):
-                        delete_data = json.loads(delete_str)
+                        delete_data = self._decode_row(delete_str)
                     else:
                         delete_data = list(delete_str)
 
@@ -613,7 +613,7 @@ class TasksProcessor(BaseProcessor):
                 try:
 
                     if isinstance(insert_str, str):
-                        task_data = json.loads(insert_str)
+                        task_data = self._decode_row(insert_str)
                     else:
                         task_data = list(insert_str)
 
@@ -720,7 +720,7 @@ class TasksProcessor(BaseProcessor):
                 try:
 
                     if isinstance(delete_str, str):
-                        delete_data = json.loads(delete_str)
+                        delete_data = self._decode_row(delete_str)
                     else:
                         delete_data = list(delete_str)
 
@@ -738,7 +738,7 @@ class TasksProcessor(BaseProcessor):
                 try:
 
                     if isinstance(insert_str, str):
-                        desc_data = json.loads(insert_str)
+                        desc_data = self._decode_row(insert_str)
                     else:
                         desc_data = dict(insert_str)
 
@@ -831,7 +831,7 @@ class TasksProcessor(BaseProcessor):
                 try:
 
                     if isinstance(insert_str, str):
-                        player_data = json.loads(insert_str)
+                        player_data = self._decode_row(insert_str)
                     else:
                         player_data = dict(insert_str)
 
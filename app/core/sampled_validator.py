@@ -0,0 +1,203 @@
+"""
+Sampled dataclass validation of routed table updates.
+
+MessageRouter used to build dataclass instances for up to five rows of every
+table update before any processor saw it. SampledValidator keeps the same
+checks and statistics but runs them on a worker thread for a random sample of
+updates, so routing never waits on validation. When the worker falls behind,
+samples are dropped and counted rather than queued without limit.
+"""
+
+import logging
+import queue
+import random
+import threading
+
+from app.services import json_codec
+
+_STOP = object()
+
+# Rows checked per sampled table update
+SAMPLE_ROWS = 5
+
+
+class SampledValidator:
+    """Validates a sample of table updates against their dataclasses on a worker thread."""
+
+    def __init__(self, dataclass_mapping, sample_rate: float = 0.1, max_pending: int = 100):
+        """
+        Args:
+            dataclass_mapping: Table name -> dataclass with from_dict/from_array
+            sample_rate: Fraction of table updates to validate (1.0 validates every update, 0 disables)
+            max_pending: Samples queued for the worker before new ones are dropped
+        """
+        self.dataclass_mapping = dataclass_mapping
+        self.sample_rate = sample_rate
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._stats_lock = threading.Lock()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset validation statistics (called on cache clear)."""
+        with self._stats_lock:
+            self.stats = {
+                "total_validations": 0,
+                "successful_validations": 0,
+                "validation_errors": 0,
+                "table_validation_counts": {},
+            }
+            self.sampled = 0
+            self.dropped = 0
+
+    def submit(self, table_name, table_update, update_type):
+        """
+        Queue a table update for validation if it is picked for the sample.
+
+        Only a shallow copy of the rows to check is queued, so the caller may
+        keep mutating the update.
+
+        Args:
+            table_name: Name of the table being updated
+            table_update: The table update data
+            update_type: Type of update ("transaction" or "subscription")
+
+        Returns:
+            bool: True if the update was queued for validation
+        """
+        if table_name not in self.dataclass_mapping or self.sample_rate <= 0:
+            return False
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return False
+
+        rows = self._sample_rows(table_update, update_type)
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((table_name, rows, update_type))
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return False
+
+        with self._stats_lock:
+            self.sampled += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued sample has been validated.
+
+        Returns:
+            bool: True if the queue drained within the timeout
+        """
+        done = threading.Event()
+        try:
+            self._queue.put((done.set, None, None), timeout=timeout)
+        except queue.Full:
+            return False
+        self._ensure_worker()
+        return done.wait(timeout)
+
+    def stop(self):
+        """Stop the worker thread; pending samples are discarded."""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put(_STOP)
+        worker.join(timeout=2.0)
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: Validation totals and per-table counts, plus sampled, dropped and sample_rate
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+            stats["table_validation_counts"] = {k: dict(v) for k, v in self.stats["table_validation_counts"].items()}
+            stats["sampled"] = self.sampled
+            stats["dropped"] = self.dropped
+            stats["sample_rate"] = self.sample_rate
+            return stats
+
+    def _sample_rows(self, table_update, update_type):
+        if update_type == "subscription":
+            # For subscription data, validate table_rows directly
+            return list(table_update.get("table_rows", [])[:SAMPLE_ROWS])
+
+        # For transaction data, look in updates -> inserts
+        rows = []
+        for update in table_update.get("updates", []):
+            rows.extend(update.get("inserts", [])[:SAMPLE_ROWS])
+            if len(rows) >= SAMPLE_ROWS:
+                break
+        return rows[:SAMPLE_ROWS]
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="SampledValidator", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            table_name, rows, update_type = item
+            if rows is None:
+                # flush() marker
+                table_name()
+                continue
+            try:
+                self._validate(table_name, rows, update_type)
+            except Exception as e:
+                logging.debug(f"Error in dataclass validation for {table_name}: {e}")
+
+    def _validate(self, table_name, rows, update_type):
+        dataclass_type = self.dataclass_mapping[table_name]
+        validation_samples = 0
+        validation_errors = 0
+
+        for data_item in rows:
+            data = data_item
+            try:
+                if isinstance(data_item, str):
+                    data = json_codec.loads(data_item)
+
+                # Rows arrive as dicts (JSON) or arrays (positional); skip arrays
+                # for classes without from_array
+                if isinstance(data, dict):
+                    dataclass_type.from_dict(data)
+                elif hasattr(dataclass_type, "from_array"):
+                    dataclass_type.from_array(data)
+                else:
+                    continue
+
+                validation_samples += 1
+
+            except Exception as validation_error:
+                validation_errors += 1
+                if validation_errors <= 2:  # Only log first few errors per batch
+                    logging.warning(
+                        f"Dataclass validation failed for {table_name}, data may be inconsistent: {validation_error}"
+                    )
+                    # Log the problematic data for debugging
+                    if table_name in ["stamina_state", "character_stats_state"]:
+                        logging.warning(f"[Validation] Problematic {table_name} data: {data}")
+
+        with self._stats_lock:
+            self.stats["total_validations"] += 1
+            counts = self.stats["table_validation_counts"].setdefault(table_name, {"success": 0, "error": 0})
+            if validation_errors == 0 and validation_samples > 0:
+                self.stats["successful_validations"] += 1
+                counts["success"] += 1
+            elif validation_errors > 0:
+                self.stats["validation_errors"] += 1
+                counts["error"] += 1
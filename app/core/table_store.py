@@ -0,0 +1,319 @@
+"""
+Client-side table store for subscribed SpacetimeDB tables.
+
+Holds one copy of the state tables several processors join against
+(SHARED_TABLES), keyed by primary key, with secondary indexes on the foreign-key
+columns processors look up. The MessageRouter applies subscription rows and
+TransactionUpdate insert/delete pairs here once, and processors read from the
+store instead of each keeping a private copy of building_state,
+building_nickname_state and claim_member_state. Tables owned by a single
+processor (inventory_state, passive_craft_state, ...) stay in that processor.
+"""
+
+import dataclasses
+import logging
+import threading
+
+from app.models import (
+    InventoryState,
+    ProgressiveActionState,
+    PublicProgressiveActionState,
+    ClaimLocalState,
+    ClaimState,
+    ClaimMemberState,
+    ClaimTechState,
+    BuildingState,
+    PassiveCraftState,
+    TravelerTaskState,
+    StaminaState,
+    CharacterStatsState,
+)
+
+# Tables read by more than one processor - the only ones stored by default
+SHARED_TABLES = frozenset({"building_state", "building_nickname_state", "claim_member_state"})
+
+# Columns that get a secondary index in every table that has them
+INDEXED_FIELDS = ("owner_entity_id", "building_entity_id", "claim_entity_id", "player_entity_id")
+
+# Dataclasses used by row_to_dict() to normalize rows into column dicts
+DEFAULT_ROW_TYPES = {
+    "inventory_state": InventoryState,
+    "progressive_action_state": ProgressiveActionState,
+    "public_progressive_action_state": PublicProgressiveActionState,
+    "claim_local_state": ClaimLocalState,
+    "claim_state": ClaimState,
+    "claim_member_state": ClaimMemberState,
+    "claim_tech_state": ClaimTechState,
+    "building_state": BuildingState,
+    "passive_craft_state": PassiveCraftState,
+    "traveler_task_state": TravelerTaskState,
+    "stamina_state": StaminaState,
+    "character_stats_state": CharacterStatsState,
+}
+
+# Column order for array rows that do not line up with a dataclass
+DEFAULT_COLUMN_NAMES = {
+    "building_nickname_state": ["entity_id", "nickname"],
+}
+
+
+def row_to_dict(table_name, row, row_types=None, column_names=None):
+    """
+    Convert a decoded SpacetimeDB row to a column dict.
+
+    Subscription rows are dicts and are normalized through the table's dataclass
+    from_dict().to_dict(), so they have the same shape as converted transaction rows
+    (rows the dataclass rejects are kept as they are). Transaction rows are arrays
+    and are mapped through column_names, the table's dataclass from_array(), or the
+    dataclass field order, in that order of preference.
+
+    Args:
+        table_name: Name of the table the row belongs to
+        row: Decoded row (dict or list)
+        row_types: Mapping of table name to dataclass (defaults to DEFAULT_ROW_TYPES)
+        column_names: Mapping of table name to column order (defaults to DEFAULT_COLUMN_NAMES)
+
+    Returns:
+        dict: Column dict, or None if the row could not be converted
+    """
+    row_types = DEFAULT_ROW_TYPES if row_types is None else row_types
+    column_names = DEFAULT_COLUMN_NAMES if column_names is None else column_names
+
+    try:
+        if isinstance(row, dict):
+            row_type = row_types.get(table_name)
+            if row_type is not None and hasattr(row_type, "from_dict"):
+                try:
+                    return row_type.from_dict(row).to_dict()
+                except (ValueError, TypeError, KeyError):
+                    pass
+            return row
+
+        if isinstance(row, list):
+            columns = column_names.get(table_name)
+            if columns:
+                return dict(zip(columns, row))
+
+            row_type = row_types.get(table_name)
+            if row_type is not None and hasattr(row_type, "from_array"):
+                return row_type.from_array(row).to_dict()
+
+            if row_type is not None and dataclasses.is_dataclass(row_type):
+                return dict(zip((field.name for field in dataclasses.fields(row_type)), row))
+
+            # Unknown layout - keep the raw row keyed by its first column
+            return {"entity_id": row[0], "row": row} if row else None
+
+    except Exception as e:
+        logging.debug(f"[TableStore] Could not convert {table_name} row: {e}")
+
+    return None
+
+
+def primary_key(row_dict):
+    """Return a row dict's primary key (entity_id, falling back to id)."""
+    key = row_dict.get("entity_id")
+    if key is None:
+        key = row_dict.get("id")
+    return key
+
+
+class TableStore:
+    """
+    Indexed in-memory copy of subscribed SpacetimeDB tables.
+
+    Rows are stored as dicts keyed by primary key (entity_id, falling back to id).
+    Each table keeps secondary indexes mapping values of INDEXED_FIELDS to the set
+    of primary keys that carry them. All methods are thread-safe.
+    """
+
+    def __init__(self, row_types=None, column_names=None, table_filter=None):
+        """
+        Initialize an empty store.
+
+        Args:
+            row_types: Optional mapping of table name to dataclass used for array rows
+            column_names: Optional mapping of table name to column order for array rows
+            table_filter: Optional callable(table_name) -> bool selecting stored tables.
+                          Defaults to SHARED_TABLES.
+        """
+        self.row_types = dict(DEFAULT_ROW_TYPES if row_types is None else row_types)
+        self.column_names = dict(DEFAULT_COLUMN_NAMES if column_names is None else column_names)
+        self.table_filter = table_filter or SHARED_TABLES.__contains__
+
+        self._tables = {}
+        self._indexes = {}
+        self._lock = threading.RLock()
+
+    def handles(self, table_name):
+        """
+        Check whether a table is kept in this store.
+
+        Args:
+            table_name: Name of the SpacetimeDB table
+
+        Returns:
+            bool: True if rows for this table are stored
+        """
+        return bool(table_name) and self.table_filter(table_name)
+
+    def apply_table_update(self, table_update):
+        """
+        Apply the insert/delete rows of one table update to the store.
+
+        Works for subscription and TransactionUpdate payloads alike. Deletes in each
+        update group are applied before its inserts, so a delete+insert pair for the
+        same primary key leaves the new row in place.
+
+        Args:
+            table_update: Table update dict with decoded rows
+
+        Returns:
+            int: Number of rows inserted or replaced
+        """
+        table_name = table_update.get("table_name", "")
+        if not self.handles(table_name):
+            return 0
+
+        row_groups = [table_update]
+        row_groups.extend(u for u in table_update.get("updates", []) if isinstance(u, dict))
+
+        applied = 0
+        with self._lock:
+            for group in row_groups:
+                for row in group.get("deletes", None) or []:
+                    row_dict = self._to_row_dict(table_name, row)
+                    if row_dict is not None:
+                        self._remove(table_name, self._primary_key(row_dict))
+
+                for row in group.get("inserts", None) or []:
+                    row_dict = self._to_row_dict(table_name, row)
+                    if row_dict is not None:
+                        self._upsert(table_name, row_dict)
+                        applied += 1
+
+        return applied
+
+    def _to_row_dict(self, table_name, row):
+        """Convert a decoded row (dict or array) to a column dict, or None if unusable."""
+        return row_to_dict(table_name, row, self.row_types, self.column_names)
+
+    @staticmethod
+    def _primary_key(row_dict):
+        return primary_key(row_dict)
+
+    def _upsert(self, table_name, row_dict):
+        key = self._primary_key(row_dict)
+        if key is None:
+            return
+
+        table = self._tables.setdefault(table_name, {})
+        if key in table:
+            self._unindex(table_name, key, table[key])
+
+        table[key] = row_dict
+
+        indexes = self._indexes.setdefault(table_name, {})
+        for field in INDEXED_FIELDS:
+            value = row_dict.get(field)
+            if value is not None:
+                indexes.setdefault(field, {}).setdefault(value, set()).add(key)
+
+    def _remove(self, table_name, key):
+        table = self._tables.get(table_name)
+        if not table or key not in table:
+            return None
+
+        row_dict = table.pop(key)
+        self._unindex(table_name, key, row_dict)
+        return row_dict
+
+    def _unindex(self, table_name, key, row_dict):
+        indexes = self._indexes.get(table_name, {})
+        for field in INDEXED_FIELDS:
+            value = row_dict.get(field)
+            if value is None or field not in indexes:
+                continue
+            keys = indexes[field].get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del indexes[field][value]
+
+    def get(self, table_name, key, default=None):
+        """
+        Get a row by primary key.
+
+        Args:
+            table_name: Name of the table
+            key: Primary key (entity_id or id)
+            default: Value returned when the row is missing
+
+        Returns:
+            dict: The stored row or default
+        """
+        with self._lock:
+            return self._tables.get(table_name, {}).get(key, default)
+
+    def get_rows(self, table_name):
+        """
+        Get all rows of a table.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            list: Snapshot of the stored rows
+        """
+        with self._lock:
+            return list(self._tables.get(table_name, {}).values())
+
+    def find_by(self, table_name, field, value):
+        """
+        Get rows whose indexed column equals a value.
+
+        Args:
+            table_name: Name of the table
+            field: One of INDEXED_FIELDS
+            value: Column value to match
+
+        Returns:
+            list: Matching rows (empty if none)
+        """
+        if field not in INDEXED_FIELDS:
+            raise ValueError(f"Column '{field}' is not indexed")
+
+        with self._lock:
+            table = self._tables.get(table_name, {})
+            keys = self._indexes.get(table_name, {}).get(field, {}).get(value, ())
+            return [table[key] for key in keys if key in table]
+
+    def count(self, table_name):
+        """Return the number of rows stored for a table."""
+        with self._lock:
+            return len(self._tables.get(table_name, {}))
+
+    def clear(self, table_name=None):
+        """
+        Remove stored rows.
+
+        Args:
+            table_name: Table to clear, or None to clear every table
+        """
+        with self._lock:
+            if table_name is None:
+                self._tables.clear()
+                self._indexes.clear()
+            else:
+                self._tables.pop(table_name, None)
+                self._indexes.pop(table_name, None)
+
+    def get_stats(self):
+        """
+        Get row counts per table for monitoring.
+
+        Returns:
+            dict: Table name to row count
+        """
+        with self._lock:
+            return {table_name: len(rows) for table_name, rows in self._tables.items()}
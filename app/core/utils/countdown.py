@@ -0,0 +1,61 @@
+"""
+Countdown formatting shared by crafting processors and UI tabs.
+
+Processors send absolute completion times; tabs derive the remaining time
+locally, so both sides must format countdowns the same way.
+"""
+
+import logging
+import time
+
+
+def format_time_remaining(seconds):
+    """
+    Format seconds into a human-readable duration string.
+
+    Args:
+        seconds: Duration in seconds
+
+    Returns:
+        str: Formatted duration (e.g., "2h 30m", "45m", "30s"), or "READY" when elapsed
+    """
+    try:
+        if seconds <= 0:
+            return "READY"
+
+        hours = int(seconds // 3600)
+        minutes = int((seconds % 3600) // 60)
+        remaining_seconds = int(seconds % 60)
+
+        parts = []
+        if hours > 0:
+            parts.append(f"{hours}h")
+        if minutes > 0:
+            parts.append(f"{minutes}m")
+        if remaining_seconds > 0 and hours == 0:  # Only show seconds if no hours
+            parts.append(f"{remaining_seconds}s")
+
+        return " ".join(parts) if parts else "READY"
+
+    except Exception as e:
+        logging.warning(f"Error formatting time {seconds}: {e}")
+        return "Unknown"
+
+
+def format_countdown(completion_time, now=None, approximate=False):
+    """
+    Format the time left until an absolute completion time.
+
+    Args:
+        completion_time: Completion time in seconds since the epoch
+        now: Current time (defaults to time.time())
+        approximate: Prefix "~" while counting down (several jobs summarized)
+
+    Returns:
+        str: Formatted remaining time, or "READY" once completion_time has passed
+    """
+    remaining = completion_time - (time.time() if now is None else now)
+    text = format_time_remaining(remaining)
+    if approximate and text != "READY":
+        text = f"~{text}"
+    return text
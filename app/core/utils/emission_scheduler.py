@@ -0,0 +1,153 @@
+"""
+Rate limiting of processor UI emissions.
+
+A burst of transactions (a member unloading a cart, a batch of crafts finishing)
+used to rebuild and queue a full UI update per transaction. EmissionScheduler
+lets the processor apply each transaction to its state immediately while the
+expensive UI emission runs at most once per window:
+
+- the first transaction after a quiet period is emitted right away, so single
+  changes show up without delay;
+- transactions arriving within the window are merged and emitted once when the
+  window ends, with every reducer and player that contributed.
+"""
+
+import logging
+import threading
+import time
+
+from app.services.latency_tracer import current_trace, earliest, use_trace
+
+
+class EmissionScheduler:
+    """Merges emission requests and runs the emit callable at most once per window."""
+
+    def __init__(self, emit, window: float = 0.25, lock=None, name: str = ""):
+        """
+        Args:
+            emit: Callable(reducer_name, timestamp, *args, attribution=None) that sends
+                  the UI update. attribution is only passed for merged bursts.
+            window: Minimum seconds between emissions (0 emits every request)
+            lock: Lock held while emitting; pass the lock that guards the
+                  processor's state so deferred emissions see a consistent view
+            name: Label used in log messages
+        """
+        self.emit = emit
+        self.window = window
+        self.lock = lock or threading.RLock()
+        self.name = name
+
+        self.requested = 0
+        self.emitted = 0
+
+        self._pending = []
+        self._traces = []
+        self._last_emit = 0.0
+        self._timer: threading.Timer | None = None
+
+    def request(self, reducer_name, timestamp, *args):
+        """
+        Record a transaction that needs a UI update.
+
+        Args:
+            reducer_name: Reducer that caused the transaction
+            timestamp: Transaction timestamp
+            *args: Extra emit arguments (dicts are merged across a burst, other
+                   values keep the latest one)
+        """
+        with self.lock:
+            self.requested += 1
+            self._pending.append((reducer_name, timestamp, args))
+            self._traces.append(current_trace())
+            if self._timer is not None:
+                return
+
+            wait = self._last_emit + self.window - time.monotonic()
+            if wait <= 0:
+                self._flush_locked()
+            else:
+                self._timer = threading.Timer(wait, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Emit pending requests now."""
+        with self.lock:
+            self._cancel_timer()
+            self._flush_locked()
+
+    def cancel(self):
+        """Drop pending requests (e.g. when the processor's data is cleared)."""
+        with self.lock:
+            self._cancel_timer()
+            self._pending = []
+            self._traces = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _on_timer(self):
+        with self.lock:
+            self._timer = None
+            self._flush_locked()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush_locked(self):
+        pending, self._pending = self._pending, []
+        traces, self._traces = self._traces, []
+        if not pending:
+            return
+        self._last_emit = time.monotonic()
+        self.emitted += 1
+
+        try:
+            # A merged update is traced from the earliest transaction it contains
+            with use_trace(earliest(traces)):
+                if len(pending) == 1:
+                    reducer_name, timestamp, args = pending[0]
+                    self.emit(reducer_name, timestamp, *args)
+                else:
+                    reducer_name, timestamp, args = merge_requests(pending)
+                    self.emit(reducer_name, timestamp, *args, attribution=attribution(pending))
+        except Exception as e:
+            logging.error(f"[EmissionScheduler] Error emitting {self.name} update: {e}")
+
+
+def merge_requests(pending):
+    """
+    Fold a burst of (reducer_name, timestamp, args) requests into one.
+
+    Returns:
+        tuple: (latest reducer_name, latest timestamp, merged args)
+    """
+    reducer_name, timestamp, args = pending[-1]
+    merged = []
+    for index in range(len(args)):
+        values = [request[2][index] for request in pending if len(request[2]) > index]
+        if all(isinstance(value, dict) or value is None for value in values):
+            combined = {}
+            for value in values:
+                combined.update(value or {})
+            merged.append(combined)
+        else:
+            merged.append(values[-1])
+    return reducer_name, timestamp, tuple(merged)
+
+
+def attribution(pending) -> dict:
+    """
+    Describe which reducers contributed to a merged emission.
+
+    Returns:
+        dict: reducers (distinct names in arrival order), reducer_counts and
+              transaction_count
+    """
+    counts = {}
+    for reducer_name, _, _ in pending:
+        counts[reducer_name] = counts.get(reducer_name, 0) + 1
+    return {"reducers": list(counts), "reducer_counts": counts, "transaction_count": len(pending)}
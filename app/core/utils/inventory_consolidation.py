@@ -0,0 +1,196 @@
+"""
+Vectorized inventory consolidation for full rebuilds.
+
+Flattens every pocket of every inventory record into parallel NumPy arrays
+(item id, item/cargo table flag, quantity, container index, record index) and
+computes per-item, per-container and per-record totals with np.bincount.
+Item names are resolved once per distinct (item id, table) pair instead of once
+per pocket.
+
+NumPy is optional. When it is not installed NUMPY_AVAILABLE is False and
+InventoryProcessor keeps using its pure-Python consolidation loop.
+"""
+
+import logging
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Below this many pockets NumPy call overhead outweighs the vectorized sums
+MIN_VECTORIZED_POCKETS = 2000
+
+# Indexed by the vectorized item/cargo table flag
+TABLE_NAMES = ("item_desc", "cargo_desc")
+
+
+def count_pockets(containers):
+    """Return the total number of pockets (occupied or not) held by the containers."""
+    return sum(len(record.get("pockets") or ()) for _, records in containers for record in records)
+
+
+def flatten_pockets(containers):
+    """
+    Flatten the occupied pockets of inventory records into parallel lists.
+
+    Applies the same pocket layout rules as InventoryState.get_items() directly to
+    the raw pocket arrays, without building a dataclass and item dict per pocket.
+
+    Args:
+        containers: List of (container_name, inventory_records) pairs
+
+    Returns:
+        tuple: (records, pockets) where records is a dict of per-record lists
+               (entity_id, container_index, cargo_index, pocket_count, item_count) and
+               pockets is a dict of per-pocket lists (item_id, quantity, slot_index)
+    """
+    records = {"entity_id": [], "container_index": [], "cargo_index": [], "pocket_count": [], "item_count": []}
+    item_ids = []
+    quantities = []
+    slot_indexes = []
+
+    for container_index, (_, inventory_records) in enumerate(containers):
+        for inventory_record in inventory_records:
+            pockets = inventory_record.get("pockets") or []
+            start = len(item_ids)
+            try:
+                for slot_index, pocket in enumerate(pockets):
+                    if len(pocket) < 3:
+                        continue
+                    pocket_content = pocket[1]
+                    if len(pocket_content) < 2 or pocket_content[0] != 0:
+                        continue
+                    item_data = pocket_content[1]
+                    if len(item_data) < 2:
+                        continue
+                    item_ids.append(item_data[0])
+                    quantities.append(item_data[1])
+                    slot_indexes.append(slot_index)
+            except Exception as e:
+                # Drop the whole record, like the pure-Python path does
+                logging.debug(f"Error processing inventory record: {e}")
+                del item_ids[start:], quantities[start:], slot_indexes[start:]
+
+            records["entity_id"].append(inventory_record.get("entity_id"))
+            records["container_index"].append(container_index)
+            records["cargo_index"].append(inventory_record.get("cargo_index", 0))
+            records["pocket_count"].append(len(pockets))
+            records["item_count"].append(len(item_ids) - start)
+
+    return records, {"item_id": item_ids, "quantity": quantities, "slot_index": slot_indexes}
+
+
+def consolidate_inventory_vectorized(containers, item_lookup_service):
+    """
+    Consolidate inventory records by item name using NumPy.
+
+    Produces the same result as InventoryProcessor's pure-Python consolidation.
+
+    Args:
+        containers: List of (container_name, inventory_records) pairs; Town Banks
+                    and other excluded containers must already be filtered out
+        item_lookup_service: ItemLookupService used to resolve item names
+
+    Returns:
+        tuple: (consolidated, contributions) where consolidated maps item_name to
+               {"tier", "total_quantity", "tag", "containers"} and contributions maps
+               each record's entity_id to (container_name, {item_name: (tier, tag, quantity)})
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is not installed")
+
+    # Containers can share a display name; their quantities are summed together
+    container_names = []
+    name_slots = {}
+    container_slots = []
+    for container_name, _ in containers:
+        if container_name not in name_slots:
+            name_slots[container_name] = len(container_names)
+            container_names.append(container_name)
+        container_slots.append(name_slots[container_name])
+
+    records, pockets = flatten_pockets(containers)
+    record_ids = records["entity_id"]
+    contributions = {
+        entity_id: (containers[container_index][0], {})
+        for entity_id, container_index in zip(record_ids, records["container_index"])
+    }
+
+    if not pockets["item_id"]:
+        return {}, contributions
+
+    item_ids = np.asarray(pockets["item_id"], dtype=np.int64)
+    quantities = np.asarray(pockets["quantity"], dtype=np.int64)
+    slot_indexes = np.asarray(pockets["slot_index"], dtype=np.int64)
+
+    # Expand per-record columns to one entry per occupied pocket
+    item_counts = np.asarray(records["item_count"], dtype=np.int64)
+    record_indexes = np.repeat(np.arange(len(record_ids), dtype=np.int64), item_counts)
+    cargo_indexes = np.repeat(np.asarray(records["cargo_index"], dtype=np.int64), item_counts)
+    pocket_counts = np.repeat(np.asarray(records["pocket_count"], dtype=np.int64), item_counts)
+    container_indexes = np.asarray(container_slots, dtype=np.int64)[
+        np.repeat(np.asarray(records["container_index"], dtype=np.int64), item_counts)
+    ]
+
+    # Slot-based item/cargo table selection:
+    # cargo_index == 0 -> all cargo, cargo_index >= pockets -> all items, else split at cargo_index
+    is_cargo = (cargo_indexes == 0) | ((cargo_indexes < pocket_counts) & (slot_indexes >= cargo_indexes))
+
+    # Resolve each distinct (item_id, table) pair once
+    pair_codes, pair_inverse = np.unique(item_ids * 2 + is_cargo, return_inverse=True)
+    pair_inverse = pair_inverse.reshape(-1)
+
+    name_index = {}
+    names = []
+    pair_to_name = np.empty(len(pair_codes), dtype=np.int64)
+    for pair_index, pair_code in enumerate(pair_codes.tolist()):
+        item_id, table_flag = divmod(pair_code, 2)
+        table_name = TABLE_NAMES[table_flag]
+        item_data = item_lookup_service.lookup_item_by_id(item_id, table_name)
+        if item_data:
+            item_name = item_data.get("name", f"Unknown Item ({item_id})")
+            item_tier = item_data.get("tier", 0)
+            item_tag = item_data.get("tag", "")
+        else:
+            item_name = f"Unknown Item ({item_id})"
+            item_tier = 0
+            item_tag = ""
+            logging.warning(f"[InventoryProcessor] Item {item_id} not found in {table_name} table")
+
+        if item_name not in name_index:
+            name_index[item_name] = len(names)
+            names.append((item_name, item_tier, item_tag))
+        pair_to_name[pair_index] = name_index[item_name]
+
+    name_indexes = pair_to_name[pair_inverse]
+    name_count = len(names)
+    container_count = len(container_names)
+
+    # Totals per item
+    totals = np.bincount(name_indexes, weights=quantities, minlength=name_count).astype(np.int64)
+    consolidated = {}
+    for (item_name, item_tier, item_tag), total in zip(names, totals.tolist()):
+        consolidated[item_name] = {"tier": item_tier, "total_quantity": total, "tag": item_tag, "containers": {}}
+
+    # Totals per (item, container)
+    container_keys = name_indexes * container_count + container_indexes
+    unique_keys, key_inverse = np.unique(container_keys, return_inverse=True)
+    key_totals = np.bincount(key_inverse.reshape(-1), weights=quantities).astype(np.int64)
+    for key, quantity in zip(unique_keys.tolist(), key_totals.tolist()):
+        name_slot, container_slot = divmod(key, container_count)
+        consolidated[names[name_slot][0]]["containers"][container_names[container_slot]] = quantity
+
+    # Totals per (record, item) so transactions can later replace one record's contribution
+    record_keys = record_indexes * name_count + name_indexes
+    unique_keys, key_inverse = np.unique(record_keys, return_inverse=True)
+    key_totals = np.bincount(key_inverse.reshape(-1), weights=quantities).astype(np.int64)
+    for key, quantity in zip(unique_keys.tolist(), key_totals.tolist()):
+        record_index, name_slot = divmod(key, name_count)
+        item_name, item_tier, item_tag = names[name_slot]
+        contributions[record_ids[record_index]][1][item_name] = (item_tier, item_tag, quantity)
+
+    return consolidated, contributions
@@ -6,8 +6,35 @@ across multiple processors, providing a single source of truth for item data acc
 """
 
 import logging
+import re
+from dataclasses import dataclass
 from typing import Dict, Optional, Tuple, Any, List
 
+_PLACEHOLDER_PATTERN = re.compile(r"\{\d+\}")
+
+
+@dataclass(frozen=True)
+class RecipeRecord:
+    """
+    Precomputed, immutable view of a crafting_recipe_desc row.
+
+    Built once per reference data load so processors never rescan the recipe
+    table or re-clean recipe names while handling updates.
+    """
+
+    recipe_id: int
+    name: str
+    display_name: str
+    duration_seconds: float
+    actions_required: int
+    outputs: Tuple[Tuple[int, int], ...]
+    building_type: Optional[int]
+    item_name: str
+
+    def total_effort(self, craft_count: int = 1) -> int:
+        """Return the effort needed for craft_count crafts (at least 1)."""
+        return max(1, self.actions_required * craft_count)
+
 
 class ItemLookupService:
     """
@@ -28,13 +55,17 @@ class ItemLookupService:
         self._item_lookups: Optional[Dict] = None
         self._building_lookups: Optional[Dict] = None
         self._recipe_lookups: Optional[Dict] = None
+        self._recipe_records: Optional[Dict[int, RecipeRecord]] = None
+        self._items_by_id: Optional[Dict[int, List[Dict]]] = None
         self._initialize_lookups()
 
     def _initialize_lookups(self):
         """Initialize all lookup caches."""
         self._item_lookups = self._build_item_lookups()
+        self._items_by_id = self._build_item_id_index()
         self._building_lookups = self._build_building_lookups()
         self._recipe_lookups = self._build_recipe_lookups()
+        self._recipe_records = self._build_recipe_records()
 
     def _build_item_lookups(self) -> Dict:
         """
@@ -71,6 +102,30 @@ class ItemLookupService:
             logging.error(f"ItemLookupService: Error creating item lookups: {e}")
             return {}
 
+    def _build_item_id_index(self) -> Dict[int, List[Dict]]:
+        """
+        Group the distinct items of the item lookups by item ID.
+
+        Preserves the lookup insertion order so find_items_by_id returns items in
+        the same order as a full scan of the compound keys.
+
+        Returns:
+            Dictionary mapping item_id to the list of distinct items with that ID
+        """
+        try:
+            items_by_id = {}
+            for key, item_data in (self._item_lookups or {}).items():
+                if not (isinstance(key, tuple) and len(key) == 2):
+                    continue
+                items = items_by_id.setdefault(key[0], [])
+                if not any(existing["id"] == item_data["id"] and existing["name"] == item_data["name"] for existing in items):
+                    items.append(item_data)
+            return items_by_id
+
+        except Exception as e:
+            logging.error(f"ItemLookupService: Error creating item ID index: {e}")
+            return {}
+
     def _build_building_lookups(self) -> Dict:
         """
         Create building lookup dictionary from building_desc reference data.
@@ -115,6 +170,83 @@ class ItemLookupService:
             logging.error(f"ItemLookupService: Error creating recipe lookups: {e}")
             return {}
 
+    def _build_recipe_records(self) -> Dict[int, RecipeRecord]:
+        """
+        Create precomputed recipe records from the recipe lookups.
+
+        Must run after the item lookups are built, since each record resolves the
+        name of its first output item.
+
+        Returns:
+            Dictionary mapping recipe_id to RecipeRecord
+        """
+        try:
+            recipe_records = {}
+
+            for recipe_id, recipe in (self._recipe_lookups or {}).items():
+                try:
+                    recipe_records[recipe_id] = self._create_recipe_record(recipe_id, recipe)
+                except Exception as e:
+                    logging.debug(f"ItemLookupService: Skipping malformed recipe {recipe_id}: {e}")
+
+            return recipe_records
+
+        except Exception as e:
+            logging.error(f"ItemLookupService: Error creating recipe records: {e}")
+            return {}
+
+    def _create_recipe_record(self, recipe_id: int, recipe: Dict) -> RecipeRecord:
+        """
+        Build a RecipeRecord from a raw crafting_recipe_desc row.
+
+        Args:
+            recipe_id: The recipe ID
+            recipe: Raw recipe dictionary
+
+        Returns:
+            RecipeRecord for the recipe
+        """
+        name = recipe.get("name", f"Recipe {recipe_id}")
+        display_name = _PLACEHOLDER_PATTERN.sub("", name).strip()
+
+        duration_micros = recipe.get("duration_micros", 0)
+        if duration_micros:
+            duration_seconds = duration_micros / 1_000_000
+        else:
+            duration_seconds = recipe.get("time_requirement", 0) or 0
+
+        outputs = tuple(
+            (stack[0], stack[1])
+            for stack in recipe.get("crafted_item_stacks", None) or []
+            if isinstance(stack, (list, tuple)) and len(stack) >= 2
+        )
+
+        # building_requirement is an Option: [0, {"building_type": ..., "tier": ...}] or [1, []]
+        building_type = None
+        requirement = recipe.get("building_requirement")
+        if isinstance(requirement, (list, tuple)) and len(requirement) >= 2 and requirement[0] == 0:
+            requirement = requirement[1]
+        if isinstance(requirement, dict):
+            building_type = requirement.get("building_type")
+
+        if outputs:
+            item_id = outputs[0][0]
+            found_items = self.find_items_by_id(item_id)
+            item_name = found_items[0].get("name", f"Item {item_id}") if found_items else f"Item {item_id}"
+        else:
+            item_name = display_name
+
+        return RecipeRecord(
+            recipe_id=recipe_id,
+            name=name,
+            display_name=display_name,
+            duration_seconds=duration_seconds,
+            actions_required=recipe.get("actions_required", 1),
+            outputs=outputs,
+            building_type=building_type,
+            item_name=item_name,
+        )
+
     def lookup_item_by_id(self, item_id: int, table_source: str) -> Optional[Dict]:
         """
         Look up an item by ID and explicit table source.
@@ -221,18 +353,10 @@ class ItemLookupService:
             List of all items with this ID (may include multiple items from different tables)
         """
         try:
-            if self._item_lookups is None:
+            if self._items_by_id is None:
                 return []
-            
-            items = []
-            for key, item_data in self._item_lookups.items():
-                # Check both name-based and table-based keys
-                if isinstance(key, tuple) and len(key) == 2 and key[0] == item_id:
-                    # Avoid duplicates by checking if this item is already in the list
-                    if not any(existing['id'] == item_data['id'] and existing['name'] == item_data['name'] for existing in items):
-                        items.append(item_data)
-            
-            return items
+
+            return list(self._items_by_id.get(item_id, ()))
         except Exception as e:
             logging.error(f"ItemLookupService: Error finding items with ID {item_id}: {e}")
             return []
@@ -440,6 +564,21 @@ class ItemLookupService:
             logging.error(f"ItemLookupService: Error looking up recipe {recipe_id}: {e}")
             return None
 
+    def get_recipe_record(self, recipe_id: int) -> Optional[RecipeRecord]:
+        """
+        Look up the precomputed record for a recipe.
+
+        Args:
+            recipe_id: The recipe ID to look up
+
+        Returns:
+            RecipeRecord or None if not found
+        """
+        if self._recipe_records is None:
+            logging.warning("ItemLookupService: Recipe records not initialized")
+            return None
+        return self._recipe_records.get(recipe_id)
+
     def get_recipe_name(self, recipe_id: int) -> str:
         """
         Get the display name for a recipe.
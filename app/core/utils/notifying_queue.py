@@ -0,0 +1,40 @@
+"""
+Queue that tells its consumer when items arrive.
+
+The main window used to poll the data queue every 100 ms, so an update waited
+up to a full poll interval before it was drawn and the UI woke up ten times a
+second with nothing to do. NotifyingQueue calls a notifier after every put;
+the main window uses it to post a Tk virtual event that wakes the drain loop.
+"""
+
+import logging
+import queue
+
+
+class NotifyingQueue(queue.Queue):
+    """queue.Queue that calls a notifier after every put."""
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self._notifier = None
+
+    def set_notifier(self, notifier):
+        """
+        Set the callable run after every put.
+
+        The notifier runs on the producer's thread, so it must be cheap and
+        thread-safe; pass None to remove it.
+
+        Args:
+            notifier: Callable taking no arguments, or None
+        """
+        self._notifier = notifier
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        notifier = self._notifier
+        if notifier is not None:
+            try:
+                notifier()
+            except Exception as e:
+                logging.debug(f"Error notifying queue consumer: {e}")
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional, Dict
 
+from app.services import json_codec
+
 
 @dataclass
 class ClaimLocalState:
@@ -144,7 +146,7 @@ class ClaimState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "ClaimState":
         """Create ClaimState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     def to_dict(self) -> dict:
@@ -193,7 +195,7 @@ class TravelerTaskState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "TravelerTaskState":
         """Create TravelerTaskState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     def to_dict(self, traveler_desc_data: Optional[dict] = None, task_desc_data: Optional[dict] = None) -> dict:
@@ -358,7 +360,7 @@ class ClaimMemberState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "ClaimMemberState":
         """Create ClaimMemberState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     def to_dict(self) -> dict:
@@ -416,7 +418,7 @@ class BuildingState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "BuildingState":
         """Create BuildingState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     def to_dict(self) -> dict:
@@ -539,7 +541,7 @@ class BuildingState:
         # Parse functions data if it's a string
         if isinstance(functions_data, str) and functions_data:
             try:
-                functions_array = json.loads(functions_data)
+                functions_array = json_codec.loads(functions_data)
             except (json.JSONDecodeError, TypeError):
                 return building_type_info
         elif isinstance(functions_data, list):
@@ -593,7 +595,7 @@ class InventoryState:
         # Handle string data that needs JSON parsing
         if isinstance(data, str):
             try:
-                data = json.loads(data)
+                data = json_codec.loads(data)
                 logging.debug(f"[InventoryState.from_array] Parsed JSON, new type: {type(data)}")
             except (json.JSONDecodeError, TypeError) as e:
                 logging.error(f"[InventoryState.from_array] Failed to parse JSON string: {e}")
@@ -639,7 +641,7 @@ class InventoryState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "InventoryState":
         """Create InventoryState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     def to_dict(self) -> dict:
@@ -795,7 +797,7 @@ class ProgressiveActionState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "ProgressiveActionState":
         """Create ProgressiveActionState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     @classmethod
@@ -983,7 +985,7 @@ class ProgressiveActionState:
             return []
 
         try:
-            return json.loads(field_value)
+            return json_codec.loads(field_value)
         except (json.JSONDecodeError, TypeError):
             return []
 
@@ -1092,7 +1094,7 @@ class PublicProgressiveActionState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "PublicProgressiveActionState":
         """Create PublicProgressiveActionState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     def to_dict(self) -> dict:
@@ -1176,10 +1178,41 @@ class PassiveCraftState:
             slot=data.get("slot", []),
         )
 
+    @classmethod
+    def from_array(cls, data: List) -> "PassiveCraftState":
+        """
+        Create PassiveCraftState from SpacetimeDB array format.
+
+        Transaction rows carry 7 columns: [entity_id, owner_entity_id, recipe_id,
+        building_entity_id, timestamp, status, slot]. building_description_id is not
+        part of the row, and the timestamp is either [micros] or plain micros.
+        """
+        if not isinstance(data, list):
+            raise ValueError(f"Invalid passive_craft_state array format: expected list, got {type(data)}")
+
+        if len(data) < 7:
+            raise ValueError(f"Invalid passive_craft_state array format: expected at least 7 elements, got {len(data)}")
+
+        timestamp = {}
+        if data[4]:
+            micros = data[4][0] if isinstance(data[4], list) else data[4]
+            timestamp = {"__timestamp_micros_since_unix_epoch__": micros}
+
+        return cls(
+            entity_id=data[0],
+            owner_entity_id=data[1],
+            recipe_id=data[2],
+            building_entity_id=data[3],
+            building_description_id=0,  # Not available in transaction format
+            timestamp=timestamp,
+            status=data[5] if data[5] else [0, {}],
+            slot=data[6],
+        )
+
     @classmethod
     def from_json_string(cls, json_str: str) -> "PassiveCraftState":
         """Create PassiveCraftState from JSON string"""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     @property
@@ -2028,7 +2061,7 @@ class StaminaState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "StaminaState":
         """Create StaminaState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     @property
@@ -2098,7 +2131,7 @@ class CharacterStatsState:
         # Handle JSON string parsing if needed
         if isinstance(data, str):
             try:
-                data = json.loads(data)
+                data = json_codec.loads(data)
             except (json.JSONDecodeError, TypeError) as e:
                 logging.error(f"[CharacterStatsState.from_array] Failed to parse JSON string: {e}")
                 raise ValueError(f"Invalid character_stats_state JSON string: {e}")
@@ -2124,7 +2157,7 @@ class CharacterStatsState:
     @classmethod
     def from_json_string(cls, json_str: str) -> "CharacterStatsState":
         """Create CharacterStatsState from JSON string."""
-        data = json.loads(json_str)
+        data = json_codec.loads(json_str)
         return cls.from_dict(data)
 
     def to_dict(self) -> dict:
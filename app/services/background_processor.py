@@ -13,6 +13,8 @@ from typing import Any, Callable, Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor, Future
 from dataclasses import dataclass
 
+from app.services.metrics_registry import get_metrics_registry
+
 
 @dataclass
 class BackgroundTask:
@@ -210,6 +212,9 @@ class BackgroundProcessor:
         if total_tasks > 0:
             self.task_stats["avg_time"] = self.task_stats["total_time"] / total_tasks
 
+        # Averages hide the slow tail; keep the full distribution in the metrics registry
+        get_metrics_registry().observe_latency("BackgroundProcessor.task", execution_time)
+
     def cancel_task(self, task_id: str) -> bool:
         """
         Cancel a pending or running task.
@@ -41,12 +41,15 @@ class ClaimService:
             return []
 
         try:
-            claim_memberships = self.query_service.get_user_claims(user_id)
+            claim_memberships, local_states, claim_states = self.query_service.get_user_claims_with_details(user_id)
             if not claim_memberships:
                 logging.warning(f"No claim memberships found for user {user_id} - user may not be a member of any claims")
                 return []
 
-            # Get detailed info for each claim
+            local_states_by_id = {row.get("entity_id"): row for row in local_states}
+            claim_states_by_id = {row.get("entity_id"): row for row in claim_states}
+
+            # Combine the batched details for each claim
             claims_list = []
             for membership in claim_memberships:
                 claim_entity_id = membership.get("claim_entity_id")
@@ -54,8 +57,9 @@ class ClaimService:
                     logging.warning(f"Membership row missing claim_entity_id: {membership}")
                     continue
 
-                # Get claim name and details
-                claim_details = self._fetch_claim_details(claim_entity_id)
+                claim_details = {}
+                claim_details.update(local_states_by_id.get(claim_entity_id, {}))
+                claim_details.update(claim_states_by_id.get(claim_entity_id, {}))
                 if claim_details:
                     claims_list.append(claim_details)
                 else:
@@ -88,29 +92,6 @@ class ClaimService:
             logging.error(f"Error refreshing user claims: {e}")
             return self.available_claims  # Return current claims on error
 
-    def _fetch_claim_details(self, claim_id: str) -> Optional[Dict]:
-        """
-        Fetches detailed information for a specific claim.
-
-        Args:
-            claim_id: The claim entity ID
-
-        Returns:
-            Dictionary with claim details or None if not found
-        """
-        claim_data = {}
-        try:
-            claim_local_state = self.query_service.get_claim_local_state(claim_id)
-            claim_data.update(claim_local_state)
-
-            claim_state = self.query_service.get_claim_state(claim_id)
-            claim_data.update(claim_state)
-
-            return claim_data
-        except Exception as e:
-            logging.error(f"Error fetching details for claim {claim_id}: {e}")
-            return {}
-
     def set_available_claims(self, claims_list: List[Dict]):
         """
         Sets the list of available claims and loads cached data if available.
@@ -0,0 +1,84 @@
+"""
+Fast JSON encoding/decoding with optional backends.
+
+Uses orjson when installed, then msgspec, and falls back to the stdlib json
+module otherwise. All decode errors are raised as json.JSONDecodeError (orjson's
+error already subclasses it), so existing `except json.JSONDecodeError` handlers
+keep working whichever backend is active.
+
+Frames, rows and the reference data cache all go through loads()/dumps().
+
+Note: orjson and msgspec only handle integers up to 64 bits. Depending on the
+release they either reject wider ones (the document is then re-parsed with the
+stdlib) or return them as floats. SpacetimeDB only sends wider numbers for
+connection ids and energy quanta in message envelopes, which the app never reads;
+every table column it uses (entity ids included) fits in a u64.
+"""
+
+import json
+
+try:
+    import orjson
+
+    BACKEND = "orjson"
+except ImportError:
+    orjson = None
+    try:
+        import msgspec
+
+        BACKEND = "msgspec"
+    except ImportError:
+        msgspec = None
+        BACKEND = "json"
+
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """
+    Decode a JSON document.
+
+    Args:
+        data: JSON text as str, bytes or bytearray
+
+    Returns:
+        The decoded Python object
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+    """
+    if BACKEND == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+    if BACKEND == "msgspec":
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError:
+            return json.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """
+    Encode an object as compact JSON text.
+
+    Args:
+        obj: JSON-serializable object (non-string dict keys are converted to strings)
+
+    Returns:
+        str: JSON text
+    """
+    if BACKEND == "orjson":
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    elif BACKEND == "msgspec":
+        try:
+            return msgspec.json.encode(obj).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"))
@@ -0,0 +1,141 @@
+"""
+Latency Tracer
+
+Follows a server transaction from the socket to the screen. Each decoded frame
+is stamped with its receive time and the server's commit timestamp
+(__timestamp_micros_since_unix_epoch__); the stamp travels with the work:
+
+    socket recv -> MessageRouter -> processor -> data_queue
+        -> MainWindow.process_data_queue -> tab render complete
+
+The multiplexer's dispatcher takes the trace off the message and makes it
+current for the thread while the handler runs; MessageRouter marks when
+routing started, BaseProcessor._queue_update copies the trace into the UI
+message (EmissionScheduler carries it to deferred emissions), and the main
+window finishes it once the tab has rendered. finish_trace() records a span
+for every hop in the metrics registry (latency names starting with "trace.").
+
+All marks are wall-clock seconds (time.time()) so they can be compared with
+the server timestamp; the server_to_recv span therefore includes clock skew.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from app.services.metrics_registry import get_metrics_registry
+
+# Key under which the multiplexer stores the trace in a decoded message
+TRACE_KEY = "_trace"
+
+# Hops recorded by finish_trace: (span name, start mark, end mark)
+SPANS = (
+    ("server_to_recv", "server", "received"),
+    ("recv_to_route", "received", "routed"),
+    ("route_to_queue", "routed", "queued"),
+    ("queue_wait", "queued", "picked"),
+    ("dispatch", "picked", "handled"),
+    ("render", "handled", "rendered"),
+    ("recv_to_screen", "received", "rendered"),
+    ("event_to_screen", "server", "rendered"),
+)
+
+_local = threading.local()
+
+
+def server_timestamp(message) -> Optional[float]:
+    """
+    Return the commit time of a TransactionUpdate in seconds, or None.
+
+    Args:
+        message: Decoded SpacetimeDB message
+    """
+    body = message.get("TransactionUpdate") if isinstance(message, dict) else None
+    if not isinstance(body, dict):
+        return None
+    timestamp = body.get("timestamp")
+    if isinstance(timestamp, dict):
+        micros = timestamp.get("__timestamp_micros_since_unix_epoch__")
+        if micros:
+            return micros / 1_000_000
+    return None
+
+
+def stamp_frame(message, received: Optional[float] = None):
+    """
+    Attach a trace to a decoded message.
+
+    Args:
+        message: Decoded SpacetimeDB message (left alone if not a dict)
+        received: Receive time; defaults to now
+    """
+    if isinstance(message, dict):
+        message[TRACE_KEY] = {
+            "received": received if received is not None else time.time(),
+            "server": server_timestamp(message),
+        }
+
+
+def current_trace() -> Optional[dict]:
+    """Return the trace of the message being processed on this thread, if any."""
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def use_trace(trace: Optional[dict], mark: Optional[str] = None):
+    """
+    Make trace current for the duration of the block.
+
+    Args:
+        trace: Trace dict (None leaves no trace current)
+        mark: Optional mark to set to the current time on a copy of the trace,
+              e.g. "routed" when the router starts on the message
+    """
+    if trace is not None and mark is not None:
+        trace = {**trace, mark: time.time()}
+    previous = getattr(_local, "trace", None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def earliest(traces) -> Optional[dict]:
+    """Return the trace received first, so merged work reports its worst-case latency."""
+    traces = [trace for trace in traces if trace]
+    return min(traces, key=lambda trace: trace.get("received") or 0) if traces else None
+
+
+def mark(trace: Optional[dict], name: str) -> Optional[dict]:
+    """
+    Return a copy of trace with the named mark set to now.
+
+    Args:
+        trace: Trace dict or None (returned as None)
+        name: Mark name, e.g. "queued"
+    """
+    if trace is None:
+        return None
+    return {**trace, name: time.time()}
+
+
+def finish_trace(trace: dict, metrics=None) -> dict:
+    """
+    Record a span for every hop whose start and end marks are both set.
+
+    Args:
+        trace: Trace dict with marks from SPANS
+        metrics: MetricsRegistry to record into (defaults to the global registry)
+
+    Returns:
+        dict: Span name -> seconds for the spans recorded
+    """
+    metrics = metrics or get_metrics_registry()
+    spans = {}
+    for name, start, end in SPANS:
+        if trace.get(start) is not None and trace.get(end) is not None:
+            spans[name] = max(0.0, trace[end] - trace[start])
+            metrics.observe_latency(f"trace.{name}", spans[name])
+    return spans
@@ -0,0 +1,357 @@
+"""
+Metrics Registry
+
+Collects throughput and latency metrics for every stage between the WebSocket
+and the UI so a slow stage can be identified on a heavy claim:
+
+- frames and bytes received per frame (WebSocketMultiplexer reader)
+- messages and rows per second per table (MessageRouter)
+- process_transaction / process_subscription latency per processor
+- data_queue depth over time and UI drain time (main window)
+- background task latency (BackgroundProcessor)
+
+Latencies are kept in fixed log-scale histograms and rates in per-second
+buckets over a sliding window, so memory use does not grow with traffic.
+The registry is shared through get_metrics_registry() and read by the
+diagnostics window; snapshot() / dump_json() give the same data as JSON.
+"""
+
+import bisect
+import collections
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Seconds of history used for per-second rates
+RATE_WINDOW = 10
+
+# Queue depth samples kept per queue
+DEPTH_HISTORY = 600
+
+
+class Histogram:
+    """Fixed log-scale histogram with approximate percentiles."""
+
+    def __init__(self, start: float = 1e-5, factor: float = 2 ** 0.25, buckets: int = 96):
+        """
+        Args:
+            start: Upper bound of the first bucket
+            factor: Ratio between consecutive bucket bounds
+            buckets: Number of bounded buckets (larger values go to an overflow bucket)
+        """
+        self.bounds = [start * factor**i for i in range(buckets)]
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Return the upper bound of the bucket holding the given fraction of observations.
+
+        Args:
+            fraction: 0.5 for p50, 0.99 for p99, ...
+
+        Returns:
+            float: Approximate percentile (never above the observed maximum)
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> dict:
+        """
+        Args:
+            scale: Multiplier applied to every value (1000 reports seconds as ms)
+
+        Returns:
+            dict: count, avg, p50, p95, p99 and max
+        """
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count * scale, 3) if self.count else 0.0,
+            "p50": round(self.percentile(0.50) * scale, 3),
+            "p95": round(self.percentile(0.95) * scale, 3),
+            "p99": round(self.percentile(0.99) * scale, 3),
+            "max": round(self.max * scale, 3),
+        }
+
+
+class RateCounter:
+    """Counts events in per-second buckets to report a sliding-window rate."""
+
+    def __init__(self, window: int = RATE_WINDOW):
+        self.window = window
+        self.total = 0
+        self._first_second = None
+        self._buckets = collections.deque()
+
+    def add(self, amount: int = 1, now: Optional[float] = None):
+        second = int(now if now is not None else time.monotonic())
+        if self._first_second is None:
+            self._first_second = second
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += amount
+        else:
+            self._buckets.append([second, amount])
+        self.total += amount
+        self._trim(second)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Average events per second over the window (or since the first event, if sooner)."""
+        if self._first_second is None:
+            return 0.0
+        second = int(now if now is not None else time.monotonic())
+        self._trim(second)
+        elapsed = min(self.window, second - self._first_second + 1)
+        return sum(count for _, count in self._buckets) / elapsed
+
+    def _trim(self, second: int):
+        while self._buckets and self._buckets[0][0] <= second - self.window:
+            self._buckets.popleft()
+
+
+class MetricsRegistry:
+    """Thread-safe store for pipeline metrics."""
+
+    def __init__(self):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop every recorded metric."""
+        with self._lock:
+            self.started = time.time()
+            self._table_messages: Dict[str, RateCounter] = {}
+            self._table_rows: Dict[str, RateCounter] = {}
+            self._frames = RateCounter()
+            self._frame_bytes = RateCounter()
+            self._frame_sizes = Histogram(start=64, factor=2**0.5, buckets=48)
+            self._latencies: Dict[str, Histogram] = {}
+            self._queue_depths: Dict[str, collections.deque] = {}
+            self._queue_max: Dict[str, int] = {}
+
+    # ---- recording ----
+
+    def record_frame(self, size: int):
+        """
+        Record one WebSocket frame.
+
+        Args:
+            size: Frame size in bytes (characters for text frames)
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._frames.add()
+            self._frame_bytes.add(size)
+            self._frame_sizes.observe(size)
+
+    def record_table(self, table_name: str, rows: int):
+        """
+        Record one table update routed to processors.
+
+        Args:
+            table_name: Name of the table
+            rows: Rows inserted plus deleted by the update
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if table_name not in self._table_messages:
+                self._table_messages[table_name] = RateCounter()
+                self._table_rows[table_name] = RateCounter()
+            self._table_messages[table_name].add()
+            self._table_rows[table_name].add(rows)
+
+    def observe_latency(self, name: str, seconds: float):
+        """
+        Record a duration in the named latency histogram.
+
+        Args:
+            name: Histogram name, e.g. "InventoryProcessor.process_transaction"
+            seconds: Duration in seconds
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._latencies.get(name)
+            if histogram is None:
+                histogram = self._latencies[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str):
+        """Context manager that records the duration of its block under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_latency(name, time.perf_counter() - start)
+
+    def record_queue_depth(self, name: str, depth: int):
+        """
+        Sample the depth of a queue.
+
+        Args:
+            name: Queue name, e.g. "data_queue"
+            depth: Items currently queued
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            history = self._queue_depths.get(name)
+            if history is None:
+                history = self._queue_depths[name] = collections.deque(maxlen=DEPTH_HISTORY)
+            history.append((round(time.time(), 3), depth))
+            self._queue_max[name] = max(self._queue_max.get(name, 0), depth)
+
+    # ---- reporting ----
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: JSON-serialisable view of every metric. Latencies are in ms,
+                  rates are per second over the last RATE_WINDOW seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tables = {
+                table_name: {
+                    "messages": messages.total,
+                    "rows": self._table_rows[table_name].total,
+                    "messages_per_second": round(messages.rate(now), 2),
+                    "rows_per_second": round(self._table_rows[table_name].rate(now), 2),
+                }
+                for table_name, messages in sorted(self._table_messages.items())
+            }
+            frames = {
+                "count": self._frames.total,
+                "bytes": self._frame_bytes.total,
+                "frames_per_second": round(self._frames.rate(now), 2),
+                "bytes_per_second": round(self._frame_bytes.rate(now), 2),
+                "bytes_per_frame": self._frame_sizes.summary(),
+            }
+            latency_ms = {name: histogram.summary(1000) for name, histogram in sorted(self._latencies.items())}
+            queues = {
+                name: {
+                    "current": history[-1][1] if history else 0,
+                    "max": self._queue_max.get(name, 0),
+                    "history": list(history),
+                }
+                for name, history in self._queue_depths.items()
+            }
+            return {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "frames": frames,
+                "tables": tables,
+                "latency_ms": latency_ms,
+                "queues": queues,
+            }
+
+    def dump_json(self, path) -> bool:
+        """
+        Write snapshot() to a JSON file.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            bool: True if the file was written
+        """
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2)
+            logging.info(f"Metrics written to {path}")
+            return True
+        except Exception as e:
+            logging.error(f"Error writing metrics to {path}: {e}")
+            return False
+
+
+def format_report(snapshot: dict) -> str:
+    """
+    Render a snapshot as a plain-text report for the diagnostics window.
+
+    Args:
+        snapshot: Output of MetricsRegistry.snapshot(); extra top-level dicts
+                  (e.g. "ingress", "validation") are listed as key/value pairs
+
+    Returns:
+        str: Multi-line report
+    """
+    lines = [f"Uptime: {snapshot.get('uptime_seconds', 0):.0f}s", ""]
+
+    frames = snapshot.get("frames", {})
+    sizes = frames.get("bytes_per_frame", {})
+    lines.append("WebSocket frames")
+    lines.append(
+        f"  {frames.get('count', 0)} frames, {frames.get('frames_per_second', 0):.1f}/s, "
+        f"{frames.get('bytes_per_second', 0) / 1024:.1f} KiB/s"
+    )
+    lines.append(
+        f"  bytes/frame avg {sizes.get('avg', 0):.0f}  p50 {sizes.get('p50', 0):.0f}  "
+        f"p95 {sizes.get('p95', 0):.0f}  p99 {sizes.get('p99', 0):.0f}  max {sizes.get('max', 0):.0f}"
+    )
+    lines.append("")
+
+    lines.append(f"{'Table':<36}{'msg/s':>9}{'rows/s':>10}{'messages':>10}{'rows':>10}")
+    for table_name, table in snapshot.get("tables", {}).items():
+        lines.append(
+            f"{table_name:<36}{table['messages_per_second']:>9.1f}{table['rows_per_second']:>10.1f}"
+            f"{table['messages']:>10}{table['rows']:>10}"
+        )
+    lines.append("")
+
+    lines.append(f"{'Latency (ms)':<48}{'count':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, latency in snapshot.get("latency_ms", {}).items():
+        lines.append(
+            f"{name:<48}{latency['count']:>8}{latency['p50']:>9.2f}{latency['p95']:>9.2f}"
+            f"{latency['p99']:>9.2f}{latency['max']:>9.2f}"
+        )
+    lines.append("")
+
+    for name, depth in snapshot.get("queues", {}).items():
+        recent = [sample[1] for sample in depth.get("history", [])[-20:]]
+        lines.append(f"Queue {name}: current {depth['current']}, max {depth['max']}, recent {recent}")
+
+    known = {"uptime_seconds", "frames", "tables", "latency_ms", "queues"}
+    for section, values in snapshot.items():
+        if section in known or not isinstance(values, dict) or not values:
+            continue
+        lines.append("")
+        lines.append(section.replace("_", " ").capitalize())
+        for key, value in values.items():
+            lines.append(f"  {key}: {value}")
+
+    return "\n".join(lines)
+
+
+# Global metrics registry instance
+_metrics_registry = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global metrics registry instance."""
+    global _metrics_registry
+    if _metrics_registry is None:
+        _metrics_registry = MetricsRegistry()
+    return _metrics_registry
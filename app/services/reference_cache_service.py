@@ -12,6 +12,8 @@ import time
 from typing import Dict, Optional
 from pathlib import Path
 
+from app.services import json_codec
+
 
 class ReferenceCacheService:
     """
@@ -83,7 +85,7 @@ class ReferenceCacheService:
             # Load cached data
             cache_start = time.time()
             with open(self.cache_file, 'r', encoding='utf-8') as f:
-                reference_data = json.load(f)
+                reference_data = json_codec.loads(f.read())
             cache_load_time = time.time() - cache_start
             
             # Validate data structure
@@ -124,7 +126,7 @@ class ReferenceCacheService:
             
             # Save reference data
             with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(reference_data, f, separators=(',', ':'))  # Compact JSON
+                f.write(json_codec.dumps(reference_data))  # Compact JSON
             
             # Save metadata
             metadata = {
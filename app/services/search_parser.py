@@ -7,11 +7,30 @@ Supports search syntax like:
 - quantity<100 (numeric less than)
 - container=carving (special container search)
 - Mixed: "item=stone tier>2 quantity<50"
+
+compile_query() turns a query into a predicate with field aliases, operators
+and lowercased constants resolved once, so filtering a large table on each
+keystroke only runs the per-row comparisons. Compiled predicates are kept in a
+small LRU cache keyed by query text and tab.
 """
 
 import re
 import logging
-from typing import Dict, List, Tuple, Union, Any, Optional
+import operator as operator_module
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple, Union, Any, Optional
+
+# Numeric comparison functions by search operator
+NUMERIC_OPERATORS = {
+    "=": operator_module.eq,
+    "!=": operator_module.ne,
+    ">": operator_module.gt,
+    "<": operator_module.lt,
+    ">=": operator_module.ge,
+    "<=": operator_module.le,
+}
+
+CONTAINER_FIELDS = ("containers", "container")
 
 
 class SearchParser:
@@ -76,9 +95,13 @@ class SearchParser:
         "journal": ["profession"],
     }
 
+    # Number of compiled queries kept per parser
+    QUERY_CACHE_SIZE = 64
+
     def __init__(self):
         """Initialize the search parser."""
         self.logger = logging.getLogger(__name__)
+        self._compiled_queries: "OrderedDict[Tuple[str, str], Callable[[Dict[str, Any]], bool]]" = OrderedDict()
 
     def parse_search_query(self, search_text: str) -> Dict[str, Any]:
         """
@@ -209,6 +232,205 @@ class SearchParser:
 
         return True
 
+    def compile_query(self, search_text: str, scope: str = "") -> Callable[[Dict[str, Any]], bool]:
+        """
+        Return a predicate matching rows against a search query, reusing a cached one if possible.
+
+        The predicate gives the same result as match_row() with the parsed query.
+
+        Args:
+            search_text: The raw search query string
+            scope: Name of the tab or window filtering with the query, so the same
+                   text searched in different tabs is cached separately
+
+        Returns:
+            Callable taking a data row and returning True if it matches
+        """
+        cache_key = (scope, search_text)
+        predicate = self._compiled_queries.get(cache_key)
+        if predicate is not None:
+            self._compiled_queries.move_to_end(cache_key)
+            return predicate
+
+        predicate = self.compile_parsed_query(self.parse_search_query(search_text))
+        self._compiled_queries[cache_key] = predicate
+        if len(self._compiled_queries) > self.QUERY_CACHE_SIZE:
+            self._compiled_queries.popitem(last=False)
+        return predicate
+
+    def clear_query_cache(self):
+        """Forget compiled queries (needed after FIELD_ALIASES changes)."""
+        self._compiled_queries.clear()
+
+    def compile_parsed_query(self, parsed_query: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Compile a parsed query into a predicate.
+
+        Args:
+            parsed_query: Result from parse_search_query()
+
+        Returns:
+            Callable taking a data row and returning True if it matches
+        """
+        checks = [
+            self._compile_keyword_filter(field, conditions) for field, conditions in parsed_query["keywords"].items()
+        ]
+        if parsed_query["regular_terms"]:
+            checks.append(self._compile_regular_terms(parsed_query["regular_terms"]))
+
+        if not checks:
+            return lambda row: True
+        if len(checks) == 1:
+            return checks[0]
+
+        def predicate(row):
+            for check in checks:
+                if not check(row):
+                    return False
+            return True
+
+        return predicate
+
+    def _compile_keyword_filter(self, field: str, conditions: List[Tuple[str, Any]]) -> Callable[[Dict[str, Any]], bool]:
+        """Compile the conditions on one keyword field, with its aliases resolved once."""
+        field_checks = [
+            (field_name, [self._compile_condition(operator, value, field_name) for operator, value in conditions])
+            for field_name in self.FIELD_ALIASES.get(field, [field])
+        ]
+
+        def check(row):
+            for field_name, comparisons in field_checks:
+                row_value = row.get(field_name)
+                if row_value is None:
+                    continue
+                for compare in comparisons:
+                    if not compare(row_value):
+                        break
+                else:
+                    return True
+            return False
+
+        return check
+
+    def _compile_condition(self, operator: str, search_value: Any, field_name: str) -> Callable[[Any], bool]:
+        """Compile one condition into a function of the row value (see _compare_values)."""
+        if isinstance(search_value, dict) and "type" in search_value:
+            comparisons = [self._compile_single_value(operator, value, field_name) for value in search_value["values"]]
+            if search_value["type"] == "or":
+
+                def match_any(row_value):
+                    for compare in comparisons:
+                        if compare(row_value):
+                            return True
+                    return False
+
+                return match_any
+            if search_value["type"] == "and":
+
+                def match_all(row_value):
+                    for compare in comparisons:
+                        if not compare(row_value):
+                            return False
+                    return True
+
+                return match_all
+            return lambda row_value: False
+        return self._compile_single_value(operator, search_value, field_name)
+
+    def _compile_single_value(self, operator: str, search_value: Any, field_name: str) -> Callable[[Any], bool]:
+        """Compile a comparison against one search value (see _compare_single_value)."""
+        search_str = str(search_value).lower()
+        numeric_search = self._convert_to_numeric(search_value)
+        numeric_compare = NUMERIC_OPERATORS.get(operator, lambda row_numeric, value: False)
+        is_container_field = field_name in CONTAINER_FIELDS
+        to_numeric = self._convert_to_numeric
+        string_compare = self._string_compare
+        logger = self.logger
+
+        if operator in ("=", "!="):
+            # Numbers compare numerically; otherwise = and != are substring tests
+            matched = operator == "="
+            if not isinstance(search_value, (int, float)):
+                numeric_search = None
+
+            def compare(row_value):
+                try:
+                    if is_container_field and isinstance(row_value, dict):
+                        for container_name in row_value:
+                            if search_str in str(container_name).lower():
+                                return matched
+                        return not matched
+
+                    if numeric_search is not None:
+                        row_numeric = row_value if isinstance(row_value, (int, float)) else to_numeric(row_value)
+                        if row_numeric is not None:
+                            return numeric_compare(row_numeric, numeric_search)
+
+                    return (search_str in str(row_value).lower()) == matched
+                except Exception as e:
+                    logger.debug(f"Error comparing {row_value} {operator} {search_value}: {e}")
+                    return False
+
+            return compare
+
+        def compare_ordered(row_value):
+            try:
+                if is_container_field and isinstance(row_value, dict):
+                    return False
+
+                if numeric_search is not None:
+                    row_numeric = row_value if isinstance(row_value, (int, float)) else to_numeric(row_value)
+                    if row_numeric is not None:
+                        return numeric_compare(row_numeric, numeric_search)
+
+                # Alphabetical comparison when either side is not a number
+                return string_compare(str(row_value).lower(), operator, search_str)
+            except Exception as e:
+                logger.debug(f"Error comparing {row_value} {operator} {search_value}: {e}")
+                return False
+
+        return compare_ordered
+
+    def _compile_regular_terms(self, terms: List[str]) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Compile free-text terms; each must appear in some field of the row.
+
+        With several terms, the row's fields are lowercased once into a single
+        newline-joined text. Terms never contain whitespace, so a term cannot
+        match across two fields.
+        """
+        terms_lower = [term.lower() for term in terms]
+
+        if len(terms_lower) == 1:
+            term_lower = terms_lower[0]
+
+            def check_term(row):
+                for key, value in row.items():
+                    if key in CONTAINER_FIELDS and isinstance(value, dict):
+                        for container_name in value:
+                            if term_lower in str(container_name).lower():
+                                return True
+                    elif term_lower in str(value).lower():
+                        return True
+                return False
+
+            return check_term
+
+        def check_terms(row):
+            texts = []
+            for key, value in row.items():
+                if key in CONTAINER_FIELDS and isinstance(value, dict):
+                    texts.extend(str(container_name) for container_name in value)
+                else:
+                    texts.append(str(value))
+            row_text = "\n".join(texts).lower()
+            for term_lower in terms_lower:
+                if term_lower not in row_text:
+                    return False
+            return True
+
+        return check_terms
+
     def _match_keyword_filter(
         self, row: Dict[str, Any], field: str, conditions: List[Tuple[str, Union[str, int, float]]]
     ) -> bool:
@@ -1309,6 +1309,15 @@ class CodexWindow(ctk.CTkToplevel, SearchableWindowMixin):
         Args:
             inventory_data: New inventory data (dict or any data structure)
         """
+        self.refresh_inventory()
+
+    def refresh_inventory(self):
+        """
+        Invalidate cached requirements and schedule a recalculation.
+
+        Requirements are recomputed from the codex service, so callers only
+        need to signal that the claim inventory changed, not pass its contents.
+        """
         try:
             # Only update if we have loaded data and a codex service
             if not hasattr(self, "data_service") or not self.data_service:
@@ -0,0 +1,190 @@
+import json
+import logging
+import time
+
+import customtkinter as ctk
+
+from app.core.data_paths import get_user_data_path
+from app.services.metrics_registry import format_report, get_metrics_registry
+from app.ui.themes import get_color, register_theme_callback
+
+
+class DiagnosticsWindow(ctk.CTkToplevel):
+    """Popup window showing live throughput and latency metrics for each pipeline stage."""
+
+    REFRESH_MS = 1000
+
+    def __init__(self, parent, data_service=None):
+        super().__init__(parent)
+
+        self.parent = parent
+        self.data_service = data_service
+        self.metrics = get_metrics_registry()
+        self._refresh_job = None
+
+        self._setup_window()
+
+        # Register for theme change notifications
+        register_theme_callback(self._on_theme_changed)
+
+        # Apply current theme
+        self.configure(fg_color=get_color("BACKGROUND_PRIMARY"))
+
+        self._create_widgets()
+        self._refresh()
+
+        self.protocol("WM_DELETE_WINDOW", self._on_closing)
+
+    def _setup_window(self):
+        """Configure the diagnostics window."""
+        self.title("Diagnostics")
+        self.geometry("820x560")
+        self.minsize(600, 400)
+        self.transient(self.parent)
+
+        # Configure grid weights
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+    def _create_widgets(self):
+        """Create the diagnostics window UI components."""
+        # Header frame
+        self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.header_frame.grid(row=0, column=0, sticky="ew", padx=20, pady=(20, 10))
+        self.header_frame.grid_columnconfigure(0, weight=1)
+
+        self.title_label = ctk.CTkLabel(
+            self.header_frame,
+            text="Pipeline Metrics",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            anchor="w",
+            text_color=get_color("TEXT_PRIMARY"),
+        )
+        self.title_label.grid(row=0, column=0, sticky="w")
+
+        # Controls frame
+        self.controls_frame = ctk.CTkFrame(self.header_frame, fg_color="transparent")
+        self.controls_frame.grid(row=0, column=1, sticky="e")
+
+        self.export_button = ctk.CTkButton(
+            self.controls_frame,
+            text="Export JSON",
+            width=100,
+            height=30,
+            font=ctk.CTkFont(size=11),
+            command=self.export_json,
+            fg_color=get_color("STATUS_SUCCESS"),
+            hover_color=get_color("BUTTON_HOVER"),
+            text_color=get_color("TEXT_PRIMARY"),
+        )
+        self.export_button.grid(row=0, column=0, padx=(0, 8))
+
+        self.reset_button = ctk.CTkButton(
+            self.controls_frame,
+            text="Reset",
+            width=80,
+            height=30,
+            font=ctk.CTkFont(size=11),
+            command=self._reset,
+            fg_color=get_color("STATUS_ERROR"),
+            hover_color=get_color("STATUS_ERROR"),
+            text_color=get_color("TEXT_PRIMARY"),
+        )
+        self.reset_button.grid(row=0, column=1)
+
+        # Main content frame
+        self.content_frame = ctk.CTkFrame(
+            self, fg_color=get_color("BACKGROUND_SECONDARY"), border_width=1, border_color=get_color("BORDER_DEFAULT")
+        )
+        self.content_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        self.content_frame.grid_columnconfigure(0, weight=1)
+        self.content_frame.grid_rowconfigure(0, weight=1)
+
+        self.report_textbox = ctk.CTkTextbox(
+            self.content_frame,
+            font=ctk.CTkFont(size=11, family="Consolas"),
+            wrap="none",
+            fg_color=get_color("BACKGROUND_TERTIARY"),
+            text_color=get_color("TEXT_PRIMARY"),
+            border_width=1,
+            border_color=get_color("BORDER_DEFAULT"),
+        )
+        self.report_textbox.grid(row=0, column=0, sticky="nsew", padx=15, pady=15)
+        self.report_textbox.configure(state="disabled")
+
+    def collect(self) -> dict:
+        """
+        Gather the registry snapshot plus the stats other components already keep.
+
+        Returns:
+            dict: MetricsRegistry.snapshot() with ingress, validation and
+                  background sections added when available
+        """
+        snapshot = self.metrics.snapshot()
+        service = self.data_service
+        if not service:
+            return snapshot
+
+        try:
+            if getattr(service, "client", None) and hasattr(service.client, "get_ingress_stats"):
+                snapshot["ingress"] = service.client.get_ingress_stats()
+            if getattr(service, "message_router", None):
+                validation = service.message_router.get_validation_stats()
+                validation.pop("table_validation_counts", None)
+                snapshot["validation"] = validation
+            if getattr(service, "background_processor", None):
+                snapshot["background"] = service.background_processor.get_stats()
+        except Exception as e:
+            logging.debug(f"Error collecting diagnostics: {e}")
+        return snapshot
+
+    def _refresh(self):
+        """Redraw the report and schedule the next refresh."""
+        try:
+            report = format_report(self.collect())
+            self.report_textbox.configure(state="normal")
+            self.report_textbox.delete("1.0", "end")
+            self.report_textbox.insert("1.0", report)
+            self.report_textbox.configure(state="disabled")
+        except Exception as e:
+            logging.error(f"Error refreshing diagnostics: {e}")
+        finally:
+            self._refresh_job = self.after(self.REFRESH_MS, self._refresh)
+
+    def export_json(self):
+        """Write the current diagnostics to a timestamped JSON file in the user data directory."""
+        path = get_user_data_path(f"diagnostics_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.collect(), f, indent=2, default=str)
+            logging.info(f"Diagnostics exported to {path}")
+            self.export_button.configure(text="Exported!")
+        except Exception as e:
+            logging.error(f"Error exporting diagnostics: {e}")
+            self.export_button.configure(text="Export failed")
+        self.after(2000, lambda: self.export_button.configure(text="Export JSON"))
+        return path
+
+    def _reset(self):
+        """Clear the registry so the report covers only what happens next."""
+        self.metrics.reset()
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+        self._refresh()
+
+    def _on_closing(self):
+        """Stop refreshing and close the window."""
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        self.destroy()
+
+    def _on_theme_changed(self, old_theme: str, new_theme: str):
+        """Handle theme change by updating colors."""
+        try:
+            self.configure(fg_color=get_color("BACKGROUND_PRIMARY"))
+            self.content_frame.configure(fg_color=get_color("BACKGROUND_SECONDARY"), border_color=get_color("BORDER_DEFAULT"))
+            self.report_textbox.configure(fg_color=get_color("BACKGROUND_TERTIARY"), text_color=get_color("TEXT_PRIMARY"))
+            self.title_label.configure(text_color=get_color("TEXT_PRIMARY"))
+        except Exception as e:
+            logging.error(f"Error applying theme to diagnostics window: {e}")
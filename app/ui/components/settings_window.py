@@ -220,6 +220,19 @@ class SettingsWindow(ctk.CTkToplevel):
         )
         self.export_button.pack(anchor="w", pady=(0, 8))
 
+        # Diagnostics button - fixed width, left aligned
+        self.diagnostics_button = ctk.CTkButton(
+            parent,
+            text="Diagnostics",
+            command=self._open_diagnostics,
+            width=200,
+            height=36,
+            anchor="w",
+            fg_color=get_color("STATUS_INFO"),
+            hover_color=get_color("BUTTON_HOVER"),
+        )
+        self.diagnostics_button.pack(anchor="w", pady=(0, 8))
+
     def _create_notifications_section(self, parent):
         """Create the notifications section with sound customization."""
 
@@ -701,6 +714,18 @@ class SettingsWindow(ctk.CTkToplevel):
             logging.error(f"Error triggering data export: {e}")
             messagebox.showerror("Export Error", f"Failed to export data: {e}")
 
+    def _open_diagnostics(self):
+        """Close settings and open the pipeline metrics window."""
+        try:
+            self._on_closing()
+            if hasattr(self.app, "_open_diagnostics_window"):
+                self.app._open_diagnostics_window()
+            else:
+                logging.warning("Main app does not have _open_diagnostics_window method")
+
+        except Exception as e:
+            logging.error(f"Error opening diagnostics window: {e}")
+
     def _test_notification(self):
         """Show a test notification."""
         try:
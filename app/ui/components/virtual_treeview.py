@@ -0,0 +1,525 @@
+"""
+VirtualTreeview for BitCraft Companion.
+
+A ttk.Treeview that only holds the rows on screen. The filtered and sorted rows
+stay in a VirtualTableModel; the widget keeps a fixed pool of Treeview items
+for the visible window plus a small overscan and rewrites their values as the
+user scrolls, so a claim with thousands of distinct items renders as fast as
+one with forty and uses a constant amount of Tk memory.
+
+Rows are formatted on demand with the same format_row contract as
+AsyncUIRenderer: a dict of column -> text with optional "_tags" and
+"_children" (a list of formatted child rows). Expandable rows are shown with
+an indicator in the tree column; expansion state is kept per row key so it
+survives re-sorting, filtering and data updates.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+from tkinter import ttk
+
+# Tree column indicators for expandable rows
+OPEN_INDICATOR = "▾"
+CLOSED_INDICATOR = "▸"
+
+# Rows scrolled per mouse wheel notch
+WHEEL_ROWS = 3
+
+
+class VirtualTableModel:
+    """
+    In-memory rows behind a VirtualTreeview.
+
+    Rows are kept raw and only formatted when a line is displayed. Each row is
+    one line, followed by one line per child when the row is expanded.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        format_row: Callable[[Dict[str, Any]], Dict[str, Any]],
+        row_key: Callable[[Dict[str, Any]], str],
+    ):
+        """
+        Args:
+            columns: Column identifiers, in display order
+            format_row: Function formatting a raw row for display (column -> text,
+                        plus optional "_tags" and "_children")
+            row_key: Function returning a stable unique key for a raw row
+        """
+        self.columns = list(columns)
+        self.format_row = format_row
+        self.row_key = row_key
+
+        self.rows: List[Dict[str, Any]] = []
+        self.open_keys = set()
+        self.placeholder: Optional[Dict[str, Any]] = None
+
+        # (row index, child index or None) per displayed line
+        self.lines: List[tuple] = []
+        self._line_index: Optional[Dict[str, int]] = None
+
+    def __len__(self):
+        return len(self.lines) if self.rows else (1 if self.placeholder else 0)
+
+    def set_rows(self, rows: List[Dict[str, Any]], placeholder: Optional[Dict[str, Any]] = None):
+        """
+        Replace the rows.
+
+        Args:
+            rows: Raw rows, already filtered and sorted
+            placeholder: Formatted row shown when rows is empty (e.g. an empty-table message)
+        """
+        self.rows = list(rows)
+        self.placeholder = placeholder
+        self._flatten(prune=True)
+
+    def _flatten(self, prune: bool = False):
+        lines = []
+        seen_open = set()
+        for index, row in enumerate(self.rows):
+            lines.append((index, None))
+            if not self.open_keys:
+                continue
+            key = self.row_key(row)
+            if key in self.open_keys:
+                seen_open.add(key)
+                children = self.format_row(row).get("_children") or []
+                lines.extend((index, child) for child in range(len(children)))
+
+        if prune:
+            # Forget expansion of rows that are gone
+            self.open_keys = seen_open
+        self.lines = lines
+        self._line_index = None
+
+    def line(self, index: int, formatted_cache: Optional[Dict[int, Dict]] = None) -> Dict[str, Any]:
+        """
+        Format one displayed line.
+
+        Args:
+            index: Line index
+            formatted_cache: Optional dict reused across calls so a parent row is
+                             formatted once for all of its child lines
+
+        Returns:
+            dict: key, values, tags, text (tree column), expandable, is_open
+        """
+        if not self.rows:
+            placeholder = self.placeholder or {}
+            return {
+                "key": "__placeholder__",
+                "values": [str(placeholder.get(column, "")) for column in self.columns],
+                "tags": tuple(placeholder.get("_tags", ())),
+                "text": "",
+                "expandable": False,
+                "is_open": False,
+            }
+
+        row_index, child_index = self.lines[index]
+        if formatted_cache is not None and row_index in formatted_cache:
+            formatted = formatted_cache[row_index]
+        else:
+            formatted = self.format_row(self.rows[row_index])
+            if formatted_cache is not None:
+                formatted_cache[row_index] = formatted
+
+        key = self.row_key(self.rows[row_index])
+        children = formatted.get("_children") or []
+
+        if child_index is None:
+            is_open = key in self.open_keys
+            return {
+                "key": key,
+                "values": [str(formatted.get(column, "")) for column in self.columns],
+                "tags": tuple(formatted.get("_tags", ())),
+                "text": (OPEN_INDICATOR if is_open else CLOSED_INDICATOR) if children else "",
+                "expandable": bool(children),
+                "is_open": is_open,
+            }
+
+        child = children[child_index] if child_index < len(children) else {}
+        return {
+            "key": f"{key}#{child_index}",
+            "values": [str(child.get(column, "")) for column in self.columns],
+            "tags": tuple(child.get("_tags", ())),
+            "text": "",
+            "expandable": False,
+            "is_open": False,
+        }
+
+    def window(self, start: int, count: int) -> List[Dict[str, Any]]:
+        """Format count lines starting at start (fewer at the end of the table)."""
+        formatted_cache = {}
+        return [self.line(index, formatted_cache) for index in range(max(0, start), min(len(self), start + count))]
+
+    def index_of(self, key: str) -> Optional[int]:
+        """Return the line index of a row or child key, or None if it is not displayed."""
+        if self._line_index is None:
+            self._line_index = {}
+            row_keys = {}
+            for line_index, (row_index, child_index) in enumerate(self.lines):
+                if row_index not in row_keys:
+                    row_keys[row_index] = self.row_key(self.rows[row_index])
+                key_text = row_keys[row_index] if child_index is None else f"{row_keys[row_index]}#{child_index}"
+                self._line_index[key_text] = line_index
+        return self._line_index.get(key)
+
+    def parent_line(self, index: int) -> Optional[int]:
+        """Return the line index of the row a line belongs to (itself for top-level rows)."""
+        if not self.rows or not 0 <= index < len(self.lines):
+            return None
+        row_index = self.lines[index][0]
+        while index > 0 and self.lines[index][1] is not None:
+            index -= 1
+        return index if self.lines[index][0] == row_index else None
+
+    def set_open(self, key: str, is_open: bool) -> bool:
+        """
+        Expand or collapse a row.
+
+        Returns:
+            bool: True if the displayed lines changed
+        """
+        if is_open == (key in self.open_keys):
+            return False
+        if is_open:
+            self.open_keys.add(key)
+        else:
+            self.open_keys.discard(key)
+        self._flatten()
+        return True
+
+    def expand_all(self):
+        """Expand every row that has children."""
+        self.open_keys = {self.row_key(row) for row in self.rows if self.format_row(row).get("_children")}
+        self._flatten()
+
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    Treeview that renders only the visible window of a VirtualTableModel.
+
+    Drop-in for the tabs' ttk.Treeview: headings, columns, tags, bindings and
+    the scrollbar wiring (command=tree.yview, yscrollcommand=vsb.set) work as
+    before. Rows are supplied with set_rows() instead of insert().
+    """
+
+    def __init__(
+        self,
+        master,
+        format_row: Callable[[Dict[str, Any]], Dict[str, Any]],
+        row_key: Callable[[Dict[str, Any]], str],
+        overscan: int = 5,
+        **kwargs,
+    ):
+        """
+        Args:
+            master: Parent widget
+            format_row: Function formatting a raw row for display (see VirtualTableModel)
+            row_key: Function returning a stable unique key for a raw row
+            overscan: Extra rows rendered below the visible ones
+            **kwargs: ttk.Treeview options (columns is required)
+        """
+        self._yscrollcommand = kwargs.pop("yscrollcommand", None)
+        super().__init__(master, **kwargs)
+
+        self.model = VirtualTableModel(kwargs.get("columns", ()), format_row, row_key)
+        self.overscan = overscan
+
+        self.first = 0  # Line index shown in the top row
+        self._slots: List[str] = []  # Recycled Treeview items, in display order
+        self._slot_lines: List[Optional[Dict[str, Any]]] = []  # Line last written to each slot
+        self._attached = 0  # Slots currently attached to the tree
+        self._visible = 1
+
+        self._selected_keys = set()
+        self._applied_selection = set()
+        self._focus_key = None
+
+        self._header_height = None
+        self._row_height = None
+
+        # Own bind tag ahead of the widget's, so tab bindings on the tree don't replace these
+        self._bind_tag = f"VirtualTreeview{id(self)}"
+        self.bindtags((self._bind_tag,) + self.bindtags())
+        for sequence, handler in (
+            ("<Configure>", self._on_configure),
+            ("<MouseWheel>", self._on_mousewheel),
+            ("<Button-4>", self._on_mousewheel),
+            ("<Button-5>", self._on_mousewheel),
+            ("<Button-1>", self._on_click),
+            ("<Double-Button-1>", self._on_double_click),
+            ("<<TreeviewSelect>>", self._on_select),
+            ("<Up>", lambda event: self._move_focus(-1)),
+            ("<Down>", lambda event: self._move_focus(1)),
+            ("<Prior>", lambda event: self._move_focus(-self._visible)),
+            ("<Next>", lambda event: self._move_focus(self._visible)),
+            ("<Home>", lambda event: self._move_focus(-len(self.model))),
+            ("<End>", lambda event: self._move_focus(len(self.model))),
+            ("<Left>", lambda event: self._set_focus_open(False)),
+            ("<Right>", lambda event: self._set_focus_open(True)),
+        ):
+            self.bind_class(self._bind_tag, sequence, handler)
+
+    # ---- model ----
+
+    def set_rows(self, rows: List[Dict[str, Any]], empty_message: Optional[str] = None):
+        """
+        Show new rows, keeping the scroll position, expansion and selection.
+
+        Args:
+            rows: Raw rows, already filtered and sorted
+            empty_message: Text shown (with the "empty" tag) when rows is empty
+        """
+        placeholder = None
+        if empty_message is not None and self.model.columns:
+            placeholder = {self.model.columns[0]: empty_message, "_tags": ("empty",)}
+        self.model.set_rows(rows, placeholder)
+        self.refresh()
+
+    def refresh(self):
+        """Re-format the visible window from the model; only changed items are written."""
+        try:
+            self._render_window()
+        except Exception as e:
+            logging.error(f"[VirtualTreeview] Error rendering rows: {e}")
+
+    def expand_all(self):
+        """Expand every row that has children."""
+        self.model.expand_all()
+        self.refresh()
+
+    def row_count(self) -> int:
+        """Number of lines in the model (rendered or not)."""
+        return len(self.model)
+
+    def item_for_key(self, key: str) -> Optional[str]:
+        """Return the Treeview item currently showing a row key, or None if it is off screen."""
+        for slot, line in zip(self._slots[: self._attached], self._slot_lines):
+            if line and line["key"] == key:
+                return slot
+        return None
+
+    # ---- rendering ----
+
+    def _render_window(self):
+        total = len(self.model)
+        self._visible = self._visible_rows()
+        self.first = max(0, min(self.first, total - self._visible))
+        lines = self.model.window(self.first, self._visible + self.overscan)
+
+        for position, line in enumerate(lines):
+            if position < len(self._slots):
+                slot = self._slots[position]
+                if position >= self._attached:
+                    super().move(slot, "", position)
+                if self._slot_lines[position] != line:
+                    super().item(slot, text=line["text"], values=line["values"], tags=line["tags"])
+                    self._slot_lines[position] = line
+            else:
+                slot = super().insert("", "end", text=line["text"], values=line["values"], tags=line["tags"])
+                self._slots.append(slot)
+                self._slot_lines.append(line)
+
+        # Park unused slots for reuse
+        if len(lines) < self._attached:
+            super().detach(*self._slots[len(lines) : self._attached])
+        for position in range(len(lines), len(self._slot_lines)):
+            self._slot_lines[position] = None
+        self._attached = len(lines)
+
+        # All slots fit from the top; undo any scrolling Tk did on its own
+        super().yview_moveto(0)
+        self._restore_selection()
+        self._update_scrollbar()
+
+    def _visible_rows(self) -> int:
+        """Number of rows that fit in the widget's current height."""
+        height = self.winfo_height()
+        if self._attached and (self._row_height is None or self._header_height is None):
+            bbox = super().bbox(self._slots[0])
+            if bbox:
+                self._header_height, self._row_height = bbox[1], bbox[3]
+        row_height = self._row_height or self._style_row_height()
+        header_height = self._header_height if self._header_height is not None else row_height + 4
+        return max(1, (height - header_height) // row_height)
+
+    def _style_row_height(self) -> int:
+        try:
+            return int(ttk.Style().lookup(self.cget("style") or "Treeview", "rowheight") or 20)
+        except (ValueError, TypeError):
+            return 20
+
+    def _update_scrollbar(self):
+        if not self._yscrollcommand:
+            return
+        first, last = self.yview()
+        self._yscrollcommand(first, last)
+
+    def _restore_selection(self):
+        wanted = {
+            slot for slot, line in zip(self._slots[: self._attached], self._slot_lines) if line and line["key"] in self._selected_keys
+        }
+        if wanted != set(super().selection()):
+            super().selection_set(list(wanted))
+        self._applied_selection = wanted
+
+        focus_slot = self.item_for_key(self._focus_key) if self._focus_key else None
+        if focus_slot:
+            super().focus(focus_slot)
+
+    # ---- scrolling ----
+
+    def configure(self, cnf=None, **kw):
+        """Capture yscrollcommand: the scrollbar reflects the model, not the items in the tree."""
+        if isinstance(cnf, dict) and "yscrollcommand" in cnf:
+            cnf = dict(cnf)
+            kw["yscrollcommand"] = cnf.pop("yscrollcommand")
+        if "yscrollcommand" in kw:
+            self._yscrollcommand = kw.pop("yscrollcommand")
+            self._update_scrollbar()
+            if not kw and not cnf:
+                return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def yview(self, *args):
+        """Scrollbar protocol over the model: no arguments returns (first, last) fractions."""
+        total = len(self.model)
+        if not args:
+            if not total:
+                return (0.0, 1.0)
+            return (self.first / total, min(1.0, (self.first + self._visible) / total))
+
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                amount *= self._visible
+            self.scroll_to(self.first + amount)
+        return None
+
+    def yview_moveto(self, fraction):
+        self.yview("moveto", fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview("scroll", number, what)
+
+    def scroll_to(self, first: int):
+        """Show the window starting at line first."""
+        first = max(0, min(int(first), len(self.model) - self._visible))
+        if first != self.first:
+            self.first = first
+            self.refresh()
+
+    def see_line(self, index: int):
+        """Scroll the least amount needed to show a line."""
+        if index < self.first:
+            self.scroll_to(index)
+        elif index >= self.first + self._visible:
+            self.scroll_to(index - self._visible + 1)
+
+    # ---- events ----
+
+    def _on_configure(self, event=None):
+        # Row height can change with the theme; measure again on the next render
+        self._row_height = self._header_height = None
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4:
+            notches = -1
+        elif getattr(event, "num", None) == 5:
+            notches = 1
+        else:
+            delta = getattr(event, "delta", 0)
+            notches = -(delta // 120) if abs(delta) >= 120 else (-1 if delta > 0 else 1)
+        self.scroll_to(self.first + notches * WHEEL_ROWS)
+        return "break"
+
+    def _line_at(self, y: int) -> Optional[int]:
+        slot = super().identify_row(y)
+        if not slot or slot not in self._slots[: self._attached]:
+            return None
+        return self.first + self._slots.index(slot)
+
+    def _on_click(self, event):
+        """Toggle a row when its indicator in the tree column is clicked."""
+        if super().identify_region(event.x, event.y) != "tree":
+            return None
+        line_index = self._line_at(event.y)
+        if line_index is None:
+            return None
+        line = self.model.line(line_index)
+        if line["expandable"]:
+            self._toggle(line)
+            return "break"
+        return None
+
+    def _on_double_click(self, event):
+        line_index = self._line_at(event.y)
+        if line_index is not None:
+            line = self.model.line(line_index)
+            if line["expandable"]:
+                self._toggle(line)
+                return "break"
+        return None
+
+    def _toggle(self, line: Dict[str, Any]):
+        if self.model.set_open(line["key"], not line["is_open"]):
+            self.refresh()
+
+    def _on_select(self, event=None):
+        """Remember the selection by row key so it follows rows while scrolling."""
+        current = set(super().selection())
+        if current == self._applied_selection:
+            return
+        lines = dict(zip(self._slots[: self._attached], self._slot_lines))
+        self._selected_keys = {lines[slot]["key"] for slot in current if lines.get(slot)}
+        self._applied_selection = current
+        focus_slot = super().focus()
+        if focus_slot and lines.get(focus_slot):
+            self._focus_key = lines[focus_slot]["key"]
+
+    def _focus_line(self) -> Optional[int]:
+        if self._focus_key is not None:
+            index = self.model.index_of(self._focus_key)
+            if index is not None:
+                return index
+        return None
+
+    def _move_focus(self, step: int):
+        """Move focus and selection by step lines, scrolling the window as needed."""
+        total = len(self.model)
+        if not total or not self.model.rows:
+            return "break"
+        current = self._focus_line()
+        if current is None:
+            # Nothing focused yet: Down starts at the top row, Up just above it
+            current = self.first - 1 if step > 0 else self.first
+        index = max(0, min(total - 1, current + step))
+        key = self.model.line(index)["key"]
+        self._focus_key = key
+        self._selected_keys = {key}
+        self.see_line(index)
+        self.refresh()
+        return "break"
+
+    def _set_focus_open(self, is_open: bool):
+        index = self._focus_line()
+        if index is None:
+            return "break"
+        parent_index = self.model.parent_line(index)
+        if parent_index is None:
+            return "break"
+        line = self.model.line(parent_index)
+        if line["expandable"] and self.model.set_open(line["key"], is_open):
+            if not is_open:
+                # Focus moves up to the collapsed row if it was on one of its children
+                self._focus_key = line["key"]
+                self._selected_keys = {line["key"]}
+            self.refresh()
+        return "break"
@@ -0,0 +1,171 @@
+"""
+Time-budgeted draining of the UI data queue.
+
+DataQueueDrainer takes every message waiting in the data queue, drops full
+snapshots that a newer snapshot for the same tab replaces, and dispatches the
+rest through a handler table until the frame budget is spent. Whatever is left
+stays pending for the next call, so a burst is spread over several Tk frames
+instead of freezing the window. Scheduling is left to the caller (MainWindow),
+which keeps this module free of Tk.
+"""
+
+import logging
+import queue
+import time
+
+from app.services.latency_tracer import earliest
+
+# Message types that carry a tab's complete data set; only the newest queued
+# one of each type needs to be rendered
+COALESCED_TYPES = frozenset({"inventory_update", "crafting_update", "active_crafting_update", "tasks_update"})
+
+# List-valued change keys kept from superseded snapshots so no celebration is lost
+MERGED_CHANGE_KEYS = ("crafting_completed", "completed_tasks")
+
+
+def _supersede(older, newer):
+    """Return newer carrying the celebrations and earliest trace of the snapshot it replaces."""
+    merged = dict(newer)
+
+    older_changes = older.get("changes") or {}
+    if any(older_changes.get(key) for key in MERGED_CHANGE_KEYS):
+        changes = dict(newer.get("changes") or {})
+        for key in MERGED_CHANGE_KEYS:
+            if older_changes.get(key):
+                changes[key] = list(older_changes[key]) + list(changes.get(key) or [])
+        merged["changes"] = changes
+
+    trace = earliest([older.get("trace"), newer.get("trace")])
+    if trace:
+        merged["trace"] = trace
+
+    merged["coalesced"] = older.get("coalesced", 0) + newer.get("coalesced", 0) + 1
+    return merged
+
+
+def coalesce_messages(messages):
+    """
+    Keep only the newest snapshot of each COALESCED_TYPES type.
+
+    The kept snapshot stays at the position of the newest one, so deltas queued
+    after it still apply on top of it. It inherits the completion lists and the
+    earliest latency trace of the snapshots it replaces, and counts them in
+    "coalesced".
+
+    Args:
+        messages: Queued messages, oldest first
+
+    Returns:
+        list: Messages to dispatch, oldest first
+    """
+    newest = {}
+    for index, message in enumerate(messages):
+        if message.get("type") in COALESCED_TYPES:
+            newest[message["type"]] = index
+
+    result = []
+    superseded = {}
+    for index, message in enumerate(messages):
+        msg_type = message.get("type")
+        if msg_type in COALESCED_TYPES and newest[msg_type] != index:
+            superseded[msg_type] = _supersede(superseded[msg_type], message) if msg_type in superseded else message
+            continue
+        if msg_type in superseded:
+            message = _supersede(superseded.pop(msg_type), message)
+        result.append(message)
+    return result
+
+
+class DataQueueDrainer:
+    """Drains a data queue into a handler table within a time budget."""
+
+    def __init__(self, data_queue, handlers, budget: float = 0.012, on_unknown=None):
+        """
+        Args:
+            data_queue: Queue the processors put UI messages on
+            handlers: Message type -> callable(message)
+            budget: Seconds of dispatching per drain() call before yielding
+            on_unknown: Callable(message) for types without a handler
+        """
+        self.data_queue = data_queue
+        self.handlers = handlers
+        self.budget = budget
+        self.on_unknown = on_unknown
+
+        self.pending = []
+        self.dispatched = 0
+        self.coalesced = 0
+
+    def collect(self) -> int:
+        """
+        Move everything waiting in the queue to the pending list and coalesce it.
+
+        Returns:
+            int: Messages pending after coalescing
+        """
+        taken = 0
+        while True:
+            try:
+                self.pending.append(self.data_queue.get_nowait())
+                taken += 1
+            except queue.Empty:
+                break
+
+        if taken:
+            before = len(self.pending)
+            self.pending = coalesce_messages(self.pending)
+            self.coalesced += before - len(self.pending)
+        return len(self.pending)
+
+    def drain(self, budget=None, before_dispatch=None, after_dispatch=None) -> bool:
+        """
+        Collect queued messages and dispatch them until the budget is spent.
+
+        At least one message is dispatched per call, so progress is made even
+        when a single handler takes longer than the budget.
+
+        Args:
+            budget: Seconds to spend (defaults to self.budget)
+            before_dispatch: Optional callable(message) run before each handler
+            after_dispatch: Optional callable(message) run after each handler
+
+        Returns:
+            bool: True if messages are still pending
+        """
+        budget = self.budget if budget is None else budget
+        self.collect()
+        deadline = time.perf_counter() + budget
+
+        index = 0
+        try:
+            while index < len(self.pending):
+                message = self.pending[index]
+                index += 1
+                if before_dispatch:
+                    before_dispatch(message)
+                self._dispatch(message)
+                if after_dispatch:
+                    after_dispatch(message)
+                if time.perf_counter() >= deadline:
+                    break
+        finally:
+            self.dispatched += index
+            del self.pending[:index]
+        return bool(self.pending)
+
+    def clear(self):
+        """Drop pending messages (the queue itself is left alone)."""
+        self.pending = []
+
+    def _dispatch(self, message):
+        msg_type = message.get("type")
+        handler = self.handlers.get(msg_type)
+        try:
+            if handler is not None:
+                handler(message)
+            elif self.on_unknown:
+                self.on_unknown(message)
+            else:
+                logging.warning(f"Unknown message type received: {msg_type}")
+        except Exception as e:
+            logging.error(f"Error handling {msg_type} message: {e}")
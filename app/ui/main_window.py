@@ -1,7 +1,6 @@
 import os
 import sys
 import time
-import queue
 import threading
 import logging
 from typing import Dict, List, Any
@@ -18,7 +17,11 @@ from app.ui.tabs.active_crafting_tab import ActiveCraftingTab
 from app.ui.tabs.traveler_tasks_tab import TravelerTasksTab
 from app.ui.components.activity_window import ActivityWindow
 from app.ui.components.codex_window import CodexWindow
+from app.ui.components.diagnostics_window import DiagnosticsWindow
 from app.services.activity_logger import ActivityLogger
+from app.services.latency_tracer import finish_trace
+from app.services.metrics_registry import get_metrics_registry
+from app.ui.data_queue_drain import DataQueueDrainer
 from app.ui.themes import get_theme_manager, get_color, register_theme_callback
 from app.ui.components.saved_search_dialog import SaveSearchDialog, LoadSearchDialog
 from app.ui.mixins import SearchableWindowMixin
@@ -78,6 +81,27 @@ class ShutdownDialog(ctk.CTkToplevel):
 class MainWindow(ctk.CTk, SearchableWindowMixin):
     """Main application window with modular tab system and responsive shutdown."""
 
+    # Tab that renders each traced message type (latency traces finish when it has rendered)
+    TRACE_TABS = {
+        "inventory_update": "Claim Inventory",
+        "inventory_delta": "Claim Inventory",
+        "crafting_update": "Passive Crafting",
+        "crafting_timer_update": "Passive Crafting",
+        "active_crafting_update": "Active Crafting",
+        "active_crafting_progress_update": "Active Crafting",
+        "tasks_update": "Traveler's Tasks",
+    }
+
+    # Seconds to wait for a tab render before finishing a trace anyway
+    TRACE_RENDER_TIMEOUT = 5.0
+
+    # Seconds of message dispatching per Tk frame before yielding to the event loop
+    DRAIN_BUDGET = 0.012
+
+    # Fallback poll when no <<DataQueued>> wake-up arrives, and drain delay while resizing
+    FALLBACK_POLL_MS = 1000
+    RESIZE_DRAIN_DELAY_MS = 250
+
     def __init__(self, data_service: DataService):
         super().__init__()
         logging.info("Initializing main application window")
@@ -132,6 +156,7 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
         
         # Codex window reference (UI only created when needed)
         self.codex_window = None
+        self.diagnostics_window = None
 
         # Shutdown tracking
         self.is_shutting_down = False
@@ -141,6 +166,13 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
         self.is_resizing = False
         self.resize_timer = None
 
+        # Data queue drain (started once the tabs exist)
+        self.data_drainer = None
+        self._drain_job = None
+        self._drain_due = 0.0
+        self._wake_requested = False
+        self._picked_at = 0.0
+
         # Create the claim info header
         logging.debug("Creating claim info header")
         # Note: Reference data will be updated later when DataService is fully initialized
@@ -203,9 +235,9 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
         self.is_loading = False
         self.loading_overlay.grid_remove()
 
-        # Start data processing with enhanced timer support and resize detection
-        logging.debug("Starting data processing loop with enhanced timer support")
-        self.after(100, self.process_data_queue)
+        # Start event-driven data processing with resize detection
+        logging.debug("Starting data queue drain")
+        self._start_data_queue_drain()
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.bind("<Configure>", self._on_window_configure)
         self.bind("<Escape>", self._on_escape_key)
@@ -239,8 +271,8 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
         for btn in self.tab_buttons.values():
             btn.configure(state=state)
 
-        # Start data processing with enhanced timer support
-        self.after(100, self.process_data_queue)
+        # Start data processing (no-op if already running)
+        self._start_data_queue_drain()
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def _create_search_section(self):
@@ -707,6 +739,9 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
     def _update_status_display(self):
         """Update the status bar display with current information."""
         try:
+            if getattr(self, "is_reconnecting", False):
+                return
+
             # Update last update time (simplified - no color coding)
             if self.last_message_time:
                 time_since_update = time.time() - self.last_message_time
@@ -722,6 +757,19 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
         except Exception as e:
             logging.error(f"Error updating status display: {e}")
 
+    def _handle_connection_status(self, msg_data):
+        """Show reconnect progress in the status bar."""
+        try:
+            status = (msg_data or {}).get("status")
+            self.is_reconnecting = status == "reconnecting"
+            if self.is_reconnecting:
+                self.last_update_label.configure(text="Connection lost - reconnecting...", text_color=get_color("STATUS_WARNING"))
+            elif status == "connected":
+                self._update_status_display()
+            logging.info(f"Connection status: {status}")
+        except Exception as e:
+            logging.error(f"Error handling connection status: {e}")
+
     def _schedule_status_update(self):
         """Schedule the next status update."""
         try:
@@ -1008,6 +1056,20 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
         except Exception as e:
             logging.error(f"Error opening codex window: {e}")
 
+    def _open_diagnostics_window(self):
+        """Opens the pipeline metrics diagnostics window."""
+        try:
+            if not self.diagnostics_window or not self.diagnostics_window.winfo_exists():
+                self.diagnostics_window = DiagnosticsWindow(self, data_service=self.data_service)
+                logging.info("Diagnostics window opened")
+            else:
+                # Bring existing window to front
+                self.diagnostics_window.lift()
+                self.diagnostics_window.focus()
+
+        except Exception as e:
+            logging.error(f"Error opening diagnostics window: {e}")
+
     def _update_activity_window_claim_info(self, claim_name: str):
         """Update activity window with new claim info."""
         try:
@@ -1254,6 +1316,8 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
 
         logging.info("[MainWindow] Closing application...")
         self.is_shutting_down = True
+        if hasattr(self.data_service.data_queue, "set_notifier"):
+            self.data_service.data_queue.set_notifier(None)
 
         try:
             # STEP 1: Immediately hide main window and close child windows
@@ -1596,185 +1660,262 @@ class MainWindow(ctk.CTk, SearchableWindowMixin):
         except Exception as e:
             logging.error(f"Error handling traveler task retry status: {e}")
 
-    def process_data_queue(self):
-        """Enhanced data queue processing that handles claim switching messages."""
+    def _start_data_queue_drain(self):
+        """
+        Start draining the data queue.
+
+        Producers wake the drain through <<DataQueued>> as soon as they queue a
+        message; a slow fallback poll covers queues that cannot notify. Safe to
+        call more than once.
+        """
+        if self.data_drainer is None:
+            self.data_drainer = DataQueueDrainer(self.data_service.data_queue, self._build_message_handlers(), self.DRAIN_BUDGET)
+            self.bind("<<DataQueued>>", self._on_data_queued)
+            if hasattr(self.data_service.data_queue, "set_notifier"):
+                self.data_service.data_queue.set_notifier(self._notify_data_queued)
+        self._schedule_drain(0)
+
+    def _notify_data_queued(self):
+        """Wake the drain loop; runs on the producer's thread, so only posts a Tk event."""
+        if self._wake_requested or self.is_shutting_down:
+            return
+        self._wake_requested = True
         try:
-            message_count = 0
-            queue_size = self.data_service.data_queue.qsize()
-            if queue_size > 0:
-                logging.info(f"[MAIN WINDOW] Processing queue with {queue_size} messages")
-            while not self.data_service.data_queue.empty():
-                message = self.data_service.data_queue.get_nowait()
-                message_count += 1
-                msg_type = message.get("type")
-                msg_data = message.get("data")
-
-                # Update last message time for status bar
-                self.update_last_message_time()
-
-                # Log data type and size for debugging
-                data_size = len(msg_data) if isinstance(msg_data, (dict, list)) else "unknown"
-                logging.info(f"[MAIN WINDOW] Processing message {message_count}: {msg_type} (data size: {data_size})")
-
-                if msg_type == "inventory_update":
-                    logging.info(f"[MAIN WINDOW] Received inventory_update message with {len(msg_data) if isinstance(msg_data, dict) else 'unknown'} items")
-                    if "Claim Inventory" in self.tabs:
-                        start_time = time.time()
-
-                        # Log inventory data details for debugging
-                        data_size = len(msg_data) if isinstance(msg_data, dict) else "unknown"
-                        logging.info(f"[MAIN WINDOW] Processing inventory update: {data_size} items, loading state: {self.is_loading}")
-
-                        self.tabs["Claim Inventory"].update_data(msg_data)
-                        update_time = time.time() - start_time
-                        logging.debug(f"Inventory tab update took {update_time:.3f}s")
-
-                    # Update codex window if it's open
-                    if self.codex_window and self.codex_window.winfo_exists():
-                        try:
-                            self.codex_window.update_data(msg_data)
-                            logging.debug("Updated codex window with inventory changes")
-                        except Exception as e:
-                            logging.error(f"Error updating codex window: {e}")
-
-                        # Track that we've received inventory data
-                        if self.is_loading:
-                            self.received_data_types.add("inventory")
-                            logging.info(
-                                f"[LOADING STATE] Received inventory data - progress: {self.received_data_types}/{self.expected_data_types}"
-                            )
-                            self._check_all_data_loaded()
-                        else:
-                            logging.debug(f"Inventory update processed while not in loading state")
-
-                elif msg_type == "crafting_update":
-                    if "Passive Crafting" in self.tabs:
-                        start_time = time.time()
-                        self.tabs["Passive Crafting"].update_data(msg_data)
-                        update_time = time.time() - start_time
-                        logging.debug(f"Crafting tab update took {update_time:.3f}s")
-
-                        # Check for completion celebrations
-                        changes = message.get("changes", {})
-                        if changes.get("crafting_completed"):
-                            self._celebrate_completions(changes["crafting_completed"])
-
-                        # Track that we've received crafting data
-                        if self.is_loading:
-                            self.received_data_types.add("crafting")
-                            logging.debug(f"Received crafting data - progress: {self.received_data_types}")
-                            self._check_all_data_loaded()
-
-                elif msg_type == "active_crafting_update":
-                    if "Active Crafting" in self.tabs:
-                        start_time = time.time()
-                        self.tabs["Active Crafting"].update_data(msg_data)
-                        update_time = time.time() - start_time
-                        logging.debug(f"Active crafting tab update took {update_time:.3f}s")
-
-                        # Track that we've received active crafting data
-                        if self.is_loading:
-                            self.received_data_types.add("active_crafting")
-                            logging.debug(f"Received active crafting data - progress: {self.received_data_types}")
-                            self._check_all_data_loaded()
-
-                elif msg_type == "timer_update":
-                    if "Passive Crafting" in self.tabs:
-                        self.tabs["Passive Crafting"].update_data(msg_data)
-
-                elif msg_type == "crafting_timer_update":
-                    if "Passive Crafting" in self.tabs:
-                        # Lightweight timer update - only update time values
-                        self.tabs["Passive Crafting"].update_timer_only(msg_data or {})
-
-                elif msg_type == "tasks_update":
-                    logging.debug(
-                        f"MAIN WINDOW: Processing tasks_update with {len(msg_data) if isinstance(msg_data, list) else 'invalid'} items"
-                    )
-                    if "Traveler's Tasks" in self.tabs:
-                        self.tabs["Traveler's Tasks"].update_data(msg_data)
-                        # Check for task completions
-                        changes = message.get("changes", {})
-                        if changes.get("completed_tasks"):
-                            self._celebrate_task_completions(changes["completed_tasks"])
-
-                        # Track that we've received tasks data
-                        if self.is_loading:
-                            self.received_data_types.add("tasks")
-                            self._check_all_data_loaded()
-                    else:
-                        logging.warning("MAIN WINDOW: Traveler's Tasks tab not found for tasks_update")
+            self.event_generate("<<DataQueued>>", when="tail")
+        except Exception as e:
+            # Main loop not running yet (or already gone); the fallback poll picks the message up
+            self._wake_requested = False
+            logging.debug(f"Could not post data queue wake-up: {e}")
 
-                elif msg_type == "claim_info_update":
-                    self.claim_info.update_claim_data(msg_data)
-                    # Track that we've received claim info data
-                    if self.is_loading:
-                        self.received_data_types.add("claim_info")
-                        self._check_all_data_loaded()
+    def _on_data_queued(self, event=None):
+        """Drain right away, or after a short delay while the window is being resized."""
+        self._schedule_drain(self.RESIZE_DRAIN_DELAY_MS if self.is_resizing else 0)
 
-                elif msg_type == "activity_status":
-                    # Update player activity status in the claim info header
-                    if hasattr(self, "claim_info") and self.claim_info:
-                        self.claim_info.update_player_activity_status(msg_data)
-                        logging.debug(f"Activity status updated: {msg_data.get('status', 'Unknown')}")
-
-                elif msg_type == "reference_data_update":
-                    # Update ClaimInfoHeader when claim_tile_cost data changes
-                    table_name = msg_data.get('table', '')
-                    if table_name == "claim_tile_cost" or table_name == "":  # Empty means initial load
-                        try:
-                            # Get reference data from any processor that has it
-                            reference_data = None
-                            for processor in getattr(self.data_service, "processors", []):
-                                if hasattr(processor, "reference_data") and processor.reference_data:
-                                    reference_data = processor.reference_data
-                                    break
-                            
-                            if reference_data and hasattr(self, "claim_info") and self.claim_info:
-                                self.claim_info.update_reference_data(reference_data)
-                        except Exception as e:
-                            logging.error(f"Error updating ClaimInfoHeader reference data: {e}")
-
-                elif msg_type == "claim_switching":
-                    self._handle_claim_switching_message(msg_data)
-
-                elif msg_type == "claim_switched":
-                    self._handle_claim_switched_message(msg_data)
-
-                elif msg_type == "claims_list_update":
-                    self._handle_claims_list_update(msg_data)
-
-                elif msg_type == "player_state_update":
-                    self._handle_player_state_update(msg_data)
-
-                elif msg_type == "traveler_task_timer_update":
-                    self._handle_traveler_task_timer_update(msg_data)
-
-                elif msg_type == "traveler_task_retry_status":
-                    self._handle_traveler_task_retry_status(msg_data)
-
-                elif msg_type == "reference_data_loaded":
-                    pass
+    def _schedule_drain(self, delay_ms: int):
+        """
+        Schedule process_data_queue, keeping only the earliest pending run.
 
-                elif msg_type == "error":
-                    messagebox.showerror("Error", msg_data)
-                    logging.error(f"Error message displayed: {msg_data}")
+        Args:
+            delay_ms: Milliseconds until the drain should run
+        """
+        due = time.monotonic() + delay_ms / 1000
+        if self._drain_job is not None:
+            if self._drain_due <= due:
+                return
+            self.after_cancel(self._drain_job)
+        self._drain_due = due
+        self._drain_job = self.after(delay_ms, self.process_data_queue)
 
-                    # Hide loading on error
-                    if self.is_loading:
-                        self.hide_loading()
+    def _build_message_handlers(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: Message type -> handler taking the queued message
+        """
+        return {
+            "inventory_update": self._handle_inventory_update,
+            "inventory_delta": self._handle_inventory_delta,
+            "crafting_update": self._handle_crafting_update,
+            "active_crafting_update": self._handle_active_crafting_update,
+            "timer_update": lambda message: self._update_tab("Passive Crafting", "update_data", message.get("data")),
+            "crafting_timer_update": lambda message: self._update_tab(
+                "Passive Crafting", "update_timer_only", message.get("data") or {}
+            ),
+            "active_crafting_progress_update": lambda message: self._update_tab(
+                "Active Crafting", "update_progress_only", message.get("data") or {}
+            ),
+            "tasks_update": self._handle_tasks_update,
+            "claim_info_update": self._handle_claim_info_update,
+            "activity_status": self._handle_activity_status,
+            "reference_data_update": self._handle_reference_data_update,
+            "claim_switching": lambda message: self._handle_claim_switching_message(message.get("data")),
+            "claim_switched": lambda message: self._handle_claim_switched_message(message.get("data")),
+            "claims_list_update": lambda message: self._handle_claims_list_update(message.get("data")),
+            "player_state_update": lambda message: self._handle_player_state_update(message.get("data")),
+            "traveler_task_timer_update": lambda message: self._handle_traveler_task_timer_update(message.get("data")),
+            "traveler_task_retry_status": lambda message: self._handle_traveler_task_retry_status(message.get("data")),
+            "reference_data_loaded": lambda message: None,
+            "connection_status": lambda message: self._handle_connection_status(message.get("data")),
+            "error": self._handle_error_message,
+        }
 
-                else:
-                    logging.warning(f"Unknown message type received: {msg_type}")
+    def process_data_queue(self):
+        """
+        Dispatch queued data messages for up to DRAIN_BUDGET seconds.
 
-        except queue.Empty:
-            pass
+        Superseded tab snapshots are dropped before dispatch; messages left when
+        the budget runs out are handled on the next Tk frame so a burst never
+        freezes the window.
+        """
+        self._drain_job = None
+        self._wake_requested = False
+        metrics = get_metrics_registry()
+        drain_start = time.perf_counter()
+        dispatched_before = self.data_drainer.dispatched
+        more = False
+        try:
+            more = self.data_drainer.drain(before_dispatch=self._before_dispatch, after_dispatch=self._after_dispatch)
+            metrics.record_queue_depth("data_queue", self.data_service.data_queue.qsize() + len(self.data_drainer.pending))
         except Exception as e:
             logging.error(f"Error processing data queue: {e}")
         finally:
-            # Adaptive update frequency: slower during resize for better performance
-            interval = 250 if self.is_resizing else 100
-            self.after(interval, self.process_data_queue)
+            dispatched = self.data_drainer.dispatched - dispatched_before
+            if dispatched:
+                metrics.observe_latency("ui.process_data_queue", time.perf_counter() - drain_start)
+                logging.debug(
+                    f"[MAIN WINDOW] Dispatched {dispatched} messages, {len(self.data_drainer.pending)} pending, "
+                    f"{self.data_drainer.coalesced} coalesced so far"
+                )
+
+            if more:
+                self._schedule_drain(self.RESIZE_DRAIN_DELAY_MS if self.is_resizing else 1)
+            else:
+                self._schedule_drain(self.FALLBACK_POLL_MS)
+
+    def _before_dispatch(self, message):
+        """Note when a message was picked up for its latency trace and the status bar."""
+        self._picked_at = time.time()
+        self.update_last_message_time()
+        logging.debug(f"[MAIN WINDOW] Processing {message.get('type')} message")
+
+    def _after_dispatch(self, message):
+        """Finish the latency trace of the server transaction behind a handled message."""
+        trace = message.get("trace")
+        if trace:
+            self._finish_trace_after_render(
+                {**trace, "picked": self._picked_at, "handled": time.time()}, self.TRACE_TABS.get(message.get("type"))
+            )
+
+    def _update_tab(self, tab_name: str, method: str, data) -> bool:
+        """
+        Pass data to a tab method if the tab exists.
+
+        Returns:
+            bool: True if the tab was updated
+        """
+        tab = self.tabs.get(tab_name)
+        if tab is None:
+            return False
+        start_time = time.time()
+        getattr(tab, method)(data)
+        logging.debug(f"{tab_name} {method} took {time.time() - start_time:.3f}s")
+        return True
+
+    def _mark_data_received(self, data_type: str):
+        """Track a first data set while the loading overlay is shown."""
+        if self.is_loading:
+            self.received_data_types.add(data_type)
+            logging.debug(f"Received {data_type} data - progress: {self.received_data_types}")
+            self._check_all_data_loaded()
+
+    def _refresh_codex_window(self):
+        """Tell the codex window, if open, that the claim inventory changed."""
+        if self.codex_window and self.codex_window.winfo_exists():
+            try:
+                self.codex_window.refresh_inventory()
+            except Exception as e:
+                logging.error(f"Error updating codex window: {e}")
+
+    def _handle_inventory_update(self, message):
+        msg_data = message.get("data")
+        if self._update_tab("Claim Inventory", "update_data", msg_data):
+            self._mark_data_received("inventory")
+        self._refresh_codex_window()
+
+    def _handle_inventory_delta(self, message):
+        msg_data = message.get("data")
+        self._update_tab("Claim Inventory", "apply_delta", msg_data or {})
+        self._refresh_codex_window()
+
+    def _handle_crafting_update(self, message):
+        if self._update_tab("Passive Crafting", "update_data", message.get("data")):
+            # Check for completion celebrations
+            changes = message.get("changes") or {}
+            if changes.get("crafting_completed"):
+                self._celebrate_completions(changes["crafting_completed"])
+            self._mark_data_received("crafting")
+
+    def _handle_active_crafting_update(self, message):
+        if self._update_tab("Active Crafting", "update_data", message.get("data")):
+            self._mark_data_received("active_crafting")
+
+    def _handle_tasks_update(self, message):
+        if self._update_tab("Traveler's Tasks", "update_data", message.get("data")):
+            # Check for task completions
+            changes = message.get("changes") or {}
+            if changes.get("completed_tasks"):
+                self._celebrate_task_completions(changes["completed_tasks"])
+            self._mark_data_received("tasks")
+        else:
+            logging.warning("MAIN WINDOW: Traveler's Tasks tab not found for tasks_update")
+
+    def _handle_claim_info_update(self, message):
+        self.claim_info.update_claim_data(message.get("data"))
+        self._mark_data_received("claim_info")
+
+    def _handle_activity_status(self, message):
+        # Update player activity status in the claim info header
+        msg_data = message.get("data") or {}
+        if hasattr(self, "claim_info") and self.claim_info:
+            self.claim_info.update_player_activity_status(msg_data)
+            logging.debug(f"Activity status updated: {msg_data.get('status', 'Unknown')}")
+
+    def _handle_reference_data_update(self, message):
+        # Update ClaimInfoHeader when claim_tile_cost data changes
+        table_name = (message.get("data") or {}).get("table", "")
+        if table_name not in ("claim_tile_cost", ""):  # Empty means initial load
+            return
+        try:
+            # Get reference data from any processor that has it
+            reference_data = None
+            for processor in getattr(self.data_service, "processors", []):
+                if hasattr(processor, "reference_data") and processor.reference_data:
+                    reference_data = processor.reference_data
+                    break
+
+            if reference_data and hasattr(self, "claim_info") and self.claim_info:
+                self.claim_info.update_reference_data(reference_data)
+        except Exception as e:
+            logging.error(f"Error updating ClaimInfoHeader reference data: {e}")
+
+    def _handle_error_message(self, message):
+        msg_data = message.get("data")
+        messagebox.showerror("Error", msg_data)
+        logging.error(f"Error message displayed: {msg_data}")
+
+        # Hide loading on error
+        if self.is_loading:
+            self.hide_loading()
+
+    def _finish_trace_after_render(self, trace, tab_name=None):
+        """
+        Record a latency trace once the tab that received the update has rendered it.
+
+        Tabs debounce updates and render large tables in chunks, so the render is
+        only complete when the tab has no debounce timers or async render left;
+        the trace is finished on the next idle callback after that, once Tk has
+        repainted.
+
+        Args:
+            trace: Trace dict with the marks up to "handled"
+            tab_name: Tab that renders this message type, if any
+        """
+        try:
+            tab = self.tabs.get(tab_name) if tab_name else None
+            if tab is not None and self._tab_render_pending(tab):
+                if time.time() - trace["handled"] < self.TRACE_RENDER_TIMEOUT:
+                    self.after(10, lambda: self._finish_trace_after_render(trace, tab_name))
+                    return
+            self.after_idle(lambda: finish_trace({**trace, "rendered": time.time()}))
+        except Exception as e:
+            logging.debug(f"Error finishing latency trace: {e}")
+
+    @staticmethod
+    def _tab_render_pending(tab) -> bool:
+        """Return True while a tab still has a debounced update or async render outstanding."""
+        if getattr(tab, "_debounce_timers", None):
+            return True
+        renderer = getattr(tab, "async_renderer", None)
+        return bool(renderer and renderer.is_rendering())
 
     def show_loading_with_message(self, message: str):
         """
@@ -93,6 +93,7 @@ class SearchableWindowMixin:
         # Add custom field aliases if provided
         if custom_field_aliases:
             self.search_parser.FIELD_ALIASES.update(custom_field_aliases)
+            self.search_parser.clear_query_cache()
         
         # Create search bar component
         self.search_bar = SearchBarComponent(
@@ -214,12 +215,9 @@ class SearchableWindowMixin:
                 # No search - show all data
                 self.filtered_data = all_data
             else:
-                # Parse search query and filter data
-                parsed_query = self.search_parser.parse_search_query(current_search_text)
-                self.filtered_data = [
-                    item for item in all_data 
-                    if self.search_parser.match_row(item, parsed_query)
-                ]
+                # Compile the search query (cached per window) and filter data
+                matches_search = self.search_parser.compile_query(current_search_text, current_window_id)
+                self.filtered_data = [item for item in all_data if matches_search(item)]
             
             # Update UI with filtered results
             self._update_ui_with_filtered_data(self.filtered_data)
@@ -7,13 +7,13 @@ from tkinter import Menu, ttk
 
 from app.ui.components.filter_popup import FilterPopup
 from app.ui.components.optimized_table_mixin import OptimizedTableMixin
-from app.ui.mixins.async_rendering_mixin import AsyncRenderingMixin
+from app.ui.components.virtual_treeview import VirtualTreeview
 from app.ui.styles import TreeviewStyles
 from app.ui.themes import get_color, register_theme_callback
 from app.services.search_parser import SearchParser
 
 
-class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
+class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin):
     """The tab for displaying active crafting status with item-focused, expandable rows."""
 
     def __init__(self, master, app):
@@ -41,23 +41,12 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         # Initialize optimization features after UI is created
         self.__init_optimization__(max_workers=2, max_cache_size_mb=50)
 
-        # Initialize async rendering with active crafting specific settings
-        self._setup_async_rendering(chunk_size=60, enable_progress=True)  # Medium chunks for active crafting data
-
-        # Configure thresholds for active crafting (variable dataset size)
-        self._configure_async_rendering(
-            enabled=True,
-            chunk_size=60,
-            async_threshold=40,  # Use async for medium datasets
-            progress_threshold=100,  # Show progress for larger datasets
-        )
-
-        # Track current async operation for cancellation
-        self.current_render_operation = None
-
         # Tab identification for visibility checks
         self._tab_name = "Active Crafting"
 
+        # action_id -> flattened rows, for progress deltas
+        self._rows_by_action = {}
+
     def _create_widgets(self):
         """Creates the styled Treeview and its scrollbars."""
         style = ttk.Style()
@@ -66,8 +55,15 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         TreeviewStyles.apply_treeview_style(style)
         self.v_scrollbar_style, self.h_scrollbar_style = TreeviewStyles.apply_scrollbar_style(style, "ActiveCrafting")
 
-        # Create the Treeview with tree structure support
-        self.tree = ttk.Treeview(self, columns=self.headers, show="tree headings", style="Treeview")
+        # Create the virtualized Treeview (one row per crafting operation)
+        self.tree = VirtualTreeview(
+            self,
+            format_row=self._format_row_for_display,
+            row_key=self._generate_item_key,
+            columns=self.headers,
+            show="tree headings",
+            style="Treeview",
+        )
 
         # Apply common tree tags and configure custom status tags
         TreeviewStyles.configure_tree_tags(self.tree)
@@ -111,9 +107,6 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         # Bind events
         self.tree.bind("<Button-3>", self.show_header_context_menu)
         self.tree.bind("<Configure>", self.on_tree_configure)
-        self.tree.bind("<MouseWheel>", self._on_scroll)
-        self.tree.bind("<Button-4>", self._on_scroll)
-        self.tree.bind("<Button-5>", self._on_scroll)
 
     def _configure_status_tags(self):
         """Configure status-specific tag colors using current theme."""
@@ -269,6 +262,7 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
         if self._has_data_changed(new_flattened_data):
             self.all_data = new_flattened_data
+            self._index_actions()
             self._increment_data_version()
 
             # Notify MainWindow that data loading completed (for loading overlay detection)
@@ -329,6 +323,7 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
                                 "accept_help": operation.get("accept_help", "Unknown"),
                                 "crafter": operation.get("crafter", "Unknown"),
                                 "building": operation.get("building_name", operation.get("building", "Unknown")),
+                                "action_id": operation.get("action_id"),
                             }
                         )
 
@@ -337,6 +332,40 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
         return flattened
 
+    def _index_actions(self):
+        """Map each progressive action ID to the flattened rows it produces."""
+        self._rows_by_action = {}
+        for row in self.all_data:
+            action_id = row.get("action_id")
+            if action_id is not None:
+                self._rows_by_action.setdefault(action_id, []).append(row)
+
+    def update_progress_only(self, progress_data):
+        """
+        Apply a progress delta without re-flattening, filtering or sorting.
+
+        The rows are updated in place and the visible window redrawn, which only
+        rewrites the Remaining Effort cells that changed.
+
+        Args:
+            progress_data: Dict of progressive action entity_id -> remaining effort (0 = READY)
+        """
+        try:
+            changed = False
+            for action_id, remaining_effort in (progress_data or {}).items():
+                display = f"{remaining_effort:,}" if remaining_effort > 0 else "READY"
+                for row in self._rows_by_action.get(action_id, []):
+                    if row.get("remaining_effort") == display:
+                        continue
+                    row["remaining_effort"] = display
+                    changed = True
+
+            if changed:
+                self.tree.refresh()
+
+        except Exception as e:
+            logging.error(f"[ActiveCraftingTab] Error applying progress update: {e}")
+
     def _generate_item_key(self, operation_data):
         """Generate a unique key for an operation with optimized string handling."""
         # Use tuple for faster hashing, convert to string only when needed
@@ -461,8 +490,8 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
         # Apply keyword-based search
         if search_text:
-            parsed_query = self.search_parser.parse_search_query(search_text)
-            temp_data = [row for row in temp_data if self.search_parser.match_row(row, parsed_query)]
+            matches_search = self.search_parser.compile_query(search_text, "active_crafting")
+            temp_data = [row for row in temp_data if matches_search(row)]
 
         return temp_data
 
@@ -695,7 +724,7 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
             self.tree.heading(header, text=text + filter_indicator)
 
     def render_table(self):
-        """Render the active crafting data with lazy loading and differential updates."""
+        """Render the active crafting data; only the visible rows become Treeview items."""
         # Debounce render operations to prevent excessive UI updates
         self._debounce_operation("render_table", self._process_render_table)
 
@@ -708,156 +737,15 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
             self._update_pending = True
 
-            # Check if we need a full rebuild or can do incremental updates
-            if self._tree_needs_full_rebuild or not self._ui_item_cache:
-                logging.debug(f"Active crafting: Full rebuild with lazy loading for {len(self.filtered_data)} items")
-                self._render_table_lazy()
-                self._tree_needs_full_rebuild = False
-            else:
-                logging.debug(f"Active crafting: Differential update for {len(self.filtered_data)} items")
-                self._render_table_differential()
+            logging.debug(f"Active crafting: Rendering {len(self.filtered_data)} items")
+            self.tree.set_rows(self.filtered_data)
+            self._tree_needs_full_rebuild = False
 
         except Exception as e:
             logging.error(f"Error in render_table: {e}")
-            # Fall back to lazy render on error
-            self._render_table_lazy()
-            self._tree_needs_full_rebuild = False
         finally:
             self._update_pending = False
 
-    def _render_table_lazy(self):
-        """Enhanced rendering using async processing for large datasets."""
-        # Clear the tree and cache
-        self.tree.delete(*self.tree.get_children())
-        self._ui_item_cache.clear()
-
-        # Use async rendering for better performance with large datasets
-        def completion_callback(operation_id=None, stats=None):
-            logging.debug(f"[ActiveCraftingTab] Completed async rendering of {len(self.filtered_data)} items")
-
-        # Start async rendering
-        self.current_render_operation = self._render_tree_async(
-            tree_widget=self.tree,
-            data=self.filtered_data,
-            columns=self.headers,
-            format_row_func=self._format_row_for_display,
-            completion_callback=completion_callback,
-            operation_name="active_crafting",
-        )
-
-    def _schedule_lazy_load(self, remaining_items, batch_size=25):
-        """Schedule lazy loading of remaining items in batches."""
-        if not remaining_items:
-            return
-
-        # Load next batch
-        batch = remaining_items[:batch_size]
-        for operation_data in batch:
-            self._insert_tree_item(operation_data)
-
-        # Schedule next batch with small delay to keep UI responsive
-        if len(remaining_items) > batch_size:
-            next_batch = remaining_items[batch_size:]
-            self.after(10, lambda: self._schedule_lazy_load(next_batch, batch_size))
-
-    def _render_table_differential(self):
-        """Differential update - only modify changed items."""
-        # Create set of current filtered items
-        current_items = set()
-        current_data_map = {}
-
-        for operation_data in self.filtered_data:
-            item_key = self._generate_item_key(operation_data)
-            current_items.add(item_key)
-            current_data_map[item_key] = operation_data
-
-        # Find items to remove (in UI but not in current data)
-        cached_items = set(self._ui_item_cache.keys())
-        items_to_remove = cached_items - current_items
-
-        # Remove obsolete items
-        for item_key in items_to_remove:
-            if item_key in self._ui_item_cache:
-                tree_item_id = self._ui_item_cache[item_key]
-                try:
-                    self.tree.delete(tree_item_id)
-                except:
-                    pass  # Item may have already been deleted
-                del self._ui_item_cache[item_key]
-
-        # Find items to add (in current data but not in UI)
-        items_to_add = current_items - cached_items
-
-        # Add new items
-        for item_key in items_to_add:
-            operation_data = current_data_map[item_key]
-            self._insert_tree_item(operation_data)
-
-        # Update existing items (check for changes in displayed values)
-        items_to_update = current_items & cached_items
-        for item_key in items_to_update:
-            operation_data = current_data_map[item_key]
-            self._update_tree_item_if_changed(item_key, operation_data)
-
-    def _insert_tree_item(self, operation_data):
-        """Insert a new item into the tree and cache."""
-        # Extract data for the operation
-        item_name = operation_data.get("item", "Unknown Item")
-        tier = operation_data.get("tier", 0)
-        quantity = operation_data.get("quantity", 0)
-        tag = operation_data.get("tag", "empty")
-        remaining_effort = operation_data.get("remaining_effort", "Unknown")
-        accept_help = operation_data.get("accept_help", "Unknown")
-        crafter = operation_data.get("crafter", "Unknown")
-        building = operation_data.get("building", "Unknown")
-
-        # Prepare row values
-        values = [item_name, str(tier), str(quantity), tag, remaining_effort, accept_help, crafter, building]
-
-        # Determine tag based on progress for styling
-        progress_tag = self._get_progress_tag(remaining_effort)
-
-        # Insert into tree
-        tree_item_id = self.tree.insert("", "end", values=values, tags=(progress_tag,))
-
-        # Cache the tree item ID for future updates
-        item_key = self._generate_item_key(operation_data)
-        self._ui_item_cache[item_key] = tree_item_id
-
-    def _update_tree_item_if_changed(self, item_key, operation_data):
-        """Update a tree item only if its displayed values have changed."""
-        try:
-            tree_item_id = self._ui_item_cache[item_key]
-
-            # Get current values from tree
-            current_values = self.tree.item(tree_item_id, "values")
-
-            # Generate new values
-            item_name = operation_data.get("item", "Unknown Item")
-            tier = operation_data.get("tier", 0)
-            quantity = operation_data.get("quantity", 0)
-            tag = operation_data.get("tag", "empty")
-            remaining_effort = operation_data.get("remaining_effort", "Unknown")
-            accept_help = operation_data.get("accept_help", "Unknown")
-            crafter = operation_data.get("crafter", "Unknown")
-            building = operation_data.get("building", "Unknown")
-
-            new_values = [item_name, str(tier), str(quantity), tag, remaining_effort, accept_help, crafter, building]
-
-            # Only update if values actually changed
-            if list(current_values) != new_values:
-                self.tree.item(tree_item_id, values=new_values)
-
-                # Update tags if needed
-                progress_tag = self._get_progress_tag(remaining_effort)
-                self.tree.item(tree_item_id, tags=(progress_tag,))
-
-        except Exception as e:
-            # Item may have been deleted, remove from cache and re-insert
-            if item_key in self._ui_item_cache:
-                del self._ui_item_cache[item_key]
-            self._insert_tree_item(operation_data)
-
     def _get_progress_tag(self, progress):
         """Determines the appropriate tag for color coding based on progress."""
         progress_str = str(progress).lower()
@@ -870,13 +758,6 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
     def shutdown(self):
         """Clean shutdown of tab resources."""
-        # Cancel any pending async operations
-        if hasattr(self, "current_render_operation") and self.current_render_operation:
-            self._cancel_render_operation(self.current_render_operation)
-
-        # Clean up async rendering resources
-        self._cleanup_async_rendering()
-
         # Shutdown optimization features
         self.optimization_shutdown()
 
@@ -973,35 +854,6 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         """Estimate memory freed by removing cache entries."""
         return len(removed_keys) * 10  # Rough estimate: 10KB per entry
 
-    def _on_scroll(self, event):
-        """Handle scroll events for potential lazy loading expansion."""
-        # Debounce scroll events to prevent excessive processing
-        self._debounce_operation("scroll_handler", self._process_scroll_event, event)
-
-    def _process_scroll_event(self, event):
-        """Process scroll events to potentially load more items."""
-        try:
-            # Get current scroll position
-            top_fraction = self.tree.yview()[0]
-            bottom_fraction = self.tree.yview()[1]
-
-            total_items = len(self.filtered_data)
-            visible_items = len(self.tree.get_children())
-
-            # If we're near the bottom and haven't loaded all items, load more
-            if bottom_fraction > 0.8 and visible_items < total_items:
-                remaining_start = visible_items
-                remaining_end = min(total_items, remaining_start + 50)
-
-                batch_items = self.filtered_data[remaining_start:remaining_end]
-                for operation_data in batch_items:
-                    self._insert_tree_item(operation_data)
-
-                logging.debug(f"Lazy loaded {len(batch_items)} more items ({visible_items} -> {len(self.tree.get_children())})")
-
-        except Exception as e:
-            logging.error(f"Error processing scroll event: {e}")
-
     def _format_row_for_display(self, item: Dict) -> Dict[str, str]:
         """Format active crafting data for display in the tree."""
         # Apply progress tag for styling
@@ -1026,13 +878,6 @@ class ActiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
     def destroy(self):
         """Clean up resources when tab is destroyed."""
         try:
-            # Cancel any active async rendering operations
-            if hasattr(self, "current_render_operation") and self.current_render_operation:
-                self._cancel_async_rendering(self.current_render_operation)
-
-            # Clean up async rendering resources
-            self._cleanup_async_rendering()
-
             # Clean up optimization resources
             self.optimization_shutdown()
         except Exception as e:
@@ -8,19 +8,20 @@ from tkinter import Menu, ttk
 
 from app.ui.components.filter_popup import FilterPopup
 from app.ui.components.optimized_table_mixin import OptimizedTableMixin
-from app.ui.mixins.async_rendering_mixin import AsyncRenderingMixin
+from app.ui.components.virtual_treeview import VirtualTreeview
 from app.ui.styles import TreeviewStyles
 from app.ui.themes import get_color, register_theme_callback
 from app.services.search_parser import SearchParser
 
 
-class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
+class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin):
     """
     The tab for displaying claim inventory with expandable rows for multi-container items.
 
     THREADING MODEL:
     - Background processing: Data transformation, filtering, sorting (large datasets)
     - Main thread: All UI operations, tree rendering, layout management
+    - The tree is virtualized: only the rows on screen exist as Treeview items
     - Uses .grid() layout manager exclusively (never mix with .pack())
     """
 
@@ -58,31 +59,23 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         self.change_timestamps: Dict[str, float] = {}  # item_name -> timestamp
         self.container_change_timestamps: Dict[str, Dict[str, float]] = {}  # item_name -> {container: timestamp}
 
+        # Latest consolidated inventory and its rows, so inventory deltas can be applied in place
+        self._inventory_items: Dict[str, Dict] = {}  # item_name -> consolidated item info
+        self._rows_by_name: Dict[str, Dict] = {}  # item_name -> row in all_data
+        self._full_update_in_progress = False
+        self._delta_names_during_full: set = set()
+
         self._create_widgets()
         self._create_context_menu()
 
         # Initialize optimization features after UI is created
         self.__init_optimization__(max_workers=2, max_cache_size_mb=75)
 
-        # Initialize async rendering with inventory specific settings
-        self._setup_async_rendering(chunk_size=75, enable_progress=False)  # Larger chunks for simpler inventory data
-
-        # Configure thresholds for claim inventory (typically 505+ items)
-        self._configure_async_rendering(
-            enabled=True,
-            chunk_size=75,
-            async_threshold=50,  # Use async for medium datasets
-            progress_threshold=150,  # Show progress for large datasets
-        )
-
-        # Track current async operation for cancellation
-        self.current_render_operation = None
-
         # Tab identification for visibility checks
         self._tab_name = "Claim Inventory"
 
     def _format_row_for_display(self, row_data: Dict) -> Dict[str, str]:
-        """Format an inventory item for async display rendering with hierarchical support."""
+        """Format an inventory item for display when its row scrolls into view, with hierarchical support."""
         item_name = row_data.get("name", "")
         containers = row_data.get("containers", {})
         base_quantity = row_data.get("quantity", 0)
@@ -151,8 +144,15 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         TreeviewStyles.apply_treeview_style(style)
         self.v_scrollbar_style, self.h_scrollbar_style = TreeviewStyles.apply_scrollbar_style(style, "ClaimInventory")
 
-        # Create the Treeview with support for child items
-        self.tree = ttk.Treeview(self, columns=self.headers, show="tree headings", style="Treeview")
+        # Create the virtualized Treeview; multi-container items expand to one row per container
+        self.tree = VirtualTreeview(
+            self,
+            format_row=self._format_row_for_display,
+            row_key=self._generate_item_key,
+            columns=self.headers,
+            show="tree headings",
+            style="Treeview",
+        )
 
         # Apply common tree tags
         TreeviewStyles.configure_tree_tags(self.tree)
@@ -277,12 +277,100 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
     def update_data(self, new_data):
         """Receives new inventory data and processes it with optimization."""
+        if isinstance(new_data, dict):
+            # Keep our own copy so deltas arriving before the debounced update runs are merged into it
+            self._inventory_items = dict(new_data)
+            new_data = self._inventory_items
         self._debounce_operation("data_update", self._process_data_update, new_data)
 
+    def apply_delta(self, delta):
+        """
+        Apply an inventory_delta message in place.
+
+        Only the added, changed and removed items are rebuilt and compared against their
+        previous quantities; the rest of the table data is left untouched.
+
+        Args:
+            delta: {"added": {item_name: info}, "changed": {item_name: info}, "removed": [item_name]}
+                   where info has the consolidated inventory shape (tier, total_quantity, tag, containers)
+        """
+        try:
+            added = delta.get("added", {})
+            changed = delta.get("changed", {})
+            removed = delta.get("removed", [])
+
+            self._inventory_items.update(added)
+            self._inventory_items.update(changed)
+            for item_name in removed:
+                self._inventory_items.pop(item_name, None)
+
+            item_names = set(added) | set(changed) | set(removed)
+            if not item_names:
+                return
+
+            # A debounced full update is pending - it processes the merged items
+            if "data_update" in self._debounce_timers:
+                return
+
+            # A full update is being processed in the background - reapply these items when it lands
+            if self._full_update_in_progress:
+                self._delta_names_during_full |= item_names
+                return
+
+            self._apply_item_changes(item_names)
+            self.apply_filter()
+
+        except Exception as e:
+            logging.error(f"[ClaimInventoryTab] Error applying inventory delta: {e}")
+
+    def _apply_item_changes(self, item_names):
+        """Rebuild the rows of the given items from _inventory_items and track their quantity changes."""
+        current_quantities = {}
+        current_container_quantities = {}
+        removed_names = set()
+
+        for item_name in item_names:
+            item_info = self._inventory_items.get(item_name)
+            if item_info is None:
+                if self._rows_by_name.pop(item_name, None) is not None:
+                    removed_names.add(item_name)
+                self.previous_quantities.pop(item_name, None)
+                self.previous_container_quantities.pop(item_name, None)
+                continue
+
+            row = self._build_inventory_row(item_name, item_info)
+            current_quantities[item_name] = row["quantity"]
+            current_container_quantities[item_name] = dict(row["containers"])
+
+            existing_row = self._rows_by_name.get(item_name)
+            if existing_row is not None:
+                # Same keys, so readers never see a partially updated row
+                existing_row.update(row)
+            else:
+                self._rows_by_name[item_name] = row
+                self.all_data.append(row)
+
+        if removed_names:
+            self.all_data = [row for row in self.all_data if row.get("name") not in removed_names]
+
+        self._calculate_quantity_changes(current_quantities, current_container_quantities, partial=True)
+
+    def _build_inventory_row(self, item_name, item_info):
+        """Build a table row from a consolidated inventory item."""
+        return {
+            "name": item_name,
+            "tier": item_info.get("tier", 0),
+            "quantity": item_info.get("total_quantity", 0),
+            "tag": item_info.get("tag", ""),
+            "containers": item_info.get("containers", {}),
+        }
+
     def _process_data_update(self, new_data):
         """Process inventory data update with background processing for large datasets."""
         try:
             if isinstance(new_data, dict) and len(new_data) > 100:
+                self._full_update_in_progress = True
+                self._delta_names_during_full = set()
 
                 self._submit_background_task(
                     "inventory_processing",
@@ -307,21 +395,12 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         current_container_quantities = {}
 
         for item_name, item_info in new_data.items():
-            quantity = item_info.get("total_quantity", 0)
-            containers = item_info.get("containers", {})
-
-            current_quantities[item_name] = quantity
-            current_container_quantities[item_name] = containers.copy()
-
-            table_data.append(
-                {
-                    "name": item_name,
-                    "tier": item_info.get("tier", 0),
-                    "quantity": quantity,
-                    "tag": item_info.get("tag", ""),
-                    "containers": containers,
-                }
-            )
+            row = self._build_inventory_row(item_name, item_info)
+
+            current_quantities[item_name] = row["quantity"]
+            current_container_quantities[item_name] = row["containers"].copy()
+
+            table_data.append(row)
 
         return {
             "table_data": table_data,
@@ -341,8 +420,15 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
             # Store raw data - formatting happens during rendering
             self.all_data = table_data
+            self._rows_by_name = {row["name"]: row for row in table_data}
             logging.info(f"[ClaimInventoryTab] Background processing completed - {len(table_data)} items (with hierarchy)")
 
+            # Reapply deltas that arrived while the full update was processed
+            self._full_update_in_progress = False
+            if self._delta_names_during_full:
+                self._apply_item_changes(self._delta_names_during_full)
+                self._delta_names_during_full = set()
+
             # Notify MainWindow that data loading completed (for loading overlay detection)
             if hasattr(self.app, "is_loading") and self.app.is_loading:
                 if hasattr(self.app, "received_data_types"):
@@ -358,48 +444,52 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
     def _on_inventory_processing_error(self, error):
         """Callback when background inventory processing fails."""
         logging.error(f"Background inventory processing failed: {error}")
-        self._process_inventory_data_sync(self._last_raw_data if hasattr(self, "_last_raw_data") else {})
+        self._process_inventory_data_sync(self._inventory_items)
 
     def _process_inventory_data_sync(self, new_data):
         """Synchronous processing for inventory data."""
+        self._full_update_in_progress = False
+        self._delta_names_during_full = set()
+
         if isinstance(new_data, dict):
             table_data = []
             current_quantities = {}
             current_container_quantities = {}
 
             for item_name, item_info in new_data.items():
-                quantity = item_info.get("total_quantity", 0)
-                containers = item_info.get("containers", {})
+                row = self._build_inventory_row(item_name, item_info)
 
-                current_quantities[item_name] = quantity
-                current_container_quantities[item_name] = containers.copy()
+                current_quantities[item_name] = row["quantity"]
+                current_container_quantities[item_name] = row["containers"].copy()
 
-                table_data.append(
-                    {
-                        "name": item_name,
-                        "tier": item_info.get("tier", 0),
-                        "quantity": quantity,
-                        "tag": item_info.get("tag", ""),
-                        "containers": containers,
-                    }
-                )
+                table_data.append(row)
 
             # Calculate quantity changes
             self._calculate_quantity_changes(current_quantities, current_container_quantities)
 
             # Store raw data - formatting happens during rendering
             self.all_data = table_data
+            self._rows_by_name = {row["name"]: row for row in table_data}
             logging.info(f"[ClaimInventoryTab] Successfully processed {len(table_data)} inventory items (with hierarchy)")
         else:
             self.all_data = new_data if isinstance(new_data, list) else []
+            self._rows_by_name = {row.get("name"): row for row in self.all_data if isinstance(row, dict)}
             logging.info(f"[ClaimInventoryTab] Set data to list with {len(self.all_data)} items")
 
         # Apply filter and render table
         self.apply_filter()
         logging.info(f"[ClaimInventoryTab] Data update completed successfully")
 
-    def _calculate_quantity_changes(self, current_quantities, current_container_quantities):
-        """Calculate changes in item quantities since last update."""
+    def _calculate_quantity_changes(self, current_quantities, current_container_quantities, partial=False):
+        """
+        Calculate changes in item quantities since last update.
+
+        Args:
+            current_quantities: item_name -> total quantity
+            current_container_quantities: item_name -> {container: quantity}
+            partial: True if only the changed items are passed (inventory delta), so
+                     previous quantities of other items must be kept
+        """
         current_time = time.time()
 
         # Calculate total quantity changes
@@ -461,8 +551,12 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         self._cleanup_expired_changes(current_time)
 
         # Update previous quantities for next comparison
-        self.previous_quantities = current_quantities.copy()
-        self.previous_container_quantities = current_container_quantities.copy()
+        if partial:
+            self.previous_quantities.update(current_quantities)
+            self.previous_container_quantities.update(current_container_quantities)
+        else:
+            self.previous_quantities = current_quantities.copy()
+            self.previous_container_quantities = current_container_quantities.copy()
 
     def _cleanup_expired_changes(self, current_time):
         """Remove changes older than 10 minutes."""
@@ -615,8 +709,8 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
         # Apply advanced search using SearchParser (work with raw data)
         if search_text:
-            parsed_query = self.search_parser.parse_search_query(search_text)
-            temp_data = [row for row in temp_data if self.search_parser.match_row(row, parsed_query)]
+            matches_search = self.search_parser.compile_query(search_text, "claim_inventory")
+            temp_data = [row for row in temp_data if matches_search(row)]
 
         return temp_data
 
@@ -637,8 +731,8 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
 
         # Apply advanced search using SearchParser (work with raw data)
         if search_text:
-            parsed_query = self.search_parser.parse_search_query(search_text)
-            temp_data = [row for row in temp_data if self.search_parser.match_row(row, parsed_query)]
+            matches_search = self.search_parser.compile_query(search_text, "claim_inventory")
+            temp_data = [row for row in temp_data if matches_search(row)]
 
         self.filtered_data = temp_data
         self.sort_by(self.sort_column, self.sort_reverse)
@@ -781,47 +875,15 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
             self.tree.heading(header, text=text + filter_indicator)
 
     def render_table(self):
-        """Renders table with optimization support for large datasets."""
+        """Hands the filtered rows to the virtualized tree; only the visible rows are formatted."""
         try:
-            logging.debug(f"[ClaimInventoryTab] Starting table render - {len(self.filtered_data)} items")
-
-            self._render_direct(self.filtered_data)
-
-            logging.debug(f"[ClaimInventoryTab] Table render complete")
+            self.tree.set_rows(self.filtered_data, empty_message="No items in claim inventory")
+            logging.debug(f"[ClaimInventoryTab] Table render complete - {len(self.filtered_data)} items")
 
         except Exception as e:
             logging.error(f"[ClaimInventoryTab] Critical error during table render: {e}")
             logging.debug(traceback.format_exc())
 
-    def _render_direct(self, data):
-        """Render inventory data using async rendering for better performance."""
-        # Cancel any existing render operation
-        if self.current_render_operation:
-            self._cancel_async_rendering(self.current_render_operation)
-            self.current_render_operation = None
-
-        if not data:
-            # Clear and show empty message
-            self.tree.delete(*self.tree.get_children())
-            empty_item = self.tree.insert("", "end", values=["No items in claim inventory", "", "", "", ""])
-            self.tree.item(empty_item, tags=("empty",))
-            return
-
-        def completion_callback(item_count: int):
-            """Called when async rendering completes."""
-            self.current_render_operation = None
-            logging.debug(f"[ClaimInventoryTab] Async rendering completed - {item_count} items")
-
-        # Start async rendering with proper formatting
-        self.current_render_operation = self._render_tree_async(
-            tree_widget=self.tree,
-            data=data,
-            columns=self.headers,
-            format_row_func=self._format_row_for_display,
-            completion_callback=completion_callback,
-            operation_name="claim_inventory",
-        )
-
     def _setup_column_headers(self):
         """Set up column headers and initial widths."""
         # Define base widths and scaling factors
@@ -898,13 +960,6 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
     def destroy(self):
         """Clean up resources when tab is destroyed."""
         try:
-            # Cancel any active async rendering operations
-            if hasattr(self, "current_render_operation") and self.current_render_operation:
-                self._cancel_async_rendering(self.current_render_operation)
-
-            # Clean up async rendering resources
-            self._cleanup_async_rendering()
-
             # Clean up optimization resources
             self.optimization_shutdown()
         except Exception as e:
@@ -924,50 +979,3 @@ class ClaimInventoryTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         if key_tuple not in self._memory_manager["item_pool"]:
             self._memory_manager["item_pool"][key_tuple] = "|".join(str(x) for x in key_tuple)
         return self._memory_manager["item_pool"][key_tuple]
-
-    def _insert_tree_item(self, item_data):
-        """Insert inventory item into tree."""
-        item_name = item_data.get("name", "Unknown Item")
-        tier = item_data.get("tier", 0)
-        quantity = item_data.get("quantity", 0)
-        tag = item_data.get("tag", "")
-        containers = item_data.get("containers", {})
-
-        quantity_display = self._format_quantity_with_change(item_name, quantity)
-
-        values = [
-            item_name,
-            str(tier),
-            quantity_display,
-            tag,
-            f"{len(containers)} Containers" if len(containers) > 1 else next(iter(containers.keys()), "N/A"),
-        ]
-
-        tags = []
-        if item_name in self.quantity_changes:
-            change = self.quantity_changes[item_name]
-            if change > 0:
-                tags.append("quantity_increase")
-            elif change < 0:
-                tags.append("quantity_decrease")
-
-        if len(containers) > 1:
-            item_id = self.tree.insert("", "end", values=values, tags=tags)
-            for container_name, container_quantity in containers.items():
-                container_quantity_display = self._format_quantity_with_change(item_name, container_quantity, container_name)
-                container_values = ["", "", container_quantity_display, "", container_name]
-
-                container_tags = []
-                if item_name in self.container_quantity_changes and container_name in self.container_quantity_changes[item_name]:
-                    change = self.container_quantity_changes[item_name][container_name]
-                    if change > 0:
-                        container_tags.append("quantity_increase")
-                    elif change < 0:
-                        container_tags.append("quantity_decrease")
-
-                self.tree.insert(item_id, "end", values=container_values, tags=container_tags)
-        else:
-            item_id = self.tree.insert("", "end", values=values, tags=tags)
-
-        item_key = self._generate_item_key(item_data)
-        self._ui_item_cache[item_key] = item_id
@@ -1,4 +1,5 @@
 import logging
+import time
 
 
 from typing import Dict, List
@@ -8,15 +9,19 @@ from tkinter import Menu, ttk
 
 from app.ui.components.filter_popup import FilterPopup
 from app.ui.components.optimized_table_mixin import OptimizedTableMixin
-from app.ui.mixins.async_rendering_mixin import AsyncRenderingMixin
+from app.ui.components.virtual_treeview import VirtualTreeview
 from app.ui.styles import TreeviewStyles
 from app.ui.themes import get_color, register_theme_callback
 from app.services.search_parser import SearchParser
+from app.core.utils.countdown import format_countdown, format_time_remaining
 
 
-class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
+class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin):
     """The tab for displaying passive crafting status with item-focused, expandable rows."""
 
+    # How often displayed countdowns are refreshed from their completion times
+    COUNTDOWN_INTERVAL_MS = 1000
+
     def __init__(self, master, app):
         super().__init__(master, fg_color="transparent")
         self.app = app
@@ -50,26 +55,15 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
         # Initialize optimization features after UI is created
         self.__init_optimization__(max_workers=2, max_cache_size_mb=50)
         
-        # Initialize async rendering with passive crafting specific settings
-        self._setup_async_rendering(
-            chunk_size=50,  # Smaller chunks for complex hierarchical data
-            enable_progress=True
-        )
-        
-        # Configure thresholds for passive crafting (typically 188+ items)
-        self._configure_async_rendering(
-            enabled=True,
-            chunk_size=50,
-            async_threshold=30,  # Lower threshold due to complex rendering
-            progress_threshold=80  # Show progress for medium-large datasets
-        )
-        
-        # Track current async operation for cancellation
-        self.current_render_operation = None
-        
         # Tab identification for visibility checks
         self._tab_name = "Passive Crafting"
 
+        # Countdowns are formatted from completion times whenever a row is drawn;
+        # the processor only pushes updates when crafts complete, so the display ticks here
+        # entity_id -> (parent item, child operation) for timer deltas
+        self._rows_by_entity = {}
+        self._countdown_after_id = self.after(self.COUNTDOWN_INTERVAL_MS, self._tick_countdowns)
+
     def _create_widgets(self):
         """Creates the styled Treeview and its scrollbars."""
         style = ttk.Style()
@@ -78,8 +72,15 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
         TreeviewStyles.apply_treeview_style(style)
         self.v_scrollbar_style, self.h_scrollbar_style = TreeviewStyles.apply_scrollbar_style(style, "PassiveCrafting")
 
-        # Create the Treeview
-        self.tree = ttk.Treeview(self, columns=self.headers, show="tree headings", style="Treeview")
+        # Create the virtualized Treeview; items with several jobs expand to one row per operation
+        self.tree = VirtualTreeview(
+            self,
+            format_row=self._format_row_for_display,
+            row_key=self._generate_item_key,
+            columns=self.headers,
+            show="tree headings",
+            style="Treeview",
+        )
 
         # Apply common tree tags and configure custom status tags
         TreeviewStyles.configure_tree_tags(self.tree)
@@ -315,8 +316,8 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
 
         # Apply keyword-based search
         if search_text:
-            parsed_query = self.search_parser.parse_search_query(search_text)
-            temp_data = [row for row in temp_data if self.search_parser.match_row(row, parsed_query)]
+            matches_search = self.search_parser.compile_query(search_text, "passive_crafting")
+            temp_data = [row for row in temp_data if matches_search(row)]
 
         self.filtered_data = temp_data
         self.sort_by(self.sort_column)
@@ -468,6 +469,7 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
         try:
             processed_data = result["processed_data"]
             self.all_data = processed_data
+            self._index_entities()
             logging.info(f"[PassiveCraftingTab] Background processing completed - {len(processed_data)} items")
             
             # Notify MainWindow that data loading completed (for loading overlay detection)
@@ -500,6 +502,7 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
     def _process_passive_data_sync(self, new_data):
         """Synchronous processing for passive crafting data."""
         self.all_data = new_data if new_data else []
+        self._index_entities()
         
         # Apply current filters to new data
         self._apply_all_filters()
@@ -511,22 +514,69 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
         elif self.has_had_first_load:
             self.has_had_first_load = True
 
-    def _update_display(self):
-        """Update the TreeView display using direct hierarchical rendering."""
-        # Cancel any existing render operation
-        if self.current_render_operation:
-            self._cancel_async_rendering(self.current_render_operation)
-            self.current_render_operation = None
+    def _index_entities(self):
+        """Map each passive craft entity_id to the parent item and child operation showing it."""
+        self._rows_by_entity = {}
+        for item in self.all_data:
+            for operation in item.get("operations", []):
+                for entity_id in operation.get("entity_ids") or [operation.get("entity_id")]:
+                    if entity_id is not None:
+                        self._rows_by_entity[entity_id] = (item, operation)
+
+    def update_timer_only(self, timer_data):
+        """
+        Apply a timer delta without rebuilding the hierarchy.
+
+        The affected items are updated in place and the visible rows redrawn; rows
+        off screen or filtered out show the new values when they are next drawn.
+
+        Args:
+            timer_data: Dict of passive craft entity_id -> remaining seconds (0 = READY)
+        """
+        try:
+            if not timer_data:
+                return
+
+            now = time.time()
+            touched_items = {}
+            for entity_id, remaining_seconds in timer_data.items():
+                rows = self._rows_by_entity.get(entity_id)
+                if rows is None:
+                    continue
+
+                item, operation = rows
+                operation["completion_time"] = now + remaining_seconds if remaining_seconds > 0 else None
+                operation["time_remaining"] = format_time_remaining(remaining_seconds)
+                touched_items[id(item)] = item
+
+            for item in touched_items.values():
+                self._refresh_parent_timer(item, now)
+            if touched_items:
+                self.tree.refresh()
+
+        except Exception as e:
+            logging.error(f"[PassiveCraftingTab] Error applying timer update: {e}")
+
+    def _refresh_parent_timer(self, item: Dict, now: float):
+        """Recompute a parent row's job count and countdown from its child operations."""
+        operations = item.get("operations", [])
+        active_operations = [operation for operation in operations if operation.get("time_remaining") != "READY"]
+        item["completed_jobs"] = len(operations) - len(active_operations)
+
+        completions = [operation["completion_time"] for operation in active_operations if operation.get("completion_time")]
+        item["completion_time"] = max(completions) if completions else None
+        item["countdown_approximate"] = len(active_operations) > 1
 
+        if not active_operations:
+            item["time_remaining"] = "READY"
+        elif item["completion_time"]:
+            item["time_remaining"] = format_countdown(item["completion_time"], now, item["countdown_approximate"])
+
+    def _update_display(self):
+        """Hand the filtered items to the virtualized tree; expansion state is kept per item."""
+        self.tree.set_rows(self.filtered_data, empty_message="No passive crafts active")
         if not self.filtered_data:
-            # Clear and show empty message only when no data
-            self.tree.delete(*self.tree.get_children())
-            empty_item = self.tree.insert("", "end", values=["No passive crafts active", "", "", "", "", "", "", ""])
-            self.tree.item(empty_item, tags=("empty",))
             return
-
-        # Use differential updates to preserve tree state and avoid hard refresh
-        self._render_hierarchical_data_differential()
         
         # Auto-expand on first load if enabled
         if not self.has_had_first_load and self.auto_expand_on_first_load and self.filtered_data:
@@ -535,174 +585,73 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
         elif not self.has_had_first_load:
             self.has_had_first_load = True
 
-    def _render_hierarchical_data_differential(self):
-        """Render hierarchical data with differential updates to preserve tree state."""
-        # Initialize UI cache if it doesn't exist
-        if not hasattr(self, '_ui_item_cache'):
-            self._ui_item_cache = {}
-        
-        # Track existing tree items to preserve expansion states
-        existing_items = set(self.tree.get_children())
-        current_item_keys = set()
-        
-        # Store expansion states before any modifications
-        expansion_states = {}
-        for item_id in existing_items:
-            expansion_states[item_id] = self.tree.item(item_id, "open")
-        
-        # Process each filtered data item
-        for item in self.filtered_data:
-            # Create unique key for this item (same logic as _generate_item_key)
-            item_key = f"{item.get('item', 'Unknown')}|{item.get('tier', 0)}|{item.get('crafter', '')}|{item.get('building_name', '')}"
-            current_item_keys.add(item_key)
-            
-            # Check if item already exists in tree
-            if item_key in self._ui_item_cache:
-                existing_item_id = self._ui_item_cache[item_key]
-                # Update existing item if it still exists in tree
-                if existing_item_id in existing_items:
-                    self._update_existing_item(existing_item_id, item)
-                    existing_items.remove(existing_item_id)
-                else:
-                    # Item was removed, create new one
-                    self._create_new_item(item, item_key)
-            else:
-                # New item, create it
-                self._create_new_item(item, item_key)
-        
-        # Remove items that are no longer in filtered data
-        for obsolete_item_id in existing_items:
-            # Find the item key for this tree item to clean up cache
-            item_key_to_remove = None
-            for key, cached_id in self._ui_item_cache.items():
-                if cached_id == obsolete_item_id:
-                    item_key_to_remove = key
-                    break
-            
-            self.tree.delete(obsolete_item_id)
-            if item_key_to_remove:
-                del self._ui_item_cache[item_key_to_remove]
-        
-        # Restore expansion states for remaining items
-        for item_id, was_open in expansion_states.items():
-            if self.tree.exists(item_id) and was_open:
-                self.tree.item(item_id, open=True)
-
-    def _create_new_item(self, item: Dict, item_key: str):
-        """Create a new tree item with hierarchical children."""
-        # Determine item-level tag based on time remaining
-        item_tag = "ready" if "READY" in item.get("time_remaining", "") else "crafting"
-        
-        # Create parent item values
-        item_values = [
-            item.get("item", ""),
-            item.get("tier", ""),
-            item.get("total_quantity", ""),
-            item.get("tag", ""),
-            f"{item.get('completed_jobs', 0)}/{item.get('total_jobs', 0)}",
-            item.get("time_remaining", ""),
-            item.get("crafter", ""),
-            item.get("building_name", ""),
-        ]
-        
-        # Insert parent item
-        parent_id = self.tree.insert("", "end", values=item_values, tags=(item_tag,))
-        self._ui_item_cache[item_key] = parent_id
-        
-        # Add child operations if expandable
-        if item.get("is_expandable", False):
-            for operation in item.get("operations", []):
-                child_tag = "ready" if operation.get("time_remaining", "") == "READY" else "crafting"
-                child_values = [
-                    "",  # Empty item name for child
-                    "",  # Empty tier for child
-                    operation.get("quantity", ""),
-                    "",  # Empty tag for child
-                    "",  # Empty jobs for child
-                    operation.get("time_remaining", ""),
-                    operation.get("crafter", ""),
-                    operation.get("building_name", ""),
-                ]
-                self.tree.insert(parent_id, "end", values=child_values, tags=("child", child_tag))
-
-    def _update_existing_item(self, item_id: str, item: Dict):
-        """Update an existing tree item and its children."""
-        # Determine item-level tag based on time remaining
-        item_tag = "ready" if "READY" in item.get("time_remaining", "") else "crafting"
-        
-        # Update parent item values
-        item_values = [
-            item.get("item", ""),
-            item.get("tier", ""),
-            item.get("total_quantity", ""),
-            item.get("tag", ""),
-            f"{item.get('completed_jobs', 0)}/{item.get('total_jobs', 0)}",
-            item.get("time_remaining", ""),
-            item.get("crafter", ""),
-            item.get("building_name", ""),
-        ]
-        
-        # Update the parent item
-        self.tree.item(item_id, values=item_values, tags=(item_tag,))
-        
-        # Remove existing children and recreate them
-        for child_id in self.tree.get_children(item_id):
-            self.tree.delete(child_id)
-        
-        # Add child operations if expandable
-        if item.get("is_expandable", False):
-            for operation in item.get("operations", []):
-                child_tag = "ready" if operation.get("time_remaining", "") == "READY" else "crafting"
-                child_values = [
-                    "",  # Empty item name for child
-                    "",  # Empty tier for child
-                    operation.get("quantity", ""),
-                    "",  # Empty tag for child
-                    "",  # Empty jobs for child
-                    operation.get("time_remaining", ""),
-                    operation.get("crafter", ""),
-                    operation.get("building_name", ""),
-                ]
-                self.tree.insert(item_id, "end", values=child_values, tags=("child", child_tag))
+    def _tick_countdowns(self):
+        """Redraw the visible rows so their countdowns advance; only changed cells are written."""
+        try:
+            # The processor sends the READY refresh (job counts) when the craft completes
+            if self.filtered_data and self.winfo_viewable():
+                self.tree.refresh()
+
+        except Exception as e:
+            logging.error(f"[PassiveCraftingTab] Error updating countdowns: {e}")
+        finally:
+            self._countdown_after_id = self.after(self.COUNTDOWN_INTERVAL_MS, self._tick_countdowns)
 
     def _format_row_for_display(self, item: Dict) -> Dict[str, str]:
-        """Format a passive crafting item for async display rendering (legacy method)."""
-        # Determine item-level tag based on time remaining
-        item_tag = "ready" if "READY" in item.get("time_remaining", "") else "crafting"
-        
-        # This is for the main parent rows - child operations are handled separately
-        return {
+        """Format a passive crafting item, with one child row per operation, when it scrolls into view."""
+        now = time.time()
+        time_remaining = self._display_time_remaining(item, now)
+
+        formatted = {
             "Item": item.get("item", ""),
             "Tier": item.get("tier", ""),
             "Quantity": item.get("total_quantity", ""),
             "Tag": item.get("tag", ""),
             "Jobs": f"{item.get('completed_jobs', 0)}/{item.get('total_jobs', 0)}",
-            "Time Remaining": item.get("time_remaining", ""),
+            "Time Remaining": time_remaining,
             "Crafter": item.get("crafter", ""),
             "Building": item.get("building_name", ""),
-            "_tags": (item_tag,)  # Special field for tree item tags
+            "_tags": ("ready" if "READY" in time_remaining else "crafting",),  # Special field for tree item tags
         }
 
+        # Add child operations if expandable
+        if item.get("is_expandable", False):
+            children = []
+            for operation in item.get("operations", []):
+                operation_remaining = self._display_time_remaining(operation, now)
+                children.append(
+                    {
+                        "Quantity": operation.get("quantity", ""),
+                        "Time Remaining": operation_remaining,
+                        "Crafter": operation.get("crafter", ""),
+                        "Building": operation.get("building_name", ""),
+                        "_tags": ("child", "ready" if operation_remaining == "READY" else "crafting"),
+                    }
+                )
+            formatted["_children"] = children
+
+        return formatted
+
+    @staticmethod
+    def _display_time_remaining(row: Dict, now: float) -> str:
+        """Time Remaining text for a row, counted down locally from its completion time."""
+        completion_time = row.get("completion_time")
+        if completion_time:
+            return format_countdown(completion_time, now, row.get("countdown_approximate", False))
+        return row.get("time_remaining", "")
+
     def _expand_all_items(self):
         """Expand all parent items in the tree."""
-        def expand_recursive(item_id):
-            self.tree.item(item_id, open=True)
-            for child_id in self.tree.get_children(item_id):
-                expand_recursive(child_id)
-        
-        for item_id in self.tree.get_children():
-            expand_recursive(item_id)
+        self.tree.expand_all()
 
     def destroy(self):
         """Clean up resources when tab is destroyed."""
         try:
-            # Cancel any active async rendering operations
-            if hasattr(self, 'current_render_operation') and self.current_render_operation:
-                self._cancel_async_rendering(self.current_render_operation)
-            
-            # Clean up async rendering resources
-            self._cleanup_async_rendering()
-            
+            # Stop the countdown tick
+            if getattr(self, "_countdown_after_id", None):
+                self.after_cancel(self._countdown_after_id)
+                self._countdown_after_id = None
+
             # Clean up optimization resources
             self.optimization_shutdown()
         except Exception as e:
@@ -725,54 +674,14 @@ class PassiveCraftingTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin)
             self._memory_manager["item_pool"][key_tuple] = "|".join(str(x) for x in key_tuple)
         return self._memory_manager["item_pool"][key_tuple]
 
-    def _insert_tree_item(self, item_data):
-        """Insert passive crafting item into tree."""
-        # Determine item-level tag based on time remaining
-        item_tag = "ready" if "READY" in item_data.get("time_remaining", "") else "crafting"
-        
-        # Create parent item
-        item_values = [
-            item_data.get("item", ""),
-            item_data.get("tier", ""),
-            item_data.get("total_quantity", ""),
-            item_data.get("tag", ""),
-            f"{item_data.get('completed_jobs', 0)}/{item_data.get('total_jobs', 0)}",
-            item_data.get("time_remaining", ""),
-            item_data.get("crafter", ""),
-            item_data.get("building_name", ""),
-        ]
-        
-        parent_id = self.tree.insert("", "end", values=item_values, tags=(item_tag,))
-        
-        # Add child operations if expandable
-        if item_data.get("is_expandable", False):
-            for operation in item_data.get("operations", []):
-                child_tag = "ready" if operation.get("time_remaining", "") == "READY" else "crafting"
-                child_values = [
-                    "",  # Empty item name for child
-                    "",  # Empty tier for child
-                    operation.get("quantity", ""),
-                    "",  # Empty tag for child
-                    "",  # Empty jobs for child
-                    operation.get("time_remaining", ""),
-                    operation.get("crafter", ""),
-                    operation.get("building_name", ""),
-                ]
-                self.tree.insert(parent_id, "end", values=child_values, tags=("child", child_tag))
-
-        item_key = self._generate_item_key(item_data)
-        self._ui_item_cache[item_key] = parent_id
-    
     def destroy(self):
         """Clean up resources when tab is destroyed."""
         try:
-            # Cancel any active async rendering operations
-            if hasattr(self, 'current_render_operation') and self.current_render_operation:
-                self._cancel_async_rendering(self.current_render_operation)
-            
-            # Clean up async rendering resources
-            self._cleanup_async_rendering()
-            
+            # Stop the countdown tick
+            if getattr(self, "_countdown_after_id", None):
+                self.after_cancel(self._countdown_after_id)
+                self._countdown_after_id = None
+
             # Clean up optimization resources
             self.optimization_shutdown()
         except Exception as e:
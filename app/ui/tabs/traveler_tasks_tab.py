@@ -454,9 +454,9 @@ class TravelerTasksTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
         Filters the master data list based on search and column filters.
         """
         search_text = self.app.get_search_text()
-        parsed_query = None
+        matches_search = None
         if search_text:
-            parsed_query = self.search_parser.parse_search_query(search_text)
+            matches_search = self.search_parser.compile_query(search_text, "traveler_tasks")
         
         temp_data = []
 
@@ -501,7 +501,7 @@ class TravelerTasksTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
                                 break
 
                 # Apply keyword-based search filter to individual operations
-                if operation_matches and parsed_query:
+                if operation_matches and matches_search:
                     # For operations, we need to map some fields for proper searching
                     # Map various possible field names from the operation data
                     required_item = operation.get('required_item', '') or operation.get('item', '') or operation.get('name', '')
@@ -517,7 +517,7 @@ class TravelerTasksTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
                         # Include all operation fields for broader matching
                         **operation
                     }
-                    if not self.search_parser.match_row(search_row, parsed_query):
+                    if not matches_search(search_row):
                         operation_matches = False
 
                 # If operation matches all filters, include it
@@ -539,7 +539,7 @@ class TravelerTasksTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
                             break
 
             # Apply search to traveler level if no operations matched
-            if traveler_matches and parsed_query and not filtered_operations:
+            if traveler_matches and matches_search and not filtered_operations:
                 # If no operations matched search, check if traveler info matches
                 search_row = {
                     'name': row.get('traveler_name', '') or row.get('traveler', ''),
@@ -549,7 +549,7 @@ class TravelerTasksTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
                     # Include all traveler fields for broader matching
                     **row
                 }
-                if not self.search_parser.match_row(search_row, parsed_query):
+                if not matches_search(search_row):
                     traveler_matches = False
 
             # Include traveler group if it matches and has matching operations (or no operation-level filters)
@@ -576,7 +576,7 @@ class TravelerTasksTab(ctk.CTkFrame, OptimizedTableMixin, AsyncRenderingMixin):
                         temp_data.append(filtered_row)
                 else:
                     # No operation-level filters, include as-is (but still apply search to operations)
-                    if parsed_query and filtered_operations != original_operations:
+                    if matches_search and filtered_operations != original_operations:
                         filtered_row["operations"] = filtered_operations
                         completed_count = sum(1 for op in filtered_operations if op.get("status") == "✅")
                         total_count = len(filtered_operations)
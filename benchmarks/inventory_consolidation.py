@@ -0,0 +1,106 @@
+"""
+Benchmark: pure-Python vs NumPy inventory consolidation.
+
+Builds a synthetic claim (default 20,000 occupied pockets spread over 400
+containers) and times a full InventoryProcessor._consolidate_inventory() rebuild
+with each engine.
+
+Usage:
+    python benchmarks/inventory_consolidation.py [--pockets 20000] [--containers 400] [--repeat 5]
+"""
+
+import argparse
+import os
+import queue
+import random
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.table_store import TableStore
+from app.core.processors import inventory_processor
+from app.core.processors.inventory_processor import InventoryProcessor
+from app.core.utils.item_lookup_service import ItemLookupService
+
+
+def build_reference_data(item_count=2000, cargo_count=500):
+    """Create item/cargo/building reference data of realistic size."""
+    return {
+        "item_desc": [{"id": i, "name": f"Item {i}", "tier": i % 10, "tag": "Material"} for i in range(1, item_count + 1)],
+        "cargo_desc": [{"id": i, "name": f"Cargo {i}", "tier": i % 10, "tag": "Cargo"} for i in range(1, cargo_count + 1)],
+        "resource_desc": [],
+        "building_desc": [{"id": 100, "name": "Storage Chest"}],
+        "crafting_recipe_desc": [],
+    }
+
+
+def build_processor(pocket_count, container_count, seed=1):
+    """Create an InventoryProcessor holding a synthetic claim inventory."""
+    rng = random.Random(seed)
+    reference_data = build_reference_data()
+    services = {"item_lookup_service": ItemLookupService(reference_data), "table_store": TableStore()}
+    processor = InventoryProcessor(queue.Queue(), services, reference_data)
+    processor.item_lookup_service = services["item_lookup_service"]
+
+    pockets_per_container = max(1, pocket_count // container_count)
+    buildings = []
+    rows = []
+    for container in range(container_count):
+        building_id = 10_000 + container
+        buildings.append({"entity_id": building_id, "building_description_id": 100})
+
+        # Mixed containers: item slots first, cargo slots from cargo_index
+        cargo_index = pockets_per_container * 3 // 4
+        pockets = []
+        for slot in range(pockets_per_container):
+            item_id = rng.randint(1, 500 if slot >= cargo_index else 2000)
+            pockets.append([0, [0, [item_id, rng.randint(1, 100), [0, []], [1, []]]], False])
+
+        rows.append(
+            {"entity_id": 1_000_000 + container, "owner_entity_id": building_id, "cargo_index": cargo_index, "pockets": pockets}
+        )
+
+    services["table_store"].apply_table_update({"table_name": "building_state", "inserts": buildings})
+    processor._process_inventory_data(rows)
+    return processor
+
+
+def time_engine(processor, use_numpy, repeat):
+    """Return (best seconds, result) for repeated full rebuilds with one engine."""
+    best = None
+    result = None
+    with patch.object(inventory_processor, "NUMPY_AVAILABLE", use_numpy):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = processor._consolidate_inventory()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pockets", type=int, default=20_000)
+    parser.add_argument("--containers", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    processor = build_processor(args.pockets, args.containers)
+    print(f"{args.pockets} pockets in {args.containers} containers, best of {args.repeat}")
+
+    python_time, python_result = time_engine(processor, False, args.repeat)
+    print(f"  python: {python_time * 1000:8.1f} ms  ({len(python_result)} items)")
+
+    if not inventory_processor.NUMPY_AVAILABLE:
+        print("  numpy:  not installed")
+        return
+
+    numpy_time, numpy_result = time_engine(processor, True, args.repeat)
+    print(f"  numpy:  {numpy_time * 1000:8.1f} ms  ({len(numpy_result)} items)")
+    print(f"  speedup: {python_time / numpy_time:.1f}x, results match: {numpy_result == python_result}")
+
+
+if __name__ == "__main__":
+    main()
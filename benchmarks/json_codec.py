@@ -0,0 +1,158 @@
+"""
+Benchmark: stdlib json vs the fast json_codec backend on SpacetimeDB frames.
+
+Decodes each frame and then every row string inside it, the same work the
+client and MessageRouter do per message. Frames are read from a recording (a
+TrafficRecorder .jsonl.gz file, or one raw JSON frame per line) or synthesized:
+one InitialSubscription plus a stream of small TransactionUpdates over
+inventory and crafting rows.
+
+Usage:
+    python benchmarks/json_codec.py [--frames session.jsonl.gz] [--updates 2000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.client.traffic_recorder import read_recording
+from app.services import json_codec
+
+
+def inventory_row(rng, entity_id):
+    pockets = [[0, [0, [rng.randint(1, 2000), rng.randint(1, 100), [0, []], [1, []]]], False] for _ in range(40)]
+    return {"entity_id": entity_id, "owner_entity_id": entity_id + 1, "cargo_index": 30, "pockets": pockets}
+
+
+def craft_row(rng, entity_id):
+    return {
+        "entity_id": entity_id,
+        "owner_entity_id": 123,
+        "recipe_id": rng.randint(1, 500),
+        "building_entity_id": rng.randint(1, 400),
+        "building_description_id": 7,
+        "timestamp": {"__timestamp_micros_since_unix_epoch__": 1_700_000_000_000_000},
+        "status": [1, {}],
+        "slot": [0, 3],
+    }
+
+
+def table_update(table_name, inserts, deletes=()):
+    return {
+        "table_id": 1,
+        "table_name": table_name,
+        "num_rows": len(inserts),
+        "updates": [{"deletes": [json.dumps(r) for r in deletes], "inserts": [json.dumps(r) for r in inserts]}],
+    }
+
+
+def synthesize_frames(update_count, seed=1):
+    """Create raw JSON frames shaped like a live claim subscription."""
+    rng = random.Random(seed)
+    inventories = [inventory_row(rng, 1_000_000 + i) for i in range(400)]
+    crafts = [craft_row(rng, 2_000_000 + i) for i in range(300)]
+
+    frames = [
+        json.dumps(
+            {
+                "InitialSubscription": {
+                    "database_update": {
+                        "tables": [table_update("inventory_state", inventories), table_update("passive_craft_state", crafts)]
+                    },
+                    "request_id": 1,
+                }
+            }
+        )
+    ]
+    for _ in range(update_count):
+        if rng.random() < 0.5:
+            old = rng.choice(inventories)
+            update = table_update("inventory_state", [inventory_row(rng, old["entity_id"])], [old])
+        else:
+            old = rng.choice(crafts)
+            update = table_update("passive_craft_state", [craft_row(rng, old["entity_id"])], [old])
+        frames.append(
+            json.dumps(
+                {
+                    "TransactionUpdate": {
+                        "status": {"Committed": {"tables": [update]}},
+                        "timestamp": {"__timestamp_micros_since_unix_epoch__": 1_700_000_000_000_000},
+                        "reducer_call": {"reducer_name": "inventory_update", "reducer_id": 1, "args": "", "request_id": 0},
+                    }
+                }
+            )
+        )
+    return frames
+
+
+def load_frames(path):
+    """Read text frames from a TrafficRecorder recording or a file with one raw JSON frame per line."""
+    if path.endswith(".gz"):
+        _, frames = read_recording(path)
+        return [frame for _, frame in frames if isinstance(frame, str)]
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def decode_frame(frame):
+    """Decode a frame and every row string in it; returns the row count."""
+    message = json_codec.loads(frame)
+    rows = 0
+    for body in message.values():
+        if not isinstance(body, dict):
+            continue
+        tables = body.get("status", {}).get("Committed", {}).get("tables") or body.get("database_update", {}).get("tables", [])
+        for table in tables:
+            for update in table.get("updates", []):
+                for key in ("inserts", "deletes"):
+                    for row in update.get(key, []):
+                        if isinstance(row, str):
+                            json_codec.loads(row)
+                            rows += 1
+    return rows
+
+
+def time_backend(frames, backend, repeat):
+    """Return (best seconds, rows decoded) for decoding all frames with one backend."""
+    best = None
+    rows = 0
+    with patch.object(json_codec, "BACKEND", backend):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = sum(decode_frame(frame) for frame in frames)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", help="TrafficRecorder recording (.gz) or file with one raw JSON frame per line")
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames) if args.frames else synthesize_frames(args.updates)
+    size_mb = sum(len(frame) for frame in frames) / 1e6
+    print(f"{len(frames)} frames ({size_mb:.1f} MB), best of {args.repeat}")
+
+    json_time, rows = time_backend(frames, "json", args.repeat)
+    print(f"  json:    {json_time * 1000:8.1f} ms  ({rows} rows)")
+
+    if json_codec.BACKEND == "json":
+        print("  orjson/msgspec: not installed")
+        return
+
+    fast_time, _ = time_backend(frames, json_codec.BACKEND, args.repeat)
+    print(f"  {json_codec.BACKEND + ':':8} {fast_time * 1000:8.1f} ms")
+    print(f"  speedup: {json_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
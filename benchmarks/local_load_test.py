@@ -0,0 +1,163 @@
+"""
+Benchmark: end-to-end DataService throughput and latency against the local stand-in server.
+
+Starts app.client.local_server with a synthetic claim (or a recording), points
+BitCraft at it through BITCRAFT_SPACETIME_HOST and runs the real DataService
+start-up path: player lookup, reference data and claim queries, subscriptions
+and processors. While the server commits transactions at --rate, every
+TransactionUpdate's latency is measured from its commit timestamp to the moment
+MessageRouter has finished routing it.
+
+The reference data cache and player_data.json are left untouched.
+
+Per-stage metrics (rows/s per table, processor latency percentiles, frame
+sizes, queue depth) can be written with --metrics-json.
+
+Usage:
+    python benchmarks/local_load_test.py [--rate 200] [--duration 10] [--buildings 400] [--recording session.jsonl.gz]
+                                         [--metrics-json metrics.json]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.client.local_server import LocalDatabase, LocalSpacetimeServer, SyntheticWorkload, load_recording, synthetic_claim
+from app.core.message_router import MessageRouter
+from app.services.latency_tracer import finish_trace
+from app.services.metrics_registry import get_metrics_registry
+
+
+class LatencyProbe:
+    """Wraps MessageRouter.handle_message to time subscription messages."""
+
+    def __init__(self):
+        self.latencies = []
+        self.ready_at = None
+        self._handle_message = MessageRouter.handle_message
+
+    def handle_message(self, router, message):
+        self._handle_message(router, message)
+        if "TransactionUpdate" in message:
+            committed = message["TransactionUpdate"].get("timestamp", {}).get("__timestamp_micros_since_unix_epoch__")
+            if committed:
+                self.latencies.append(time.time() - committed / 1_000_000)
+        elif self.ready_at is None and ("SubscribeMultiApplied" in message or "InitialSubscription" in message):
+            self.ready_at = time.monotonic()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=200.0, help="server transactions per second (0 = unthrottled)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to measure after subscriptions are live")
+    parser.add_argument("--player", default="loadtest")
+    parser.add_argument("--buildings", type=int, default=400)
+    parser.add_argument("--pockets", type=int, default=20)
+    parser.add_argument("--crafts", type=int, default=300)
+    parser.add_argument("--recording", help="seed the server from a JSON traffic recording instead")
+    parser.add_argument("--metrics-json", help="write the metrics registry snapshot for the measured period here")
+    parser.add_argument("--verbose", action="store_true", help="keep application logging enabled")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    if args.recording:
+        tables, workload = load_recording(args.recording)
+        database = LocalDatabase(tables)
+    else:
+        database = LocalDatabase(synthetic_claim(args.player, args.buildings, args.pockets, args.crafts))
+        workload = SyntheticWorkload(database)
+
+    probe = LatencyProbe()
+    server = LocalSpacetimeServer(database, workload=None, rate=args.rate).start()
+    os.environ["BITCRAFT_SPACETIME_HOST"] = server.url
+
+    with patch.object(MessageRouter, "handle_message", lambda router, message: probe.handle_message(router, message)), patch(
+        "app.services.reference_cache_service.ReferenceCacheService.get_cached_reference_data", return_value=None
+    ), patch("app.services.reference_cache_service.ReferenceCacheService.cache_reference_data", return_value=True), patch(
+        "app.client.bitcraft_client.BitCraft.update_user_data_file"
+    ):
+        from app.core.data_service import DataService
+
+        service = DataService()
+        service.client.auth = "local-load-test"
+
+        # Drain the UI queue like the main window would
+        ui_messages = [0]
+        stop_draining = threading.Event()
+
+        def drain():
+            while not stop_draining.is_set():
+                try:
+                    message = service.data_queue.get(timeout=0.1)
+                    ui_messages[0] += 1
+                except Exception:
+                    continue
+                # No tabs here: the trace ends when the message is taken off the queue
+                if message.get("trace"):
+                    now = time.time()
+                    finish_trace({**message["trace"], "picked": now, "handled": now})
+
+        threading.Thread(target=drain, daemon=True).start()
+
+        start = time.monotonic()
+        service.start("loadtest@example.com", None, "local", args.player)
+        while probe.ready_at is None and time.monotonic() - start < 60:
+            time.sleep(0.05)
+        if probe.ready_at is None:
+            print("DataService did not subscribe within 60s")
+            service.stop()
+            server.stop()
+            return
+        # Let both subscription groups land before the load starts
+        time.sleep(0.5)
+        startup = probe.ready_at - start
+
+        committed_before = server.transactions_committed
+        get_metrics_registry().reset()
+        server.start_workload(workload)
+        time.sleep(args.duration)
+        server.stop_workload()
+        committed = server.transactions_committed - committed_before
+        # Let in-flight messages drain
+        time.sleep(0.5)
+        snapshot = get_metrics_registry().snapshot()
+        if args.metrics_json:
+            get_metrics_registry().dump_json(args.metrics_json)
+
+        service.stop()
+        stop_draining.set()
+    server.stop()
+
+    latencies = probe.latencies
+    print(f"startup (connect, queries, first subscription): {startup * 1000:.0f} ms")
+    print(f"transactions committed: {committed} in {args.duration:.1f}s ({committed / args.duration:.0f}/s)")
+    print(f"transactions routed:    {len(latencies)}, UI messages: {ui_messages[0]}")
+    if latencies:
+        print(
+            "latency ms: "
+            f"p50 {statistics.median(latencies) * 1000:.1f}  "
+            f"p95 {percentile(latencies, 0.95) * 1000:.1f}  "
+            f"p99 {percentile(latencies, 0.99) * 1000:.1f}  "
+            f"max {max(latencies) * 1000:.1f}"
+        )
+    for name, span in snapshot["latency_ms"].items():
+        if name.startswith("trace."):
+            print(f"{name:<22} p50 {span['p50']:.1f}  p95 {span['p95']:.1f}  p99 {span['p99']:.1f}  ({span['count']} updates)")
+
+
+if __name__ == "__main__":
+    main()
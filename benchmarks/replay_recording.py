@@ -0,0 +1,107 @@
+"""
+Benchmark: replay a recorded session through the real processors.
+
+Loads a traffic recording (set BITCRAFT_RECORD_TRAFFIC=session.jsonl.gz while
+running the app, or call BitCraft.start_recording), builds the same
+MessageRouter/processor stack as DataService and feeds it every recorded
+message. Frames are decoded up front so the routing time excludes JSON/BSATN
+decoding, which is reported separately.
+
+Reference data comes from the local reference cache when present.
+
+Usage:
+    python benchmarks/replay_recording.py session.jsonl.gz [--speed 0] [--claim-id ID] [--repeat 3] [--verbose]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.client.traffic_recorder import ReplayClient
+from app.core.change_feed import ChangeFeed
+from app.core.message_router import MessageRouter
+from app.core.processors import (
+    ActiveCraftingProcessor,
+    ClaimsProcessor,
+    CraftingProcessor,
+    InventoryProcessor,
+    ReferenceDataProcessor,
+    StaminaProcessor,
+    TasksProcessor,
+)
+from app.core.table_store import TableStore
+from app.core.utils.item_lookup_service import ItemLookupService
+from app.models.claim import Claim
+from app.services.reference_cache_service import ReferenceCacheService
+
+
+def build_router(reference_data, claim_id):
+    """Create a MessageRouter with the DataService processor stack (no timers)."""
+    data_queue = queue.Queue()
+    claim = Claim()
+    claim.claim_id = claim_id
+    table_store = TableStore()
+    services = {
+        "claim": claim,
+        "item_lookup_service": ItemLookupService(reference_data),
+        "table_store": table_store,
+        "change_feed": ChangeFeed(),
+    }
+    processors = [
+        InventoryProcessor(data_queue, services, reference_data),
+        CraftingProcessor(data_queue, services, reference_data),
+        TasksProcessor(data_queue, services, reference_data),
+        ClaimsProcessor(data_queue, services, reference_data),
+        ActiveCraftingProcessor(data_queue, services, reference_data),
+        ReferenceDataProcessor(data_queue, services, reference_data),
+        StaminaProcessor(data_queue, services, reference_data),
+    ]
+    for processor in processors:
+        processor.claim = claim
+    router = MessageRouter(processors, data_queue, table_store=table_store, change_feed=services["change_feed"])
+    return router, data_queue
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=0, help="1 = recorded timing, N = N times faster, 0 = no delays")
+    parser.add_argument("--claim-id", default=None, help="claim the processors treat as current")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--verbose", action="store_true", help="keep processor logging enabled")
+    args = parser.parse_args()
+
+    # Processor logging would dominate the timings
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    reference_data = ReferenceCacheService().get_cached_reference_data() or {}
+    client = ReplayClient(args.recording)
+
+    start = time.perf_counter()
+    messages = client.decode_messages()
+    decode_time = time.perf_counter() - start
+    duration = client.frames[-1][0] - client.frames[0][0] if client.frames else 0.0
+
+    print(f"{len(client.frames)} frames ({client.header.get('subprotocol')}), {duration:.1f}s recorded")
+    print(f"  decode: {decode_time * 1000:8.1f} ms  ({len(messages)} messages)")
+
+    for run in range(args.repeat):
+        # MessageRouter decodes row strings in place, so each run needs fresh messages
+        if run:
+            messages = client.decode_messages()
+        router, data_queue = build_router(reference_data, args.claim_id)
+        stats = client.replay(router.handle_message, speed=args.speed, messages=messages)
+        print(
+            f"  route:  {stats['elapsed'] * 1000:8.1f} ms  ({stats['messages_per_second']:.0f} msg/s, "
+            f"{data_queue.qsize()} UI messages, {stats['errors']} errors)"
+        )
+
+
+if __name__ == "__main__":
+    main()
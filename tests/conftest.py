@@ -25,6 +25,8 @@ class MockBitCraftClient:
         self.region = "test-region"
         self.query_responses = {}
         self.subscription_listener = None
+        self.subscriptions = {}
+        self.subscription_history = []
         self.subscription_thread = None
         self._stop_subscription = Mock()
         self.ws_lock = threading.Lock()
@@ -67,6 +69,10 @@ class MockBitCraftClient:
     def query(self, query_string: str) -> List[Dict]:
         """Return mock query responses based on query string."""
         return self.query_responses.get(query_string, [])
+
+    def query_many(self, query_strings: List[str]) -> List[List[Dict]]:
+        """Return mock query responses for a batch of queries."""
+        return [self.query(query_string) for query_string in query_strings]
         
     def start_subscription_listener(self, queries: List[str], callback):
         """Mock subscription listener."""
@@ -75,6 +81,22 @@ class MockBitCraftClient:
             "callback": callback
         }
         
+    def subscribe(self, queries: List[str], callback) -> int:
+        """Mock per-handle subscription; returns a new handle."""
+        query_id = len(self.subscription_history) + 1
+        self.subscription_history.append(("subscribe", query_id, list(queries)))
+        self.subscriptions[query_id] = list(queries)
+        self.subscription_listener = {"queries": queries, "callback": callback}
+        return query_id
+
+    def unsubscribe(self, query_id: int) -> bool:
+        """Mock removal of one subscription handle."""
+        self.subscription_history.append(("unsubscribe", query_id, None))
+        return self.subscriptions.pop(query_id, None) is not None
+
+    def get_subscription_ids(self) -> List[int]:
+        return list(self.subscriptions)
+
     def test_server_connectivity(self) -> bool:
         """Mock server connectivity test."""
         return True
@@ -0,0 +1,264 @@
+"""
+Tests for the BSATN codec - binary rows decode to the same shapes as JSON rows.
+"""
+
+import gzip
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.client.bsatn import (
+    CLIENT_MESSAGE,
+    SERVER_MESSAGE,
+    TABLE_SCHEMAS,
+    BsatnCodec,
+    dataclass_schema,
+    U32,
+)
+from app.client.bitcraft_client import BitCraft
+from app.client.codecs import JsonCodec
+from app.client.query_service import QUERIED_TABLES
+from app.core.change_feed import ChangeFeed
+from app.core.message_router import MessageRouter
+from app.core.processors.crafting_processor import CraftingProcessor
+from app.core.processors.inventory_processor import InventoryProcessor
+from app.core.table_store import TableStore
+from app.models import BuildingState
+from tests.conftest import MockProcessor
+
+
+def encode_row(table_name, row):
+    out = bytearray()
+    TABLE_SCHEMAS[table_name].encode(row, out)
+    return bytes(out)
+
+
+def encode_frame(message, compression=0):
+    out = bytearray()
+    SERVER_MESSAGE.encode(message, out)
+    body = bytes(out)
+    if compression == 2:
+        body = gzip.compress(body)
+    return bytes([compression]) + body
+
+
+PASSIVE_CRAFT = {
+    "entity_id": 2**63 + 5,
+    "owner_entity_id": 123,
+    "recipe_id": 100,
+    "building_entity_id": 200,
+    "timestamp": {"__timestamp_micros_since_unix_epoch__": 1_700_000_000_000_000},
+    "status": [1, {}],
+    "slot": [0, 3],
+}
+
+# The same row as JSON TransactionUpdates carry it
+PASSIVE_CRAFT_ARRAY = [2**63 + 5, 123, 100, 200, [1_700_000_000_000_000], [1, {}], [0, 3]]
+
+BUILDING = {
+    "entity_id": 200,
+    "claim_entity_id": 300,
+    "direction_index": 2,
+    "building_description_id": 7,
+    "constructed_by_player_entity_id": 123,
+}
+
+
+def table_update(table_name, inserts, deletes=()):
+    return {
+        "table_id": 1,
+        "table_name": table_name,
+        "num_rows": len(inserts),
+        "updates": [
+            {
+                "deletes": [encode_row(table_name, row) for row in deletes],
+                "inserts": [encode_row(table_name, row) for row in inserts],
+            }
+        ],
+    }
+
+
+def transaction_message(table_name, inserts, deletes=(), extra_tables=()):
+    return {
+        "TransactionUpdate": {
+            "status": {"Committed": {"tables": [table_update(table_name, inserts, deletes), *extra_tables]}},
+            "timestamp": {"__timestamp_micros_since_unix_epoch__": 1_700_000_000_000_000},
+            "caller_identity": {"__identity__": "0x" + "ab" * 32},
+            "caller_connection_id": {"__connection_id__": 9},
+            "reducer_call": {"reducer_name": "passive_craft_process", "reducer_id": 4, "args": b"", "request_id": 0},
+            "energy_quanta_used": {"quanta": 0},
+            "total_host_execution_duration": {"__time_duration_micros__": 12},
+        }
+    }
+
+
+class TestBsatnCodec:
+    """Test BSATN decoding of rows and server messages."""
+
+    def test_row_round_trip_matches_json_shape(self):
+        """Test that a row decodes to the dict shape processors read from JSON subscription rows."""
+        row = encode_row("passive_craft_state", PASSIVE_CRAFT)
+        decoded, end = TABLE_SCHEMAS["passive_craft_state"].decode(row, 0)
+
+        assert decoded == PASSIVE_CRAFT
+        assert end == len(row)
+
+    def test_schema_fields_follow_dataclass(self):
+        """Test that row schemas use the dataclass field order."""
+        assert [name for name, _ in TABLE_SCHEMAS["building_state"].fields] == list(BuildingState.__dataclass_fields__)
+
+        with pytest.raises(ValueError):
+            dataclass_schema(BuildingState, entity_id=U32)  # remaining int fields have no width
+        with pytest.raises(ValueError):
+            dataclass_schema(BuildingState, not_a_field=U32)
+
+    @pytest.mark.parametrize("compression", [0, 2])
+    def test_transaction_update_decodes_for_message_router(self, compression):
+        """Test that a decoded TransactionUpdate routes like its JSON equivalent."""
+        frame = encode_frame(transaction_message("passive_craft_state", [PASSIVE_CRAFT]), compression)
+        message = BsatnCodec().decode(frame)
+
+        transaction = message["TransactionUpdate"]
+        decoded_update = transaction["status"]["Committed"]["tables"][0]
+        assert decoded_update["updates"][0]["inserts"] == [PASSIVE_CRAFT_ARRAY]
+        assert transaction["reducer_call"]["reducer_name"] == "passive_craft_process"
+
+        processor = MockProcessor(["passive_craft_state"])
+        router = MessageRouter([processor], data_queue=None)
+        router.handle_message(message)
+
+        routed = processor.processed_transactions[0]
+        assert routed["table_update"]["updates"][0]["inserts"] == [PASSIVE_CRAFT_ARRAY]
+        assert routed["reducer_name"] == "passive_craft_process"
+        assert routed["timestamp"] == 1_700_000_000
+
+    def test_transaction_rows_reach_real_processors(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that BSATN transaction rows are parsed by the processors' from_array() paths."""
+        store = TableStore()
+        feed = ChangeFeed()
+        member = {"entity_id": 1, "claim_entity_id": 300, "player_entity_id": 123, "user_name": "Alice"}
+        store.apply_table_update({"table_name": "claim_member_state", "updates": [{"inserts": [member]}]})
+        services = dict(mock_services, table_store=store, change_feed=feed)
+        inventory = InventoryProcessor(mock_data_queue, services, mock_reference_data)
+        crafting = CraftingProcessor(mock_data_queue, services, mock_reference_data)
+        inventory._send_incremental_inventory_update = Mock()
+        crafting._send_incremental_crafting_update = Mock()
+        router = MessageRouter([inventory, crafting], mock_data_queue, table_store=store, change_feed=feed)
+
+        inventory_row = {
+            "entity_id": 10,
+            # [volume, some([item_id, quantity, item_type, durability]), locked]
+            "pockets": [[6000, [0, [1001, 7, [0, {}], [1, {}]]], False]],
+            "inventory_index": 0,
+            "cargo_index": 1,
+            "owner_entity_id": 200,
+            "player_owner_entity_id": 123,
+        }
+        message = transaction_message(
+            "passive_craft_state", [PASSIVE_CRAFT], extra_tables=[table_update("inventory_state", [inventory_row])]
+        )
+
+        router.handle_message(BsatnCodec().decode(encode_frame(message)))
+
+        assert inventory._inventory_data[200][10]["pockets"][0][1][1][1] == 7
+        inventory._send_incremental_inventory_update.assert_called_once()
+        craft = crafting._passive_craft_data[2**63 + 5]
+        assert craft["timestamp_micros"] == 1_700_000_000_000_000
+        assert craft["slot"] == [0, 3]
+        crafting._send_incremental_crafting_update.assert_called_once()
+
+    def test_row_not_matching_schema_raises(self):
+        """Test that rows with bytes left over their schema are rejected instead of misread."""
+        message = transaction_message("building_state", [BUILDING])
+        row_update = message["TransactionUpdate"]["status"]["Committed"]["tables"][0]["updates"][0]
+        row_update["inserts"] = [row_update["inserts"][0] + b"\x00\x00\x00\x00"]
+
+        with pytest.raises(ValueError):
+            BsatnCodec().decode(encode_frame(message))
+
+    def test_client_uses_bsatn_only_with_every_queried_schema(self):
+        """Test that BSATN is not negotiated while a queried table has no schema."""
+        missing = BsatnCodec().missing_schemas(QUERIED_TABLES)
+        assert {"claim_local_state", "item_desc", "player_lowercase_username_state"} <= set(missing)
+        assert "passive_craft_state" not in missing
+        assert isinstance(BitCraft._create_codec(BsatnCodec.subprotocol), JsonCodec)
+
+        with patch("app.client.bitcraft_client.QUERIED_TABLES", frozenset(TABLE_SCHEMAS)):
+            assert isinstance(BitCraft._create_codec(BsatnCodec.subprotocol), BsatnCodec)
+
+    def test_tables_without_schema_are_dropped(self):
+        """Test that updates for unknown tables are removed rather than passed on as bytes."""
+        message = transaction_message("building_state", [BUILDING])
+        message["TransactionUpdate"]["status"]["Committed"]["tables"][0]["table_name"] = "mystery_state"
+
+        decoded = BsatnCodec().decode(encode_frame(message))
+
+        assert decoded["TransactionUpdate"]["status"]["Committed"]["tables"] == []
+
+    def test_one_off_query_response(self):
+        """Test that query responses get hex message ids and decoded rows."""
+        frame = encode_frame(
+            {
+                "OneOffQueryResponse": {
+                    "message_id": bytes.fromhex("00ff10"),
+                    "error": [1, {}],
+                    "tables": [{"table_name": "building_state", "rows": [encode_row("building_state", BUILDING)]}],
+                    "total_host_execution_duration": {"__time_duration_micros__": 1},
+                }
+            }
+        )
+
+        response = BsatnCodec().decode(frame)["OneOffQueryResponse"]
+
+        assert response["message_id"] == "00ff10"
+        assert response["error"] is None
+        assert response["tables"][0]["rows"] == [BUILDING]
+
+    def test_encode_client_messages(self):
+        """Test that Subscribe and OneOffQuery frames round-trip through the client schema."""
+        codec = BsatnCodec()
+
+        subscribe = {"Subscribe": {"query_strings": ["SELECT * FROM building_state;"], "request_id": 1}}
+        assert CLIENT_MESSAGE.decode(codec.encode(subscribe), 0)[0] == subscribe
+
+        query = codec.encode({"OneOffQuery": {"message_id": "abcd", "query_string": "SELECT 1;"}})
+        decoded = CLIENT_MESSAGE.decode(query, 0)[0]
+        assert decoded == {"OneOffQuery": {"message_id": b"\xab\xcd", "query_string": "SELECT 1;"}}
+
+    def test_subscription_handle_messages(self):
+        """Test SubscribeMulti/UnsubscribeMulti encoding and SubscribeMultiApplied decoding."""
+        codec = BsatnCodec()
+        subscribe = {"SubscribeMulti": {"query_strings": ["SELECT * FROM building_state;"], "request_id": 2, "query_id": {"id": 5}}}
+        unsubscribe = {"UnsubscribeMulti": {"request_id": 3, "query_id": {"id": 5}}}
+        assert CLIENT_MESSAGE.decode(codec.encode(subscribe), 0)[0] == subscribe
+        assert CLIENT_MESSAGE.decode(codec.encode(unsubscribe), 0)[0] == unsubscribe
+
+        database_update = transaction_message("building_state", [BUILDING])["TransactionUpdate"]["status"]["Committed"]
+        frame = encode_frame(
+            {
+                "SubscribeMultiApplied": {
+                    "request_id": 2,
+                    "total_host_execution_duration_micros": 10,
+                    "query_id": {"id": 5},
+                    "update": database_update,
+                }
+            }
+        )
+
+        applied = codec.decode(frame)["SubscribeMultiApplied"]
+
+        assert applied["query_id"] == {"id": 5}
+        assert applied["update"]["tables"][0]["updates"][0]["inserts"] == [BUILDING]
+
+    def test_malformed_frame_raises_value_error(self):
+        """Test that truncated frames raise ValueError for the reader to log."""
+        frame = encode_frame(transaction_message("building_state", [BUILDING]))
+
+        with pytest.raises(ValueError):
+            BsatnCodec().decode(frame[:-10])
+
+    @pytest.mark.parametrize("payload", [b"notgzip", gzip.compress(b"\x00" * 64)[:-12]])
+    def test_corrupt_gzip_frame_raises_value_error(self, payload):
+        """Test that corrupt or truncated gzip payloads raise ValueError."""
+        with pytest.raises(ValueError):
+            BsatnCodec().decode(bytes([2]) + payload)
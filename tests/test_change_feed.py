@@ -0,0 +1,243 @@
+"""
+Tests for the row-level change feed.
+
+Tests pairing of SpacetimeDB delete+insert rows into RowInserted/RowUpdated/RowDeleted
+events, filtered subscriptions, and MessageRouter/processor integration.
+"""
+
+from unittest.mock import Mock
+from app.core.change_feed import ChangeFeed, RowInserted, RowUpdated, RowDeleted, compute_row_changes
+from app.core.message_router import MessageRouter
+from app.core.processors.active_crafting_processor import ActiveCraftingProcessor
+from app.core.processors.crafting_processor import CraftingProcessor
+from app.core.processors.inventory_processor import InventoryProcessor
+from app.core.table_store import TableStore
+from app.core.utils.item_lookup_service import ItemLookupService
+from tests.conftest import MockProcessor
+
+
+def _inventory_row(entity_id, owner_id, quantity, player_id=0):
+    return [entity_id, [[0, [0, [1001, quantity, [], []]], False]], 0, 1, owner_id, player_id]
+
+
+class TestComputeRowChanges:
+    """Test delete+insert pairing."""
+
+    def test_pairs_deletes_and_inserts_by_primary_key(self):
+        """Test that matching keys become updates and the rest inserts/deletes."""
+        table_update = {
+            "table_name": "inventory_state",
+            "updates": [{
+                "deletes": [_inventory_row(1, 100, 5), _inventory_row(2, 100, 3)],
+                "inserts": [_inventory_row(1, 100, 7), _inventory_row(3, 200, 1)],
+            }],
+        }
+
+        events = compute_row_changes(table_update)
+        by_key = {event.key: event for event in events}
+
+        assert isinstance(by_key[1], RowUpdated)
+        assert by_key[1].old_row["pockets"][0][1][1][1] == 5
+        assert by_key[1].new_row["pockets"][0][1][1][1] == 7
+        assert isinstance(by_key[2], RowDeleted)
+        assert isinstance(by_key[3], RowInserted)
+        assert by_key[3].row["owner_entity_id"] == 200
+
+    def test_pairs_across_update_groups(self):
+        """Test that a delete and insert in different update groups form one update."""
+        table_update = {
+            "table_name": "building_nickname_state",
+            "updates": [{"deletes": [[5, "Old"]]}, {"inserts": [[5, "New"]]}],
+        }
+
+        events = compute_row_changes(table_update)
+
+        assert events == [RowUpdated("building_nickname_state", 5, {"entity_id": 5, "nickname": "Old"}, {"entity_id": 5, "nickname": "New"})]
+
+    def test_parse_row_can_skip_rows(self):
+        """Test that rows rejected by parse_row produce no events."""
+        table_update = {"table_name": "t", "updates": [{"inserts": [{"entity_id": 1}, {"entity_id": 2}]}]}
+
+        events = compute_row_changes(table_update, lambda row: row if row["entity_id"] == 2 else None)
+
+        assert [event.key for event in events] == [2]
+
+
+class TestChangeFeed:
+    """Test ChangeFeed subscriptions."""
+
+    def test_filtered_subscriptions(self):
+        """Test table, event type and predicate filters."""
+        feed = ChangeFeed()
+        all_inventory = Mock()
+        deletes_only = Mock()
+        owner_200 = Mock()
+        other_table = Mock()
+
+        feed.subscribe(all_inventory, tables=["inventory_state"])
+        feed.subscribe(deletes_only, tables=["inventory_state"], event_types=[RowDeleted])
+        feed.subscribe(owner_200, predicate=lambda e: isinstance(e, RowInserted) and e.row["owner_entity_id"] == 200)
+        feed.subscribe(other_table, tables=["claim_state"])
+
+        feed.publish(
+            {"table_name": "inventory_state", "updates": [{"inserts": [_inventory_row(3, 200, 1)], "deletes": [_inventory_row(2, 100, 3)]}]},
+            "item_stack_move",
+            1640995200.0,
+        )
+
+        events, reducer_name, timestamp = all_inventory.call_args[0]
+        assert len(events) == 2
+        assert reducer_name == "item_stack_move"
+        assert timestamp == 1640995200.0
+        assert [type(e) for e in deletes_only.call_args[0][0]] == [RowDeleted]
+        assert [e.key for e in owner_200.call_args[0][0]] == [3]
+        other_table.assert_not_called()
+
+    def test_unsubscribe_and_no_work_without_subscribers(self):
+        """Test that unsubscribed listeners stop receiving events."""
+        feed = ChangeFeed()
+        listener = Mock()
+        subscription_id = feed.subscribe(listener)
+
+        assert feed.unsubscribe(subscription_id) is True
+        assert feed.unsubscribe(subscription_id) is False
+        assert feed.publish({"table_name": "t", "updates": [{"inserts": [{"entity_id": 1}]}]}) == []
+        listener.assert_not_called()
+
+    def test_listener_errors_are_isolated(self, caplog):
+        """Test that one failing listener does not block others."""
+        feed = ChangeFeed()
+        good = Mock()
+        feed.subscribe(Mock(side_effect=RuntimeError("boom")))
+        feed.subscribe(good)
+
+        feed.publish({"table_name": "t", "updates": [{"inserts": [{"entity_id": 1}]}]})
+
+        good.assert_called_once()
+        assert "Error in change listener" in caplog.text
+
+    def test_router_publishes_transaction_changes(self, mock_data_queue):
+        """Test that MessageRouter publishes decoded transaction rows to the feed."""
+        feed = ChangeFeed()
+        listener = Mock()
+        feed.subscribe(listener, tables=["building_nickname_state"])
+        router = MessageRouter([MockProcessor(["building_nickname_state"])], mock_data_queue, change_feed=feed)
+
+        router.handle_message({
+            "TransactionUpdate": {
+                "status": {"Committed": {"tables": [{
+                    "table_name": "building_nickname_state",
+                    "updates": [{"inserts": ['[5, "Main Chest"]'], "deletes": []}],
+                }]}},
+                "reducer_call": {"reducer_name": "building_set_nickname"},
+                "timestamp": {"__timestamp_micros_since_unix_epoch__": 1640995200000000},
+            }
+        })
+
+        events, reducer_name, _ = listener.call_args[0]
+        assert events == [RowInserted("building_nickname_state", 5, {"entity_id": 5, "nickname": "Main Chest"})]
+        assert reducer_name == "building_set_nickname"
+
+
+class TestInventoryProcessorChanges:
+    """Test InventoryProcessor transaction handling built on row changes."""
+
+    def test_update_replaces_record_and_delete_removes_it(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that delete+insert replaces a record and a standalone delete removes it."""
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor._send_incremental_inventory_update = Mock()
+        processor._upsert_inventory_record({"entity_id": 1, "owner_entity_id": 100})
+        processor._upsert_inventory_record({"entity_id": 2, "owner_entity_id": 100})
+
+        processor.process_transaction(
+            {
+                "table_name": "inventory_state",
+                "updates": [{
+                    "deletes": [_inventory_row(1, 100, 5), _inventory_row(2, 100, 3)],
+                    "inserts": [_inventory_row(1, 100, 7, player_id=42)],
+                }],
+            },
+            "item_stack_move",
+            1640995200.0,
+        )
+
+        records = processor._inventory_data[100]
+        assert list(records) == [1]
+        assert records[1]["pockets"][0][1][1][1] == 7
+        processor._send_incremental_inventory_update.assert_called_once_with("item_stack_move", 1640995200.0, {1: 42})
+
+    def test_processors_consume_changes_from_feed(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that routed transactions reach processors through their feed subscriptions."""
+        feed = ChangeFeed()
+        store = TableStore()
+        member = {"entity_id": 9, "claim_entity_id": 100, "player_entity_id": 42, "user_name": "Alice"}
+        store.apply_table_update({"table_name": "claim_member_state", "updates": [{"inserts": [member]}]})
+        services = dict(mock_services, change_feed=feed, table_store=store)
+
+        inventory = InventoryProcessor(mock_data_queue, services, mock_reference_data)
+        crafting = CraftingProcessor(mock_data_queue, services, mock_reference_data)
+        inventory._send_incremental_inventory_update = Mock()
+        crafting._send_incremental_crafting_update = Mock()
+        router = MessageRouter([inventory, crafting], mock_data_queue, table_store=store, change_feed=feed)
+
+        craft_row = lambda entity_id, owner_id: [entity_id, owner_id, 55, 100, [1640995200000000], [1, {}], [0, 1]]
+        router.handle_message({
+            "TransactionUpdate": {
+                "status": {"Committed": {"tables": [
+                    {"table_name": "inventory_state", "updates": [{"inserts": [_inventory_row(1, 100, 7, player_id=42)]}]},
+                    {"table_name": "passive_craft_state", "updates": [{"inserts": [craft_row(5, 42), craft_row(6, 43)]}]},
+                ]}},
+                "reducer_call": {"reducer_name": "craft_start"},
+                "timestamp": {"__timestamp_micros_since_unix_epoch__": 1640995200000000},
+            }
+        })
+
+        assert inventory._inventory_data[100][1]["pockets"][0][1][1][1] == 7
+        inventory._send_incremental_inventory_update.assert_called_once_with("craft_start", 1640995200.0, {1: 42})
+
+        # Only the claim member's craft passes the subscription predicate
+        assert list(crafting._passive_craft_data) == [5]
+        assert crafting._passive_craft_data[5]["timestamp_micros"] == 1640995200000000
+        crafting._send_incremental_crafting_update.assert_called_once()
+
+    def test_active_crafting_consumes_changes_from_feed(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that progressive action rows reach ActiveCraftingProcessor as paired row changes."""
+        feed = ChangeFeed()
+        store = TableStore()
+        member = {"entity_id": 9, "claim_entity_id": 100, "player_entity_id": 42, "user_name": "Alice"}
+        store.apply_table_update({"table_name": "claim_member_state", "updates": [{"inserts": [member]}]})
+        services = dict(mock_services, change_feed=feed, table_store=store, item_lookup_service=ItemLookupService(mock_reference_data))
+        processor = ActiveCraftingProcessor(mock_data_queue, services, mock_reference_data)
+        processor.emission_window = 0
+        processor._send_incremental_active_crafting_update = Mock()
+        router = MessageRouter([processor], mock_data_queue, table_store=store, change_feed=feed)
+
+        def action_row(entity_id, owner_id, progress):
+            return [entity_id, 77, 1, progress, 100, 1, 0, owner_id, None, False]
+
+        def transaction(table_name, inserts=(), deletes=()):
+            router.handle_message({
+                "TransactionUpdate": {
+                    "status": {"Committed": {"tables": [
+                        {"table_name": table_name, "updates": [{"inserts": list(inserts), "deletes": list(deletes)}]},
+                    ]}},
+                    "reducer_call": {"reducer_name": "craft_continue"},
+                    "timestamp": {"__timestamp_micros_since_unix_epoch__": 1640995200000000},
+                }
+            })
+
+        transaction("progressive_action_state", inserts=[action_row(5, 42, 0), action_row(6, 43, 0)])
+        transaction("progressive_action_state", inserts=[action_row(5, 42, 3)], deletes=[action_row(5, 42, 0)])
+        transaction("public_progressive_action_state", inserts=[[5, 77, 42]])
+
+        # Only the claim member's craft is tracked; the progress-only update goes out as a delta
+        assert list(processor._progressive_action_data) == [5]
+        assert [m["type"] for m in list(mock_data_queue.queue)] == ["active_crafting_progress_update"]
+        assert processor._progressive_action_data[5]["progress"] == 3
+        assert processor._public_actions == {5}
+
+        transaction("progressive_action_state", deletes=[action_row(5, 42, 3)])
+        transaction("public_progressive_action_state", deletes=[[5, 77, 42]])
+        assert processor._progressive_action_data == {}
+        assert processor._public_actions == set()
+        assert processor._send_incremental_active_crafting_update.call_count == 4
@@ -0,0 +1,153 @@
+"""
+Tests for the UI data queue drain: wake-up notification, coalescing and the time budget.
+"""
+
+import queue
+import threading
+import time
+
+from app.core.utils.notifying_queue import NotifyingQueue
+from app.ui.data_queue_drain import DataQueueDrainer, coalesce_messages
+
+
+class TestNotifyingQueue:
+    """Test NotifyingQueue wake-up calls."""
+
+    def test_notifier_runs_after_put(self):
+        data_queue = NotifyingQueue()
+        sizes = []
+        data_queue.set_notifier(lambda: sizes.append(data_queue.qsize()))
+
+        data_queue.put({"type": "a"})
+        data_queue.put_nowait({"type": "b"})
+
+        # The item is already queued when the consumer is woken
+        assert sizes == [1, 2]
+        assert isinstance(data_queue, queue.Queue)
+
+    def test_notifier_runs_on_producer_thread_and_errors_are_contained(self):
+        data_queue = NotifyingQueue()
+        threads = []
+
+        def notifier():
+            threads.append(threading.current_thread().name)
+            raise RuntimeError("main thread is not in main loop")
+
+        data_queue.set_notifier(notifier)
+        producer = threading.Thread(target=lambda: data_queue.put({"type": "a"}), name="producer")
+        producer.start()
+        producer.join()
+
+        assert threads == ["producer"]
+        assert data_queue.get_nowait() == {"type": "a"}
+
+        data_queue.set_notifier(None)
+        data_queue.put({"type": "b"})
+        assert threads == ["producer"]
+
+
+class TestCoalesceMessages:
+    """Test that only the newest tab snapshot of each type is kept."""
+
+    def test_keeps_newest_snapshot_at_its_position(self):
+        messages = [
+            {"type": "inventory_update", "data": {"v": 1}},
+            {"type": "inventory_delta", "data": {"d": 1}},
+            {"type": "crafting_update", "data": [1]},
+            {"type": "inventory_update", "data": {"v": 2}},
+            {"type": "inventory_delta", "data": {"d": 2}},
+            {"type": "crafting_update", "data": [2]},
+        ]
+
+        result = coalesce_messages(messages)
+
+        assert [m["type"] for m in result] == ["inventory_delta", "inventory_update", "inventory_delta", "crafting_update"]
+        assert result[1]["data"] == {"v": 2}
+        assert result[1]["coalesced"] == 1
+        assert result[3]["data"] == [2]
+
+    def test_merges_completions_and_keeps_earliest_trace(self):
+        messages = [
+            {"type": "crafting_update", "data": [1], "changes": {"crafting_completed": ["a"]}, "trace": {"received": 1.0}},
+            {"type": "crafting_update", "data": [2], "changes": {"crafting_completed": ["b"]}, "trace": {"received": 3.0}},
+            {"type": "crafting_update", "data": [3], "changes": {"type": "incremental"}, "trace": {"received": 2.0}},
+        ]
+
+        (result,) = coalesce_messages(messages)
+
+        assert result["data"] == [3]
+        assert result["changes"] == {"type": "incremental", "crafting_completed": ["a", "b"]}
+        assert result["trace"] == {"received": 1.0}
+        assert result["coalesced"] == 2
+        # Queued messages are not mutated
+        assert messages[2]["changes"] == {"type": "incremental"}
+
+    def test_other_types_are_untouched(self):
+        messages = [{"type": "crafting_timer_update", "data": {}}, {"type": "crafting_timer_update", "data": {}}]
+        assert coalesce_messages(messages) == messages
+
+
+class TestDataQueueDrainer:
+    """Test dispatching through the handler table."""
+
+    def test_dispatches_by_type_and_reports_unknown(self):
+        data_queue = queue.Queue()
+        handled = []
+        unknown = []
+        drainer = DataQueueDrainer(
+            data_queue,
+            {"a": lambda m: handled.append(m["data"]), "boom": lambda m: 1 / 0},
+            on_unknown=unknown.append,
+        )
+        for message in ({"type": "a", "data": 1}, {"type": "boom"}, {"type": "x"}, {"type": "a", "data": 2}):
+            data_queue.put(message)
+
+        assert drainer.drain() is False
+        assert handled == [1, 2]
+        assert unknown == [{"type": "x"}]
+        assert drainer.dispatched == 4
+
+    def test_budget_leaves_rest_pending_in_order(self):
+        data_queue = queue.Queue()
+        handled = []
+
+        def slow(message):
+            handled.append(message["data"])
+            time.sleep(0.01)
+
+        drainer = DataQueueDrainer(data_queue, {"slow": slow}, budget=0.015)
+        for i in range(10):
+            data_queue.put({"type": "slow", "data": i})
+
+        assert drainer.drain() is True
+        first = len(handled)
+        assert 1 <= first < 10
+
+        # A zero budget still makes progress
+        assert drainer.drain(budget=0) is True
+        assert len(handled) == first + 1
+
+        while drainer.drain():
+            pass
+        assert handled == list(range(10))
+
+    def test_snapshots_queued_while_pending_are_coalesced(self):
+        data_queue = queue.Queue()
+        handled = []
+        drainer = DataQueueDrainer(data_queue, {"inventory_update": lambda m: handled.append(m["data"])}, budget=0)
+        for i in range(3):
+            data_queue.put({"type": "inventory_update", "data": i})
+
+        drainer.drain()
+        assert handled == [2]
+
+        data_queue.put({"type": "inventory_update", "data": 3})
+        data_queue.put({"type": "inventory_update", "data": 4})
+        drainer.drain()
+        assert handled == [2, 4]
+        assert drainer.coalesced == 3
+
+    def test_empty_queue(self):
+        drainer = DataQueueDrainer(queue.Queue(), {})
+        assert drainer.drain() is False
+        assert drainer.dispatched == 0
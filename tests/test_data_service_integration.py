@@ -341,9 +341,10 @@ class TestClaimSwitching:
 
         # Mock processors with clear_cache method
         mock_processors = []
-        for i in range(3):
+        for table_names in (["inventory_state", "building_state"], ["passive_craft_state"], ["stamina_state"]):
             processor = Mock()
             processor.clear_cache = Mock()
+            processor.get_table_names.return_value = table_names
             mock_processors.append(processor)
 
         data_service.processors = mock_processors
@@ -377,9 +378,10 @@ class TestClaimSwitching:
             # Verify claim manager was updated
             mock_claim_manager.set_current_claim.assert_called_with("new-claim-123")
 
-            # Verify all processors had their cache cleared
-            for processor in mock_processors:
+            # Verify claim processors had their cache cleared and player-scoped ones stayed warm
+            for processor in mock_processors[:2]:
                 processor.clear_cache.assert_called_once()
+            mock_processors[2].clear_cache.assert_not_called()
 
             # Verify subscriptions were restarted
             mock_setup_subs.assert_called_once()
@@ -468,6 +470,34 @@ class TestClaimSwitching:
 
         assert result == False
 
+    def test_claim_switch_only_swaps_claim_subscription(self):
+        """Test that player-scoped queries keep their handle while claim queries are replaced."""
+        data_service = DataService()
+        data_service.client = MockBitCraftClient()
+        data_service.message_router = Mock()
+        data_service.user_id = "user-1"
+        data_service.claim = Mock()
+        data_service.claim.claim_id = "claim-1"
+
+        data_service._setup_subscriptions_for_current_claim()
+        player_id = data_service.player_subscription_id
+        first_claim_id = data_service.claim_subscription_id
+
+        data_service.claim.claim_id = "claim-2"
+        data_service._setup_subscriptions_for_current_claim(context="claim_switch")
+
+        history = data_service.client.subscription_history
+        assert [(action, query_id) for action, query_id, _ in history] == [
+            ("subscribe", player_id),
+            ("subscribe", first_claim_id),
+            ("unsubscribe", first_claim_id),
+            ("subscribe", data_service.claim_subscription_id),
+        ]
+        assert data_service.player_subscription_id == player_id
+        assert all("claim-2" in query for query in history[-1][2])
+        assert not any("claim-" in query for query in history[0][2])
+        assert set(data_service.client.get_subscription_ids()) == {player_id, data_service.claim_subscription_id}
+
 
 class TestErrorHandling:
     """Test error handling in integration scenarios."""
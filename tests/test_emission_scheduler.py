@@ -0,0 +1,127 @@
+"""
+Tests for EmissionScheduler and the merged processor UI emissions built on it.
+"""
+
+import time
+from unittest.mock import Mock
+
+from app.core.processors.inventory_processor import InventoryProcessor
+from app.core.utils.emission_scheduler import EmissionScheduler
+
+
+def _inventory_row(entity_id, owner_id, quantity, player_id=0):
+    return [entity_id, [[0, [0, [1001, quantity, [], []]], False]], 0, 1, owner_id, player_id]
+
+
+class TestEmissionScheduler:
+    """Test leading-edge emission and trailing merges."""
+
+    def test_first_request_emits_and_burst_is_merged(self):
+        """Test that a burst inside the window becomes one emission with attribution."""
+        emit = Mock()
+        scheduler = EmissionScheduler(emit, window=10)
+
+        scheduler.request("a", 1.0, {1: 10})
+        emit.assert_called_once_with("a", 1.0, {1: 10})
+
+        scheduler.request("b", 2.0, {2: 20})
+        scheduler.request("b", 3.0, {3: 30})
+        scheduler.request("c", 4.0, None)
+        assert emit.call_count == 1 and scheduler.pending == 3
+
+        scheduler.flush()
+        emit.assert_called_with(
+            "c",
+            4.0,
+            {2: 20, 3: 30},
+            attribution={"reducers": ["b", "c"], "reducer_counts": {"b": 2, "c": 1}, "transaction_count": 3},
+        )
+        assert (scheduler.requested, scheduler.emitted) == (4, 2)
+
+    def test_timer_emits_at_end_of_window(self):
+        """Test that deferred requests are emitted without an explicit flush."""
+        emit = Mock()
+        scheduler = EmissionScheduler(emit, window=0.05)
+        scheduler.request("a", 1.0)
+        scheduler.request("b", 2.0)
+
+        deadline = time.monotonic() + 5
+        while emit.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert emit.call_count == 2
+        assert emit.call_args.args == ("b", 2.0)
+
+    def test_cancel_drops_pending(self):
+        """Test that cancelled requests are never emitted."""
+        emit = Mock()
+        scheduler = EmissionScheduler(emit, window=10)
+        scheduler.request("a", 1.0)
+        scheduler.request("b", 2.0)
+
+        scheduler.cancel()
+        scheduler.flush()
+
+        emit.assert_called_once()
+
+
+class TestProcessorEmissions:
+    """Test that processors apply every transaction but merge UI updates."""
+
+    def test_inventory_burst_keeps_player_attribution(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that player context from every transaction in a burst reaches the merged update."""
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.emission_window = 10
+        processor._send_incremental_inventory_update = Mock()
+
+        for entity_id, player_id in ((1, 41), (2, 42), (3, 43)):
+            processor.process_transaction(
+                {"table_name": "inventory_state", "updates": [{"inserts": [_inventory_row(entity_id, 100, 1, player_id)]}]},
+                f"reducer_{entity_id}",
+                float(entity_id),
+            )
+
+        # Every transaction is applied immediately; only the first is emitted so far
+        assert list(processor._inventory_data[100]) == [1, 2, 3]
+        processor._send_incremental_inventory_update.assert_called_once_with("reducer_1", 1.0, {1: 41})
+
+        processor.flush_emissions()
+        processor._send_incremental_inventory_update.assert_called_with(
+            "reducer_3",
+            3.0,
+            {2: 42, 3: 43},
+            attribution={
+                "reducers": ["reducer_2", "reducer_3"],
+                "reducer_counts": {"reducer_2": 1, "reducer_3": 1},
+                "transaction_count": 2,
+            },
+        )
+
+    def test_merged_update_carries_attribution_to_ui(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that the attribution ends up in the queued update's changes."""
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor._queue_update = Mock()
+        processor._aggregate_ready = True
+        processor._take_inventory_delta = Mock(return_value={"added": {"Plank": {}}, "changed": {}, "removed": []})
+
+        processor._send_incremental_inventory_update(
+            "reducer_3", 3.0, {2: 42}, attribution={"reducers": ["reducer_2", "reducer_3"], "transaction_count": 2}
+        )
+
+        changes = processor._queue_update.call_args.kwargs["changes"]
+        assert changes["player_context"] == {2: 42}
+        assert changes["reducers"] == ["reducer_2", "reducer_3"]
+        assert changes["transaction_count"] == 2
+
+    def test_clear_cache_cancels_pending_emissions(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that switching claims drops updates merged for the old claim."""
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.emission_window = 10
+        send = Mock()
+
+        processor._schedule_emission("inventory", send, "a", 1.0)
+        processor._schedule_emission("inventory", send, "b", 2.0)
+        processor.clear_cache()
+        processor.flush_emissions()
+
+        send.assert_called_once_with("a", 1.0)
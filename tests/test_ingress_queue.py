@@ -0,0 +1,149 @@
+"""
+Tests for the ingress queue - backpressure, statistics and TransactionUpdate coalescing.
+"""
+
+import json
+import queue
+import threading
+import time
+
+import pytest
+
+from app.client.ingress_queue import IngressQueue, merge_transaction_updates
+from app.client.local_server import LocalDatabase, LocalSpacetimeServer, SyntheticWorkload, synthetic_claim
+from app.client.ws_multiplexer import _STOP, WebSocketMultiplexer
+
+
+def transaction(table_name, inserts=(), deletes=(), reducer_name="update", micros=1):
+    table = {
+        "table_name": table_name,
+        "num_rows": len(inserts),
+        "updates": [{"inserts": [json.dumps(r) for r in inserts], "deletes": [json.dumps(r) for r in deletes]}],
+    }
+    return {
+        "TransactionUpdate": {
+            "status": {"Committed": {"tables": [table]}},
+            "reducer_call": {"reducer_name": reducer_name},
+            "timestamp": {"__timestamp_micros_since_unix_epoch__": micros},
+        }
+    }
+
+
+def rows(message, table_name, key):
+    for table in message["TransactionUpdate"]["status"]["Committed"]["tables"]:
+        if table["table_name"] == table_name:
+            return [json.loads(row) for row in table["updates"][0][key]]
+    return None
+
+
+class TestMergeTransactionUpdates:
+    """Test folding a burst of transactions into one."""
+
+    def test_rows_are_netted_out_in_order(self):
+        """Test that intermediate row versions cancel and only the net change remains."""
+        v0, v1, v2 = ({"entity_id": 1, "quantity": q} for q in (0, 1, 2))
+        burst = [
+            transaction("inventory_state", inserts=[v1], deletes=[v0], reducer_name="a", micros=1),
+            transaction("inventory_state", inserts=[v2], deletes=[v1], reducer_name="b", micros=2),
+            transaction("passive_craft_state", inserts=[{"entity_id": 9}], reducer_name="c", micros=3),
+            transaction("passive_craft_state", deletes=[{"entity_id": 9}], reducer_name="d", micros=4),
+        ]
+
+        merged = merge_transaction_updates(burst)
+
+        assert rows(merged, "inventory_state", "deletes") == [v0]
+        assert rows(merged, "inventory_state", "inserts") == [v2]
+        assert rows(merged, "passive_craft_state", "inserts") == []
+        assert rows(merged, "passive_craft_state", "deletes") == []
+        assert merged["TransactionUpdate"]["reducer_call"]["reducer_name"] == "d"
+        assert merged["TransactionUpdate"]["timestamp"]["__timestamp_micros_since_unix_epoch__"] == 4
+
+    def test_accepts_rows_outside_update_groups(self):
+        """Test tables carrying inserts/deletes directly, as some messages do."""
+        message = {
+            "TransactionUpdate": {
+                "status": {"Committed": {"tables": [{"table_name": "t", "inserts": [{"entity_id": 1}], "deletes": []}]}}
+            }
+        }
+
+        merged = merge_transaction_updates([message, message])
+
+        assert merged["TransactionUpdate"]["status"]["Committed"]["tables"][0]["updates"] == [
+            {"deletes": [], "inserts": [{"entity_id": 1}]}
+        ]
+
+
+class TestIngressQueue:
+    """Test the bounded queue."""
+
+    def test_put_waits_for_space_and_counts_it(self):
+        """Test that a full queue blocks put until the consumer takes an item."""
+        ingress = IngressQueue(maxsize=2)
+        assert ingress.put_nowait(1) and ingress.put_nowait(2)
+        assert not ingress.put_nowait(3)
+        assert not ingress.put(3, timeout=0.01)
+
+        threading.Timer(0.05, ingress.get).start()
+        assert ingress.put(3, timeout=5)
+
+        ingress.force_put(4)
+        stats = ingress.get_stats()
+        assert stats["depth"] == 3
+        assert stats["high_water"] == 3
+        assert stats["overflow"] == 1
+        assert stats["backpressure_seconds"] > 0
+        with pytest.raises(queue.Empty):
+            IngressQueue().get(timeout=0.01)
+
+
+class TestMultiplexerIngress:
+    """Test the dispatcher and reader ends of the ingress queue."""
+
+    def test_coalescing_window_merges_burst(self):
+        """Test that queued transactions become one handler call and other messages keep their order."""
+        connection = WebSocketMultiplexer("ws://unused", {}, coalesce_window=0.2)
+        received = []
+        connection.set_message_handler(received.append)
+        for quantity in range(3):
+            connection._dispatch_queue.put_nowait(transaction("inventory_state", inserts=[{"entity_id": quantity}]))
+        connection._dispatch_queue.put_nowait({"SubscribeMultiApplied": {}})
+        connection._dispatch_queue.force_put(_STOP)
+
+        connection._dispatch_messages()
+
+        assert len(received) == 2
+        assert [row["entity_id"] for row in rows(received[0], "inventory_state", "inserts")] == [0, 1, 2]
+        assert "SubscribeMultiApplied" in received[1]
+        assert connection.get_ingress_stats()["coalesced"] == 2
+
+    def test_slow_handler_applies_backpressure(self):
+        """Test that a slow handler bounds the queue instead of buffering every frame."""
+        database = LocalDatabase(synthetic_claim(buildings=5, pockets=2, crafts=5, members=1))
+        server = LocalSpacetimeServer(database).start()
+        connection = WebSocketMultiplexer(server.url, {}, connect_timeout=5, ingress_queue_size=4, max_queue=1)
+        received = queue.Queue()
+
+        def slow_handler(message):
+            time.sleep(0.005)
+            received.put(message)
+
+        try:
+            connection.start()
+            connection.set_message_handler(slow_handler)
+            queries = ["SELECT * FROM inventory_state;", "SELECT * FROM passive_craft_state;"]
+            connection.send({"SubscribeMulti": {"query_strings": queries, "request_id": 1, "query_id": {"id": 1}}})
+            assert "SubscribeMultiApplied" in received.get(timeout=5)
+
+            workload = SyntheticWorkload(database)
+            for _ in range(60):
+                server.commit(*workload.next_transaction())
+            for _ in range(60):
+                assert "TransactionUpdate" in received.get(timeout=5)
+
+            stats = connection.get_ingress_stats()
+            assert stats["backpressure_waits"] > 0
+            assert stats["high_water"] <= 4
+            assert stats["overflow"] == 0
+        finally:
+            connection.close()
+            server.stop()
@@ -169,4 +169,45 @@ class TestItemLookupService:
         
         # Verify old items are gone
         found_old_items = item_lookup_service.find_items_by_id(3001)
-        assert len(found_old_items) == 0
\ No newline at end of file
+        assert len(found_old_items) == 0
+    def test_recipe_records_are_precomputed(self, item_lookup_service):
+        """Test that recipe records expose cleaned names, outputs and durations."""
+        record = item_lookup_service.get_recipe_record(100)
+        assert record.actions_required == 50
+        assert record.outputs == ((3, 1),)
+        assert record.item_name == item_lookup_service.find_items_by_id(3)[0]["name"]
+        assert record.total_effort(3) == 150
+        assert item_lookup_service.get_recipe_record(9999) is None
+
+        with pytest.raises(AttributeError):
+            record.actions_required = 1
+
+    def test_recipe_record_name_duration_and_building_type(self):
+        """Test placeholder cleanup, duration units and building requirement parsing."""
+        service = ItemLookupService({
+            "crafting_recipe_desc": [
+                {"id": 1, "name": "Smelt {0} Ingots {1}", "duration_micros": 90_000_000,
+                 "building_requirement": [0, {"building_type": 7, "tier": 2}], "crafted_item_stacks": []},
+                {"id": 2, "name": "Weave {0}", "time_requirement": 12.5, "building_requirement": [1, []]},
+            ]
+        })
+
+        first = service.get_recipe_record(1)
+        assert first.display_name == "Smelt  Ingots"
+        assert first.item_name == "Smelt  Ingots"
+        assert first.duration_seconds == 90
+        assert first.building_type == 7
+
+        second = service.get_recipe_record(2)
+        assert second.duration_seconds == 12.5
+        assert second.building_type is None
+
+    def test_recipe_records_rebuilt_on_refresh(self, item_lookup_service):
+        """Test that refresh_lookups replaces the recipe records."""
+        item_lookup_service.refresh_lookups({
+            "item_desc": [{"id": 9001, "name": "Test Item", "tier": 0, "tag": "Test"}],
+            "crafting_recipe_desc": [{"id": 500, "name": "Test Recipe", "crafted_item_stacks": [[9001, 2]]}],
+        })
+
+        assert item_lookup_service.get_recipe_record(100) is None
+        assert item_lookup_service.get_recipe_record(500).item_name == "Test Item"
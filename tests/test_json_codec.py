@@ -0,0 +1,56 @@
+"""
+Tests for json_codec - fast JSON backends behave like the stdlib json module.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.services import json_codec
+
+BACKENDS = ["json"] + ([json_codec.BACKEND] if json_codec.BACKEND != "json" else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    with patch.object(json_codec, "BACKEND", request.param):
+        yield request.param
+
+
+class TestJsonCodec:
+    """Test loads/dumps across the available backends."""
+
+    def test_round_trip_matches_stdlib(self, backend):
+        """Test that rows decode to the same objects as json.loads."""
+        row = '{"entity_id": 18446744073709551615, "pockets": [[0, [0, [5, 10, [0, []], [1, []]]], false]], "name": "Plank \\u00e9"}'
+
+        assert json_codec.loads(row) == json.loads(row)
+        assert json_codec.loads(row.encode("utf-8")) == json.loads(row)
+        assert json.loads(json_codec.dumps(json.loads(row))) == json.loads(row)
+
+    def test_dumps_is_compact_and_accepts_int_keys(self, backend):
+        """Test that dumps returns compact str output and stringifies int keys like json.dumps."""
+        text = json_codec.dumps({"a": [1, 2], 3: None})
+
+        assert isinstance(text, str)
+        assert json.loads(text) == {"a": [1, 2], "3": None}
+        assert " " not in text
+
+    def test_invalid_json_raises_json_decode_error(self, backend):
+        """Test that existing `except json.JSONDecodeError` handlers still catch bad rows."""
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads("{not json")
+
+    def test_fast_backend_errors_fall_back_to_stdlib(self):
+        """Test that documents the fast backend rejects are re-parsed by the stdlib."""
+        if json_codec.BACKEND == "json":
+            pytest.skip("no fast JSON backend installed")
+
+        wide = '{"quanta": 340282366920938463463374607431768211455}'
+        if json_codec.BACKEND == "orjson":
+            target, error = "orjson.loads", json_codec.orjson.JSONDecodeError("too wide", wide, 0)
+        else:
+            target, error = "msgspec.json.decode", json_codec.msgspec.DecodeError("too wide")
+        with patch(f"app.services.json_codec.{target}", side_effect=error):
+            assert json_codec.loads(wide) == {"quanta": 340282366920938463463374607431768211455}
@@ -0,0 +1,102 @@
+"""
+Tests for end-to-end latency tracing - stamping, propagation through the pipeline and span recording.
+"""
+
+import time
+from unittest.mock import Mock
+
+from app.client.ws_multiplexer import _STOP, WebSocketMultiplexer
+from app.core.message_router import MessageRouter
+from app.core.processors.inventory_processor import InventoryProcessor
+from app.core.utils.emission_scheduler import EmissionScheduler
+from app.services.latency_tracer import TRACE_KEY, current_trace, finish_trace, stamp_frame, use_trace
+from app.services.metrics_registry import MetricsRegistry
+
+
+def transaction(micros, entity_id=1):
+    table = {"table_name": "inventory_state", "updates": [{"inserts": [f'{{"entity_id": {entity_id}}}'], "deletes": []}]}
+    return {
+        "TransactionUpdate": {
+            "status": {"Committed": {"tables": [table]}},
+            "timestamp": {"__timestamp_micros_since_unix_epoch__": micros},
+        }
+    }
+
+
+class TestTraceSpans:
+    """Test stamping and span recording."""
+
+    def test_stamp_reads_server_timestamp(self):
+        """Test that a frame's trace carries the commit time in seconds."""
+        message = transaction(1_700_000_000_500_000)
+        stamp_frame(message, received=1_700_000_000.6)
+
+        assert message[TRACE_KEY] == {"received": 1_700_000_000.6, "server": 1_700_000_000.5}
+
+    def test_finish_records_every_complete_hop(self):
+        """Test that spans are recorded for hops with both marks and skipped otherwise."""
+        registry = MetricsRegistry()
+        trace = {"server": 10.0, "received": 10.1, "routed": 10.15, "queued": 10.2, "picked": 10.3, "handled": 10.35}
+
+        spans = finish_trace({**trace, "rendered": 10.5}, metrics=registry)
+
+        assert round(spans["queue_wait"], 3) == 0.1
+        assert round(spans["event_to_screen"], 3) == 0.5
+        assert registry.snapshot()["latency_ms"]["trace.render"]["count"] == 1
+
+        spans = finish_trace({"received": 1.0, "picked": 2.0}, metrics=registry)
+        assert spans == {}
+
+
+class TestTracePropagation:
+    """Test that the trace follows a transaction from the dispatcher to the UI queue."""
+
+    def test_dispatcher_hands_clean_message_with_current_trace(self):
+        """Test that handlers get the plain message and the coalesced burst keeps the earliest trace."""
+        connection = WebSocketMultiplexer("ws://unused", {}, coalesce_window=0.2)
+        seen = []
+        connection.set_message_handler(lambda message: seen.append((message, current_trace())))
+        for index, micros in enumerate((1_000_000, 2_000_000)):
+            message = transaction(micros, entity_id=index)
+            stamp_frame(message, received=100.0 + index)
+            connection._dispatch_queue.put_nowait(message)
+        connection._dispatch_queue.force_put(_STOP)
+
+        connection._dispatch_messages()
+
+        message, trace = seen[0]
+        assert TRACE_KEY not in message
+        assert trace == {"received": 100.0, "server": 1.0}
+        assert current_trace() is None
+
+    def test_router_and_processor_carry_trace_to_data_queue(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that the UI update queued for a traced transaction has routed and queued marks."""
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.emission_window = 0
+        processor._aggregate_ready = True
+        processor._take_inventory_delta = Mock(return_value={"added": {"Plank": {}}, "changed": {}, "removed": []})
+        router = MessageRouter([processor], mock_data_queue, metrics=MetricsRegistry())
+        row = '[1, [], 0, 0, 100, 42]'
+        message = transaction(1_000_000)
+        message["TransactionUpdate"]["status"]["Committed"]["tables"][0]["updates"][0]["inserts"] = [row]
+
+        received = time.time()
+        with use_trace({"received": received, "server": 1.0}):
+            router.handle_message(message)
+
+        update = mock_data_queue.get_nowait()
+        assert update["type"] == "inventory_delta"
+        assert update["trace"]["received"] == received
+        assert received <= update["trace"]["routed"] <= update["trace"]["queued"]
+
+    def test_merged_emission_uses_earliest_trace(self):
+        """Test that a trailing merged emission runs under the trace of its first transaction."""
+        traces = []
+        scheduler = EmissionScheduler(lambda *args, **kwargs: traces.append(current_trace()), window=10)
+        for received in (1.0, 2.0, 3.0):
+            with use_trace({"received": received}):
+                scheduler.request("reducer", received)
+
+        scheduler.flush()
+
+        assert traces == [{"received": 1.0}, {"received": 2.0}]
@@ -0,0 +1,187 @@
+"""
+Tests for the local SpacetimeDB stand-in server - query subset, subscriptions and BitCraft wiring.
+"""
+
+import json
+import queue
+
+import pytest
+
+from app.client.bitcraft_client import BitCraft
+from app.client.local_server import (
+    LocalDatabase,
+    LocalSpacetimeServer,
+    SyntheticWorkload,
+    load_recording,
+    parse_query,
+    synthetic_claim,
+)
+from app.client.query_service import QueryService
+from app.client.traffic_recorder import TrafficRecorder
+
+PLAYER_ID = "1000"
+CLAIM_ID = "2000"
+
+
+@pytest.fixture
+def database():
+    return LocalDatabase(synthetic_claim(buildings=20, pockets=4, crafts=10, members=3))
+
+
+@pytest.fixture
+def server(database):
+    server = LocalSpacetimeServer(database).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server, monkeypatch):
+    monkeypatch.setenv("BITCRAFT_SPACETIME_HOST", server.url)
+    monkeypatch.setattr(BitCraft, "update_user_data_file", lambda self, key, value: None)
+
+    client = BitCraft()
+    client.auth = "local"
+    client.auto_reconnect = False
+    client.set_region("local")
+    client.set_endpoint("subscribe")
+    client.set_websocket_uri()
+    client.connect_websocket()
+    yield client
+    client.close_websocket()
+
+
+class TestLocalDatabase:
+    """Test the SQL subset against in-memory tables."""
+
+    def test_parses_every_subscription_query(self, mock_bitcraft_client):
+        """Test that all queries QueryService subscribes to are understood."""
+        query_service = QueryService(mock_bitcraft_client)
+        queries = query_service.get_player_subscription_queries(PLAYER_ID) + query_service.get_claim_subscription_queries(
+            CLAIM_ID
+        )
+
+        parsed = [parse_query(query) for query in queries]
+
+        assert [query.table for query in parsed][:3] == ["traveler_task_state", "stamina_state", "character_stats_state"]
+
+    def test_join_selects_rows_of_projected_table(self, database):
+        """Test that a JOIN filters the projected table by the joined table's WHERE clause."""
+        database.apply("building_state", inserts=[{"entity_id": 99, "claim_entity_id": 5}])
+        database.apply("inventory_state", inserts=[{"entity_id": 98, "owner_entity_id": 99, "pockets": []}])
+        query = parse_query(
+            "SELECT inventory_state.* FROM inventory_state "
+            "JOIN building_state ON inventory_state.owner_entity_id = building_state.entity_id "
+            f"WHERE building_state.claim_entity_id = '{CLAIM_ID}';"
+        )
+
+        rows = database.select(query)
+
+        assert len(rows) == 20
+        assert 98 not in {row["entity_id"] for row in rows}
+
+    def test_rejects_unsupported_sql(self):
+        """Test that queries outside the subset raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_query("SELECT * FROM item_desc WHERE tier > 3;")
+
+
+class TestLocalSpacetimeServer:
+    """Test the server through the real BitCraft client."""
+
+    def test_one_off_queries(self, client):
+        """Test that the player lookup and claim detail queries are answered."""
+        user_id = client.fetch_user_id_by_username("LoadTest")
+        memberships, local_states, claim_states = QueryService(client).get_user_claims_with_details(user_id)
+
+        assert str(user_id) == PLAYER_ID
+        assert [row["claim_entity_id"] for row in memberships] == [int(CLAIM_ID)]
+        assert local_states[0]["entity_id"] == claim_states[0]["entity_id"] == int(CLAIM_ID)
+
+    def test_subscription_receives_snapshot_and_matching_transactions(self, client, server, database):
+        """Test SubscribeMultiApplied contents and that only subscribed rows are pushed."""
+        messages = queue.Queue()
+        client.subscribe(QueryService(client).get_claim_subscription_queries(CLAIM_ID), messages.put)
+
+        applied = messages.get(timeout=5)["SubscribeMultiApplied"]
+        num_rows = {table["table_name"]: table["num_rows"] for table in applied["update"]["tables"]}
+        assert num_rows["building_state"] == 20
+        assert num_rows["inventory_state"] == 20
+        assert num_rows["passive_craft_state"] == 10
+
+        # A change outside the claim is not delivered; the next one is
+        server.commit("other_claim", [("inventory_state", [{"entity_id": 1, "owner_entity_id": 1, "pockets": []}], [])])
+        reducer_name, changes = SyntheticWorkload(database).next_transaction()
+        server.commit(reducer_name, changes)
+
+        update = messages.get(timeout=5)["TransactionUpdate"]
+        assert update["reducer_call"]["reducer_name"] == reducer_name
+        table = update["status"]["Committed"]["tables"][0]
+        assert len(table["updates"][0]["inserts"]) == len(table["updates"][0]["deletes"]) == 1
+        assert messages.empty()
+
+    def test_workload_runs_at_configured_rate(self, client, server, database):
+        """Test that the synthetic workload streams transactions to subscribers."""
+        messages = queue.Queue()
+        client.subscribe(QueryService(client).get_claim_subscription_queries(CLAIM_ID), messages.put)
+        assert "SubscribeMultiApplied" in messages.get(timeout=5)
+
+        server.rate = 200
+        server.start_workload(SyntheticWorkload(database))
+        received = [messages.get(timeout=5) for _ in range(5)]
+        server.stop_workload()
+
+        assert all("TransactionUpdate" in message for message in received)
+
+
+class TestLoadRecording:
+    """Test seeding the server from a traffic recording."""
+
+    def test_snapshot_and_transactions(self, tmp_path):
+        """Test that snapshots seed the tables and transactions become the workload."""
+        path = tmp_path / "session.jsonl.gz"
+        recorder = TrafficRecorder(path, "v1.json.spacetimedb")
+        row = {"entity_id": 7, "claim_entity_id": 2000}
+        table = {"table_name": "building_state", "updates": [{"inserts": [json.dumps(row)], "deletes": []}]}
+        recorder.record(json.dumps({"SubscribeMultiApplied": {"query_id": {"id": 2}, "update": {"tables": [table]}}}))
+        recorder.record(
+            json.dumps(
+                {"TransactionUpdate": {"status": {"Committed": {"tables": [table]}}, "reducer_call": {"reducer_name": "build"}}}
+            )
+        )
+        recorder.close()
+
+        tables, transactions = load_recording(path)
+
+        assert tables == {"building_state": [row]}
+        assert [(reducer, changes) for _, reducer, changes in transactions] == [("build", [("building_state", [row], [])])]
+
+    def test_positional_transaction_rows(self, tmp_path):
+        """Test that inventory rows recorded in column order are read back as dicts."""
+        path = tmp_path / "session.jsonl"
+        recorder = TrafficRecorder(path, "v1.json.spacetimedb")
+        table = {"table_name": "inventory_state", "updates": [{"inserts": ["[5, [], 0, 3, 7, 0]"], "deletes": []}]}
+        recorder.record(json.dumps({"TransactionUpdate": {"status": {"Committed": {"tables": [table]}}}}))
+        recorder.close()
+
+        _, transactions = load_recording(path)
+
+        inserted = transactions[0][2][0][1][0]
+        assert inserted == {
+            "entity_id": 5,
+            "pockets": [],
+            "inventory_index": 0,
+            "cargo_index": 3,
+            "owner_entity_id": 7,
+            "player_owner_entity_id": 0,
+        }
+
+
+def test_host_with_scheme_and_port():
+    """Test that BITCRAFT_SPACETIME_HOST may name a ws:// host and port."""
+    client = BitCraft()
+
+    client.host = "ws://127.0.0.1:3000"
+    assert client._host_parts() == ("ws", "127.0.0.1:3000", "127.0.0.1", 3000)
+    client.host = "bitcraft-early-access.spacetimedb.com"
+    assert client._host_parts() == ("wss", client.host, client.host, 443)
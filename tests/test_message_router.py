@@ -8,7 +8,12 @@ InitialSubscription) to appropriate processors based on table names.
 import pytest
 import queue
 from unittest.mock import Mock, patch
+from app.services import json_codec
+from app.core.change_feed import ChangeFeed
+from app.core.table_store import TableStore
 from app.core.message_router import MessageRouter
+from app.core.processors.crafting_processor import CraftingProcessor
+from app.core.processors.inventory_processor import InventoryProcessor
 from tests.conftest import MockProcessor, get_mock_spacetime_messages
 
 
@@ -255,4 +260,286 @@ class TestMessageRouter:
         
         # Both processors should have received the transaction
         assert len(processor1.processed_transactions) == 1
-        assert len(processor2.processed_transactions) == 1
\ No newline at end of file
+        assert len(processor2.processed_transactions) == 1
+    def test_rows_decoded_once_for_shared_table(self, mock_data_queue):
+        """Test that JSON row strings are decoded once and shared by all processors."""
+        processor1 = MockProcessor(["building_state"])
+        processor2 = MockProcessor(["building_state"])
+        router = MessageRouter([processor1, processor2], mock_data_queue)
+
+        transaction_msg = {
+            "TransactionUpdate": {
+                "status": {
+                    "Committed": {
+                        "tables": [{
+                            "table_name": "building_state",
+                            "updates": [{
+                                "inserts": ["[1001, 2002, 3003]"],
+                                "deletes": ["[1001, 2002, 3000]"]
+                            }]
+                        }]
+                    }
+                },
+                "reducer_call": {"reducer_name": "test_reducer"},
+                "timestamp": {"__timestamp_micros_since_unix_epoch__": 1640995200000000}
+            }
+        }
+
+        with patch("app.core.message_router.json_codec.loads", wraps=json_codec.loads) as mock_loads:
+            router.handle_message(transaction_msg)
+
+        assert mock_loads.call_count == 2
+
+        update1 = processor1.processed_transactions[0]["table_update"]["updates"][0]
+        update2 = processor2.processed_transactions[0]["table_update"]["updates"][0]
+        assert update1["inserts"] == [[1001, 2002, 3003]]
+        assert update1["deletes"] == [[1001, 2002, 3000]]
+        assert update1["inserts"][0] is update2["inserts"][0]
+
+    def test_undecodable_rows_left_for_processors(self, mock_data_queue):
+        """Test that rows which fail to decode are passed through unchanged."""
+        router = MessageRouter([], mock_data_queue)
+        table_update = {"table_name": "building_state", "updates": [{"inserts": ["not json", '{"entity_id": 1}']}]}
+
+        decoded = router._decode_table_rows(table_update)
+
+        assert decoded == 1
+        assert table_update["updates"][0]["inserts"] == ["not json", {"entity_id": 1}]
+
+    def test_resync_routes_only_changed_rows(self, mock_data_queue, caplog):
+        """Test that the InitialSubscription after a reconnect is diffed against the table store."""
+        processor = MockProcessor(["building_state", "claim_tile_cost"])
+        router = MessageRouter([processor], mock_data_queue, table_store=TableStore())
+
+        def initial(rows):
+            return {
+                "InitialSubscription": {
+                    "database_update": {
+                        "tables": [
+                            {"table_name": "building_state", "updates": [{"inserts": [json_codec.dumps(r) for r in rows]}]},
+                            {"table_name": "claim_tile_cost", "updates": [{"inserts": ['{"id": 1}']}]},
+                        ]
+                    }
+                }
+            }
+
+        unchanged = {"entity_id": 1, "claim_entity_id": 9, "building_description_id": 5}
+        changed = {"entity_id": 2, "claim_entity_id": 9, "building_description_id": 5}
+        removed = {"entity_id": 3, "claim_entity_id": 9, "building_description_id": 5}
+        router.handle_message(initial([unchanged, changed, removed]))
+        assert len(processor.processed_subscriptions) == 2
+
+        router.begin_resync()
+        added = {"entity_id": 4, "claim_entity_id": 9, "building_description_id": 6}
+        changed_now = dict(changed, building_description_id=7)
+        with caplog.at_level("INFO"):
+            router.handle_message(initial([unchanged, changed_now, added]))
+        assert "Resynced after reconnect: 4 row inserts/deletes" in caplog.text
+
+        # Only the building_state difference is routed, as a transaction
+        assert len(processor.processed_transactions) == 1
+        routed = processor.processed_transactions[0]
+        assert routed["reducer_name"] == "reconnect_resync"
+        update = routed["table_update"]["updates"][0]
+        assert sorted(row["entity_id"] for row in update["inserts"]) == [2, 4]
+        assert sorted(row["entity_id"] for row in update["deletes"]) == [2, 3]
+
+        # Tables outside the store are processed as a regular subscription update
+        assert [u["table_name"] for u in processor.processed_subscriptions[2:]] == ["claim_tile_cost"]
+        assert sorted(row["entity_id"] for row in router.table_store.get_rows("building_state")) == [1, 2, 4]
+        assert router.table_store.get("building_state", 2)["building_description_id"] == 7
+
+        # Without begin_resync the next InitialSubscription is a full reload again
+        router.handle_message(initial([unchanged]))
+        assert len(processor.processed_transactions) == 1
+
+    def test_subscription_handles_load_and_unload(self, mock_data_queue):
+        """Test that SubscribeMultiApplied loads a handle's rows and UnsubscribeMultiApplied removes them."""
+        processor = MockProcessor(["building_state"])
+        router = MessageRouter([processor], mock_data_queue, table_store=TableStore())
+        rows = ['{"entity_id": 1, "claim_entity_id": 9}', '{"entity_id": 2, "claim_entity_id": 9}']
+
+        router.handle_message(
+            {
+                "SubscribeMultiApplied": {
+                    "request_id": 3,
+                    "query_id": {"id": 7},
+                    "update": {"tables": [{"table_name": "building_state", "updates": [{"inserts": rows, "deletes": []}]}]},
+                }
+            }
+        )
+        assert processor.processed_subscriptions[0]["updates"][0]["inserts"][0] == {"entity_id": 1, "claim_entity_id": 9}
+        assert router.table_store.count("building_state") == 2
+
+        router.handle_message(
+            {
+                "UnsubscribeMultiApplied": {
+                    "request_id": 4,
+                    "query_id": {"id": 7},
+                    "update": {"tables": [{"table_name": "building_state", "updates": [{"inserts": [], "deletes": rows}]}]},
+                }
+            }
+        )
+        assert processor.processed_transactions[0]["reducer_name"] == "unsubscribe"
+        assert router.table_store.count("building_state") == 0
+
+    def test_resync_per_subscription_handle(self, mock_data_queue):
+        """Test that only the handles being re-sent are diffed, each against its own tables."""
+        processor = MockProcessor(["building_state", "stamina_state"])
+        router = MessageRouter([processor], mock_data_queue, table_store=TableStore())
+
+        def applied(query_id, table_name, rows):
+            update = {"table_name": table_name, "updates": [{"inserts": [json_codec.dumps(r) for r in rows], "deletes": []}]}
+            return {"SubscribeMultiApplied": {"request_id": 1, "query_id": {"id": query_id}, "update": {"tables": [update]}}}
+
+        router.handle_message(applied(1, "stamina_state", [{"entity_id": 5, "stamina": 10}]))
+        router.handle_message(applied(2, "building_state", [{"entity_id": 1}, {"entity_id": 2}]))
+
+        router.begin_resync([1, 2])
+        router.handle_message(applied(1, "stamina_state", [{"entity_id": 5, "stamina": 10}]))
+        router.handle_message(applied(2, "building_state", [{"entity_id": 1}]))
+
+        # building_state reports the missing row as deleted; stamina_state is not shared,
+        # so its snapshot is reloaded as a subscription update
+        assert len(processor.processed_transactions) == 1
+        update = processor.processed_transactions[0]["table_update"]
+        assert update["table_name"] == "building_state"
+        assert update["updates"][0] == {"deletes": [{"entity_id": 2}], "inserts": []}
+        assert [u["table_name"] for u in processor.processed_subscriptions[2:]] == ["stamina_state"]
+        assert router.table_store.count("stamina_state") == 0
+
+
+    def test_resync_updates_real_processors(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that a resync diff reaches InventoryProcessor and CraftingProcessor state."""
+        store = TableStore()
+        feed = ChangeFeed()
+        services = dict(mock_services, table_store=store, change_feed=feed)
+        inventory = InventoryProcessor(mock_data_queue, services, mock_reference_data)
+        crafting = CraftingProcessor(mock_data_queue, services, mock_reference_data)
+        for processor in (inventory, crafting):
+            processor.emission_window = 0
+        inventory._send_incremental_inventory_update = Mock()
+        inventory._refresh_inventory = Mock()
+        crafting._send_incremental_crafting_update = Mock()
+        router = MessageRouter([inventory, crafting], mock_data_queue, table_store=store, change_feed=feed)
+
+        def pockets(quantity):
+            return [[0, [0, [1001, quantity, [], []]], False]]
+
+        def inventory_row(entity_id, quantity):
+            return {"entity_id": entity_id, "pockets": pockets(quantity), "inventory_index": 0,
+                    "cargo_index": 1, "owner_entity_id": 100, "player_owner_entity_id": 42}
+
+        def craft_row(entity_id, recipe_id):
+            return {"entity_id": entity_id, "owner_entity_id": 42, "recipe_id": recipe_id, "building_entity_id": 100,
+                    "timestamp": {"__timestamp_micros_since_unix_epoch__": 1640995200000000},
+                    "status": [1, {}], "slot": [0, 1]}
+
+        member = {"entity_id": 9, "claim_entity_id": 7, "player_entity_id": 42, "user_name": "Alice"}
+        building = {"entity_id": 100, "claim_entity_id": 7, "direction_index": 0,
+                    "building_description_id": 1001, "constructed_by_player_entity_id": 0}
+
+        def applied(inventory_rows, craft_rows):
+            tables = [
+                ("claim_member_state", [member]),
+                ("building_state", [building]),
+                ("inventory_state", inventory_rows),
+                ("passive_craft_state", craft_rows),
+            ]
+            update = {"tables": [
+                {"table_name": name, "updates": [{"inserts": [json_codec.dumps(r) for r in rows], "deletes": []}]}
+                for name, rows in tables
+            ]}
+            return {"SubscribeMultiApplied": {"request_id": 1, "query_id": {"id": 1}, "update": update}}
+
+        router.handle_message(applied([inventory_row(1, 5), inventory_row(2, 3)], [craft_row(5, 55), craft_row(6, 55)]))
+
+        # Live transactions leave array-shaped rows behind for the same entities
+        router.handle_message({
+            "TransactionUpdate": {
+                "status": {"Committed": {"tables": [
+                    {"table_name": "building_state", "updates": [{"deletes": [[100, 7, 0, 1001, 0]], "inserts": [[100, 7, 0, 1001, 0]]}]},
+                    {"table_name": "inventory_state", "updates": [{
+                        "deletes": [[1, pockets(5), 0, 1, 100, 42]],
+                        "inserts": [[1, pockets(7), 0, 1, 100, 42]],
+                    }]},
+                ]}},
+                "reducer_call": {"reducer_name": "item_stack_move"},
+                "timestamp": {"__timestamp_micros_since_unix_epoch__": 1640995200000000},
+            }
+        })
+        assert inventory._inventory_data[100][1]["pockets"] == pockets(7)
+        inventory._send_incremental_inventory_update.reset_mock()
+        inventory._refresh_inventory.reset_mock()
+
+        routed = []
+        feed.subscribe(lambda events, reducer, timestamp: routed.extend((e.table_name, e.key) for e in events))
+        router.begin_resync([1])
+        router.handle_message(applied([inventory_row(1, 7), inventory_row(3, 2)], [craft_row(5, 55), craft_row(6, 56)]))
+
+        # Only changed rows are routed, although stored and snapshot rows differ in shape
+        assert sorted(routed) == [("inventory_state", 2), ("inventory_state", 3), ("passive_craft_state", 6)]
+        assert sorted(inventory._inventory_data[100]) == [1, 3]
+        inventory._send_incremental_inventory_update.assert_called_once()
+        assert inventory._send_incremental_inventory_update.call_args[0][0] == "reconnect_resync"
+        assert crafting._passive_craft_data[6]["recipe_id"] == 56
+        assert sorted(crafting._passive_craft_data) == [5, 6]
+        crafting._send_incremental_crafting_update.assert_called_once()
+        inventory._refresh_inventory.assert_not_called()
+
+
+class TestSampledValidation:
+    """Test that dataclass validation runs on a sample of updates in the background."""
+
+    def _building_update(self, *rows):
+        return {"table_name": "building_state", "updates": [{"inserts": [json_codec.dumps(r) for r in rows]}]}
+
+    def test_sampled_updates_are_validated_by_worker(self, mock_data_queue):
+        """Test that valid and invalid rows are counted per table once the worker drains."""
+        router = MessageRouter([MockProcessor(["building_state"])], mock_data_queue, validation_sample_rate=1.0)
+        valid = {
+            "entity_id": 1,
+            "claim_entity_id": 9,
+            "direction_index": 0,
+            "building_description_id": 5,
+            "constructed_by_player_entity_id": 2,
+        }
+
+        router._route_transaction_table(self._building_update(valid), "build", 0.0)
+        router._route_transaction_table(self._building_update({"entity_id": 2}), "build", 0.0)
+        assert router.validator.flush()
+
+        stats = router.get_validation_stats()
+        assert stats["total_validations"] == 2
+        assert stats["successful_validations"] == 1
+        assert stats["validation_errors"] == 1
+        assert stats["table_validation_counts"]["building_state"] == {"success": 1, "error": 1}
+        assert stats["sampled"] == 2 and stats["sample_rate"] == 1.0
+
+        router.clear_all_processor_caches()
+        assert router.validation_stats["total_validations"] == 0
+        router.validator.stop()
+
+    def test_zero_sample_rate_skips_validation(self, mock_data_queue):
+        """Test that a sample rate of 0 never queues work."""
+        processor = MockProcessor(["building_state"])
+        router = MessageRouter([processor], mock_data_queue, validation_sample_rate=0)
+
+        router._route_transaction_table(self._building_update({"entity_id": 2}), "build", 0.0)
+
+        assert len(processor.processed_transactions) == 1
+        assert router.get_validation_stats()["sampled"] == 0
+        assert router.validator._worker is None
+
+    def test_full_backlog_drops_samples(self, mock_data_queue):
+        """Test that samples are dropped instead of queued without limit when the worker lags."""
+        router = MessageRouter([], mock_data_queue, validation_sample_rate=1.0)
+        router.validator._queue.maxsize = 1
+        router.validator._ensure_worker = Mock()  # Keep the worker from draining
+
+        router.validator.submit("building_state", self._building_update({"entity_id": 1}), "transaction")
+        router.validator.submit("building_state", self._building_update({"entity_id": 2}), "transaction")
+
+        stats = router.get_validation_stats()
+        assert stats["sampled"] == 1
+        assert stats["dropped"] == 1
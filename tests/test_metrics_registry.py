@@ -0,0 +1,112 @@
+"""
+Tests for the metrics registry - histograms, rates, snapshots and router instrumentation.
+"""
+
+import json
+
+from app.core.message_router import MessageRouter
+from app.services.metrics_registry import Histogram, MetricsRegistry, RateCounter, format_report
+from tests.conftest import MockProcessor
+
+
+class TestHistogram:
+    """Test percentile estimation."""
+
+    def test_percentiles_track_the_tail(self):
+        """Test that p50 reflects the bulk and p99 the slow tail, within one bucket."""
+        histogram = Histogram()
+        for _ in range(98):
+            histogram.observe(0.001)
+        histogram.observe(0.5)
+        histogram.observe(0.5)
+
+        summary = histogram.summary(1000)
+
+        assert 1.0 <= summary["p50"] <= 1.2
+        assert 420 <= summary["p99"] <= 500
+        assert summary["max"] == 500.0
+        assert summary["count"] == 100
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros."""
+        assert Histogram().summary() == {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+
+class TestRateCounter:
+    """Test sliding-window rates."""
+
+    def test_rate_uses_elapsed_time_until_window_fills(self):
+        """Test that old buckets expire and a young counter is not diluted by the full window."""
+        counter = RateCounter(window=10)
+        counter.add(10, now=100.0)
+        counter.add(10, now=101.5)
+
+        assert counter.rate(now=101.9) == 10.0
+        assert counter.rate(now=115.0) == 0.0
+        assert counter.total == 20
+
+
+class TestMetricsRegistry:
+    """Test recording and reporting."""
+
+    def test_snapshot_and_json_dump(self, tmp_path):
+        """Test that every metric kind appears in the snapshot, the JSON dump and the report."""
+        registry = MetricsRegistry()
+        registry.record_frame(2048)
+        registry.record_table("inventory_state", 4)
+        registry.record_queue_depth("data_queue", 3)
+        registry.record_queue_depth("data_queue", 1)
+        with registry.time("ui.process_data_queue"):
+            pass
+
+        path = tmp_path / "metrics.json"
+        assert registry.dump_json(path)
+        snapshot = json.loads(path.read_text())
+
+        assert snapshot["frames"]["bytes"] == 2048
+        assert snapshot["tables"]["inventory_state"]["rows"] == 4
+        assert snapshot["queues"]["data_queue"]["current"] == 1
+        assert snapshot["queues"]["data_queue"]["max"] == 3
+        assert snapshot["latency_ms"]["ui.process_data_queue"]["count"] == 1
+
+        report = format_report({**snapshot, "ingress": {"depth": 0}})
+        assert "inventory_state" in report and "ui.process_data_queue" in report and "depth: 0" in report
+
+        registry.reset()
+        assert registry.snapshot()["tables"] == {}
+
+    def test_disabled_registry_records_nothing(self):
+        """Test that recording is skipped while disabled."""
+        registry = MetricsRegistry()
+        registry.enabled = False
+        registry.record_table("inventory_state", 1)
+        registry.observe_latency("x", 0.1)
+
+        assert registry.snapshot()["tables"] == {}
+        assert registry.snapshot()["latency_ms"] == {}
+
+    def test_router_records_table_rows_and_processor_latency(self, mock_data_queue):
+        """Test that MessageRouter counts rows per table and times each processor call."""
+        registry = MetricsRegistry()
+        router = MessageRouter([MockProcessor(["building_state"])], mock_data_queue, metrics=registry)
+
+        router._route_transaction_table(
+            {"table_name": "building_state", "updates": [{"inserts": ['{"entity_id": 1}'], "deletes": ['{"entity_id": 2}']}]},
+            "build",
+            0.0,
+        )
+        router.handle_message(
+            {
+                "InitialSubscription": {
+                    "database_update": {
+                        "tables": [{"table_name": "building_state", "updates": [{"inserts": ['{"entity_id": 3}']}]}]
+                    }
+                }
+            }
+        )
+
+        snapshot = registry.snapshot()
+        assert snapshot["tables"]["building_state"]["messages"] == 2
+        assert snapshot["tables"]["building_state"]["rows"] == 3
+        assert snapshot["latency_ms"]["MockProcessor.process_transaction"]["count"] == 1
+        assert snapshot["latency_ms"]["MockProcessor.process_subscription"]["count"] == 1
@@ -13,6 +13,7 @@ from app.core.processors.base_processor import BaseProcessor
 from app.core.processors.inventory_processor import InventoryProcessor
 from app.core.processors.tasks_processor import TasksProcessor
 from app.core.processors.crafting_processor import CraftingProcessor
+from app.core.processors.active_crafting_processor import ActiveCraftingProcessor
 from tests.conftest import get_mock_spacetime_messages, get_mock_reference_data
 
 
@@ -343,20 +344,20 @@ class TestInventoryProcessor:
         
         # Set up mock inventory data with conflicting IDs
         processor._inventory_data = {
-            "building_1": [
-                {
+            "building_1": {
+                "inv_1": {
                     "entity_id": "inv_1", 
                     "item_id": 3001,  # Conflicting ID
                     "quantity": 5,
                     "owner_entity_id": "building_1"
                 },
-                {
+                "inv_2": {
                     "entity_id": "inv_2",
                     "item_id": 1001,  # Conflicting ID
                     "quantity": 3,
                     "owner_entity_id": "building_1"
                 }
-            ]
+            }
         }
         
         # Set up mock building data
@@ -387,6 +388,159 @@ class TestInventoryProcessor:
             assert "Supply Package" in consolidated, "Should show cargo items based on slot logic"
             # Slot-based logic correctly determines these are cargo slots, so cargo items are returned
 
+    def test_inventory_records_keyed_by_entity(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test O(1) record upsert/removal, including records moving between owners."""
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+
+        processor._process_inventory_data([
+            {"entity_id": 1, "owner_entity_id": "b1"},
+            {"entity_id": 2, "owner_entity_id": "b1"},
+            {"entity_id": 1, "owner_entity_id": "b1", "cargo_index": 3},  # re-subscription replaces, not duplicates
+        ])
+        assert list(processor._inventory_data["b1"]) == [1, 2]
+        assert processor._inventory_data["b1"][1]["cargo_index"] == 3
+
+        # Moving a record to another owner updates the owner index
+        processor._upsert_inventory_record({"entity_id": 2, "owner_entity_id": "b2"})
+        assert list(processor._inventory_data["b1"]) == [1]
+        assert list(processor._inventory_data["b2"]) == [2]
+
+        assert processor._remove_inventory_record(2)["owner_entity_id"] == "b2"
+        assert "b2" not in processor._inventory_data
+        assert processor._remove_inventory_record(2) is None
+
+        processor.clear_cache()
+        assert processor._inventory_data == {}
+        assert processor._inventory_owners == {}
+
+    def test_incremental_aggregate_matches_full_rebuild(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that transactions update the consolidated inventory without a full rebuild."""
+        from app.core.utils.item_lookup_service import ItemLookupService
+        from app.models import InventoryState
+
+        def inventory_row(entity_id, owner_id, item_id, quantity):
+            # Inventory-only container: one item pocket, cargo_index past the end
+            return [entity_id, [[0, [0, [item_id, quantity, [], []]], False]], 0, 1, owner_id, 0]
+
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.item_lookup_service = ItemLookupService(mock_reference_data)
+        processor._building_data = {
+            "b1": {"building_description_id": 200, "claim_entity_id": "c1", "entity_id": "b1"},
+            "b2": {"building_description_id": 201, "claim_entity_id": "c1", "entity_id": "b2"},
+        }
+        processor._building_nicknames = {"b2": "Shed"}
+        processor._upsert_inventory_record(InventoryState.from_array(inventory_row(1, "b1", 1, 10)).to_dict())
+        processor._upsert_inventory_record(InventoryState.from_array(inventory_row(2, "b2", 1, 5)).to_dict())
+
+        consolidated = processor._consolidate_inventory()
+        assert consolidated["Wood"]["total_quantity"] == 15
+        assert consolidated["Wood"]["containers"] == {"Smelting Station": 10, "Shed": 5}
+
+        # Only the touched record should be resolved again
+        processor._get_record_items = Mock(wraps=processor._get_record_items)
+        processor._send_incremental_inventory_update = Mock()
+        processor.process_transaction(
+            {
+                "table_name": "inventory_state",
+                "updates": [{
+                    "deletes": [inventory_row(2, "b2", 1, 5)],
+                    "inserts": [inventory_row(2, "b2", 2, 4), inventory_row(3, "b1", 3, 1)],
+                }],
+            },
+            "item_stack_move",
+            0,
+        )
+        assert processor._get_record_items.call_count == 2
+
+        incremental = processor._snapshot_aggregate()
+        assert incremental["Wood"] == {"tier": 0, "total_quantity": 10, "tag": "Material", "containers": {"Smelting Station": 10}}
+        assert incremental["Iron Ore"]["containers"] == {"Shed": 4}
+        assert incremental["Iron Bar"]["total_quantity"] == 1
+
+        # Deleting the last stack removes the item entirely
+        processor.process_transaction(
+            {"table_name": "inventory_state", "updates": [{"deletes": [inventory_row(3, "b1", 3, 1)], "inserts": []}]},
+            "item_stack_move",
+            0,
+        )
+        assert "Iron Bar" not in processor._snapshot_aggregate()
+        assert processor._snapshot_aggregate() == processor._consolidate_inventory()
+
+    def test_vectorized_consolidation_matches_python(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that the NumPy consolidation engine matches the pure-Python loop."""
+        pytest.importorskip("numpy")
+        from app.core.utils.item_lookup_service import ItemLookupService
+
+        def pocket(item_id, quantity):
+            return [0, [0, [item_id, quantity, [], []]], False]
+
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.item_lookup_service = ItemLookupService(mock_reference_data)
+        processor._building_data = {
+            "b1": {"building_description_id": 200, "entity_id": "b1"},
+            "b2": {"building_description_id": 201, "entity_id": "b2"},
+            "b3": {"building_description_id": 200, "entity_id": "b3"},  # same display name as b1
+        }
+        processor._building_nicknames = {"b2": "Shed"}
+        processor._process_inventory_data([
+            {"entity_id": 5, "owner_entity_id": "b3", "cargo_index": 1, "pockets": [pocket(1, 7)]},
+            # Inventory-only, mixed (cargo from slot 2) and cargo-only containers
+            {"entity_id": 1, "owner_entity_id": "b1", "cargo_index": 5, "pockets": [pocket(1, 10), pocket(2, 3)]},
+            {"entity_id": 2, "owner_entity_id": "b2", "cargo_index": 2,
+             "pockets": [pocket(1, 4), [0, [1, []], False], pocket(3001, 2), pocket(999999, 1)]},
+            {"entity_id": 3, "owner_entity_id": "b2", "cargo_index": 0, "pockets": [pocket(3001, 6)]},
+            {"entity_id": 4, "owner_entity_id": "b1", "cargo_index": 1, "pockets": []},
+        ])
+
+        with patch("app.core.processors.inventory_processor.MIN_VECTORIZED_POCKETS", 0):
+            vectorized = processor._consolidate_inventory()
+        vectorized_contributions = dict(processor._record_contributions)
+
+        with patch("app.core.processors.inventory_processor.NUMPY_AVAILABLE", False):
+            python = processor._consolidate_inventory()
+
+        assert vectorized == python
+        assert vectorized_contributions == processor._record_contributions
+        assert python["Wood"]["containers"] == {"Smelting Station": 17, "Shed": 4}
+        assert python["Pyrelite Ore Chunk"]["total_quantity"] == 8
+
+    def test_transaction_sends_inventory_delta(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that live transactions queue only the added, changed and removed items."""
+        from app.core.utils.item_lookup_service import ItemLookupService
+        from app.models import InventoryState
+
+        def inventory_row(entity_id, owner_id, item_id, quantity):
+            return [entity_id, [[0, [0, [item_id, quantity, [], []]], False]], 0, 1, owner_id, 7]
+
+        processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.item_lookup_service = ItemLookupService(mock_reference_data)
+        processor._building_data = {"b1": {"building_description_id": 200, "entity_id": "b1"}}
+        processor._upsert_inventory_record(InventoryState.from_array(inventory_row(1, "b1", 1, 10)).to_dict())
+        processor._upsert_inventory_record(InventoryState.from_array(inventory_row(2, "b1", 2, 3)).to_dict())
+        processor._consolidate_inventory()
+
+        processor.process_transaction(
+            {
+                "table_name": "inventory_state",
+                "updates": [{
+                    "deletes": [inventory_row(1, "b1", 1, 10), inventory_row(2, "b1", 2, 3)],
+                    "inserts": [inventory_row(1, "b1", 1, 4), inventory_row(4, "b1", 3, 2)],
+                }],
+            },
+            "item_stack_split",
+            1640995200.0,
+        )
+
+        message = mock_data_queue.get_nowait()
+        assert message["type"] == "inventory_delta"
+        assert message["data"]["changed"] == {
+            "Wood": {"tier": 0, "total_quantity": 4, "tag": "Material", "containers": {"Smelting Station": 4}}
+        }
+        assert list(message["data"]["added"]) == ["Iron Bar"]
+        assert message["data"]["removed"] == ["Iron Ore"]
+        assert message["changes"]["reducer"] == "item_stack_split"
+        assert message["changes"]["player_context"] == {1: 7, 2: 7, 4: 7}
+
     def test_missing_item_lookup_service(self, mock_data_queue, mock_services, mock_reference_data):
         """Test graceful handling when item_lookup_service is missing."""
         processor = InventoryProcessor(mock_data_queue, mock_services, mock_reference_data)
@@ -503,6 +657,177 @@ class TestCraftingProcessor:
         assert len(newly_ready_items) == 0
 
 
+    def test_completion_scheduler_fires_only_due_crafts(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that the deadline heap reports each craft once, when its deadline passes."""
+        mock_reference_data["crafting_recipe_desc"][0]["time_requirement"] = 60
+        from app.core.utils.item_lookup_service import ItemLookupService
+
+        processor = CraftingProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.item_lookup_service = ItemLookupService(mock_reference_data)
+        now_micros = int(time.time() * 1_000_000)
+
+        processor._passive_craft_data = {
+            "done": {"recipe_id": 100, "owner_entity_id": "123", "status": [1, {}], "timestamp_micros": now_micros - 120_000_000},
+            "running": {"recipe_id": 100, "owner_entity_id": "123", "status": [1, {}], "timestamp_micros": now_micros},
+            "server_ready": {"recipe_id": 100, "owner_entity_id": "456", "status": [2, {}], "timestamp_micros": now_micros},
+        }
+        processor._schedule_completions()
+
+        with processor._deadline_condition:
+            assert sorted(processor._pop_due_deadlines()) == ["done", "server_ready"]
+            assert 55 < processor._next_deadline_timeout() <= 60
+
+        # Rescheduling after the running craft is collected leaves nothing pending
+        del processor._passive_craft_data["running"]
+        processor.notified_ready_items.update({"done", "server_ready"})
+        processor._schedule_completions()
+        with processor._deadline_condition:
+            assert processor._next_deadline_timeout() is None
+
+    def test_completion_scheduler_updates_one_craft_at_a_time(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that a craft change pushes only its own deadline and leaves the old entry stale."""
+        mock_reference_data["crafting_recipe_desc"][0]["time_requirement"] = 60
+        from app.core.utils.item_lookup_service import ItemLookupService
+
+        processor = CraftingProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.item_lookup_service = ItemLookupService(mock_reference_data)
+        now_micros = int(time.time() * 1_000_000)
+        processor._passive_craft_data = {
+            "a": {"recipe_id": 100, "owner_entity_id": "123", "status": [1, {}], "timestamp_micros": now_micros},
+            "b": {"recipe_id": 100, "owner_entity_id": "123", "status": [1, {}], "timestamp_micros": now_micros},
+        }
+        processor._schedule_completions()
+
+        # Craft a restarts 30s earlier: one new entry, a's first entry is now stale
+        processor._passive_craft_data["a"] = dict(processor._passive_craft_data["a"], timestamp_micros=now_micros - 30_000_000)
+        processor._schedule_completion("a")
+        assert len(processor._deadline_heap) == 3
+        with processor._deadline_condition:
+            assert 25 < processor._next_deadline_timeout() <= 30
+
+        # Unchanged and removed crafts push nothing
+        processor._schedule_completion("b")
+        del processor._passive_craft_data["a"]
+        processor._schedule_completion("a")
+        assert len(processor._deadline_heap) == 3
+        assert list(processor._scheduled_deadlines) == ["b"]
+        with processor._deadline_condition:
+            assert 55 < processor._next_deadline_timeout() <= 60
+            assert processor._pop_due_deadlines() == []
+
+    def test_crafts_ready_sends_one_notification_and_timer_delta(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that completed crafts trigger a bundled notification and a single timer delta."""
+        processor = CraftingProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor._passive_craft_data = {
+            "a": {"recipe_id": 100, "owner_entity_id": "123", "status": [1, {}]},
+            "b": {"recipe_id": 100, "owner_entity_id": "123", "status": [1, {}]},
+            "c": {"recipe_id": 100, "owner_entity_id": "456", "status": [1, {}]},
+        }
+        processor._is_current_player = Mock(side_effect=lambda owner: owner == "123")
+        processor._get_item_name_from_recipe = Mock(return_value="Iron Bar")
+        processor._trigger_bundled_passive_craft_notifications = Mock()
+        processor._consolidate_crafting = Mock()
+        processor.ui_update_callback = Mock()
+
+        processor._on_crafts_ready(["a", "b", "c"])
+
+        notified = processor._trigger_bundled_passive_craft_notifications.call_args[0][0]
+        assert [item["entity_id"] for item in notified] == ["a", "b"]
+        assert processor.notified_ready_items == {"a", "b", "c"}
+        assert processor.ui_update_callback.call_count == 1
+        message = processor.ui_update_callback.call_args[0][0]
+        assert message["type"] == "crafting_timer_update"
+        assert message["data"] == {"a": 0.0, "b": 0.0, "c": 0.0}
+        processor._consolidate_crafting.assert_not_called()
+
+    def test_countdown_only_transaction_sends_timer_delta(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that timestamp/status-only craft updates skip the full hierarchy rebuild."""
+        mock_reference_data["crafting_recipe_desc"][0]["time_requirement"] = 60
+        from app.core.utils.item_lookup_service import ItemLookupService
+
+        processor = CraftingProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.item_lookup_service = ItemLookupService(mock_reference_data)
+        processor._is_current_claim_member = Mock(return_value=True)
+        processor._send_incremental_crafting_update = Mock()
+        now_micros = int(time.time() * 1_000_000)
+
+        def craft_row(entity_id, timestamp_micros, status, recipe_id=100):
+            return [entity_id, 123, recipe_id, 200, [timestamp_micros], [status, {}], 0]
+
+        processor._passive_craft_data = {}
+        processor.process_transaction(
+            {
+                "table_name": "passive_craft_state",
+                "updates": [{
+                    "deletes": [craft_row(1, now_micros - 30_000_000, 1), craft_row(2, now_micros, 1)],
+                    "inserts": [craft_row(1, now_micros - 30_000_000, 2), craft_row(2, now_micros - 10_000_000, 1)],
+                }],
+            },
+            "passive_craft_process",
+            0,
+        )
+
+        message = mock_data_queue.get_nowait()
+        assert message["type"] == "crafting_timer_update"
+        assert message["data"][1] == 0.0
+        assert 49 < message["data"][2] <= 50
+        processor._send_incremental_crafting_update.assert_not_called()
+
+        # A recipe change is structural and still triggers the full update
+        processor.process_transaction(
+            {
+                "table_name": "passive_craft_state",
+                "updates": [{"deletes": [craft_row(2, now_micros, 1)], "inserts": [craft_row(2, now_micros, 1, recipe_id=101)]}],
+            },
+            "passive_craft_process",
+            0,
+        )
+        processor._send_incremental_crafting_update.assert_called_once()
+
+
+class TestActiveCraftingProcessor:
+    """Test ActiveCraftingProcessor functionality."""
+
+    def test_progress_only_transaction_sends_progress_delta(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that progress ticks send remaining effort instead of a full rebuild."""
+        from app.core.utils.item_lookup_service import ItemLookupService
+
+        processor = ActiveCraftingProcessor(mock_data_queue, mock_services, mock_reference_data)
+        processor.item_lookup_service = ItemLookupService(mock_reference_data)
+        processor._is_current_claim_member = Mock(return_value=True)
+        processor._is_current_player = Mock(return_value=False)
+        processor._send_incremental_active_crafting_update = Mock()
+
+        def action_row(entity_id, progress, craft_count=2):
+            # Recipe 100 needs 50 actions per craft
+            return [entity_id, 200, 1, progress, 100, craft_count, 0, 123]
+
+        processor.process_transaction(
+            {
+                "table_name": "progressive_action_state",
+                "updates": [{"deletes": [action_row(1, 10), action_row(2, 90)], "inserts": [action_row(1, 25), action_row(2, 100)]}],
+            },
+            "craft_continue",
+            0,
+        )
+
+        message = mock_data_queue.get_nowait()
+        assert message["type"] == "active_crafting_progress_update"
+        assert message["data"] == {1: 75, 2: 0}
+        processor._send_incremental_active_crafting_update.assert_not_called()
+
+        # Changing the craft count is structural
+        processor.process_transaction(
+            {
+                "table_name": "progressive_action_state",
+                "updates": [{"deletes": [action_row(1, 25)], "inserts": [action_row(1, 25, craft_count=3)]}],
+            },
+            "craft_continue",
+            0,
+        )
+        processor._send_incremental_active_crafting_update.assert_called_once()
+
+
 class TestProcessorErrorHandling:
     """Test error handling across processors."""
 
@@ -127,6 +127,36 @@ class TestQueryService:
         assert result[0]["claim_entity_id"] == "claim-1"
         assert result[1]["claim_entity_id"] == "claim-2"
 
+    def test_get_user_claims_with_details_batches_queries(self):
+        """Test that memberships and both claim state tables are fetched in one batch."""
+        mock_client = MockBitCraftClient()
+        mock_client.query_many = Mock(
+            return_value=[
+                [{"claim_entity_id": "claim-1"}],
+                [{"entity_id": "claim-1", "supplies": 10}],
+                None,
+            ]
+        )
+        query_service = QueryService(mock_client)
+
+        memberships, local_states, claim_states = query_service.get_user_claims_with_details("user-123")
+
+        mock_client.query_many.assert_called_once()
+        queries = mock_client.query_many.call_args[0][0]
+        assert len(queries) == 3
+        assert all("user-123" in query for query in queries)
+        assert memberships == [{"claim_entity_id": "claim-1"}]
+        assert local_states == [{"entity_id": "claim-1", "supplies": 10}]
+        assert claim_states == []
+
+    def test_query_many_falls_back_to_sequential_queries(self):
+        """Test that clients without query_many are queried one by one."""
+        mock_client = Mock(spec=["query"])
+        mock_client.query.side_effect = [[{"id": 1}], Exception("Database error")]
+        query_service = QueryService(mock_client)
+
+        assert query_service.query_many(["SELECT 1;", "SELECT 2;"]) == [[{"id": 1}], None]
+
     def test_get_user_claims_error_handling(self, caplog):
         """Test user claims retrieval error handling."""
         mock_client = Mock()
@@ -156,6 +186,23 @@ class TestQueryService:
             # Method doesn't exist - that's expected for some implementations
             pass
 
+    def test_subscription_queries_split_by_scope(self):
+        """Test that player and claim subscription groups cover disjoint tables."""
+        from app.client.query_service import CLAIM_SCOPED_TABLES, PLAYER_SCOPED_TABLES
+
+        query_service = QueryService(MockBitCraftClient())
+        player_queries = query_service.get_player_subscription_queries("user-123")
+        claim_queries = query_service.get_claim_subscription_queries("claim-456")
+
+        def selected_tables(queries):
+            return {query.split("FROM ")[1].split()[0].rstrip(";") for query in queries}
+
+        assert selected_tables(player_queries) == PLAYER_SCOPED_TABLES
+        assert selected_tables(claim_queries) == CLAIM_SCOPED_TABLES
+        assert not any("claim-456" in query for query in player_queries)
+        assert not any("user-123" in query for query in claim_queries)
+        assert query_service.get_subscription_queries("user-123", "claim-456") == player_queries + claim_queries
+
     def test_query_error_handling(self, caplog):
         """Test query error handling across methods."""
         mock_client = Mock()
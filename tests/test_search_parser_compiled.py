@@ -0,0 +1,111 @@
+"""
+Tests for SearchParser compiled query predicates and their cache.
+
+The compiled predicate must give exactly the same answer as match_row() for
+every query; the rows below cover strings, numbers, formatted numbers,
+percentages, containers and missing fields.
+"""
+
+import pytest
+from app.services.search_parser import SearchParser
+
+ROWS = [
+    {"name": "Oak Plank", "tier": 2, "quantity": 150, "tag": "Refined Plank", "containers": {"Workshop Chest": 100, "Carving Table": 50}},
+    {"name": "Stone Brick", "tier": 5, "quantity": 40, "tag": "Brick", "containers": {"Storage Box": 40}},
+    {"item": "Iron Ingot", "tier": "3", "quantity": "1,200", "crafter": "Alice", "building": "Smelter", "remaining_effort": "READY"},
+    {"item": "Rough Cloth", "tier": 1, "remaining_effort": "950", "time_remaining": "5m 30s", "accept_help": "Yes"},
+    {"material": "Copper", "need": 100, "supply": 25, "progress": "25%", "profession": "Metal"},
+    {"name": "Package of Logs", "tier": 4, "quantity": 0.5, "containers": "none"},
+    {},
+]
+
+QUERIES = [
+    "item=plank",
+    "item=log item!=package qty<500",
+    "tier>2 tier<6",
+    "tier>=3 qty<=1000",
+    "tier=3",
+    "tier!=2",
+    "qty>100",
+    "quantity=1",
+    "container=carving",
+    "container!=storage",
+    "container>a",
+    "container=workshop||storage",
+    "item=plank||ingot",
+    "item=refined&plank",
+    "tag=refined&plank",
+    "effort=ready",
+    "effort>900",
+    "time<60",
+    "help=yes",
+    "progress<50%",
+    "progress>=25%",
+    "mats=copper need>50",
+    "profession=metal supply<=25",
+    "item>m",
+    "item<=oak",
+    "tier>abc",
+    "plank",
+    "chest",
+    "oak plank",
+    "brick 5",
+    "tier>1 smelter",
+    "unknownfield=foo",
+    "qty=1,200",
+]
+
+
+class TestCompiledQueries:
+    """Test that compiled predicates match the interpreted match_row()."""
+
+    def setup_method(self):
+        self.parser = SearchParser()
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_compiled_predicate_matches_match_row(self, query):
+        parsed = self.parser.parse_search_query(query)
+        predicate = self.parser.compile_query(query)
+
+        for row in ROWS:
+            assert predicate(row) == self.parser.match_row(row, parsed), (query, row)
+
+    def test_empty_query_matches_everything(self):
+        predicate = self.parser.compile_query("")
+        assert all(predicate(row) for row in ROWS)
+
+    def test_filtering_results(self):
+        predicate = self.parser.compile_query("container=carving||storage tier>1")
+        assert [row.get("name") for row in ROWS if predicate(row)] == ["Oak Plank", "Stone Brick"]
+
+
+class TestQueryCache:
+    """Test the LRU cache of compiled queries."""
+
+    def setup_method(self):
+        self.parser = SearchParser()
+
+    def test_cached_per_query_and_scope(self):
+        predicate = self.parser.compile_query("item=plank", "claim_inventory")
+
+        assert self.parser.compile_query("item=plank", "claim_inventory") is predicate
+        assert self.parser.compile_query("item=plank", "passive_crafting") is not predicate
+        assert self.parser.compile_query("item=plan", "claim_inventory") is not predicate
+
+    def test_least_recently_used_query_is_evicted(self, monkeypatch):
+        monkeypatch.setattr(SearchParser, "QUERY_CACHE_SIZE", 2)
+        first = self.parser.compile_query("a")
+        second = self.parser.compile_query("b")
+
+        # Using "a" again makes "b" the least recently used
+        assert self.parser.compile_query("a") is first
+        self.parser.compile_query("c")
+
+        assert len(self.parser._compiled_queries) == 2
+        assert self.parser.compile_query("a") is first
+        assert self.parser.compile_query("b") is not second
+
+    def test_clear_query_cache(self):
+        predicate = self.parser.compile_query("item=plank")
+        self.parser.clear_query_cache()
+        assert self.parser.compile_query("item=plank") is not predicate
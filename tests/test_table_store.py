@@ -0,0 +1,160 @@
+"""
+Tests for TableStore - the shared client-side copy of subscribed tables.
+
+Tests primary-key storage, secondary indexes, transaction insert/delete pairs,
+and MessageRouter/processor integration.
+"""
+
+import pytest
+from app.core.message_router import MessageRouter
+from app.core.table_store import TableStore
+from app.core.processors.active_crafting_processor import ActiveCraftingProcessor
+from app.core.processors.crafting_processor import CraftingProcessor
+from app.core.processors.inventory_processor import InventoryProcessor
+from tests.conftest import MockProcessor
+
+
+def _building_row(entity_id, claim_id, description_id=1001):
+    return {
+        "entity_id": entity_id,
+        "claim_entity_id": claim_id,
+        "direction_index": 0,
+        "building_description_id": description_id,
+        "constructed_by_player_entity_id": 0,
+    }
+
+
+class TestTableStore:
+    """Test the TableStore class functionality."""
+
+    def test_subscription_rows_stored_by_primary_key(self):
+        """Test that subscription rows are keyed by entity_id."""
+        store = TableStore()
+        store.apply_table_update({
+            "table_name": "building_state",
+            "updates": [{"inserts": [_building_row(1, 100), _building_row(2, 100)], "deletes": []}],
+        })
+
+        assert store.count("building_state") == 2
+        assert store.get("building_state", 1)["building_description_id"] == 1001
+        assert store.get("building_state", 3) is None
+
+    def test_secondary_index_lookup(self):
+        """Test lookups by indexed foreign-key columns."""
+        store = TableStore()
+        store.apply_table_update({
+            "table_name": "building_state",
+            "updates": [{"inserts": [_building_row(1, 100), _building_row(2, 100), _building_row(3, 200)]}],
+        })
+
+        claim_100 = store.find_by("building_state", "claim_entity_id", 100)
+        assert sorted(row["entity_id"] for row in claim_100) == [1, 2]
+        assert store.find_by("building_state", "claim_entity_id", 999) == []
+
+        with pytest.raises(ValueError):
+            store.find_by("building_state", "direction_index", 0)
+
+    def test_transaction_array_rows_update_indexes(self):
+        """Test that delete+insert array rows replace the stored row and move index entries."""
+        store = TableStore()
+        store.apply_table_update({"table_name": "building_state", "updates": [{"inserts": [_building_row(1, 100)]}]})
+
+        # Transaction rows arrive in array format
+        store.apply_table_update({
+            "table_name": "building_state",
+            "updates": [{"deletes": [[1, 100, 0, 1001, 0]], "inserts": [[1, 200, 0, 1001, 0]]}],
+        })
+
+        assert store.get("building_state", 1)["claim_entity_id"] == 200
+        assert store.find_by("building_state", "claim_entity_id", 100) == []
+        assert len(store.find_by("building_state", "claim_entity_id", 200)) == 1
+
+        store.apply_table_update({"table_name": "building_state", "updates": [{"deletes": [[1, 200, 0, 1001, 0]]}]})
+        assert store.count("building_state") == 0
+        assert store.find_by("building_state", "claim_entity_id", 200) == []
+
+    def test_unshared_tables_not_stored(self):
+        """Test that reference and single-processor tables are ignored by the default filter."""
+        store = TableStore()
+        applied = store.apply_table_update({"table_name": "item_desc", "updates": [{"inserts": [{"id": 1}]}]})
+        applied += store.apply_table_update({"table_name": "inventory_state", "updates": [{"inserts": [{"entity_id": 2}]}]})
+
+        assert applied == 0
+        assert store.get_stats() == {}
+
+    def test_router_applies_updates_before_processors(self, mock_data_queue):
+        """Test that MessageRouter keeps the store in sync and clears it with processor caches."""
+        store = TableStore()
+        processor = MockProcessor(["building_nickname_state"])
+        router = MessageRouter([processor], mock_data_queue, table_store=store)
+
+        router.handle_message({
+            "TransactionUpdate": {
+                "status": {"Committed": {"tables": [{
+                    "table_name": "building_nickname_state",
+                    "updates": [{"inserts": ['[5, "Main Chest"]'], "deletes": []}],
+                }]}},
+                "reducer_call": {"reducer_name": "building_set_nickname"},
+                "timestamp": {"__timestamp_micros_since_unix_epoch__": 1640995200000000},
+            }
+        })
+
+        assert store.get("building_nickname_state", 5)["nickname"] == "Main Chest"
+        assert len(processor.processed_transactions) == 1
+
+        router.clear_all_processor_caches()
+        assert store.count("building_nickname_state") == 0
+
+    def test_processor_reads_buildings_from_store(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that processors resolve building info and nicknames through the store."""
+        store = TableStore()
+        store.apply_table_update({"table_name": "building_state", "updates": [{"inserts": [_building_row(7, 100)]}]})
+        store.apply_table_update({"table_name": "building_nickname_state", "updates": [{"inserts": [{"entity_id": 7, "nickname": "Vault"}]}]})
+
+        services = dict(mock_services, table_store=store)
+        processor = InventoryProcessor(mock_data_queue, services, mock_reference_data)
+        processor._process_building_data([_building_row(8, 100)])
+
+        assert processor._has_building_data()
+        assert processor._get_building_info(7)["claim_entity_id"] == 100
+        assert processor._get_building_nickname(7) == "Vault"
+        assert not hasattr(processor, "_building_data")
+
+    def test_processors_read_claim_members_from_store(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that claim members are resolved through the store instead of per-processor copies."""
+        store = TableStore()
+        member = {"entity_id": 1, "claim_entity_id": 100, "player_entity_id": 42, "user_name": "Alice"}
+        store.apply_table_update({"table_name": "claim_member_state", "updates": [{"inserts": [member]}]})
+
+        services = dict(mock_services, table_store=store)
+        inventory = InventoryProcessor(mock_data_queue, services, mock_reference_data)
+        crafting = CraftingProcessor(mock_data_queue, services, mock_reference_data)
+        inventory._process_claim_member_data([member])
+        crafting._process_claim_member_data([member])
+
+        assert inventory._get_player_name(42) == "Alice"
+        assert crafting._get_player_name("42") == "Alice"
+        assert crafting._is_current_claim_member(42)
+        assert not crafting._is_current_claim_member(43)
+        assert not hasattr(inventory, "_claim_members") and not hasattr(crafting, "_claim_members")
+
+    def test_active_crafting_adds_no_placeholder_buildings_with_store(self, mock_data_queue, mock_services, mock_reference_data):
+        """Test that craft rows for unknown buildings do not create private building entries."""
+        store = TableStore()
+        member = {"entity_id": 1, "claim_entity_id": 100, "player_entity_id": 42, "user_name": "Alice"}
+        store.apply_table_update({"table_name": "claim_member_state", "updates": [{"inserts": [member]}]})
+
+        processor = ActiveCraftingProcessor(mock_data_queue, dict(mock_services, table_store=store), mock_reference_data)
+        processor._send_incremental_active_crafting_update = lambda *args, **kwargs: None
+        processor.process_transaction(
+            {"table_name": "progressive_action_state", "updates": [{"inserts": [[5, 77, 1, 0, 100, 1, 0, 42, None, False]]}]},
+            "craft_start",
+            0,
+        )
+        processor.process_transaction(
+            {"table_name": "public_progressive_action_state", "updates": [{"inserts": [[5, 78, 42]]}]}, "craft_help", 0
+        )
+
+        assert 5 in processor._progressive_action_data
+        assert processor._get_building_info(77) == {}
+        assert not hasattr(processor, "_building_data")
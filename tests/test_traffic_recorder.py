@@ -0,0 +1,107 @@
+"""
+Tests for TrafficRecorder and ReplayClient - recorded frames replay into MessageRouter.
+"""
+
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+from app.client.bsatn import BsatnCodec
+from app.client.traffic_recorder import ReplayClient, TrafficRecorder, read_recording
+from app.core.message_router import MessageRouter
+from tests.conftest import MockProcessor
+
+
+def transaction_frame(entity_id):
+    table = {"table_name": "building_state", "updates": [{"inserts": [json.dumps({"entity_id": entity_id})], "deletes": []}]}
+    return json.dumps(
+        {
+            "TransactionUpdate": {
+                "status": {"Committed": {"tables": [table]}},
+                "reducer_call": {"reducer_name": "building_update"},
+                "timestamp": {"__timestamp_micros_since_unix_epoch__": 1_700_000_000_000_000},
+            }
+        }
+    )
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "session.jsonl.gz"
+    recorder = TrafficRecorder(path, "v1.json.spacetimedb")
+    recorder.record(transaction_frame(1))
+    recorder.record(json.dumps({"OneOffQueryResponse": {"message_id": "ab", "tables": []}}))
+    recorder.record(transaction_frame(2))
+    recorder.close()
+    return path
+
+
+class TestTrafficRecorder:
+    """Test the recording file format."""
+
+    def test_records_text_and_binary_frames(self, tmp_path):
+        """Test that frames round-trip with increasing monotonic offsets."""
+        path = tmp_path / "session.jsonl.gz"
+        recorder = TrafficRecorder(path, BsatnCodec.subprotocol)
+        recorder.record('{"a": 1}')
+        recorder.record(b"\x00\x01\xff")
+        recorder.close()
+        recorder.record("after close")  # ignored
+
+        header, frames = read_recording(path)
+
+        assert header["subprotocol"] == BsatnCodec.subprotocol
+        assert [frame for _, frame in frames] == ['{"a": 1}', b"\x00\x01\xff"]
+        assert 0 <= frames[0][0] <= frames[1][0]
+        assert recorder.frame_count == 2
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that files without the recording header are refused."""
+        path = tmp_path / "other.jsonl.gz"
+        with gzip.open(path, "wt") as f:
+            f.write('{"TransactionUpdate": {}}\n')
+
+        with pytest.raises(ValueError):
+            read_recording(path)
+
+
+class TestReplayClient:
+    """Test replaying recordings into MessageRouter."""
+
+    def test_replay_feeds_message_router(self, recording, mock_data_queue):
+        """Test that every subscription message reaches the processors and query responses are skipped."""
+        processor = MockProcessor(["building_state"])
+        router = MessageRouter([processor], mock_data_queue)
+
+        stats = ReplayClient(recording).replay(router.handle_message, speed=None)
+
+        assert stats["messages"] == 2
+        assert stats["errors"] == 0
+        inserted = [t["table_update"]["updates"][0]["inserts"][0]["entity_id"] for t in processor.processed_transactions]
+        assert inserted == [1, 2]
+
+    def test_replay_speed_scales_recorded_timing(self, recording):
+        """Test that speed N compresses the recorded gaps by N."""
+        client = ReplayClient(recording)
+        client.frames = [(10.0, transaction_frame(1)), (10.4, transaction_frame(2))]
+
+        start = time.monotonic()
+        stats = client.replay(lambda message: None, speed=2.0)
+        elapsed = time.monotonic() - start
+
+        assert stats["messages"] == 2
+        assert 0.18 <= elapsed < 1.0
+
+    def test_replay_stops_on_event(self, recording):
+        """Test that a set stop event ends the replay before any delivery."""
+        stop = threading.Event()
+        stop.set()
+        delivered = []
+
+        stats = ReplayClient(recording).replay(delivered.append, speed=1.0, stop_event=stop)
+
+        assert stats["messages"] == 0
+        assert delivered == []
@@ -0,0 +1,89 @@
+"""
+Tests for the VirtualTableModel behind VirtualTreeview: flattening, expansion and windowing.
+"""
+
+from app.ui.components.virtual_treeview import CLOSED_INDICATOR, OPEN_INDICATOR, VirtualTableModel
+
+
+def _format_row(row):
+    formatted = {"Item": row["name"], "Qty": f"{row['qty']:,}", "_tags": ("row",)}
+    if row.get("ops"):
+        formatted["_children"] = [{"Item": op, "Qty": "", "_tags": ("child",)} for op in row["ops"]]
+    return formatted
+
+
+def _model(rows):
+    model = VirtualTableModel(["Item", "Qty"], _format_row, lambda row: row["name"])
+    model.set_rows(rows)
+    return model
+
+
+class TestVirtualTableModel:
+    """Test the in-memory model of the virtualized table."""
+
+    def test_window_formats_only_requested_lines(self):
+        calls = []
+        rows = [{"name": f"item{i}", "qty": i * 1000} for i in range(1000)]
+        model = VirtualTableModel(["Item", "Qty"], lambda row: calls.append(row) or _format_row(row), lambda row: row["name"])
+        model.set_rows(rows)
+
+        window = model.window(500, 20)
+
+        assert len(model) == 1000
+        assert len(calls) == 20
+        assert window[0]["key"] == "item500"
+        assert window[0]["values"] == ["item500", "500,000"]
+        assert window[0]["tags"] == ("row",)
+        # The window is clipped at the end of the table
+        assert len(model.window(990, 20)) == 10
+
+    def test_expand_and_collapse_children(self):
+        model = _model([{"name": "a", "qty": 1, "ops": ["x", "y"]}, {"name": "b", "qty": 2}])
+
+        lines = model.window(0, 10)
+        assert [line["key"] for line in lines] == ["a", "b"]
+        assert lines[0]["expandable"] and lines[0]["text"] == CLOSED_INDICATOR
+        assert not lines[1]["expandable"] and lines[1]["text"] == ""
+
+        assert model.set_open("a", True) is True
+        assert model.set_open("a", True) is False
+        lines = model.window(0, 10)
+        assert [line["key"] for line in lines] == ["a", "a#0", "a#1", "b"]
+        assert lines[0]["text"] == OPEN_INDICATOR
+        assert lines[2]["values"] == ["y", ""]
+        assert lines[2]["tags"] == ("child",)
+
+        assert model.index_of("a#1") == 2
+        assert model.index_of("b") == 3
+        assert model.parent_line(2) == 0
+        assert model.parent_line(3) == 3
+
+        model.set_open("a", False)
+        assert len(model) == 2
+        assert model.index_of("a#1") is None
+
+    def test_expansion_survives_resort_and_is_pruned_for_removed_rows(self):
+        a = {"name": "a", "qty": 1, "ops": ["x"]}
+        b = {"name": "b", "qty": 2, "ops": ["y"]}
+        model = _model([a, b])
+        model.expand_all()
+        assert model.open_keys == {"a", "b"}
+
+        model.set_rows([b, a])
+        assert [line["key"] for line in model.window(0, 10)] == ["b", "b#0", "a", "a#0"]
+
+        model.set_rows([b])
+        assert model.open_keys == {"b"}
+
+    def test_placeholder_shown_when_empty(self):
+        model = VirtualTableModel(["Item", "Qty"], _format_row, lambda row: row["name"])
+        assert len(model) == 0
+
+        model.set_rows([], placeholder={"Item": "No items", "_tags": ("empty",)})
+
+        (line,) = model.window(0, 10)
+        assert len(model) == 1
+        assert line["key"] == "__placeholder__"
+        assert line["values"] == ["No items", ""]
+        assert line["tags"] == ("empty",)
+        assert model.parent_line(0) is None
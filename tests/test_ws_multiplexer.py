@@ -0,0 +1,281 @@
+"""
+Tests for WebSocketMultiplexer - concurrent one-off queries over a live subscription.
+
+Runs a small in-process websockets server that answers OneOffQuery frames out of
+order and streams subscription updates between them, and can drop its
+connections to exercise the client's automatic reconnect.
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+
+import pytest
+from websockets.asyncio.server import serve
+
+from app.client.bitcraft_client import BitCraft, backoff_delay
+from app.client.ws_multiplexer import WebSocketMultiplexer
+
+
+class FakeSpacetimeServer:
+    """Minimal SpacetimeDB-like server running on its own event loop thread."""
+
+    def __init__(self):
+        self.port = None
+        self.received = []
+        self.connections = set()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        assert self._ready.wait(5)
+        return self
+
+    def drop_connections(self):
+        """Abort every open client connection, as a network failure would."""
+
+        async def drop():
+            for websocket in list(self.connections):
+                websocket.transport.abort()
+
+        asyncio.run_coroutine_threadsafe(drop(), self._loop).result(5)
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._stop.set_result, None)
+        self._thread.join(5)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+
+    async def _serve(self):
+        self._stop = self._loop.create_future()
+        async with serve(self._handle, "127.0.0.1", 0) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop
+
+    async def _handle(self, websocket):
+        self.connections.add(websocket)
+        try:
+            await self._serve_connection(websocket)
+        except Exception:
+            pass
+        finally:
+            self.connections.discard(websocket)
+
+    async def _serve_connection(self, websocket):
+        await websocket.send(json.dumps({"IdentityToken": {"identity": "test"}}))
+        held = []
+        async for raw in websocket:
+            message = json.loads(raw)
+            self.received.append(message)
+
+            if "Subscribe" in message:
+                await websocket.send(json.dumps({"InitialSubscription": {"request_id": 1}}))
+            elif "SubscribeMulti" in message:
+                applied = {"query_id": message["SubscribeMulti"]["query_id"], "update": {"tables": []}}
+                await websocket.send(json.dumps({"SubscribeMultiApplied": applied}))
+            elif "OneOffQuery" in message:
+                held.append(message["OneOffQuery"])
+                # Answer the second query first, with a live update in between
+                if len(held) == 2:
+                    await websocket.send(json.dumps({"TransactionUpdate": {"seq": 1}}))
+                    for query in reversed(held):
+                        rows = [json.dumps({"query": query["query_string"]})]
+                        await websocket.send(
+                            json.dumps(
+                                {
+                                    "OneOffQueryResponse": {
+                                        "message_id": query["message_id"],
+                                        "tables": [{"table_name": "t", "rows": rows}],
+                                    }
+                                }
+                            )
+                        )
+                    held.clear()
+
+
+@pytest.fixture
+def server():
+    server = FakeSpacetimeServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def connection(server):
+    connection = WebSocketMultiplexer(f"ws://127.0.0.1:{server.port}", {}, connect_timeout=5)
+    connection.start()
+    yield connection
+    connection.close()
+
+
+class TestWebSocketMultiplexer:
+    """Test routing of query responses and subscription frames."""
+
+    def test_concurrent_queries_are_routed_by_message_id(self, connection):
+        """Test that out-of-order responses reach the right callers while updates keep flowing."""
+        messages = queue.Queue()
+        connection.set_message_handler(messages.put)
+        connection.send({"Subscribe": {"request_id": 1, "query_strings": ["SELECT * FROM t;"]}})
+        assert "InitialSubscription" in messages.get(timeout=5)
+
+        results = {}
+
+        def run_query(name):
+            results[name] = connection.query(f"SELECT {name};", timeout=5)
+
+        threads = [threading.Thread(target=run_query, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert results == {"a": [{"query": "SELECT a;"}], "b": [{"query": "SELECT b;"}]}
+        assert messages.get(timeout=5) == {"TransactionUpdate": {"seq": 1}}
+
+    def test_query_many_sends_all_queries_before_waiting(self, connection):
+        """Test that batched queries are pipelined (the server only answers once both arrive)."""
+        results = connection.query_many(["SELECT a;", "SELECT b;"], timeout=5)
+        assert results == [[{"query": "SELECT a;"}], [{"query": "SELECT b;"}]]
+
+    def test_query_times_out_with_empty_result(self, connection):
+        """Test that an unanswered query returns [] after its timeout."""
+        start = time.monotonic()
+        assert connection.query("SELECT lonely;", timeout=0.2) == []
+        assert time.monotonic() - start < 2
+
+    def test_closed_connection_rejects_queries(self, connection):
+        """Test that queries after close raise instead of hanging."""
+        connection.close()
+        assert not connection.is_open
+        with pytest.raises(RuntimeError):
+            connection.query("SELECT 1;")
+
+    def test_dropped_connection_calls_on_close(self, server):
+        """Test that an unexpected drop runs on_close while an explicit close does not."""
+        dropped = threading.Event()
+        connection = WebSocketMultiplexer(
+            f"ws://127.0.0.1:{server.port}", {}, connect_timeout=5, on_close=lambda conn: dropped.set()
+        )
+        connection.start()
+
+        server.drop_connections()
+        assert dropped.wait(5)
+        assert not connection.is_open
+        connection.close()
+
+        dropped.clear()
+        connection = WebSocketMultiplexer(
+            f"ws://127.0.0.1:{server.port}", {}, connect_timeout=5, on_close=lambda conn: dropped.set()
+        )
+        connection.start()
+        connection.close()
+        assert not dropped.wait(0.3)
+
+
+class TestAutomaticReconnect:
+    """Test the client's supervised reconnect and subscription resume."""
+
+    def test_backoff_delay_is_jittered_and_capped(self):
+        """Test that delays grow per attempt, stay within the cap and vary between calls."""
+        delays = [backoff_delay(3, base_delay=1.0, max_delay=60.0) for _ in range(50)]
+        assert all(4.0 <= delay <= 8.0 for delay in delays)
+        assert len(set(delays)) > 1
+        assert all(30.0 <= backoff_delay(20, 1.0, 60.0) <= 60.0 for _ in range(10))
+
+    def test_reconnect_resends_subscription(self, server):
+        """Test that a dropped connection is replaced and the subscription is sent again."""
+        client = BitCraft()
+        client.ws_uri = f"ws://127.0.0.1:{server.port}"
+        client.reconnect_base_delay = 0.05
+        events = queue.Queue()
+        client.on_disconnect = lambda: events.put("disconnected")
+        client.on_reconnect = lambda: events.put("reconnected")
+
+        messages = queue.Queue()
+        client.connect_websocket()
+        try:
+            client.start_subscription_listener(["SELECT * FROM t;"], messages.put)
+            assert "InitialSubscription" in messages.get(timeout=5)
+            first_connection = client.ws_connection
+
+            server.drop_connections()
+
+            assert events.get(timeout=5) == "disconnected"
+            assert events.get(timeout=5) == "reconnected"
+            assert "InitialSubscription" in messages.get(timeout=5)
+            assert client.ws_connection is not first_connection and client.ws_connection.is_open
+            subscribes = [m for m in server.received if "Subscribe" in m]
+            assert [m["Subscribe"]["query_strings"] for m in subscribes] == [["SELECT * FROM t;"]] * 2
+        finally:
+            client.close_websocket()
+
+    def test_reconnect_resends_subscription_handles(self, server):
+        """Test that subscription handles are re-sent with their original query ids."""
+        client = BitCraft()
+        client.ws_uri = f"ws://127.0.0.1:{server.port}"
+        client.reconnect_base_delay = 0.05
+        messages = queue.Queue()
+        client.connect_websocket()
+        try:
+            player_id = client.subscribe(["SELECT * FROM stamina_state;"], messages.put)
+            claim_id = client.subscribe(["SELECT * FROM building_state;"], messages.put)
+            client.unsubscribe(claim_id)
+            claim_id = client.subscribe(["SELECT * FROM inventory_state;"], messages.put)
+            for _ in range(3):
+                assert "SubscribeMultiApplied" in messages.get(timeout=5)
+
+            server.drop_connections()
+
+            resent = {messages.get(timeout=5)["SubscribeMultiApplied"]["query_id"]["id"] for _ in range(2)}
+            assert resent == {player_id, claim_id}
+            assert sorted(client.get_subscription_ids()) == sorted([player_id, claim_id])
+            assert any("UnsubscribeMulti" in m for m in server.received)
+        finally:
+            client.close_websocket()
+
+    def test_stop_subscriptions_unsubscribes_every_handle(self, server):
+        """Test that stop_subscriptions() sends UnsubscribeMulti for each live handle."""
+        client = BitCraft()
+        client.ws_uri = f"ws://127.0.0.1:{server.port}"
+        messages = queue.Queue()
+        client.connect_websocket()
+        try:
+            handles = [client.subscribe([f"SELECT * FROM t{i};"], messages.put) for i in range(2)]
+            for _ in handles:
+                assert "SubscribeMultiApplied" in messages.get(timeout=5)
+
+            client.stop_subscriptions()
+
+            deadline = time.monotonic() + 5
+            unsubscribed = []
+            while len(unsubscribed) < len(handles) and time.monotonic() < deadline:
+                unsubscribed = [m["UnsubscribeMulti"]["query_id"]["id"] for m in server.received if "UnsubscribeMulti" in m]
+                time.sleep(0.01)
+            assert sorted(unsubscribed) == sorted(handles)
+            assert client.get_subscription_ids() == []
+        finally:
+            client.close_websocket()
+
+    def test_close_websocket_cancels_reconnect(self, server):
+        """Test that an explicit close stops a reconnect that is waiting to retry."""
+        client = BitCraft()
+        client.ws_uri = f"ws://127.0.0.1:{server.port}"
+        client.reconnect_base_delay = 30.0
+        client.connect_websocket()
+
+        server.drop_connections()
+        deadline = time.monotonic() + 5
+        while client._reconnect_thread is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        client.close_websocket()
+        client._reconnect_thread.join(2)
+        assert not client._reconnect_thread.is_alive()
+        assert client.ws_connection is None